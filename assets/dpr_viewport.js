@@ -0,0 +1,68 @@
+// Reports which graphs of a page are on screen, so the server draws only those.
+//
+// A page opts in with a `data-viewport-store` attribute naming a dcc.Store; the
+// ids of the graphs inside it that are within a screen of the viewport are
+// written to that store (see src/steo/calcs.py).
+(function () {
+    const MARGIN = '100% 0px';
+    const DEBOUNCE_MS = 150;
+
+    const observed = new WeakSet();
+    const visible = {};  // store id -> Set of graph ids
+    const pending = new Set();
+    let timer = null;
+
+    function flush() {
+        timer = null;
+        if (!window.dash_clientside || !window.dash_clientside.set_props) {
+            return;
+        }
+        pending.forEach(function (storeId) {
+            window.dash_clientside.set_props(storeId, {
+                data: Array.from(visible[storeId]).sort(),
+            });
+        });
+        pending.clear();
+    }
+
+    const observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            const root = entry.target.closest('[data-viewport-store]');
+            if (!root) {
+                return;
+            }
+            const storeId = root.getAttribute('data-viewport-store');
+            const ids = (visible[storeId] = visible[storeId] || new Set());
+            if (entry.isIntersecting) {
+                ids.add(entry.target.id);
+            } else {
+                ids.delete(entry.target.id);
+            }
+            pending.add(storeId);
+        });
+        if (timer === null) {
+            timer = setTimeout(flush, DEBOUNCE_MS);
+        }
+    }, {rootMargin: MARGIN});
+
+    // Graphs mount whenever a page is visited, so keep looking for new ones
+    function scan() {
+        document.querySelectorAll('[data-viewport-store] .dash-graph[id]').forEach(function (graph) {
+            if (!observed.has(graph)) {
+                observed.add(graph);
+                observer.observe(graph);
+            }
+        });
+    }
+
+    function start() {
+        scan();
+        new MutationObserver(scan).observe(document.body, {childList: true, subtree: true});
+    }
+
+    if (document.body) {
+        start();
+    } else {
+        document.addEventListener('DOMContentLoaded', start);
+    }
+})();
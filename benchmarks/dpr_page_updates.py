@@ -0,0 +1,159 @@
+"""Measure response bytes and latency per interaction on the DPR regional page.
+
+`pages/page3_1.py` has 82 graphs fed by one callback. It used to rebuild and
+send every figure on each year button or evolution counter click. Now it
+draws only the graphs on screen and answers those clicks with `Patch`es that
+move axis ranges or add and remove traces. Graphs off screen are drawn when
+they scroll into view.
+
+Both callbacks are registered on throwaway Dash apps and driven through
+Flask's test client, so the bytes counted are the `_dash-update-component`
+responses the browser would receive. The viewport is assumed to hold
+``--visible`` graphs, including the prefetch margin.
+
+Run from the repository root:
+
+    python benchmarks/dpr_page_updates.py [--repeat N] [--visible N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+PAGE_ID = "page3_1"
+
+
+def legacy_callbacks(app, page_id, num_graphs, idents, load_evolutions):
+    """The single callback that rebuilt all figures, condensed."""
+    from dash import Input, Output
+
+    from src.steo.chart_dpr import chart_dpr
+
+    @app.callback(
+        [Output(f"{page_id}-graph-{i}", "figure") for i in range(1, num_graphs + 1)],
+        [Input(f"{page_id}-btn_{year}-state", "data") for year in range(2020, 2027)]
+        + [Input("evolution-store", "data")],
+    )
+    def update_graphs(*args):
+        *buttons, evolution_counter = args
+        evolutions = load_evolutions()
+        return [chart_dpr(ident, evolutions, *buttons, evolution_counter) for ident in idents]
+
+
+def _client(register):
+    from dash import Dash, html
+
+    from pages.page3_1 import idents, region_dct
+
+    app = Dash(__name__)
+    app.layout = html.Div()
+    register(app, PAGE_ID, len(idents), idents, region_dct)
+    return app, app.server.test_client()
+
+
+def _payload(app, inputs, state):
+    """A `_dash-update-component` request for the app's one figure callback."""
+    key, spec = next((k, v) for k, v in app.callback_map.items() if "graph-1.figure" in k)
+    outputs = [
+        {"id": part.rsplit(".", 1)[0], "property": part.rsplit(".", 1)[1]}
+        for part in key.strip(".").split("...")
+    ]
+    values = [{**spec_input, "value": inputs[spec_input["id"]]} for spec_input in spec["inputs"]]
+    states = [{**spec_state, "value": state[spec_state["id"]]} for spec_state in spec["state"]]
+    return {
+        "output": key,
+        "outputs": outputs,
+        "inputs": values,
+        "state": states,
+        "changedPropIds": [f"{value['id']}.data" for value in values],
+    }
+
+
+def _interactions(visible):
+    """(label, year, evolutions, graphs on screen) in the order a user makes them."""
+    first = [f"{PAGE_ID}-graph-{i}" for i in range(1, visible + 1)]
+    below = [f"{PAGE_ID}-graph-{i}" for i in range(visible + 1, 2 * visible + 1)]
+    return [
+        ("page load", 2020, 3, None),
+        ("viewport reported", 2020, 3, first),
+        ("year 2023", 2023, 3, first),
+        ("evolutions 3 -> 4", 2023, 4, first),
+        ("evolutions 4 -> 3", 2023, 3, first),
+        ("scroll down", 2023, 3, below),
+    ]
+
+
+def _run(app, client, interactions, partial):
+    import json
+
+    drawn = {}
+    results = []
+    for label, year, evolutions, viewport in interactions:
+        inputs = {f"{PAGE_ID}-btn_{y}-state": y == year for y in range(2020, 2027)}
+        inputs["evolution-store"] = evolutions
+        inputs[f"{PAGE_ID}-viewport"] = viewport
+        state = {f"{PAGE_ID}-drawn": drawn}
+        if not partial and label in ("viewport reported", "scroll down"):
+            # The legacy callback did not listen to the viewport
+            results.append((label, 0, 0.0))
+            continue
+
+        start = time.perf_counter()
+        response = client.post("/_dash-update-component", json=_payload(app, inputs, state))
+        elapsed = time.perf_counter() - start
+        if response.status_code == 204:
+            results.append((label, 0, elapsed))
+            continue
+        assert response.status_code == 200, response.data[:500]
+        body = response.get_data()
+        if partial:
+            drawn = json.loads(body)["response"].get(f"{PAGE_ID}-drawn", {}).get("data", drawn)
+        results.append((label, len(body), elapsed))
+    return results
+
+
+def _best(runs):
+    return [
+        (label, size, min(run[i][2] for run in runs)) for i, (label, size, _) in enumerate(runs[0])
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per callback (best is reported)")
+    parser.add_argument("--visible", type=int, default=12, help="graphs within the viewport")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO))
+    os.chdir(REPO)
+    warnings.simplefilter("ignore")
+
+    from pages.page3_1 import region_dct
+    from src.steo.calcs import create_callbacks
+
+    region_dct()  # loaded once, outside the timings
+    interactions = _interactions(args.visible)
+    legacy_app, legacy_client = _client(legacy_callbacks)
+    partial_app, partial_client = _client(create_callbacks)
+    legacy = _best([_run(legacy_app, legacy_client, interactions, False) for _ in range(args.repeat)])
+    partial = _best(
+        [_run(partial_app, partial_client, interactions, True) for _ in range(args.repeat)]
+    )
+
+    print(f"82 graphs, {args.visible} on screen")
+    print(f"{'interaction':<20}{'before KB':>11}{'ms':>9}{'after KB':>11}{'ms':>9}")
+    for (label, old_size, old_time), (_, new_size, new_time) in zip(legacy, partial):
+        print(
+            f"{label:<20}{old_size / 1024:11.1f}{old_time * 1000:9.1f}"
+            f"{new_size / 1024:11.1f}{new_time * 1000:9.1f}"
+        )
+    totals = [sum(size for _, size, _ in rows) for rows in (legacy, partial)]
+    print(f"{'total':<20}{totals[0] / 1024:11.1f}{'':>9}{totals[1] / 1024:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Measure a paginated EIA API v2 download, sequential versus concurrent.
+
+`eia_downloads/steo/meta.download_api` used to request one page at a time
+with `requests.get`, so a download took (pages x round trip). `EIAClient`
+asks for the first page, then fetches the rest over a pooled session a few
+pages at a time. Both run here against a local stand-in for api.eia.gov that
+serves synthetic STEO-shaped rows and sleeps ``--latency`` ms per request;
+the last run replays the responses recorded by the concurrent one.
+
+Run from the repository root:
+
+    python benchmarks/eia_api_pages.py [--rows N] [--latency MS] [--workers N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+REPO = Path(__file__).resolve().parents[1]
+PAGE_LENGTH = 5000
+
+
+def stand_in(rows, latency):
+    """A handler answering /v2/<route>/ like the API, slowed by ``latency`` seconds."""
+
+    class Api(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = {name: values[0] for name, values in parse_qs(urlsplit(self.path).query).items()}
+            offset, length = int(query["offset"]), int(query["length"])
+            time.sleep(latency)
+            body = json.dumps(
+                {"response": {"total": str(len(rows)), "data": rows[offset : offset + length]}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Api
+
+
+def legacy_download(url):
+    """The sequential loop `download_api` ran, condensed."""
+    import pandas as pd
+    import requests
+
+    params = {"api_key": "benchmark", "offset": 0, "length": PAGE_LENGTH}
+    all_data = []
+    while True:
+        response = requests.get(url + "steo/data/", params=params)
+        series_data = response.json().get("response", {}).get("data", [])
+        all_data.extend(series_data)
+        if len(series_data) < params["length"]:
+            break
+        params["offset"] += params["length"]
+    return pd.DataFrame(all_data)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="rows served (default 100000)")
+    parser.add_argument("--latency", type=float, default=150, help="ms per request (default 150)")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent requests (default 4)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO))
+    from eia_downloads.api import Cassette, EIAClient
+    from tests.local_http import serve
+
+    rows = [
+        {
+            "period": f"{2015 + i % 11}-{i % 12 + 1:02d}",
+            "seriesId": f"SERIES{i // 132}",
+            "seriesDescription": f"Series {i // 132}",
+            "value": f"{i * 0.37:.2f}",
+            "unit": "million barrels per day",
+        }
+        for i in range(args.rows)
+    ]
+    with serve(stand_in(rows, args.latency / 1000)) as root:
+        url = root + "/v2/"
+        legacy_time, legacy = timed(legacy_download, url)
+        with tempfile.TemporaryDirectory() as directory:
+            with EIAClient("benchmark", url, workers=args.workers,
+                           cassette=Cassette(directory, mode="record")) as client:
+                client_time, table = timed(client.fetch, "steo/data")
+            with EIAClient(cassette=Cassette(directory)) as client:
+                replay_time, replayed = timed(client.fetch, "steo/data")
+
+    assert table.to_pandas().equals(legacy) and replayed.equals(table)
+    pages = -(-args.rows // PAGE_LENGTH)
+    print(f"{args.rows} rows in {pages} pages, {args.latency:.0f} ms per request")
+    print(f"{'sequential requests':<28}{legacy_time * 1000:10.1f} ms")
+    print(f"{f'EIAClient, {args.workers} workers':<28}{client_time * 1000:10.1f} ms")
+    print(f"{'EIAClient, replayed':<28}{replay_time * 1000:10.1f} ms")
+    print(f"{'speedup':<28}{legacy_time / client_time:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
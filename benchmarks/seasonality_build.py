@@ -0,0 +1,110 @@
+"""Time the WPS seasonality build against the per-id builder it replaced.
+
+The old builder reshaped the pivot into one wide frame per range type, then
+looped over every id in `production_mapping`, running two `pivot_table`s per
+id and growing the result with `pd.concat`. Stock columns were rescaled with
+a per-element `apply`. `build_seasonality` does the same work as a few
+groupbys over one long frame. The benchmark checks that both produce the same
+table before reporting times.
+
+Run from the repository root:
+
+    python benchmarks/seasonality_build.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def legacy_build(data):
+    """The pre-vectorization builder, condensed but step for step."""
+    import pandas as pd
+
+    from src.utils.variables import seasonality_windows, type_to_remove
+    from src.wps.mapping import production_mapping
+
+    df = data.copy()
+    df.insert(0, "week_of_year", df["period"].dt.isocalendar().week)
+    df.insert(1, "year", df["period"].dt.year)
+    df = df[df["week_of_year"] <= 52]
+
+    ranges = []
+    for key, years in seasonality_windows.items():
+        window = df[df["year"].isin(years)].drop(columns=["period", "year"])
+        for name, stat in [("min", "min"), ("max", "max"), ("average", "mean")]:
+            frame = window.groupby(["week_of_year"]).agg(stat).reset_index()
+            frame.insert(0, "type", f"{name}_{key}")
+            ranges.append(frame)
+
+    df.insert(0, "type", "actual_" + df["year"].astype(str))
+    df = df.drop(columns=["year"])
+    df = pd.concat([df] + ranges)
+    df["week_of_year"] = df["week_of_year"].astype(int)
+    df["period"] = pd.to_datetime(df["period"]).apply(
+        lambda date: date.strftime("%b %d") if pd.notnull(date) else "No Date"
+    )
+    df = df.set_index(["type", "week_of_year", "period"])
+    for column in df.columns:
+        if "stocks" in production_mapping[column].lower():
+            df[column] = df[column].apply(lambda x: x / 1000)
+    df = df.reset_index()
+
+    dfs = pd.DataFrame()
+    for id in production_mapping:
+        one = df[["type", "week_of_year", "period", id]].rename(columns={id: "value"})
+        one = one[~one["type"].isin(type_to_remove)]
+        values = one.pivot_table(index=["week_of_year"], columns="type", values="value", aggfunc="first")
+        dates = one[one["type"].str.contains("actual")].pivot_table(
+            index=["week_of_year"], columns="type", values="period", aggfunc="first"
+        )
+        dates.columns = [f"dates_{col}" for col in dates.columns]
+        one = pd.concat([dates, values], axis=1).reset_index()
+        one.columns.name = None
+        one.insert(0, "id", id)
+        dfs = pd.concat([dfs, one])
+    return dfs.reset_index(drop=True)
+
+
+def best_of(repeat, func, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per builder (best is reported)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO))
+    os.chdir(REPO)
+    warnings.simplefilter("ignore")
+
+    import pandas as pd
+
+    from src.wps.generate_seasonality_data import build_seasonality
+
+    data = pd.read_feather("./data/wps/wps_gte_2015_pivot.feather")
+    data["period"] = pd.to_datetime(data["period"])
+
+    legacy_time, legacy = best_of(args.repeat, legacy_build, data)
+    new_time, new = best_of(args.repeat, build_seasonality, data)
+    pd.testing.assert_frame_equal(new, legacy, check_dtype=False)
+
+    print(f"{data.shape[1] - 1} series x {len(data)} weeks -> {len(new)} rows")
+    print(f"{'per-id loop':<22}{legacy_time * 1000:10.1f} ms")
+    print(f"{'build_seasonality':<22}{new_time * 1000:10.1f} ms")
+    print(f"{'speedup':<22}{legacy_time / new_time:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Report the cold-start cost of the dashboard, page by page.
+
+Two numbers per page:
+
+* import -- the time to import the page module, which is what every worker
+  pays at startup to register callbacks. Pages are imported in `src/index.py`
+  order in one process, so shared dependencies are charged to the first page
+  that pulls them in. `--isolated` imports each page in a fresh interpreter
+  instead, charging each page its full cost.
+* layout -- the time to build the page's layout on its first visit.
+
+Run from the repository root:
+
+    python benchmarks/startup_imports.py [--isolated] [--top N]
+"""
+
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def index_pages():
+    """Page modules in the order `src/index.py` imports them."""
+    source = (REPO / "src" / "index.py").read_text(encoding="utf-8")
+    return re.findall(r"^import (pages\.\w+)", source, flags=re.MULTILINE)
+
+
+def _timed_import(name):
+    start = time.perf_counter()
+    importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+def isolated_import_time(name):
+    code = (
+        "import time, importlib, src.app; "
+        f"t = time.perf_counter(); importlib.import_module({name!r}); "
+        "print(time.perf_counter() - t)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=REPO, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--isolated", action="store_true",
+                        help="import each page in a fresh interpreter")
+    parser.add_argument("--top", type=int, default=0,
+                        help="show only the N most expensive pages")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO))
+    os.chdir(REPO)
+
+    start = time.perf_counter()
+    import src.app  # noqa: F401 -- the Dash app every page registers against
+    app_time = time.perf_counter() - start
+
+    pages = index_pages()
+    imports = {}
+    for name in pages:
+        imports[name] = isolated_import_time(name) if args.isolated else _timed_import(name)
+    if args.isolated:
+        # Layouts are built in this process; keep their import out of the timing
+        for name in pages:
+            importlib.import_module(name)
+
+    from src.components.router import PageRouter
+    from src.config.routes import DEFAULT_PAGE, ROUTES
+
+    router = PageRouter(ROUTES, DEFAULT_PAGE)
+    layouts = {}
+    for path in ROUTES:
+        module_name = router.module_for(path)
+        if module_name in layouts:
+            continue
+        start = time.perf_counter()
+        router.layout(path)
+        layouts[module_name] = time.perf_counter() - start
+
+    rows = sorted(pages, key=lambda n: imports[n], reverse=True)
+    if args.top:
+        rows = rows[:args.top]
+    print(f"{'page':<22}{'import ms':>12}{'layout ms':>12}")
+    for name in rows:
+        layout = layouts.get(name)
+        layout_ms = f"{layout * 1000:12.1f}" if layout is not None else f"{'-':>12}"
+        print(f"{name:<22}{imports[name] * 1000:12.1f}{layout_ms}")
+    print(f"{'src.app':<22}{app_time * 1000:12.1f}")
+    print(f"{'total import':<22}{(app_time + sum(imports.values())) * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Paginated reads of the EIA API v2.
+
+A v2 route (``steo/data``, ``petroleum/stoc/wstk/data``, ...) returns at most
+5000 rows per request, and `steo.meta.download_api` used to walk them with
+one blocking request after another. `EIAClient.fetch` asks for the first page,
+reads the row count the API reports with it, and fetches the remaining pages
+a few at a time over one pooled session. Each page is decoded into an Arrow
+record batch as it arrives. Throttled or failed requests are retried with
+exponential backoff, and with a checkpoint directory the pages fetched so far
+survive an interrupted run.
+
+Responses can be recorded to and replayed from a directory (`Cassette`), so
+tests and benchmarks run offline against a local stand-in server, or without
+any server.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pyarrow as pa
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = "https://api.eia.gov/v2/"
+# The most rows the API returns per request
+PAGE_LENGTH = 5000
+# Pages are fetched a few at a time; EIA throttles wider fan-outs
+WORKERS = 4
+RETRIES = 4
+BACKOFF = 1.0
+TIMEOUT = 60
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Checkpointed pages older than this are fetched again rather than resumed
+CHECKPOINT_MAX_AGE = 24 * 3600
+
+
+class ApiError(RuntimeError):
+    """A request the API refused, or one that still failed after every retry."""
+
+
+def _public(params):
+    """Request parameters without the API key, which is never logged or stored."""
+    return {name: value for name, value in params.items() if name != "api_key"}
+
+
+def _write_atomic(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as file:
+            write(file)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class Cassette:
+    """API responses stored under ``directory``, one JSON file per request.
+
+    In ``"record"`` mode every response fetched is written; in ``"replay"``
+    mode responses are served from the files only, and a request that was not
+    recorded is an error. Requests are identified by route and parameters,
+    without the API key.
+    """
+
+    def __init__(self, directory, mode="replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+
+    def path(self, route, params):
+        request = json.dumps([route.strip("/"), _public(params)], sort_keys=True, default=str)
+        return self.directory / f"{hashlib.sha1(request.encode()).hexdigest()}.json"
+
+    def read(self, route, params):
+        try:
+            with open(self.path(route, params), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise ApiError(f"No recorded response for {route} {_public(params)}") from None
+
+    def write(self, route, params, payload):
+        body = json.dumps(payload).encode("utf-8")
+        _write_atomic(self.path(route, params), lambda file: file.write(body))
+
+
+class _Checkpoint:
+    """Pages of one query kept as Arrow IPC files, so an interrupted fetch resumes."""
+
+    def __init__(self, directory, route, params, length):
+        query = json.dumps([route.strip("/"), _public(params), length], sort_keys=True, default=str)
+        self.directory = Path(directory) / hashlib.sha1(query.encode()).hexdigest()
+
+    def total(self):
+        try:
+            with open(self.directory / "total.json", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def age(self):
+        """Seconds since the run that started these pages, or None without one."""
+        try:
+            return time.time() - (self.directory / "total.json").stat().st_mtime
+        except OSError:
+            return None
+
+    def save_total(self, total):
+        body = json.dumps(total).encode("utf-8")
+        _write_atomic(self.directory / "total.json", lambda file: file.write(body))
+
+    def read(self, offset):
+        try:
+            with pa.memory_map(str(self.directory / f"{offset}.arrow")) as source:
+                return pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def save(self, offset, table):
+        def write(file):
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+
+        _write_atomic(self.directory / f"{offset}.arrow", write)
+
+    def remove(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def decode(rows, schema=None):
+    """The rows of one page (a list of dicts) as an Arrow table.
+
+    With a ``schema``, keys not in it are dropped and missing ones are null;
+    otherwise the columns and types are inferred from the rows.
+    """
+    if schema is not None:
+        return pa.Table.from_batches([pa.RecordBatch.from_pylist(rows, schema=schema)], schema)
+    return pa.Table.from_batches([pa.RecordBatch.from_pylist(rows)])
+
+
+class EIAClient:
+    """Reads EIA API v2 routes over a pooled session.
+
+    ``api_key`` defaults to the ``EIA_API_KEY`` environment variable; it is
+    not needed to replay a `Cassette`. ``workers`` bounds the requests in
+    flight; a request is tried ``retries`` more times after a connection
+    error or a 429/5xx answer, waiting ``backoff * 2**attempt`` seconds, or as
+    long as the API's Retry-After asks.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        base_url=API_URL,
+        workers=WORKERS,
+        retries=RETRIES,
+        backoff=BACKOFF,
+        timeout=TIMEOUT,
+        cassette=None,
+    ):
+        self.api_key = api_key if api_key is not None else os.environ.get("EIA_API_KEY")
+        self.cassette = cassette
+        if not self.api_key and not self._replaying:
+            raise RuntimeError("Missing EIA_API_KEY. Set it in .env or your shell.")
+        self.base_url = base_url.rstrip("/") + "/"
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def _replaying(self):
+        return self.cassette is not None and self.cassette.mode == "replay"
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, route, params):
+        """The JSON body of one request to ``route``."""
+        if self._replaying:
+            return self.cassette.read(route, params)
+
+        url = self.base_url + route.strip("/") + "/"
+        failure = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(failure[1] if failure[1] is not None else self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self.session.get(
+                    url, params={**params, "api_key": self.api_key}, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                failure = (type(error).__name__, None)
+                continue
+            if response.status_code in RETRY_STATUSES:
+                failure = (f"HTTP {response.status_code}", _retry_after(response))
+                continue
+            if not response.ok:
+                raise ApiError(f"{route}: HTTP {response.status_code} {response.text[:200]}")
+            payload = response.json()
+            if "error" in payload:
+                raise ApiError(f"{route}: {payload['error']}")
+            if self.cassette is not None:
+                self.cassette.write(route, params, payload)
+            return payload
+        raise ApiError(f"{route} {_public(params)} failed {self.retries + 1} times: {failure[0]}")
+
+    def page(self, route, params, offset, length=PAGE_LENGTH, schema=None):
+        """(rows as an Arrow table, total row count) of the page at ``offset``."""
+        payload = self.get(route, {**params, "offset": offset, "length": length})
+        response = payload.get("response", {})
+        return decode(response.get("data", []), schema), int(response.get("total", 0))
+
+    def fetch(self, route, params=None, schema=None, length=PAGE_LENGTH, checkpoint=None):
+        """Every row of ``route`` for ``params`` as one Arrow table, in the API's order.
+
+        ``schema`` fixes the columns and types of the rows; otherwise they are
+        inferred per page and unified. With a ``checkpoint`` directory each
+        page is kept there as it arrives, a later call with the same arguments
+        fetches only the pages still missing, and the pages are removed once
+        all of them are in. The first page is always fetched: stored pages are
+        reused only while the API reports the row count they were fetched
+        with, and for at most `CHECKPOINT_MAX_AGE` seconds.
+        """
+        params = dict(params or {})
+        pages = _Checkpoint(checkpoint, route, params, length) if checkpoint is not None else None
+
+        tables = {}
+        first, total = self.page(route, params, 0, length, schema)
+        if pages is not None:
+            age = pages.age()
+            if pages.total() != total or (age is not None and age > CHECKPOINT_MAX_AGE):
+                # Pages of an earlier state of the data: start over
+                pages.remove()
+            pages.save(0, first)
+            if pages.total() is None:
+                pages.save_total(total)
+        tables[0] = first
+
+        offsets = list(range(length, total, length))
+        missing = []
+        for offset in offsets:
+            stored = pages.read(offset) if pages is not None else None
+            if stored is None:
+                missing.append(offset)
+            else:
+                tables[offset] = stored
+        if missing:
+            print(f"Downloading {route}: {total} rows, {len(missing)} of {len(offsets) + 1} pages to fetch")
+
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {
+                pool.submit(self.page, route, params, offset, length, schema): offset
+                for offset in missing
+            }
+            for future in as_completed(futures):
+                table, _ = future.result()
+                tables[futures[future]] = table
+                if pages is not None:
+                    pages.save(futures[future], table)
+        finally:
+            # A failed page stops the pages not yet started; those fetched are kept
+            pool.shutdown(cancel_futures=True)
+
+        ordered = [tables[offset] for offset in sorted(tables)]
+        if schema is not None:
+            table = pa.concat_tables(ordered)
+        else:
+            table = pa.concat_tables(ordered, promote_options="permissive")
+        if pages is not None:
+            pages.remove()
+        return table
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
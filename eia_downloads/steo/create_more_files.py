@@ -1,4 +1,5 @@
 import pandas as pd
+from dash_eia.transforms import dpr
 from eia_downloads import config
 
 def get_dpr_ids():
@@ -12,6 +13,12 @@ def get_dpr_ids():
     df = df.reset_index(drop=True)
 
     df.to_feather(str(config.get_data_path("steo", "steo_pivot_dpr.feather")))
+    # The DPR pages chart from this array rather than the pivot
+    dpr.materialize(
+        config.get_data_path("steo", "steo_pivot_dpr.feather"),
+        config.get_lookup_path("steo", "mapping_dpr.csv"),
+        config.get_data_path("steo", "steo_pivot_dpr_evolutions.npz"),
+    )
 
     return df
 
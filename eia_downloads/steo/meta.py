@@ -1,7 +1,8 @@
-import os
-import requests
+import argparse
+
 import pandas as pd
 from eia_downloads import config
+from eia_downloads.api import Cassette, EIAClient
 
 
 def _load_dotenv():
@@ -22,39 +23,22 @@ def _load_dotenv():
     load_dotenv()
 
 
-def download_api():
+def download_api(cassette=None):
+    """Every monthly STEO value since 2015 from `api.eia.gov/v2/steo/data/`.
+
+    Pages are fetched concurrently (`eia_downloads.api`) and checkpointed
+    under data/raw/eia_api, so an interrupted download resumes. A `Cassette`
+    records the responses, or replays them without a network or API key.
+    """
     _load_dotenv()
-    base_url = "https://api.eia.gov/v2/steo/data/"
-    api_key = os.environ.get("EIA_API_KEY")
-    if not api_key:
-        raise RuntimeError("Missing EIA_API_KEY. Set it in .env or your shell.")
     params = {
-        "api_key": api_key,
         "frequency": "monthly",
         "data[0]": "value",
         "start": "2015-01",
-        "offset": 0,  # Start with an offset of 0
-        "length": 5000,  # Number of records per request (adjust as needed)
     }
-    all_data = []
-    while True:
-        response = requests.get(base_url, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            series_data = data.get("response", {}).get("data", [])
-            all_data.extend(series_data)
-            if len(series_data) < params["length"]:
-                break
-            else:
-                params["offset"] += params["length"]
-                print(f"Downloading steo via API Call | Offset: {params['offset']}")
-
-        else:
-            print("Error:", response.status_code)
-            break
-    df = pd.DataFrame(all_data)
-    return df
+    with EIAClient(cassette=cassette) as client:
+        table = client.fetch("steo/data", params, checkpoint=config.get_data_path("raw", "eia_api"))
+    return table.to_pandas()
 
 
 def create_csv(df):
@@ -86,8 +70,8 @@ def create_meta(df):
     return df
 
 
-def main():
-    df = download_api()
+def main(cassette=None):
+    df = download_api(cassette)
     df = create_csv(df)
     meta = create_meta(df)
     meta.to_csv(config.get_lookup_path("steo", "metadata_steo.csv"), index=False)
@@ -96,4 +80,15 @@ def main():
 
 
 if __name__ == "__main__":
-    df = main()
+    parser = argparse.ArgumentParser(description="Download STEO metadata from the EIA API v2")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="DIR", help="store every API response under DIR")
+    group.add_argument("--replay", metavar="DIR", help="read the API responses stored under DIR")
+    args = parser.parse_args()
+    if args.record:
+        cassette = Cassette(args.record, mode="record")
+    elif args.replay:
+        cassette = Cassette(args.replay, mode="replay")
+    else:
+        cassette = None
+    df = main(cassette)
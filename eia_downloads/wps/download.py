@@ -2,7 +2,7 @@ import requests
 import pandas as pd
 import numpy as np
 from eia_downloads.wps.mapping import production_mapping
-from eia_downloads.wps.calculations import generate_additional_tickers
+from dash_eia.transforms.wps import generate_additional_tickers
 from eia_downloads import config
 
 def download_raw_file():
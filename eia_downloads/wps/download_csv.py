@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from eia_downloads.wps.mapping import production_mapping
-from eia_downloads.wps.calculations import generate_additional_tickers
+from dash_eia.transforms.wps import generate_additional_tickers
 from eia_downloads import config
 
 def first_pass(df):
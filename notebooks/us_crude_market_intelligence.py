@@ -53,10 +53,11 @@ if ROOT not in sys.path:
 
 # %%
 # Load all datasets
+from src.cli.store import CRUDE, read_imports
 wps_pivot = pd.read_feather(os.path.join(ROOT, 'data/wps/wps_gte_2015_pivot.feather'))
 wps_long = pd.read_feather(os.path.join(ROOT, 'data/wps/wps_gte_2015.feather'))
 seasonality = pd.read_feather(os.path.join(ROOT, 'data/wps/seasonality_data.feather'))
-cli_crude = pd.read_parquet(os.path.join(ROOT, 'data/cli/companylevelimports_crude.parquet'))
+cli_crude = read_imports(os.path.join(ROOT, 'data/cli/companylevelimports'), products=CRUDE)
 steo_dpr = pd.read_feather(os.path.join(ROOT, 'data/steo/steo_pivot_dpr.feather'))
 steo_dpr_other = pd.read_feather(os.path.join(ROOT, 'data/steo/steo_pivot_dpr_other.feather'))
 
@@ -142,72 +142,74 @@ def _build_sparkline(df, ticker, label, color):
 
 
 # ── Build layout ──────────────────────────────────────────────────────
-_df = _load_data()
-
-if _df is not None and len(_df) >= 2:
-    _latest = _df.iloc[-1]
-    _prev = _df.iloc[-2]
-    _last_date = _latest["period"].strftime("%B %d, %Y")
-
-    _metric_cols = []
-    for ticker, label, unit, divisor, color in METRICS:
-        cur = _latest.get(ticker, 0)
-        prv = _prev.get(ticker, 0)
-        delta = cur - prv
-        _metric_cols.append(
-            dbc.Col(
-                create_metric_card(label, _fmt(cur, unit, divisor),
-                                   _delta_str(delta, unit, divisor), delta, color),
-                lg=2, md=4, sm=6, className="mb-3",
+def layout():
+    """Built on first navigation rather than at import (see src/config/routes.py)"""
+    df = _load_data()
+
+    if df is not None and len(df) >= 2:
+        latest = df.iloc[-1]
+        prev = df.iloc[-2]
+        last_date = latest["period"].strftime("%B %d, %Y")
+
+        metric_cols = []
+        for ticker, label, unit, divisor, color in METRICS:
+            cur = latest.get(ticker, 0)
+            prv = prev.get(ticker, 0)
+            delta = cur - prv
+            metric_cols.append(
+                dbc.Col(
+                    create_metric_card(label, _fmt(cur, unit, divisor),
+                                       _delta_str(delta, unit, divisor), delta, color),
+                    lg=2, md=4, sm=6, className="mb-3",
+                )
             )
-        )
-
-    _sparkline_cols = []
-    for ticker, label, color in SPARKLINES:
-        _sparkline_cols.append(
-            dbc.Col(_build_sparkline(_df, ticker, label, color),
-                    lg=4, md=6, className="mb-3")
-        )
-else:
-    _last_date = "--"
-    _metric_cols = [dbc.Col(html.Div("Data unavailable"), lg=12)]
-    _sparkline_cols = []
-
-layout = html.Div([
-    # Header strip
-    dbc.Row([
-        dbc.Col(
-            html.Div("Market Summary", style={
-                "fontSize": "1.1rem", "fontWeight": "600", "color": GRAY_800,
-            }),
-            width="auto",
-        ),
-        dbc.Col(
-            html.Div([
-                html.Span("EIA Weekly Petroleum Status Report", style={
-                    "fontSize": "0.85rem", "color": GRAY_500,
-                }),
-                html.Span(" | ", style={"margin": "0 0.5rem", "color": "#dee2e6"}),
-                html.Span(f"Last Updated: {_last_date}", style={
-                    "fontSize": "0.85rem", "color": GRAY_500,
+
+        sparkline_cols = []
+        for ticker, label, color in SPARKLINES:
+            sparkline_cols.append(
+                dbc.Col(_build_sparkline(df, ticker, label, color),
+                        lg=4, md=6, className="mb-3")
+            )
+    else:
+        last_date = "--"
+        metric_cols = [dbc.Col(html.Div("Data unavailable"), lg=12)]
+        sparkline_cols = []
+
+    return html.Div([
+        # Header strip
+        dbc.Row([
+            dbc.Col(
+                html.Div("Market Summary", style={
+                    "fontSize": "1.1rem", "fontWeight": "600", "color": GRAY_800,
                 }),
-            ], style={"textAlign": "right"}),
+                width="auto",
+            ),
+            dbc.Col(
+                html.Div([
+                    html.Span("EIA Weekly Petroleum Status Report", style={
+                        "fontSize": "0.85rem", "color": GRAY_500,
+                    }),
+                    html.Span(" | ", style={"margin": "0 0.5rem", "color": "#dee2e6"}),
+                    html.Span(f"Last Updated: {last_date}", style={
+                        "fontSize": "0.85rem", "color": GRAY_500,
+                    }),
+                ], style={"textAlign": "right"}),
+            ),
+        ], align="center", className="mb-4",
+           style={"borderBottom": "1px solid #dee2e6", "paddingBottom": "0.75rem"}),
+
+        # Metric cards
+        dbc.Row(metric_cols, className="mb-4"),
+
+        # Sparklines
+        dbc.Row(sparkline_cols, className="mb-4"),
+
+        # Footer
+        html.Div(
+            f"Data sourced from EIA Weekly Petroleum Status Report  |  Report date: {last_date}",
+            style={
+                "textAlign": "center", "fontSize": "0.8rem",
+                "color": GRAY_500, "padding": "1rem 0",
+            },
         ),
-    ], align="center", className="mb-4",
-       style={"borderBottom": "1px solid #dee2e6", "paddingBottom": "0.75rem"}),
-
-    # Metric cards
-    dbc.Row(_metric_cols, className="mb-4"),
-
-    # Sparklines
-    dbc.Row(_sparkline_cols, className="mb-4"),
-
-    # Footer
-    html.Div(
-        f"Data sourced from EIA Weekly Petroleum Status Report  |  Report date: {_last_date}",
-        style={
-            "textAlign": "center", "fontSize": "0.8rem",
-            "color": GRAY_500, "padding": "1rem 0",
-        },
-    ),
-], style={"padding": "1.5rem 2rem", "backgroundColor": GRAY_50, "minHeight": "100vh"})
+    ], style={"padding": "1.5rem 2rem", "backgroundColor": GRAY_50, "minHeight": "100vh"})
@@ -1,41 +1,75 @@
 from src.wps.download_csv import main as download_csv
 from src.wps.download_xlsx import main as download_xlsx
-from src.wps.generate_seasonality_data import generate_seasonality_data
-from src.wps.generate_line_data import generate_line_data
 from src.wps.table_mapping import *
 from src.utils.colors import RED, GRAY_300, POSITIVE, NEGATIVE
 import dash
-from dash import html, dash_table, dcc, Input, Output
+from dash import html, dash_table, dcc, Input, Output, State
 from dash.dash_table.Format import Format, Group, Sign, Symbol, Scheme
 from src.app import app, initial_data
+from src.utils import datasets
+from src.components.jobs import POLL_INTERVAL, job_status
+from dash_eia import jobs
 import pandas as pd
 
 layout = html.Div([
     dcc.Store(id='headline-data-store', data=initial_data),
     html.Button('Generate and Save Data', id='headline-generate-data-btn'),
+    html.Button('Cancel', id='headline-cancel-btn', style={'marginLeft': '10px'}),
+    # The ingest runs as a background job, polled until it finishes
+    dcc.Store(id='headline-job'),
+    dcc.Interval(id='headline-job-poll', interval=POLL_INTERVAL, disabled=True),
+    html.Div(id='headline-job-status'),
     html.Div(style={'height': '20px'}),  # Buffer separator
     html.Div(id='headline-tables-container')  # Container to hold the tables
 ])
 
 @app.callback(
-    Output('headline-data-store', 'data'),
+    Output('headline-job', 'data'),
+    Output('headline-job-poll', 'disabled'),
+    Output('headline-job-status', 'children'),
     Input('headline-generate-data-btn', 'n_clicks'),
     prevent_initial_call=True
 )
 def generate_data(n_clicks):
-    if n_clicks is not None and n_clicks > 0:
-        df = download_xlsx()
-        generate_seasonality_data()
-        generate_line_data()
-        return df.to_dict('records')
-    else:
-        return pd.read_feather('./data/wps/wps_gte_2015_pivot.feather').to_dict('records')
+    # Also brings the line and seasonality files up to date. A second click,
+    # from any session, joins the ingest already running.
+    job_id = jobs.default_queue().submit(download_xlsx, key='wps_ingest')
+    return job_id, False, job_status(jobs.default_queue().status(job_id), 'Update')
+
+@app.callback(
+    Output('headline-job-status', 'children', allow_duplicate=True),
+    Input('headline-cancel-btn', 'n_clicks'),
+    State('headline-job', 'data'),
+    prevent_initial_call=True
+)
+def cancel_data(n_clicks, job_id):
+    if not job_id or not jobs.default_queue().cancel(job_id):
+        return dash.no_update
+    return 'Cancelling...'
+
+@app.callback(
+    Output('headline-data-store', 'data'),
+    Output('headline-job-poll', 'disabled', allow_duplicate=True),
+    Output('headline-job-status', 'children', allow_duplicate=True),
+    Input('headline-job-poll', 'n_intervals'),
+    State('headline-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_data(n_intervals, job_id):
+    if not job_id:
+        return dash.no_update, True, dash.no_update
+    job = jobs.default_queue().status(job_id)
+    if job is not None and job.active:
+        return dash.no_update, False, job_status(job, 'Update')
+    if job is not None and job.status == jobs.DONE:
+        # The rewritten pivot carries a new version, so the handle resolves to fresh data
+        return datasets.handle('wps_pivot'), True, None
+    return dash.no_update, True, job_status(job, 'Update')
 
 def generate_main_table(df):
     df['period'] = pd.to_datetime(df['period']).dt.strftime('%m/%d')
-    df = df.tail(2).set_index('period').T.reset_index()
+    df = df.tail(2).set_index('period').T.rename_axis('name').reset_index()
     df['change'] = df.iloc[:, 2] - df.iloc[:, 1]
-    df.rename(columns={'index': 'name'}, inplace=True)
     return df
 
 def generate_dash_table(df, idents, table_id):
@@ -106,7 +140,7 @@ def update_tables(data):
     if data is None:
         return dash.no_update
     
-    df = pd.DataFrame(data)
+    df = datasets.resolve(data)
     main_table = generate_main_table(df)
 
     table_ids = {
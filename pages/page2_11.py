@@ -4,29 +4,16 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from src.wps.ag_calculations import DataProcessor
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import RED, BLUE, ORANGE, GREEN, PURPLE, POSITIVE, NEGATIVE, COLORSCALE_HEATMAP, CHART_SEQUENCE
 
-# Initialize the data processor
-processor = DataProcessor()
-
 # Dynamic date range - get most recent data
 today = datetime.now()
 # Start from 6 months ago for better visualization
 default_start_date = (today - timedelta(days=180)).strftime('%Y-%m-%d')
 default_end_date = today.strftime('%Y-%m-%d')
 
-# Process data and column definitions - with error handling
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_11: {e}")
-    # Create empty dataframe with minimal columns for initial load
-    import pandas as pd
-    df = pd.DataFrame()
-    columnDefinitions = []
-
 # Page layout for page 2_11 - PADD Regional Stock Comparison Charts
 layout = html.Div([
     # Header section
@@ -110,14 +97,14 @@ layout = html.Div([
     ], style={"padding": "20px", "height": "85vh", "overflow": "auto"}),
     
     # Hidden stores
-    dcc.Store(id='current-data-store-p11', data=df.to_dict('records') if not df.empty else [])
+    dcc.Store(id='current-data-store-p11', data=datasets.handle('wps_ag_series', start=default_start_date, end=default_end_date))
     
 ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # Helper function to get stock data by PADD and commodity
-def get_stock_data_by_padd(df, commodity_type='crude'):
-    """Extract stock data for specific commodity by PADD region"""
-    if df.empty:
+def get_stock_data_by_padd(store, commodity_type='crude'):
+    """Stock series of a commodity in the store, one row per PADD region"""
+    if not len(store):
         return pd.DataFrame()
     
     # Define the mapping based on commodity type
@@ -164,13 +151,11 @@ def get_stock_data_by_padd(df, commodity_type='crude'):
     result = []
     for padd, codes in padd_mapping.items():
         for code in codes:
-            row_data = df[df['id'] == code]
-            if not row_data.empty:
+            if code in store:
                 result.append({
                     'padd': padd,
                     'code': code,
-                    'name': row_data['name'].iloc[0],
-                    'data': row_data
+                    'name': store.name(code)
                 })
     
     return pd.DataFrame(result)
@@ -182,12 +167,7 @@ def get_stock_data_by_padd(df, commodity_type='crude'):
      Input("date-picker-range-p11", "end_date")]
 )
 def update_data_store(start_date, end_date):
-    try:
-        df, _ = processor.get_data(start_date, end_date)
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error updating data store: {e}")
-        return []
+    return datasets.handle('wps_ag_series', start=start_date, end=end_date)
 
 # Callback for PADD stocks bar chart
 @callback(
@@ -198,15 +178,13 @@ def update_padd_stocks_bar(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
+    store = datasets.resolve(data)
     
-    # Get latest date column
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in df.columns if col not in metadata_cols]
-    if not date_cols:
+    # Get latest week
+    if not len(store.periods):
         return go.Figure().update_layout(title="No date data available")
     
-    latest_date = max(date_cols)
+    latest_date = store.periods[-1]
     
     fig = go.Figure()
     
@@ -215,19 +193,17 @@ def update_padd_stocks_bar(data):
     colors = [RED, BLUE, ORANGE, GREEN]
     
     for i, commodity in enumerate(commodities):
-        stock_data = get_stock_data_by_padd(df, commodity)
+        stock_data = get_stock_data_by_padd(store, commodity)
         if not stock_data.empty:
             padds = []
             values = []
             
             for _, row in stock_data.iterrows():
                 if row['padd'] != 'US' and row['padd'] != 'CUSHING':  # Exclude US total and Cushing
-                    padd_data = row['data']
-                    if latest_date in padd_data.columns:
-                        value = padd_data[latest_date].iloc[0]
-                        if pd.notna(value):
-                            padds.append(row['padd'])
-                            values.append(float(value))
+                    value = store.row(row['code'])[-1]
+                    if pd.notna(value):
+                        padds.append(row['padd'])
+                        values.append(float(value))
             
             if padds and values:
                 fig.add_trace(go.Bar(
@@ -239,12 +215,7 @@ def update_padd_stocks_bar(data):
                     textposition='outside'
                 ))
     
-    # Convert latest_date to datetime and format it properly
-    try:
-        date_obj = pd.to_datetime(latest_date, format='%m/%d/%y')
-        formatted_date = date_obj.strftime('%Y-%m-%d')
-    except:
-        formatted_date = latest_date
+    formatted_date = latest_date.strftime('%Y-%m-%d')
     
     fig.update_layout(
         title=f"Current Stock Levels by PADD Region ({formatted_date})",
@@ -268,18 +239,15 @@ def update_days_supply_heatmap(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
+    store = datasets.resolve(data)
     
     # Calculate approximate days of supply (simplified calculation)
     # This would need actual consumption/demand data for accurate calculation
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in df.columns if col not in metadata_cols]
-    
-    if len(date_cols) < 2:
+    if len(store.periods) < 2:
         return go.Figure().update_layout(title="Insufficient data for days of supply calculation")
     
     # Use last 4 weeks to estimate consumption rate
-    recent_dates = sorted(date_cols)[-4:]
+    recent_dates = store.periods[-4:]
     
     commodities = ['Crude', 'Gasoline', 'Distillate', 'Jet Fuel']
     padds = ['P1', 'P2', 'P3', 'P4', 'P5']
@@ -320,20 +288,17 @@ def update_stock_changes_waterfall(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
+    store = datasets.resolve(data)
     
     # Get last two weeks to calculate changes
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in df.columns if col not in metadata_cols]
-    
-    if len(date_cols) < 2:
+    if len(store.periods) < 2:
         return go.Figure().update_layout(title="Insufficient data for change calculation")
     
-    current_date = sorted(date_cols)[-1]
-    previous_date = sorted(date_cols)[-2]
+    current_date = store.periods[-1]
+    previous_date = store.periods[-2]
     
     # Calculate changes for crude oil by PADD
-    stock_data = get_stock_data_by_padd(df, 'crude')
+    stock_data = get_stock_data_by_padd(store, 'crude')
     
     changes = []
     labels = []
@@ -341,14 +306,11 @@ def update_stock_changes_waterfall(data):
     if not stock_data.empty:
         for _, row in stock_data.iterrows():
             if row['padd'] not in ['US', 'CUSHING']:  # Exclude totals
-                padd_data = row['data']
-                if current_date in padd_data.columns and previous_date in padd_data.columns:
-                    current = padd_data[current_date].iloc[0]
-                    previous = padd_data[previous_date].iloc[0]
-                    if pd.notna(current) and pd.notna(previous):
-                        change = float(current) - float(previous)
-                        changes.append(change)
-                        labels.append(f"{row['padd']}")
+                previous, current = store.row(row['code'])[-2:]
+                if pd.notna(current) and pd.notna(previous):
+                    change = float(current) - float(previous)
+                    changes.append(change)
+                    labels.append(f"{row['padd']}")
     
     if not changes:
         return go.Figure().update_layout(title="No change data available")
@@ -367,15 +329,8 @@ def update_stock_changes_waterfall(data):
         decreasing={"marker": {"color": NEGATIVE}}
     ))
     
-    # Convert dates to datetime and format them properly
-    try:
-        prev_date_obj = pd.to_datetime(previous_date, format='%m/%d/%y')
-        curr_date_obj = pd.to_datetime(current_date, format='%m/%d/%y')
-        formatted_prev = prev_date_obj.strftime('%Y-%m-%d')
-        formatted_curr = curr_date_obj.strftime('%Y-%m-%d')
-    except:
-        formatted_prev = previous_date
-        formatted_curr = current_date
+    formatted_prev = previous_date.strftime('%Y-%m-%d')
+    formatted_curr = current_date.strftime('%Y-%m-%d')
     
     fig.update_layout(
         title=f"Weekly Crude Oil Stock Changes by PADD<br>({formatted_prev} to {formatted_curr})",
@@ -397,17 +352,15 @@ def update_regional_stock_pie(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
+    store = datasets.resolve(data)
     
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in df.columns if col not in metadata_cols]
-    if not date_cols:
+    if not len(store.periods):
         return go.Figure().update_layout(title="No date data available")
     
-    latest_date = max(date_cols)
+    latest_date = store.periods[-1]
     
     # Get crude oil stock data
-    stock_data = get_stock_data_by_padd(df, 'crude')
+    stock_data = get_stock_data_by_padd(store, 'crude')
     
     if stock_data.empty:
         return go.Figure().update_layout(title="No stock data available")
@@ -417,12 +370,10 @@ def update_regional_stock_pie(data):
     
     for _, row in stock_data.iterrows():
         if row['padd'] not in ['US']:  # Exclude US total
-            padd_data = row['data']
-            if latest_date in padd_data.columns:
-                value = padd_data[latest_date].iloc[0]
-                if pd.notna(value) and float(value) > 0:
-                    labels.append(row['padd'])
-                    values.append(float(value))
+            value = store.row(row['code'])[-1]
+            if pd.notna(value) and float(value) > 0:
+                labels.append(row['padd'])
+                values.append(float(value))
     
     if not labels:
         return go.Figure().update_layout(title="No valid stock data available")
@@ -436,12 +387,7 @@ def update_regional_stock_pie(data):
         marker_colors=CHART_SEQUENCE
     ))
     
-    # Convert latest_date to datetime and format it properly
-    try:
-        date_obj = pd.to_datetime(latest_date, format='%m/%d/%y')
-        formatted_date = date_obj.strftime('%Y-%m-%d')
-    except:
-        formatted_date = latest_date
+    formatted_date = latest_date.strftime('%Y-%m-%d')
     
     fig.update_layout(
         title=f"Regional Crude Oil Stock Distribution ({formatted_date})",
@@ -462,16 +408,13 @@ def update_padd_time_series(data, selected_product):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    stock_data = get_stock_data_by_padd(df, selected_product)
+    store = datasets.resolve(data)
+    stock_data = get_stock_data_by_padd(store, selected_product)
     
     if stock_data.empty:
         return go.Figure().update_layout(title=f"No {selected_product} data available")
     
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in df.columns if col not in metadata_cols]
-    
-    if not date_cols:
+    if not len(store.periods):
         return go.Figure().update_layout(title="No time series data available")
     
     fig = go.Figure()
@@ -483,37 +426,10 @@ def update_padd_time_series(data, selected_product):
     
     for i, (_, row) in enumerate(stock_data.iterrows()):
         if row['padd'] not in ['US']:  # Exclude US total
-            padd_data = row['data']
-            
-            dates = []
-            values = []
-            
-            # padd_data is a DataFrame with one row, get that row
-            if not padd_data.empty:
-                data_row = padd_data.iloc[0]
-                
-                # Parse all date columns first, then sort by actual date
-                date_value_pairs = []
-                for col in date_cols:
-                    try:
-                        if col in data_row.index:
-                            date = pd.to_datetime(col, format='%m/%d/%y')
-                            value = data_row[col]
-                            if pd.notna(value):
-                                date_value_pairs.append((date, float(value)))
-                    except:
-                        continue
-                
-                # Sort by date to ensure chronological order
-                date_value_pairs.sort(key=lambda x: x[0])
-                
-                # Extract sorted dates and values
-                for date, value in date_value_pairs:
-                    dates.append(date)
-                    values.append(value)
-                    all_values.append(value)
+            dates, values = store.series(row['code'])
+            all_values.extend(values)
             
-            if dates and values:
+            if len(values):
                 chart_data.append({
                     'padd': row['padd'],
                     'dates': dates,
@@ -529,7 +445,7 @@ def update_padd_time_series(data, selected_product):
         # If CUSHING has values much higher than PADD regions, put it on secondary y-axis
         cushing_secondary = False
         for data_item in chart_data:
-            if data_item['padd'] == 'CUSHING' and data_item['values']:
+            if data_item['padd'] == 'CUSHING' and len(data_item['values']):
                 avg_cushing = np.mean(data_item['values'])
                 if avg_cushing > q75 * 3:  # CUSHING values are 3x higher than 75th percentile
                     cushing_secondary = True
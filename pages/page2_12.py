@@ -3,27 +3,14 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from src.wps.ag_calculations import DataProcessor
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import RED, BLUE, ORANGE, GREEN, POSITIVE, NEGATIVE, CHART_SEQUENCE
 
-# Initialize the data processor
-processor = DataProcessor()
-
 # Default date range
 default_start_date = default_start_date_eia_wps_table
 default_end_date = default_end_date_eia_wps_table
 
-# Process data and column definitions - with error handling
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_12: {e}")
-    # Create empty dataframe with minimal columns for initial load
-    import pandas as pd
-    df = pd.DataFrame()
-    columnDefinitions = []
-
 # Page layout for page 2_12 - Cushing vs Commercial Stocks Analysis
 layout = html.Div([
     # Header section
@@ -103,58 +90,20 @@ layout = html.Div([
     ], style={"padding": "20px", "height": "85vh", "overflow": "auto"}),
     
     # Hidden stores
-    dcc.Store(id='current-data-store-p12', data=df.to_dict('records') if not df.empty else [])
+    dcc.Store(id='current-data-store-p12', data=datasets.handle('wps_ag_series', start=default_start_date, end=default_end_date))
     
 ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
-# Helper function to get Cushing and Commercial stock data
-def get_cushing_commercial_data(df):
-    """Extract Cushing, US Commercial, and PADD 3 crude stock data"""
-    if df.empty:
-        return None, None, None
-    
-    # Cushing data
-    cushing_data = df[df['id'] == 'W_EPC0_SAX_YCUOK_MBBL']
-    # US Commercial data  
-    commercial_data = df[df['id'] == 'WCESTUS1']
-    # PADD 3 Commercial data
-    padd3_data = df[df['id'] == 'WCESTP31']
-    
-    return (cushing_data.iloc[0] if not cushing_data.empty else None,
-            commercial_data.iloc[0] if not commercial_data.empty else None,
-            padd3_data.iloc[0] if not padd3_data.empty else None)
+CUSHING = 'W_EPC0_SAX_YCUOK_MBBL'
+COMMERCIAL = 'WCESTUS1'
+PADD3_COMMERCIAL = 'WCESTP31'
 
-# Helper function to extract time series data
-def extract_time_series(data_row):
-    """Extract time series data from a data row"""
-    if data_row is None:
-        return [], []
-    
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in data_row.index if col not in metadata_cols]
-    
-    # Parse all date columns first, then sort by actual date
-    date_value_pairs = []
-    for col in date_cols:
-        try:
-            date = pd.to_datetime(col, format='%m/%d/%y')
-            value = data_row[col]
-            if pd.notna(value):
-                date_value_pairs.append((date, float(value)))
-        except:
-            continue
-    
-    # Sort by date to ensure chronological order
-    date_value_pairs.sort(key=lambda x: x[0])
-    
-    # Extract sorted dates and values
-    dates = []
-    values = []
-    for date, value in date_value_pairs:
-        dates.append(date)
-        values.append(value)
-    
-    return dates, values
+# Helper function to get the share of one stock series in another
+def stock_share(store, part, whole):
+    """part as a % of whole on the weeks both have, where whole is positive"""
+    dates, (part_values, whole_values) = store.align(part, whole)
+    positive = whole_values > 0
+    return dates[positive], part_values[positive] / whole_values[positive] * 100
 
 # Callback for updating data store
 @callback(
@@ -163,12 +112,7 @@ def extract_time_series(data_row):
      Input("date-picker-range-p12", "end_date")]
 )
 def update_data_store(start_date, end_date):
-    try:
-        df, _ = processor.get_data(start_date, end_date)
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error updating data store: {e}")
-        return []
+    return datasets.handle('wps_ag_series', start=start_date, end=end_date)
 
 # Callback for Cushing vs Commercial time series
 @callback(
@@ -179,15 +123,14 @@ def update_cushing_vs_commercial(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, commercial_data, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
     fig = go.Figure()
     
     # Add Cushing data
-    if cushing_data is not None:
-        dates, values = extract_time_series(cushing_data)
-        if dates and values:
+    if CUSHING in store:
+        dates, values = store.series(CUSHING)
+        if len(values):
             fig.add_trace(go.Scatter(
                 x=dates,
                 y=values,
@@ -198,11 +141,11 @@ def update_cushing_vs_commercial(data):
             ))
 
     # Add Commercial data (normalized to same scale as Cushing for better visualization)
-    if commercial_data is not None:
-        dates_comm, values_comm = extract_time_series(commercial_data)
-        if dates_comm and values_comm:
+    if COMMERCIAL in store:
+        dates_comm, values_comm = store.series(COMMERCIAL)
+        if len(values_comm):
             # Scale commercial data to be comparable to Cushing (divide by ~20 to bring to similar range)
-            scaled_values = [v/20 for v in values_comm]
+            scaled_values = values_comm / 20
             fig.add_trace(go.Scatter(
                 x=dates_comm,
                 y=scaled_values,
@@ -235,40 +178,18 @@ def update_cushing_percentage(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, commercial_data, padd3_data = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None:
+    if CUSHING not in store:
         return go.Figure().update_layout(title="Cushing data not available")
     
     fig = go.Figure()
     
-    cushing_dates, cushing_values = extract_time_series(cushing_data)
-    
     # Calculate Cushing as % of US Commercial Stocks
-    if commercial_data is not None:
-        commercial_dates, commercial_values = extract_time_series(commercial_data)
-        common_dates = sorted(set(cushing_dates) & set(commercial_dates))
-        
-        us_percentages = []
-        us_dates = []
+    if COMMERCIAL in store:
+        us_dates, us_percentages = stock_share(store, CUSHING, COMMERCIAL)
         
-        for date in common_dates:
-            try:
-                cushing_idx = cushing_dates.index(date)
-                commercial_idx = commercial_dates.index(date)
-                
-                cushing_val = cushing_values[cushing_idx]
-                commercial_val = commercial_values[commercial_idx]
-                
-                if commercial_val > 0:
-                    percentage = (cushing_val / commercial_val) * 100
-                    us_percentages.append(percentage)
-                    us_dates.append(date)
-            except (ValueError, ZeroDivisionError):
-                continue
-        
-        if us_percentages:
+        if len(us_percentages):
             fig.add_trace(go.Scatter(
                 x=us_dates,
                 y=us_percentages,
@@ -289,29 +210,10 @@ def update_cushing_percentage(data):
             )
     
     # Calculate Cushing as % of PADD 3 Stocks
-    if padd3_data is not None:
-        padd3_dates, padd3_values = extract_time_series(padd3_data)
-        common_dates_p3 = sorted(set(cushing_dates) & set(padd3_dates))
-        
-        p3_percentages = []
-        p3_dates = []
-        
-        for date in common_dates_p3:
-            try:
-                cushing_idx = cushing_dates.index(date)
-                padd3_idx = padd3_dates.index(date)
-                
-                cushing_val = cushing_values[cushing_idx]
-                padd3_val = padd3_values[padd3_idx]
-                
-                if padd3_val > 0:
-                    percentage = (cushing_val / padd3_val) * 100
-                    p3_percentages.append(percentage)
-                    p3_dates.append(date)
-            except (ValueError, ZeroDivisionError):
-                continue
+    if PADD3_COMMERCIAL in store:
+        p3_dates, p3_percentages = stock_share(store, CUSHING, PADD3_COMMERCIAL)
         
-        if p3_percentages:
+        if len(p3_percentages):
             fig.add_trace(go.Scatter(
                 x=p3_dates,
                 y=p3_percentages,
@@ -353,43 +255,30 @@ def update_weekly_changes_comparison(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, commercial_data, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None or commercial_data is None:
+    if CUSHING not in store or COMMERCIAL not in store:
         return go.Figure().update_layout(title="Required data not available")
     
     # Calculate weekly changes
-    cushing_dates, cushing_values = extract_time_series(cushing_data)
-    commercial_dates, commercial_values = extract_time_series(commercial_data)
-    
-    def calculate_changes(dates, values):
-        changes = []
-        change_dates = []
-        for i in range(1, len(values)):
-            change = values[i] - values[i-1]
-            changes.append(change)
-            change_dates.append(dates[i])
-        return change_dates, changes
-    
-    cushing_change_dates, cushing_changes = calculate_changes(cushing_dates, cushing_values)
-    commercial_change_dates, commercial_changes = calculate_changes(commercial_dates, commercial_values)
+    cushing_change_dates, cushing_changes = store.diff(CUSHING)
+    commercial_change_dates, commercial_changes = store.diff(COMMERCIAL)
     
     fig = go.Figure()
     
     # Add Cushing changes
-    if cushing_changes:
+    if len(cushing_changes):
         fig.add_trace(go.Bar(
             x=cushing_change_dates,
             y=cushing_changes,
             name='Cushing Weekly Change',
-            marker_color=[POSITIVE if x >= 0 else NEGATIVE for x in cushing_changes],
+            marker_color=np.where(cushing_changes >= 0, POSITIVE, NEGATIVE),
             opacity=0.7
         ))
     
     # Add commercial changes (scaled down for visibility)
-    if commercial_changes:
-        scaled_commercial = [x/50 for x in commercial_changes]  # Scale down by factor of 50
+    if len(commercial_changes):
+        scaled_commercial = commercial_changes / 50  # Scale down by factor of 50
         fig.add_trace(go.Scatter(
             x=commercial_change_dates,
             y=scaled_commercial,
@@ -429,45 +318,25 @@ def update_cushing_spread_analysis(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, commercial_data, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None or commercial_data is None:
+    if CUSHING not in store or COMMERCIAL not in store:
         return go.Figure().update_layout(title="Required data not available")
     
     # Calculate spread (difference between Cushing and proportional commercial)
-    cushing_dates, cushing_values = extract_time_series(cushing_data)
-    commercial_dates, commercial_values = extract_time_series(commercial_data)
-    
-    # Align dates and calculate spread
-    common_dates = sorted(set(cushing_dates) & set(commercial_dates))
-    spreads = []
-    spread_dates = []
-    
-    for date in common_dates:
-        try:
-            cushing_idx = cushing_dates.index(date)
-            commercial_idx = commercial_dates.index(date)
-            
-            cushing_val = cushing_values[cushing_idx]
-            commercial_val = commercial_values[commercial_idx]
-            
-            # Calculate spread as deviation from expected ratio
-            expected_cushing = commercial_val * 0.08  # Assume Cushing should be ~8% of commercial
-            spread = cushing_val - expected_cushing
-            
-            spreads.append(spread)
-            spread_dates.append(date)
-        except ValueError:
-            continue
+    spread_dates, (cushing_values, commercial_values) = store.align(CUSHING, COMMERCIAL)
+    
+    # Calculate spread as deviation from expected ratio
+    expected_cushing = commercial_values * 0.08  # Assume Cushing should be ~8% of commercial
+    spreads = cushing_values - expected_cushing
     
-    if not spreads:
+    if not len(spreads):
         return go.Figure().update_layout(title="No spread data available")
     
     fig = go.Figure()
     
     # Color bars based on positive/negative spread
-    colors = [POSITIVE if x >= 0 else NEGATIVE for x in spreads]
+    colors = np.where(spreads >= 0, POSITIVE, NEGATIVE)
     
     fig.add_trace(go.Bar(
         x=spread_dates,
@@ -501,20 +370,19 @@ def update_cushing_inventory_gauge(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, _, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None:
+    if CUSHING not in store:
         return go.Figure().update_layout(title="Cushing data not available")
     
-    dates, values = extract_time_series(cushing_data)
+    dates, values = store.series(CUSHING)
     
-    if not values:
+    if not len(values):
         return go.Figure().update_layout(title="No Cushing data available")
     
     current_level = values[-1]
-    max_level = max(values)
-    min_level = min(values)
+    max_level = values.max()
+    min_level = values.min()
     avg_level = np.mean(values)
     
     fig = go.Figure(go.Indicator(
@@ -552,35 +420,21 @@ def update_seasonal_pattern_radar(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, _, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None:
+    if CUSHING not in store:
         return go.Figure().update_layout(title="Cushing data not available")
     
-    dates, values = extract_time_series(cushing_data)
+    dates, values = store.series(CUSHING)
     
-    if not dates:
+    if not len(dates):
         return go.Figure().update_layout(title="No time series data available")
     
-    # Create seasonal analysis by month
-    monthly_data = {}
-    for date, value in zip(dates, values):
-        month = date.strftime('%B')
-        if month not in monthly_data:
-            monthly_data[month] = []
-        monthly_data[month].append(value)
-    
     # Calculate average by month
     months = ['January', 'February', 'March', 'April', 'May', 'June',
               'July', 'August', 'September', 'October', 'November', 'December']
     
-    monthly_avgs = []
-    for month in months:
-        if month in monthly_data:
-            monthly_avgs.append(np.mean(monthly_data[month]))
-        else:
-            monthly_avgs.append(0)
+    monthly_avgs = pd.Series(values).groupby(dates.month).mean().reindex(range(1, 13), fill_value=0).tolist()
     
     # Normalize for radar chart (0-100 scale)
     if max(monthly_avgs) > 0:
@@ -619,25 +473,24 @@ def update_key_statistics(data):
     if not data:
         return html.Div("No data available")
     
-    df = pd.DataFrame(data)
-    cushing_data, commercial_data, _ = get_cushing_commercial_data(df)
+    store = datasets.resolve(data)
     
-    if cushing_data is None or commercial_data is None:
+    if CUSHING not in store or COMMERCIAL not in store:
         return html.Div("Required data not available")
     
     # Extract time series
-    cushing_dates, cushing_values = extract_time_series(cushing_data)
-    commercial_dates, commercial_values = extract_time_series(commercial_data)
+    cushing_dates, cushing_values = store.series(CUSHING)
+    commercial_dates, commercial_values = store.series(COMMERCIAL)
     
-    if not cushing_values or not commercial_values:
+    if not len(cushing_values) or not len(commercial_values):
         return html.Div("No time series data available")
     
     # Calculate statistics
     stats = []
     
     # Current levels
-    current_cushing = cushing_values[-1] if cushing_values else 0
-    current_commercial = commercial_values[-1] if commercial_values else 0
+    current_cushing = cushing_values[-1]
+    current_commercial = commercial_values[-1]
     current_ratio = (current_cushing / current_commercial * 100) if current_commercial > 0 else 0
     
     # Changes
@@ -646,8 +499,8 @@ def update_key_statistics(data):
     
     # Historical stats
     cushing_avg = np.mean(cushing_values)
-    cushing_max = max(cushing_values)
-    cushing_min = min(cushing_values)
+    cushing_max = cushing_values.max()
+    cushing_min = cushing_values.min()
     
     stats_html = html.Div([
         html.Table([
@@ -3,27 +3,14 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from src.wps.ag_calculations import DataProcessor
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import RED, BLUE, ORANGE, GREEN, PURPLE, POSITIVE, NEGATIVE, CHART_SEQUENCE, COLORSCALE_HEATMAP
 
-# Initialize the data processor
-processor = DataProcessor()
-
 # Default date range
 default_start_date = default_start_date_eia_wps_table
 default_end_date = default_end_date_eia_wps_table
 
-# Process data and column definitions - with error handling
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_13: {e}")
-    # Create empty dataframe with minimal columns for initial load
-    import pandas as pd
-    df = pd.DataFrame()
-    columnDefinitions = []
-
 # Page layout for page 2_13 - Refinery Utilization and Crack Spread Analytics
 layout = html.Div([
     # Header section
@@ -103,14 +90,14 @@ layout = html.Div([
     ], style={"padding": "20px", "height": "85vh", "overflow": "auto"}),
     
     # Hidden stores
-    dcc.Store(id='current-data-store-p13', data=df.to_dict('records') if not df.empty else [])
+    dcc.Store(id='current-data-store-p13', data=datasets.handle('wps_ag_series', start=default_start_date, end=default_end_date))
     
 ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # Helper function to get refinery data
-def get_refinery_data(df):
-    """Extract refinery-related data from the dataset"""
-    if df.empty:
+def get_refinery_data(store):
+    """Series ids of the refinery data in the store, by category and PADD"""
+    if not len(store):
         return {}
     
     refinery_codes = {
@@ -162,46 +149,10 @@ def get_refinery_data(df):
     
     result = {}
     for category, codes in refinery_codes.items():
-        result[category] = {}
-        for padd, code in codes.items():
-            data_row = df[df['id'] == code]
-            if not data_row.empty:
-                result[category][padd] = data_row.iloc[0]
+        result[category] = {padd: code for padd, code in codes.items() if code in store}
     
     return result
 
-# Helper function to extract time series
-def extract_time_series(data_row):
-    """Extract time series data from a data row"""
-    if data_row is None or data_row.empty:
-        return [], []
-    
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in data_row.index if col not in metadata_cols]
-    
-    # Parse all date columns first, then sort by actual date
-    date_value_pairs = []
-    for col in date_cols:
-        try:
-            date = pd.to_datetime(col, format='%m/%d/%y')
-            value = data_row[col]
-            if pd.notna(value):
-                date_value_pairs.append((date, float(value)))
-        except:
-            continue
-    
-    # Sort by date to ensure chronological order
-    date_value_pairs.sort(key=lambda x: x[0])
-    
-    # Extract sorted dates and values
-    dates = []
-    values = []
-    for date, value in date_value_pairs:
-        dates.append(date)
-        values.append(value)
-    
-    return dates, values
-
 # Callback for updating data store
 @callback(
     Output("current-data-store-p13", "data"),
@@ -209,12 +160,7 @@ def extract_time_series(data_row):
      Input("date-picker-range-p13", "end_date")]
 )
 def update_data_store(start_date, end_date):
-    try:
-        df, _ = processor.get_data(start_date, end_date)
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error updating data store: {e}")
-        return []
+    return datasets.handle('wps_ag_series', start=start_date, end=end_date)
 
 # Callback for refinery utilization gauge
 @callback(
@@ -225,8 +171,8 @@ def update_refinery_utilization_gauge(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     if 'utilization' not in refinery_data:
         return go.Figure().update_layout(title="Utilization data not available")
@@ -241,8 +187,8 @@ def update_refinery_utilization_gauge(data):
     current_rates = {}
     for padd in padds:
         if padd in utilization_data:
-            dates, values = extract_time_series(utilization_data[padd])
-            if values:
+            dates, values = store.series(utilization_data[padd])
+            if len(values):
                 current_rates[padd] = values[-1]
     
     if not current_rates:
@@ -303,8 +249,8 @@ def update_crude_runs_capacity(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     if 'crude_runs' not in refinery_data:
         return go.Figure().update_layout(title="Crude runs data not available")
@@ -317,8 +263,8 @@ def update_crude_runs_capacity(data):
     
     for i, padd in enumerate(padds):
         if padd in refinery_data['crude_runs']:
-            dates, values = extract_time_series(refinery_data['crude_runs'][padd])
-            if dates and values:
+            dates, values = store.series(refinery_data['crude_runs'][padd])
+            if len(values):
                 # For long date ranges, sample data points to avoid overcrowding
                 if len(dates) > 200:
                     step = len(dates) // 200
@@ -341,9 +287,9 @@ def update_crude_runs_capacity(data):
     # In practice, these would be actual capacity data
     for i, padd in enumerate(padds):
         if padd in refinery_data['crude_runs']:
-            dates, values = extract_time_series(refinery_data['crude_runs'][padd])
-            if values:
-                estimated_capacity = max(values) * 1.15  # Assume max utilization was ~87%
+            dates, values = store.series(refinery_data['crude_runs'][padd])
+            if len(values):
+                estimated_capacity = values.max() * 1.15  # Assume max utilization was ~87%
                 fig.add_hline(
                     y=estimated_capacity,
                     line_dash="dash",
@@ -375,8 +321,8 @@ def update_crack_spread_proxy(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     # Calculate proxy crack spread using production data
     # 3-2-1 spread: 2 bbls gasoline + 1 bbl distillate vs 3 bbls crude input
@@ -392,35 +338,15 @@ def update_crack_spread_proxy(data):
         crude_data = refinery_data['crude_runs'].get('US')
         
         if gasoline_data is not None and distillate_data is not None and crude_data is not None:
-            gas_dates, gas_values = extract_time_series(gasoline_data)
-            dist_dates, dist_values = extract_time_series(distillate_data)
-            crude_dates, crude_values = extract_time_series(crude_data)
-            
             # Align dates
-            common_dates = sorted(set(gas_dates) & set(dist_dates) & set(crude_dates))
+            common_dates, (gas_prod, dist_prod, crude_input) = store.align(gasoline_data, distillate_data, crude_data)
             
-            spread_values = []
-            spread_dates = []
-            
-            for date in common_dates:
-                try:
-                    gas_idx = gas_dates.index(date)
-                    dist_idx = dist_dates.index(date)
-                    crude_idx = crude_dates.index(date)
-                    
-                    gas_prod = gas_values[gas_idx]
-                    dist_prod = dist_values[dist_idx] 
-                    crude_input = crude_values[crude_idx]
-                    
-                    # Calculate proxy spread (production efficiency ratio)
-                    if crude_input > 0:
-                        spread = (2 * gas_prod + dist_prod) / (3 * crude_input)
-                        spread_values.append(spread)
-                        spread_dates.append(date)
-                except ValueError:
-                    continue
+            # Calculate proxy spread (production efficiency ratio)
+            positive = crude_input > 0
+            spread_dates = common_dates[positive]
+            spread_values = (2 * gas_prod[positive] + dist_prod[positive]) / (3 * crude_input[positive])
             
-            if spread_values:
+            if len(spread_values):
                 # For long date ranges, sample data points
                 if len(spread_values) > 300:
                     step = len(spread_values) // 300
@@ -471,8 +397,8 @@ def update_product_yield_analysis(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     # Calculate product yields as percentage of crude input
     fig = go.Figure()
@@ -487,19 +413,19 @@ def update_product_yield_analysis(data):
         jet_data = refinery_data['jet_prod'].get('US')
         
         if all(x is not None for x in [crude_data, gas_data, dist_data, jet_data]):
-            crude_dates, crude_values = extract_time_series(crude_data)
+            crude_dates, crude_values = store.series(crude_data)
             
-            if crude_dates and crude_values:
+            if len(crude_values):
                 # Calculate latest yields
                 latest_date = crude_dates[-1]
                 latest_crude = crude_values[-1]
                 
                 # Get production values for latest date
-                _, gas_values = extract_time_series(gas_data)
-                _, dist_values = extract_time_series(dist_data) 
-                _, jet_values = extract_time_series(jet_data)
+                _, gas_values = store.series(gas_data)
+                _, dist_values = store.series(dist_data) 
+                _, jet_values = store.series(jet_data)
                 
-                if gas_values and dist_values and jet_values and latest_crude > 0:
+                if len(gas_values) and len(dist_values) and len(jet_values) and latest_crude > 0:
                     latest_gas = gas_values[-1]
                     latest_dist = dist_values[-1]
                     latest_jet = jet_values[-1]
@@ -539,8 +465,8 @@ def update_refinery_margin_indicator(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     # Calculate simple margin proxy using utilization and production efficiency
     margin_score = 75  # Default/mock score
@@ -550,8 +476,8 @@ def update_refinery_margin_indicator(data):
         utilization_rates = []
         for padd in ['P1', 'P2', 'P3', 'P4', 'P5']:
             if padd in refinery_data['utilization']:
-                dates, values = extract_time_series(refinery_data['utilization'][padd])
-                if values:
+                dates, values = store.series(refinery_data['utilization'][padd])
+                if len(values):
                     utilization_rates.append(values[-1])
         
         if utilization_rates:
@@ -593,8 +519,8 @@ def update_utilization_heatmap(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     if 'utilization' not in refinery_data:
         return go.Figure().update_layout(title="Utilization data not available")
@@ -650,16 +576,16 @@ def update_refinery_performance_table(data):
     if not data:
         return html.Div("No data available")
     
-    df = pd.DataFrame(data)
-    refinery_data = get_refinery_data(df)
+    store = datasets.resolve(data)
+    refinery_data = get_refinery_data(store)
     
     # Calculate performance metrics
     metrics = []
     
     # US crude runs
     if 'crude_runs' in refinery_data and 'US' in refinery_data['crude_runs']:
-        dates, values = extract_time_series(refinery_data['crude_runs']['US'])
-        if values:
+        dates, values = store.series(refinery_data['crude_runs']['US'])
+        if len(values):
             current_runs = values[-1]
             weekly_change = values[-1] - values[-2] if len(values) >= 2 else 0
             metrics.extend([
@@ -672,8 +598,8 @@ def update_refinery_performance_table(data):
         util_rates = []
         for padd in ['P1', 'P2', 'P3', 'P4', 'P5']:
             if padd in refinery_data['utilization']:
-                dates, values = extract_time_series(refinery_data['utilization'][padd])
-                if values:
+                dates, values = store.series(refinery_data['utilization'][padd])
+                if len(values):
                     util_rates.append(values[-1])
         
         if util_rates:
@@ -692,8 +618,8 @@ def update_refinery_performance_table(data):
     
     for prod_code, prod_name in zip(products, product_names):
         if prod_code in refinery_data and 'US' in refinery_data[prod_code]:
-            dates, values = extract_time_series(refinery_data[prod_code]['US'])
-            if values:
+            dates, values = store.series(refinery_data[prod_code]['US'])
+            if len(values):
                 current_prod = values[-1]
                 metrics.append((f"Current {prod_name}", f"{current_prod:,.0f} mb/d"))
     
@@ -3,27 +3,14 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from src.wps.ag_calculations import DataProcessor
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import RED, BLUE, ORANGE, GREEN, PURPLE, POSITIVE, NEGATIVE, CHART_SEQUENCE
 
-# Initialize the data processor
-processor = DataProcessor()
-
 # Default date range
 default_start_date = default_start_date_eia_wps_table
 default_end_date = default_end_date_eia_wps_table
 
-# Process data and column definitions - with error handling
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_14: {e}")
-    # Create empty dataframe with minimal columns for initial load
-    import pandas as pd
-    df = pd.DataFrame()
-    columnDefinitions = []
-
 # Page layout for page 2_14 - Supply/Demand Balance & Import/Export Analysis
 layout = html.Div([
     # Header section
@@ -115,14 +102,14 @@ layout = html.Div([
     ], style={"padding": "20px", "height": "85vh", "overflow": "auto"}),
     
     # Hidden stores
-    dcc.Store(id='current-data-store-p14', data=df.to_dict('records') if not df.empty else [])
+    dcc.Store(id='current-data-store-p14', data=datasets.handle('wps_ag_series', start=default_start_date, end=default_end_date))
     
 ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # Helper function to get supply/demand data
-def get_supply_demand_data(df):
-    """Extract supply/demand related data from the dataset"""
-    if df.empty:
+def get_supply_demand_data(store):
+    """Series ids of the supply/demand data in the store, by category"""
+    if not len(store):
         return {}
     
     supply_demand_codes = {
@@ -158,45 +145,7 @@ def get_supply_demand_data(df):
         'crude_imports_p5': 'WCEIMP52',
     }
     
-    result = {}
-    for category, code in supply_demand_codes.items():
-        data_row = df[df['id'] == code]
-        if not data_row.empty:
-            result[category] = data_row.iloc[0]
-    
-    return result
-
-# Helper function to extract time series
-def extract_time_series(data_row):
-    """Extract time series data from a data row"""
-    if data_row is None or data_row.empty:
-        return [], []
-    
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in data_row.index if col not in metadata_cols]
-    
-    # Parse all date columns first, then sort by actual date
-    date_value_pairs = []
-    for col in date_cols:
-        try:
-            date = pd.to_datetime(col, format='%m/%d/%y')
-            value = data_row[col]
-            if pd.notna(value):
-                date_value_pairs.append((date, float(value)))
-        except:
-            continue
-    
-    # Sort by date to ensure chronological order
-    date_value_pairs.sort(key=lambda x: x[0])
-    
-    # Extract sorted dates and values
-    dates = []
-    values = []
-    for date, value in date_value_pairs:
-        dates.append(date)
-        values.append(value)
-    
-    return dates, values
+    return {category: code for category, code in supply_demand_codes.items() if code in store}
 
 # Callback for updating data store
 @callback(
@@ -205,12 +154,7 @@ def extract_time_series(data_row):
      Input("date-picker-range-p14", "end_date")]
 )
 def update_data_store(start_date, end_date):
-    try:
-        df, _ = processor.get_data(start_date, end_date)
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error updating data store: {e}")
-        return []
+    return datasets.handle('wps_ag_series', start=start_date, end=end_date)
 
 # Callback for supply/demand waterfall
 @callback(
@@ -221,8 +165,8 @@ def update_supply_demand_waterfall(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     # Get latest values for waterfall components
     components = ['crude_production', 'crude_imports', 'crude_exports', 'crude_runs']
@@ -231,8 +175,8 @@ def update_supply_demand_waterfall(data):
     
     for component in components:
         if component in sd_data:
-            dates, vals = extract_time_series(sd_data[component])
-            if vals:
+            dates, vals = store.series(sd_data[component])
+            if len(vals):
                 latest_val = vals[-1]
                 # Make exports negative for waterfall
                 if component == 'crude_exports':
@@ -282,8 +226,8 @@ def update_import_dependency_chart(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     # Calculate import dependency for different products
     products = {
@@ -300,10 +244,10 @@ def update_import_dependency_chart(data):
         production_code = codes['production']
         
         if import_code in sd_data and production_code in sd_data:
-            import_dates, import_vals = extract_time_series(sd_data[import_code])
-            prod_dates, prod_vals = extract_time_series(sd_data[production_code])
+            import_dates, import_vals = store.series(sd_data[import_code])
+            prod_dates, prod_vals = store.series(sd_data[production_code])
             
-            if import_vals and prod_vals:
+            if len(import_vals) and len(prod_vals):
                 latest_imports = import_vals[-1]
                 latest_production = prod_vals[-1]
                 
@@ -352,8 +296,8 @@ def update_trade_flow_sankey(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     # Create mock Sankey diagram for regional crude imports
     # In practice, this would use actual trade flow data
@@ -368,8 +312,8 @@ def update_trade_flow_sankey(data):
     
     for i, (padd, code) in enumerate(zip(padds, import_codes)):
         if code in sd_data:
-            dates, vals = extract_time_series(sd_data[code])
-            if vals and vals[-1] > 0:  # Only include PADDs with imports
+            dates, vals = store.series(sd_data[code])
+            if len(vals) and vals[-1] > 0:  # Only include PADDs with imports
                 padd_imports.append(vals[-1])
                 padd_names.append(padd)
     
@@ -406,41 +350,19 @@ def update_net_imports_vs_production(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     if ('crude_imports' not in sd_data or 'crude_exports' not in sd_data 
         or 'crude_production' not in sd_data):
         return go.Figure().update_layout(title="Required data not available")
     
-    # Extract time series
-    import_dates, import_vals = extract_time_series(sd_data['crude_imports'])
-    export_dates, export_vals = extract_time_series(sd_data['crude_exports'])
-    prod_dates, prod_vals = extract_time_series(sd_data['crude_production'])
-    
     # Align dates
-    common_dates = sorted(set(import_dates) & set(export_dates) & set(prod_dates))
-    
-    net_imports = []
-    production = []
-    aligned_dates = []
-    
-    for date in common_dates:
-        try:
-            import_idx = import_dates.index(date)
-            export_idx = export_dates.index(date)
-            prod_idx = prod_dates.index(date)
-            
-            net_import = import_vals[import_idx] - export_vals[export_idx]
-            prod_val = prod_vals[prod_idx]
-            
-            net_imports.append(net_import)
-            production.append(prod_val)
-            aligned_dates.append(date)
-        except ValueError:
-            continue
+    aligned_dates, (import_vals, export_vals, production) = store.align(
+        sd_data['crude_imports'], sd_data['crude_exports'], sd_data['crude_production'])
+    net_imports = import_vals - export_vals
     
-    if not aligned_dates:
+    if not len(aligned_dates):
         return go.Figure().update_layout(title="No aligned data available")
     
     fig = go.Figure()
@@ -501,8 +423,8 @@ def update_supply_security_gauge(data):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     # Calculate supply security index based on multiple factors
     security_score = 50  # Default
@@ -511,10 +433,10 @@ def update_supply_security_gauge(data):
     
     # Factor 1: Import dependency (lower is better)
     if 'crude_imports' in sd_data and 'crude_production' in sd_data:
-        import_dates, import_vals = extract_time_series(sd_data['crude_imports'])
-        prod_dates, prod_vals = extract_time_series(sd_data['crude_production'])
+        import_dates, import_vals = store.series(sd_data['crude_imports'])
+        prod_dates, prod_vals = store.series(sd_data['crude_production'])
         
-        if import_vals and prod_vals:
+        if len(import_vals) and len(prod_vals):
             latest_imports = import_vals[-1]
             latest_production = prod_vals[-1]
             
@@ -527,10 +449,10 @@ def update_supply_security_gauge(data):
     
     # Factor 2: Stock levels (days of supply proxy)
     if 'crude_stocks' in sd_data and 'crude_runs' in sd_data:
-        stock_dates, stock_vals = extract_time_series(sd_data['crude_stocks'])
-        runs_dates, runs_vals = extract_time_series(sd_data['crude_runs'])
+        stock_dates, stock_vals = store.series(sd_data['crude_stocks'])
+        runs_dates, runs_vals = store.series(sd_data['crude_runs'])
         
-        if stock_vals and runs_vals:
+        if len(stock_vals) and len(runs_vals):
             latest_stocks = stock_vals[-1] * 1000  # Convert to barrels
             latest_runs = runs_vals[-1] * 7  # Convert to weekly consumption
             
@@ -542,7 +464,7 @@ def update_supply_security_gauge(data):
     
     # Factor 3: Production stability (lower volatility = higher security)
     if 'crude_production' in sd_data:
-        prod_dates, prod_vals = extract_time_series(sd_data['crude_production'])
+        prod_dates, prod_vals = store.series(sd_data['crude_production'])
         
         if len(prod_vals) >= 12:  # Need at least 12 weeks of data
             recent_production = prod_vals[-12:]
@@ -592,8 +514,8 @@ def update_product_balance_calendar(data, selected_product):
     if not data:
         return go.Figure().update_layout(title="No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     # Map product to data keys
     product_mapping = {
@@ -610,9 +532,9 @@ def update_product_balance_calendar(data, selected_product):
     if data_key not in sd_data:
         return go.Figure().update_layout(title=f"No {selected_product} data available")
     
-    dates, values = extract_time_series(sd_data[data_key])
+    dates, values = store.series(sd_data[data_key])
     
-    if not dates:
+    if not len(dates):
         return go.Figure().update_layout(title="No time series data available")
     
     # Create calendar heatmap data
@@ -687,15 +609,15 @@ def update_trade_statistics_table(data):
     if not data:
         return html.Div("No data available")
     
-    df = pd.DataFrame(data)
-    sd_data = get_supply_demand_data(df)
+    store = datasets.resolve(data)
+    sd_data = get_supply_demand_data(store)
     
     stats = []
     
     # Current trade volumes
     if 'crude_imports' in sd_data:
-        dates, vals = extract_time_series(sd_data['crude_imports'])
-        if vals:
+        dates, vals = store.series(sd_data['crude_imports'])
+        if len(vals):
             current_imports = vals[-1]
             weekly_change = vals[-1] - vals[-2] if len(vals) >= 2 else 0
             stats.extend([
@@ -704,8 +626,8 @@ def update_trade_statistics_table(data):
             ])
     
     if 'crude_exports' in sd_data:
-        dates, vals = extract_time_series(sd_data['crude_exports'])
-        if vals:
+        dates, vals = store.series(sd_data['crude_exports'])
+        if len(vals):
             current_exports = vals[-1]
             weekly_change = vals[-1] - vals[-2] if len(vals) >= 2 else 0
             stats.extend([
@@ -715,17 +637,17 @@ def update_trade_statistics_table(data):
     
     # Calculate net trade
     if 'crude_imports' in sd_data and 'crude_exports' in sd_data:
-        import_dates, import_vals = extract_time_series(sd_data['crude_imports'])
-        export_dates, export_vals = extract_time_series(sd_data['crude_exports'])
+        import_dates, import_vals = store.series(sd_data['crude_imports'])
+        export_dates, export_vals = store.series(sd_data['crude_exports'])
         
-        if import_vals and export_vals:
+        if len(import_vals) and len(export_vals):
             net_imports = import_vals[-1] - export_vals[-1]
             stats.append(("Net Imports", f"{net_imports:+.0f} mb/d"))
     
     # Energy independence indicator
     if 'crude_production' in sd_data and net_imports:
-        prod_dates, prod_vals = extract_time_series(sd_data['crude_production'])
-        if prod_vals:
+        prod_dates, prod_vals = store.series(sd_data['crude_production'])
+        if len(prod_vals):
             production = prod_vals[-1]
             independence = (production / (production + max(0, net_imports))) * 100
             stats.append(("Energy Independence", f"{independence:.1f}%"))
@@ -733,8 +655,8 @@ def update_trade_statistics_table(data):
     # Product imports
     for product, key in [("Gasoline", "gasoline_imports"), ("Distillate", "distillate_imports")]:
         if key in sd_data:
-            dates, vals = extract_time_series(sd_data[key])
-            if vals:
+            dates, vals = store.series(sd_data[key])
+            if len(vals):
                 stats.append((f"{product} Imports", f"{vals[-1]:,.0f} mb/d"))
     
     if not stats:
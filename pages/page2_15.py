@@ -7,7 +7,11 @@ from dash import html, dcc, callback, Output, Input
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from src.utils import registry
 from src.utils.data_loader import loader
+from src.utils.datasets import WPS_PIVOT_PATH
+from src.wps import models
+from src.wps.models import ANALYTICS_SERIES, DEFAULT_HOLDOUT, HOLDOUTS
 from src.utils.colors import (
     RED, BLUE, GREEN, ORANGE, PURPLE, BLACK,
     GRAY_50, GRAY_200, GRAY_500, GRAY_800,
@@ -17,31 +21,17 @@ from src.utils.colors import (
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 # ---------------------------------------------------------------------------
-# Data — load once at module level
+# Data — loaded on first use, and again after a refresh (src.utils.registry)
 # ---------------------------------------------------------------------------
-_pivot = loader.load_wps_pivot_data().sort_values("period").reset_index(drop=True)
+_pivot = registry.dataset(
+    "wps_pivot_by_period",
+    lambda: loader.load_wps_pivot_data().sort_values("period").reset_index(drop=True),
+    WPS_PIVOT_PATH,
+)
 
 # ---------------------------------------------------------------------------
 # Curated series
 # ---------------------------------------------------------------------------
-ANALYTICS_SERIES = {
-    "WCESTUS1": "Crude Oil Stocks",
-    "WGTSTUS1": "Gasoline Stocks",
-    "WDISTUS1": "Distillate Stocks",
-    "WKJSTUS1": "Jet Fuel Stocks",
-    "WCRFPUS2": "Crude Production",
-    "W_EPC0_FPF_R48_MBBLD": "L48 Crude Production",
-    "WCEIMUS2": "Crude Imports",
-    "WCREXUS2": "Crude Exports",
-    "WCRRIUS2": "Refinery Inputs",
-    "WPULEUS3": "Refinery Utilization",
-    "WRPUPUS2": "Total Products Supplied",
-    "WGFUPUS2": "Gasoline Supplied",
-    "WDIUPUS2": "Distillate Supplied",
-    "WKJUPUS2": "Jet Fuel Supplied",
-    "WGFRPUS2": "Gasoline Production",
-    "WDIRPUS2": "Distillate Production",
-}
 
 _SERIES_OPTIONS = [{"label": v, "value": k} for k, v in ANALYTICS_SERIES.items()]
 _DEFAULT_SERIES = "WCESTUS1"
@@ -87,9 +77,10 @@ def _empty_fig(msg="No data available", height=480):
 
 def _get_ts(series_id):
     """Return (dates, values) as numpy arrays, dropping NaNs."""
-    if series_id not in _pivot.columns:
+    pivot = _pivot()
+    if series_id not in pivot.columns:
         return np.array([]), np.array([])
-    s = _pivot[["period", series_id]].dropna(subset=[series_id])
+    s = pivot[["period", series_id]].dropna(subset=[series_id])
     return s["period"].values, s[series_id].values.astype(float)
 
 
@@ -140,7 +131,8 @@ def _tab_forecast():
     return html.Div([
         dbc.Row([
             dbc.Col(_slider("p15-fc-horizon", "Forecast Horizon (weeks)", 4, 26, 12), lg=4),
-            dbc.Col(_slider("p15-fc-holdout", "Holdout Period (weeks)", 8, 52, 26), lg=4),
+            dbc.Col(_slider("p15-fc-holdout", "Holdout Period (weeks)", min(HOLDOUTS), max(HOLDOUTS),
+                            DEFAULT_HOLDOUT, step=None, marks={h: str(h) for h in HOLDOUTS}), lg=4),
         ]),
         dbc.Row([
             dbc.Col(_chart_card("p15-stl"), lg=6),
@@ -464,9 +456,7 @@ def update_stl(series_id):
 
     name = ANALYTICS_SERIES.get(series_id, series_id)
     try:
-        from statsmodels.tsa.seasonal import STL
-        s = pd.Series(vals, index=pd.to_datetime(dates))
-        result = STL(s, period=52, robust=True).fit()
+        result = models.stl(series_id)
     except Exception as e:
         return _empty_fig(f"STL error: {e}")
 
@@ -503,7 +493,6 @@ def update_forecast(series_id, horizon, holdout):
     name = ANALYTICS_SERIES.get(series_id, series_id)
     n = len(vals)
     split = n - holdout
-    train_vals = vals[:split]
     test_vals = vals[split:split + horizon]
     test_dates = dates[split:split + horizon]
     train_dates = dates[:split]
@@ -536,11 +525,9 @@ def update_forecast(series_id, horizon, holdout):
                              f"{np.mean(np.abs(err / test_vals)) * 100:.2f}%"))
 
     # Holt-Winters
-    try:
-        from statsmodels.tsa.holtwinters import ExponentialSmoothing
-        hw = ExponentialSmoothing(train_vals, seasonal_periods=52, trend="add",
-                                  seasonal="add", use_boxcox=False).fit(optimized=True)
-        hw_fc = hw.forecast(actual_horizon)
+    hw_fc = models.holt_winters(series_id, holdout)
+    if hw_fc is not None:
+        hw_fc = hw_fc[:actual_horizon]
         fig.add_trace(go.Scatter(x=dt_test, y=hw_fc, mode="lines",
                                  name="Holt-Winters", line=dict(color=_ACCENT_COLORS[3], width=1.5, dash="dash")))
         err = test_vals - hw_fc
@@ -548,46 +535,26 @@ def update_forecast(series_id, horizon, holdout):
                              f"{np.mean(np.abs(err)):.1f}",
                              f"{np.sqrt(np.mean(err**2)):.1f}",
                              f"{np.mean(np.abs(err / test_vals)) * 100:.2f}%"))
-    except Exception:
-        pass
 
     # SARIMAX
-    try:
-        from statsmodels.tsa.statespace.sarimax import SARIMAX
-        model = SARIMAX(train_vals, order=(1, 1, 1), seasonal_order=(1, 1, 0, 52),
-                        enforce_stationarity=False, enforce_invertibility=False)
-        fit = model.fit(disp=False, maxiter=50)
-        pred = fit.get_forecast(actual_horizon)
-        sarima_fc = pred.predicted_mean
-        ci = pred.conf_int(alpha=0.05)
-        fig.add_trace(go.Scatter(x=dt_test, y=sarima_fc, mode="lines",
-                                 name="SARIMAX", line=dict(color=_ACCENT_COLORS[1], width=2)))
-        fig.add_trace(go.Scatter(x=dt_test, y=ci[:, 1], mode="lines", line=dict(width=0),
-                                 showlegend=False, hoverinfo="skip"))
-        fig.add_trace(go.Scatter(x=dt_test, y=ci[:, 0], mode="lines", line=dict(width=0),
-                                 fill="tonexty", fillcolor="rgba(255,107,107,0.15)",
-                                 name="95% CI", hoverinfo="skip"))
-        err = test_vals - sarima_fc
-        metrics_rows.append(("SARIMAX(1,1,1)(1,1,0,52)",
+    fc = models.sarimax(series_id, holdout)
+    if fc is not None:
+        model_fc = fc["mean"][:actual_horizon]
+        seasonal = "lower" in fc
+        fig.add_trace(go.Scatter(x=dt_test, y=model_fc, mode="lines",
+                                 name="SARIMAX" if seasonal else fc["label"],
+                                 line=dict(color=_ACCENT_COLORS[1], width=2)))
+        if seasonal:
+            fig.add_trace(go.Scatter(x=dt_test, y=fc["upper"][:actual_horizon], mode="lines", line=dict(width=0),
+                                     showlegend=False, hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=dt_test, y=fc["lower"][:actual_horizon], mode="lines", line=dict(width=0),
+                                     fill="tonexty", fillcolor="rgba(255,107,107,0.15)",
+                                     name="95% CI", hoverinfo="skip"))
+        err = test_vals - model_fc
+        metrics_rows.append((fc["label"],
                              f"{np.mean(np.abs(err)):.1f}",
                              f"{np.sqrt(np.mean(err**2)):.1f}",
                              f"{np.mean(np.abs(err / test_vals)) * 100:.2f}%"))
-    except Exception:
-        try:
-            from statsmodels.tsa.statespace.sarimax import SARIMAX
-            model = SARIMAX(train_vals, order=(1, 1, 1), enforce_stationarity=False, enforce_invertibility=False)
-            fit = model.fit(disp=False, maxiter=50)
-            pred = fit.get_forecast(actual_horizon)
-            arima_fc = pred.predicted_mean
-            fig.add_trace(go.Scatter(x=dt_test, y=arima_fc, mode="lines",
-                                     name="ARIMA(1,1,1)", line=dict(color=_ACCENT_COLORS[1], width=2)))
-            err = test_vals - arima_fc
-            metrics_rows.append(("ARIMA(1,1,1)",
-                                 f"{np.mean(np.abs(err)):.1f}",
-                                 f"{np.sqrt(np.mean(err**2)):.1f}",
-                                 f"{np.mean(np.abs(err / test_vals)) * 100:.2f}%"))
-        except Exception:
-            pass
 
     _apply_theme(fig)
     fig.update_layout(title=dict(text=f"Forecast Comparison — {name}", font=dict(size=13)))
@@ -622,11 +589,12 @@ def update_granger(selected):
     n = len(selected)
     pvals = np.ones((n, n))
 
-    cols = [s for s in selected if s in _pivot.columns]
+    pivot = _pivot()
+    cols = [s for s in selected if s in pivot.columns]
     if len(cols) < 2:
         return _empty_fig("Series not found in data")
 
-    df = _pivot[["period"] + cols].dropna()
+    df = pivot[["period"] + cols].dropna()
     if len(df) < 30:
         return _empty_fig("Insufficient overlapping data")
 
@@ -668,8 +636,9 @@ def update_rolling_corr(selected, window):
     if not selected or len(selected) < 2:
         return _empty_fig("Select at least 2 products")
 
-    cols = [s for s in selected if s in _pivot.columns][:6]
-    df = _pivot[["period"] + cols].dropna()
+    pivot = _pivot()
+    cols = [s for s in selected if s in pivot.columns][:6]
+    df = pivot[["period"] + cols].dropna()
     if len(df) < window + 10:
         return _empty_fig("Insufficient data")
 
@@ -704,8 +673,9 @@ def update_pca(selected):
     from sklearn.decomposition import PCA
     from sklearn.preprocessing import StandardScaler
 
-    cols = [s for s in selected if s in _pivot.columns]
-    df = _pivot[cols].dropna()
+    pivot = _pivot()
+    cols = [s for s in selected if s in pivot.columns]
+    df = pivot[cols].dropna()
     if len(df) < 30:
         return _empty_fig("Insufficient data")
 
@@ -802,9 +772,7 @@ def update_stl_seasonal(series_id):
 
     name = ANALYTICS_SERIES.get(series_id, series_id)
     try:
-        from statsmodels.tsa.seasonal import STL
-        s = pd.Series(vals, index=pd.to_datetime(dates))
-        result = STL(s, period=52, robust=True).fit()
+        result = models.stl(series_id)
     except Exception as e:
         return _empty_fig(f"STL error: {e}")
 
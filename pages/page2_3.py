@@ -3,7 +3,8 @@ import dash_ag_grid as dag
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-from src.wps.ag_calculations import DataProcessor
+from src.wps.ag_calculations import DataProcessor, format_grid_display_data
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import RED, BLUE, BLACK, GREEN, ORANGE
 
@@ -14,137 +15,110 @@ processor = DataProcessor()
 default_start_date = default_start_date_eia_wps_table
 default_end_date = default_end_date_eia_wps_table
 
-# Process data and column definitions - with error handling
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_3: {e}")
-    # Create empty dataframe with minimal columns for initial load
-    import pandas as pd
-    df = pd.DataFrame()
-    columnDefinitions = []
-
-# Keep initial data for graph purposes
-initial_df = df.copy() if not df.empty else pd.DataFrame()
-
-
-def format_grid_display_data(df):
-    """Format visible grid values without changing the raw data used by graphs."""
-    if df.empty:
-        return df
-
-    display_df = df.copy()
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    value_cols = [col for col in display_df.columns if col not in metadata_cols]
-    display_df[value_cols] = display_df[value_cols].astype(object)
-
-    def format_value(value, uom):
-        numeric_value = pd.to_numeric(value, errors='coerce')
-        if pd.isna(numeric_value) or numeric_value == 0:
-            return '-'
-
-        decimals = 1 if uom in {'mb', 'pct'} else 0
-        formatted = f"{abs(float(numeric_value)):,.{decimals}f}"
-        return f"({formatted})" if numeric_value < 0 else formatted
-
-    for idx, row in display_df.iterrows():
-        for col in value_cols:
-            display_df.at[idx, col] = format_value(row[col], row['uom'])
-
-    return display_df
 
 # Page layout for page 2_10
-layout = html.Div([
-    # Header section
-    html.Div([
-        html.Div([
-            html.H1("EIA Stats Table", style={"fontSize": "3em", "color": BLUE, "margin": "0"}),
-        ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-start"}),
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    # Process data and column definitions - with error handling
+    try:
+        df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
+    except Exception as e:
+        print(f"Error loading initial data for page2_3: {e}")
+        # Create empty dataframe with minimal columns for initial load
+        df = pd.DataFrame()
+        columnDefinitions = []
 
+    return html.Div([
+        # Header section
         html.Div([
-            dcc.DatePickerRange(
-                id='date-picker-range',
-                min_date_allowed='2010-01-01',
-                max_date_allowed='2030-12-31',
-                initial_visible_month=default_start_date,
-                start_date=default_start_date,
-                end_date=default_end_date,
-                display_format='YYYY-MM-DD',
-                style={"padding": "10px"},
-                className="custom-date-picker"
-            ),
-        ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "center"}),
+            html.Div([
+                html.H1("EIA Stats Table", style={"fontSize": "3em", "color": BLUE, "margin": "0"}),
+            ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-start"}),
 
-        html.Div([
-            html.Button("📊 Graphs", id="graph-view-btn-wps", n_clicks=0,
-                       style={"fontSize": "1.3em", "padding": "10px", "margin": "0 10px",
-                              "backgroundColor": "white", "border": f"2px solid {BLUE}",
-                              "color": BLUE, "cursor": "pointer"}),
-            html.Button("Download CSV", id="csv-button", n_clicks=0,
-                       style={"fontSize": "1.3em", "padding": "10px", "margin": "0",
-                              "backgroundColor": "white", "border": "2px solid #f0f0f0",
-                              "color": BLUE, "cursor": "pointer"}),
-        ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-end"})
-    ], style={"height": "6vh", "display": "flex", "alignItems": "center",
-              "justifyContent": "space-between", "padding": "0 20px"}),
+            html.Div([
+                dcc.DatePickerRange(
+                    id='date-picker-range',
+                    min_date_allowed='2010-01-01',
+                    max_date_allowed='2030-12-31',
+                    initial_visible_month=default_start_date,
+                    start_date=default_start_date,
+                    end_date=default_end_date,
+                    display_format='YYYY-MM-DD',
+                    style={"padding": "10px"},
+                    className="custom-date-picker"
+                ),
+            ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "center"}),
+
+            html.Div([
+                html.Button("📊 Graphs", id="graph-view-btn-wps", n_clicks=0,
+                           style={"fontSize": "1.3em", "padding": "10px", "margin": "0 10px",
+                                  "backgroundColor": "white", "border": f"2px solid {BLUE}",
+                                  "color": BLUE, "cursor": "pointer"}),
+                html.Button("Download CSV", id="csv-button", n_clicks=0,
+                           style={"fontSize": "1.3em", "padding": "10px", "margin": "0",
+                                  "backgroundColor": "white", "border": "2px solid #f0f0f0",
+                                  "color": BLUE, "cursor": "pointer"}),
+            ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-end"})
+        ], style={"height": "6vh", "display": "flex", "alignItems": "center",
+                  "justifyContent": "space-between", "padding": "0 20px"}),
     
-    # Main content area with AG Grid and Graphs
-    html.Div([
-        # AG Grid container
+        # Main content area with AG Grid and Graphs
         html.Div([
-            dag.AgGrid(
-                id="export-data-grid",
-                columnDefs=columnDefinitions,
-                defaultColDef={
-                    "filter": True,
-                    "floatingFilter": True,
-                    "sortable": False,
-                },
-                rowData=format_grid_display_data(df).to_dict('records'),
-                csvExportParams={
-                    "fileName": "eia_stats_data.csv",
-                },
-                dashGridOptions={
-                    "rowSelection": "single",
-                    "animateRows": False,
-                    "domLayout": "normal",
-                },
-                className="ag-theme-alpine",
-                style={"height": "100%", "width": "100%"}
-            )
-        ], id="grid-container-wps", style={"height": "100%", "width": "100%", "transition": "width 0.3s ease"}),
+            # AG Grid container
+            html.Div([
+                dag.AgGrid(
+                    id="export-data-grid",
+                    columnDefs=columnDefinitions,
+                    defaultColDef={
+                        "filter": True,
+                        "floatingFilter": True,
+                        "sortable": False,
+                    },
+                    rowData=format_grid_display_data(df).to_dict('records'),
+                    csvExportParams={
+                        "fileName": "eia_stats_data.csv",
+                    },
+                    dashGridOptions={
+                        "rowSelection": "single",
+                        "animateRows": False,
+                        "domLayout": "normal",
+                    },
+                    className="ag-theme-alpine",
+                    style={"height": "100%", "width": "100%"}
+                )
+            ], id="grid-container-wps", style={"height": "100%", "width": "100%", "transition": "width 0.3s ease"}),
         
-        # Graph panel (initially hidden)
-        html.Div([
+            # Graph panel (initially hidden)
             html.Div([
-                html.H3("Data Visualization", style={"margin": "10px 0", "color": BLUE, "fontSize": "1.5em"}),
-                html.Button("✕", id="close-graph-btn-wps", n_clicks=0,
-                           style={"position": "absolute", "top": "10px", "right": "10px",
-                                  "background": "transparent", "border": "none",
-                                  "fontSize": "1.5em", "cursor": "pointer", "color": "#666"})
-            ], style={"position": "relative", "padding": "0 20px", "height": "50px"}),
+                html.Div([
+                    html.H3("Data Visualization", style={"margin": "10px 0", "color": BLUE, "fontSize": "1.5em"}),
+                    html.Button("✕", id="close-graph-btn-wps", n_clicks=0,
+                               style={"position": "absolute", "top": "10px", "right": "10px",
+                                      "background": "transparent", "border": "none",
+                                      "fontSize": "1.5em", "cursor": "pointer", "color": "#666"})
+                ], style={"position": "relative", "padding": "0 20px", "height": "50px"}),
             
-            # Line graph with 4-week moving average
-            html.Div([
-                html.H4("Historical Trend", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
-                dcc.Graph(id="line-graph-wps", style={"height": "calc(100% - 30px)"})
-            ], style={"padding": "0 20px", "height": "calc(50% - 25px)"}),
+                # Line graph with 4-week moving average
+                html.Div([
+                    html.H4("Historical Trend", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
+                    dcc.Graph(id="line-graph-wps", style={"height": "calc(100% - 30px)"})
+                ], style={"padding": "0 20px", "height": "calc(50% - 25px)"}),
             
-            # Seasonality graph (weekly patterns)
-            html.Div([
-                html.H4("Weekly Seasonality Pattern", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
-                dcc.Graph(id="seasonality-graph-wps", style={"height": "calc(100% - 30px)"})
-            ], style={"padding": "0 20px", "height": "calc(50% - 25px)"})
-        ], id="graph-panel-wps", style={"height": "100%", "width": "0%", "backgroundColor": "#f8f8f8",
-                                    "borderLeft": "2px solid #e0e0e0", "overflow": "auto",
-                                    "transition": "width 0.3s ease", "display": "none"}),
-    ], style={"height": "85vh", "display": "flex", "padding": "0 20px"}),
+                # Seasonality graph (weekly patterns)
+                html.Div([
+                    html.H4("Weekly Seasonality Pattern", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
+                    dcc.Graph(id="seasonality-graph-wps", style={"height": "calc(100% - 30px)"})
+                ], style={"padding": "0 20px", "height": "calc(50% - 25px)"})
+            ], id="graph-panel-wps", style={"height": "100%", "width": "0%", "backgroundColor": "#f8f8f8",
+                                        "borderLeft": "2px solid #e0e0e0", "overflow": "auto",
+                                        "transition": "width 0.3s ease", "display": "none"}),
+        ], style={"height": "85vh", "display": "flex", "padding": "0 20px"}),
     
-    # Hidden stores
-    dcc.Store(id='graph-view-state-wps', data=False),
-    dcc.Store(id='current-data-store', data=df.to_dict('records') if not df.empty else [])
+        # Hidden stores
+        dcc.Store(id='graph-view-state-wps', data=False),
+        dcc.Store(id='current-data-store', data=datasets.publish('wps_ag_table', df, start=default_start_date, end=default_end_date) if not df.empty else [])
     
-], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
+    ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # Callbacks for page 2_10
 @callback(
@@ -168,7 +142,7 @@ def update_grid_data(start_date, end_date):
     try:
         df, updated_columnDefinitions = processor.get_data(start_date, end_date)
         display_df = format_grid_display_data(df)
-        return display_df.to_dict('records'), updated_columnDefinitions, df.to_dict('records')
+        return display_df.to_dict('records'), updated_columnDefinitions, datasets.publish('wps_ag_table', df, start=start_date, end=end_date)
     except Exception as e:
         print(f"Error updating grid data: {e}")
         # Return empty data on error
@@ -244,8 +218,8 @@ def update_graphs(selected_rows, current_data):
     item_name = selected_row.get('name', '')
     item_uom = selected_row.get('uom', '')
     
-    # Convert current data to DataFrame for easier processing
-    df = pd.DataFrame(current_data)
+    # Resolve the store's handle to the server-side table
+    df = datasets.resolve(current_data)
     
     # Get date columns (exclude metadata columns)
     metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
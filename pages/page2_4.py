@@ -5,12 +5,13 @@ import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 import plotly.graph_objects as go
 from src.utils.data_loader import loader
+from src.utils import datasets
+from src.utils import figure_cache
 from src.utils.colors import (
     RED, BLUE, GREEN, ORANGE, PURPLE, BLACK,
     POSITIVE, NEGATIVE, COLORSCALE_HEATMAP,
     CHART_SEQUENCE, GRAY_50, GRAY_200, GRAY_300, GRAY_500, GRAY_800,
 )
-from src.utils.variables import years_last_five_years_range
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -143,21 +144,9 @@ def _find_year_ago(df, target_period):
     return df.loc[idx]
 
 
-def _five_year_avg(df, target_week, col):
-    mask = (df["period"].dt.isocalendar().week.astype(int) == target_week) & (
-        df["period"].dt.year.isin(years_last_five_years_range)
-    )
-    subset = df.loc[mask, col]
-    return subset.mean() if len(subset) > 0 else np.nan
-
-
-def _five_year_stats(df, col):
-    mask = df["period"].dt.year.isin(years_last_five_years_range)
-    sub = df.loc[mask].copy()
-    sub["week"] = sub["period"].dt.isocalendar().week.astype(int)
-    if col not in sub.columns:
-        return pd.DataFrame(columns=["week", "mean", "min", "max"])
-    return sub.groupby("week")[col].agg(["mean", "min", "max"]).reset_index()
+def _stats():
+    """Seasonal bands of every WPS series (dash_eia.transforms.wps_stats), built at ingest"""
+    return datasets.resolve(datasets.handle("wps_stats"))
 
 
 def _hex_to_rgba(hex_color, alpha=0.4):
@@ -244,145 +233,134 @@ DAYS_FMT = {"function": """
 """}
 
 
-# ---------------------------------------------------------------------------
-# Pre-load data
-# ---------------------------------------------------------------------------
-
-try:
-    _initial_df = _load_pivot()
-    _initial_json = _initial_df.to_json(date_format="iso", orient="split")
-except Exception as e:
-    print(f"Error loading initial data for page2_4: {e}")
-    _initial_df = pd.DataFrame()
-    _initial_json = None
-
-
 # ---------------------------------------------------------------------------
 # Layout
 # ---------------------------------------------------------------------------
 
-layout = html.Div([
-    # Title + Product selector
-    html.Div([
-        html.Div([
-            html.Div("REGIONAL PETROLEUM OVERVIEW", style={
-                "fontSize": "0.75rem", "fontWeight": "700",
-                "letterSpacing": "0.08em", "color": GRAY_500,
-                "marginBottom": "0.25rem",
-            }),
-            html.H2("PADD Analysis", style={
-                "fontSize": "1.75rem", "fontWeight": "700",
-                "color": GRAY_800, "margin": "0",
-            }),
-        ]),
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    return html.Div([
+        # Title + Product selector
         html.Div([
-            html.Div("PRODUCT", style={
-                "fontSize": "0.7rem", "fontWeight": "700",
-                "letterSpacing": "0.08em", "color": GRAY_500,
-                "marginBottom": "0.25rem",
-            }),
-            dbc.RadioItems(
-                id="product-selector-p11",
-                options=[
-                    {"label": "Crude Oil", "value": "crude"},
-                    {"label": "Gasoline", "value": "gasoline"},
-                    {"label": "Distillate", "value": "distillate"},
-                    {"label": "Jet Fuel", "value": "jet"},
-                ],
-                value="crude",
-                inline=True,
-                inputStyle={"marginRight": "5px"},
-                labelStyle={"marginRight": "1.5rem", "fontWeight": "500"},
-            ),
-        ]),
-    ], style={"display": "flex", "justifyContent": "space-between",
-              "alignItems": "flex-end", "marginBottom": "1.5rem"}),
-
-    # KPI Strip
-    html.Div(id="kpi-strip-p11", style={"marginBottom": "1.5rem"}),
-
-    # AG Grid: PADD Comparison Table
-    dbc.Card([
-        dbc.CardBody([
-            dag.AgGrid(
-                id="padd-grid-p11",
-                rowData=[],
-                columnDefs=[],
-                defaultColDef={"resizable": True, "sortable": True, "filter": False},
-                dashGridOptions={
-                    "domLayout": "autoHeight",
-                    "suppressRowHoverHighlight": False,
-                },
-                className="ag-theme-alpine",
-                style={"width": "100%"},
-            ),
-        ], style={"padding": "0.75rem"}),
-    ], style={
-        "backgroundColor": "white", "borderRadius": "4px",
-        "boxShadow": "0 1px 3px rgba(0,0,0,0.08)",
-        "border": f"1px solid {GRAY_200}", "marginBottom": "1.5rem",
-    }),
-
-    # Row 1: Stacked Area + Stock Concentration
-    dbc.Row([
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="stocks-stacked-p11", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="stock-share-p11", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-    ], className="mb-4"),
-
-    # Row 2: Weekly Changes + Days of Supply Heatmap
-    dbc.Row([
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="weekly-changes-p11", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="dos-heatmap-p11", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-    ], className="mb-4"),
-
-    # Row 3: Seasonality + Import Dependency
-    dbc.Row([
-        dbc.Col(dbc.Card([
+            html.Div([
+                html.Div("REGIONAL PETROLEUM OVERVIEW", style={
+                    "fontSize": "0.75rem", "fontWeight": "700",
+                    "letterSpacing": "0.08em", "color": GRAY_500,
+                    "marginBottom": "0.25rem",
+                }),
+                html.H2("PADD Analysis", style={
+                    "fontSize": "1.75rem", "fontWeight": "700",
+                    "color": GRAY_800, "margin": "0",
+                }),
+            ]),
+            html.Div([
+                html.Div("PRODUCT", style={
+                    "fontSize": "0.7rem", "fontWeight": "700",
+                    "letterSpacing": "0.08em", "color": GRAY_500,
+                    "marginBottom": "0.25rem",
+                }),
+                dbc.RadioItems(
+                    id="product-selector-p11",
+                    options=[
+                        {"label": "Crude Oil", "value": "crude"},
+                        {"label": "Gasoline", "value": "gasoline"},
+                        {"label": "Distillate", "value": "distillate"},
+                        {"label": "Jet Fuel", "value": "jet"},
+                    ],
+                    value="crude",
+                    inline=True,
+                    inputStyle={"marginRight": "5px"},
+                    labelStyle={"marginRight": "1.5rem", "fontWeight": "500"},
+                ),
+            ]),
+        ], style={"display": "flex", "justifyContent": "space-between",
+                  "alignItems": "flex-end", "marginBottom": "1.5rem"}),
+
+        # KPI Strip
+        html.Div(id="kpi-strip-p11", style={"marginBottom": "1.5rem"}),
+
+        # AG Grid: PADD Comparison Table
+        dbc.Card([
             dbc.CardBody([
-                html.Div([
-                    html.Div("PADD:", style={"fontSize": "0.75rem", "fontWeight": "600",
-                                             "color": GRAY_500, "marginRight": "8px",
-                                             "alignSelf": "center"}),
-                    dcc.Dropdown(
-                        id="padd-selector-p11",
-                        options=[{"label": v, "value": k} for k, v in PADD_LABELS.items()],
-                        value="US",
-                        clearable=False,
-                        style={"width": "220px"},
-                    ),
-                ], style={"display": "flex", "marginBottom": "8px"}),
-                dcc.Graph(id="seasonality-p11", config={"displayModeBar": False}),
-            ])
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="import-dependency-p11", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-    ], className="mb-4"),
-
-    # Hidden store
-    dcc.Store(id="pivot-store-p11", data=_initial_json),
-
-], style=PAGE_STYLE)
+                dag.AgGrid(
+                    id="padd-grid-p11",
+                    rowData=[],
+                    columnDefs=[],
+                    defaultColDef={"resizable": True, "sortable": True, "filter": False},
+                    dashGridOptions={
+                        "domLayout": "autoHeight",
+                        "suppressRowHoverHighlight": False,
+                    },
+                    className="ag-theme-alpine",
+                    style={"width": "100%"},
+                ),
+            ], style={"padding": "0.75rem"}),
+        ], style={
+            "backgroundColor": "white", "borderRadius": "4px",
+            "boxShadow": "0 1px 3px rgba(0,0,0,0.08)",
+            "border": f"1px solid {GRAY_200}", "marginBottom": "1.5rem",
+        }),
+
+        # Row 1: Stacked Area + Stock Concentration
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="stocks-stacked-p11", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="stock-share-p11", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+        ], className="mb-4"),
+
+        # Row 2: Weekly Changes + Days of Supply Heatmap
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="weekly-changes-p11", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="dos-heatmap-p11", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+        ], className="mb-4"),
+
+        # Row 3: Seasonality + Import Dependency
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        html.Div("PADD:", style={"fontSize": "0.75rem", "fontWeight": "600",
+                                                 "color": GRAY_500, "marginRight": "8px",
+                                                 "alignSelf": "center"}),
+                        dcc.Dropdown(
+                            id="padd-selector-p11",
+                            options=[{"label": v, "value": k} for k, v in PADD_LABELS.items()],
+                            value="US",
+                            clearable=False,
+                            style={"width": "220px"},
+                        ),
+                    ], style={"display": "flex", "marginBottom": "8px"}),
+                    dcc.Graph(id="seasonality-p11", config={"displayModeBar": False}),
+                ])
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="import-dependency-p11", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+        ], className="mb-4"),
+
+        # Hidden store
+        dcc.Store(id="pivot-store-p11", data=datasets.handle("wps_pivot")),
+
+    ], style=PAGE_STYLE)
 
 
 # ---------------------------------------------------------------------------
@@ -392,7 +370,11 @@ layout = html.Div([
 def _rebuild_df(pivot_json):
     if not pivot_json:
         return pd.DataFrame()
-    df = pd.read_json(pivot_json, orient="split")
+    if isinstance(pivot_json, dict):
+        df = datasets.resolve(pivot_json)
+    else:
+        # JSON written by sessions opened before the store held a handle
+        df = pd.read_json(pivot_json, orient="split")
     df["period"] = pd.to_datetime(df["period"])
     return df.sort_values("period").reset_index(drop=True)
 
@@ -467,6 +449,7 @@ def update_padd_grid(product, pivot_json):
     yago = _find_year_ago(df, latest["period"])
     latest_week = int(latest["period"].isocalendar().week)
     cfg = PRODUCT_CONFIG[product]
+    stats = _stats()
 
     rows = []
     for padd in PADD_REGIONS + ['US']:
@@ -477,7 +460,7 @@ def update_padd_grid(product, pivot_json):
         stk_l = _safe_val(latest, stock_sid) if stock_sid else np.nan
         stk_p = _safe_val(prior, stock_sid) if stock_sid else np.nan
         stk_y = _safe_val(yago, stock_sid) if stock_sid else np.nan
-        stk_5yr = _five_year_avg(df, latest_week, stock_sid) if stock_sid else np.nan
+        stk_5yr = stats.five_year_avg(stock_sid, latest_week) if stock_sid in stats else np.nan
 
         imp_l = _safe_val(latest, imp_sid) if imp_sid else np.nan
         dem_l = _safe_val(latest, demand_sid) if demand_sid else np.nan
@@ -534,6 +517,7 @@ def update_padd_grid(product, pivot_json):
     Input("product-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_stocks_stacked(product, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -590,6 +574,7 @@ def update_stocks_stacked(product, pivot_json):
     Input("product-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_stock_share(product, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -636,6 +621,7 @@ def update_stock_share(product, pivot_json):
     Input("product-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_weekly_changes(product, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -697,6 +683,7 @@ def update_weekly_changes(product, pivot_json):
     Input("product-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_dos_heatmap(product, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -763,6 +750,7 @@ def update_dos_heatmap(product, pivot_json):
     Input("padd-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_seasonality(product, padd, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -770,49 +758,45 @@ def update_seasonality(product, padd, pivot_json):
 
     cfg = PRODUCT_CONFIG[product]
     sid = _get_sid(product, padd, 'stock')
-    if not sid or sid not in df.columns:
+    stats = _stats()
+    if not sid or sid not in df.columns or sid not in stats:
         return go.Figure().update_layout(title="Data not available")
 
     fig = go.Figure()
 
     # 5-year range band
-    stats = _five_year_stats(df, sid)
-    if not stats.empty:
+    band = stats.band(sid)
+    if not band.empty:
         fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["max"],
+            x=band["week"], y=band["max"],
             mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
         ))
         fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["min"],
+            x=band["week"], y=band["min"],
             mode="lines", line=dict(width=0), fill="tonexty",
             fillcolor="rgba(0,0,0,0.06)", name="5-Yr Range", hoverinfo="skip",
         ))
         fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["mean"],
+            x=band["week"], y=band["mean"],
             mode="lines", line=dict(color=GRAY_300, width=1.5, dash="dash"),
             name="5-Yr Avg",
         ))
 
     # Year-ago line
     current_year = df["period"].dt.year.max()
-    df_copy = df.copy()
-    df_copy["week"] = df_copy["period"].dt.isocalendar().week.astype(int)
-
-    ya_mask = df_copy["period"].dt.year == (current_year - 1)
-    ya = df_copy.loc[ya_mask]
-    if not ya.empty:
+    ya_weeks, ya_values = stats.by_year(stats.row(sid), current_year - 1)
+    if len(ya_weeks):
         fig.add_trace(go.Scatter(
-            x=ya["week"], y=ya[sid],
+            x=ya_weeks, y=ya_values,
             mode="lines", line=dict(color=BLUE, width=1.5),
             name=str(current_year - 1),
         ))
 
     # Current year
-    cur_mask = df_copy["period"].dt.year == current_year
-    cur = df_copy.loc[cur_mask]
-    if not cur.empty:
+    cur_weeks, cur_values = stats.by_year(stats.row(sid), current_year)
+    if len(cur_weeks):
         fig.add_trace(go.Scatter(
-            x=cur["week"], y=cur[sid],
+            x=cur_weeks, y=cur_values,
             mode="lines", line=dict(color=BLACK, width=2.5),
             name=str(current_year),
         ))
@@ -852,6 +836,7 @@ def update_seasonality(product, padd, pivot_json):
     Input("product-selector-p11", "value"),
     Input("pivot-store-p11", "data"),
 )
+@figure_cache.cached("wps_pivot")
 def update_import_dependency(product, pivot_json):
     df = _rebuild_df(pivot_json)
     if df.empty:
@@ -30,6 +30,8 @@ import os
 
 from src.app import app
 from src.wps.calculation import create_callbacks, create_layout
+from src.utils import datasets
+from src.utils import figure_cache
 from src.utils.data_loader import loader, get_line_data_for_ids
 from src.utils.colors import (
     RED, BLUE, ORANGE, GREEN, POSITIVE, NEGATIVE,
@@ -128,66 +130,73 @@ def build_cushing_kpis():
         ]
 
 
-# Build layout
-layout = html.Div([
-    # Hero section
-    html.Div([
-        html.Div("EIA WEEKLY PETROLEUM STATUS", className="page-eyebrow"),
-        html.H1("Cushing Analysis", className="page-title"),
-        html.P(
-            "Cushing, OK crude oil storage hub — the WTI delivery point and key barometer of US crude market balance.",
-            className="page-summary"
-        ),
-    ], className="page-hero", style={"marginBottom": "1.5rem"}),
-
-    # KPI cards
-    dbc.Row(build_cushing_kpis(), style={"marginBottom": "1.5rem"}),
+# The chart section registers its control callbacks as it is built, so it is
+# built here, at import; it holds no data.
+chart_section = create_layout(page_id, commodity, graph_sections_input(page_id))
 
-    # Standard WPS chart section (controls + 4 charts)
-    create_layout(page_id, commodity, graph_sections_input(page_id)),
 
-    # Custom analytics section
-    html.Div([
-        html.H1("Cushing Derived Analytics", className="eia-weekly-header-title"),
+# Build layout
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    return html.Div([
+        # Hero section
         html.Div([
-            html.Div(
-                dcc.Graph(id='cushing-pct-commercial', style={"height": "600px"}),
-                className="graph-container",
-                style={"width": "700px", "display": "inline-block", "verticalAlign": "top"}
-            ),
-            html.Div(
-                dcc.Graph(id='cushing-weekly-change', style={"height": "600px"}),
-                className="graph-container",
-                style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
+            html.Div("EIA WEEKLY PETROLEUM STATUS", className="page-eyebrow"),
+            html.H1("Cushing Analysis", className="page-title"),
+            html.P(
+                "Cushing, OK crude oil storage hub — the WTI delivery point and key barometer of US crude market balance.",
+                className="page-summary"
             ),
-        ], className="eia-weekly-graph-container",
-           style={"display": "flex", "gridTemplateColumns": "1fr 1fr", "width": "1440px"}),
-    ], style={"marginTop": "20px"}),
+        ], className="page-hero", style={"marginBottom": "1.5rem"}),
 
-    # Advanced statistics section
-    html.Div([
-        html.H1("Cushing Advanced Statistics", className="eia-weekly-header-title"),
-        html.Div([
-            html.Div(
-                dcc.Graph(id='cushing-zscore', style={"height": "600px"}),
-                className="graph-container",
-                style={"width": "700px", "display": "inline-block", "verticalAlign": "top"}
-            ),
-            html.Div(
-                dcc.Graph(id='cushing-seasonal-deviation', style={"height": "600px"}),
-                className="graph-container",
-                style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
-            ),
-            html.Div(
-                dcc.Graph(id='cushing-percentile', style={"height": "600px"}),
-                className="graph-container",
-                style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
-            ),
-        ], className="eia-weekly-graph-container",
-           style={"display": "flex", "gridTemplateColumns": "1fr 1fr 1fr", "width": "2160px"}),
-    ], style={"marginTop": "20px"}),
+        # KPI cards
+        dbc.Row(build_cushing_kpis(), style={"marginBottom": "1.5rem"}),
 
-], style={"padding": "2rem", "backgroundColor": GRAY_50, "minHeight": "100vh"})
+        # Standard WPS chart section (controls + 4 charts)
+        chart_section,
+
+        # Custom analytics section
+        html.Div([
+            html.H1("Cushing Derived Analytics", className="eia-weekly-header-title"),
+            html.Div([
+                html.Div(
+                    dcc.Graph(id='cushing-pct-commercial', style={"height": "600px"}),
+                    className="graph-container",
+                    style={"width": "700px", "display": "inline-block", "verticalAlign": "top"}
+                ),
+                html.Div(
+                    dcc.Graph(id='cushing-weekly-change', style={"height": "600px"}),
+                    className="graph-container",
+                    style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
+                ),
+            ], className="eia-weekly-graph-container",
+               style={"display": "flex", "gridTemplateColumns": "1fr 1fr", "width": "1440px"}),
+        ], style={"marginTop": "20px"}),
+
+        # Advanced statistics section
+        html.Div([
+            html.H1("Cushing Advanced Statistics", className="eia-weekly-header-title"),
+            html.Div([
+                html.Div(
+                    dcc.Graph(id='cushing-zscore', style={"height": "600px"}),
+                    className="graph-container",
+                    style={"width": "700px", "display": "inline-block", "verticalAlign": "top"}
+                ),
+                html.Div(
+                    dcc.Graph(id='cushing-seasonal-deviation', style={"height": "600px"}),
+                    className="graph-container",
+                    style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
+                ),
+                html.Div(
+                    dcc.Graph(id='cushing-percentile', style={"height": "600px"}),
+                    className="graph-container",
+                    style={"width": "700px", "display": "inline-block", "verticalAlign": "top", "marginLeft": "20px"}
+                ),
+            ], className="eia-weekly-graph-container",
+               style={"display": "flex", "gridTemplateColumns": "1fr 1fr 1fr", "width": "2160px"}),
+        ], style={"marginTop": "20px"}),
+
+    ], style={"padding": "2rem", "backgroundColor": GRAY_50, "minHeight": "100vh"})
 
 
 # Register standard WPS callbacks for the 4 charts
@@ -212,6 +221,7 @@ RATIO_CONFIG = [
      Input(f"{page_id}-btn_36m-state", "data"),
      Input(f"{page_id}-btn_60m-state", "data")]
 )
+@figure_cache.cached('wps_line')
 def update_ratio_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
     df = get_line_data_for_ids(RATIO_SERIES)
     df = df.dropna(subset=list(RATIO_SERIES))
@@ -294,6 +304,7 @@ def update_ratio_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
      Input(f"{page_id}-btn_36m-state", "data"),
      Input(f"{page_id}-btn_60m-state", "data")]
 )
+@figure_cache.cached('wps_line')
 def update_weekly_change_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
     df = get_line_data_for_ids(('W_EPC0_SAX_YCUOK_MBBL',))
     df = df.dropna(subset=['W_EPC0_SAX_YCUOK_MBBL'])
@@ -421,6 +432,11 @@ def _apply_time_filter(df, btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
     return df
 
 
+def _stats():
+    """Z-scores, percentiles and seasonal means of every WPS series (dash_eia.transforms.wps_stats)"""
+    return datasets.resolve(datasets.handle('wps_stats'))
+
+
 _TIME_INPUTS = [
     Input(f"{page_id}-btn_1m-state", "data"),
     Input(f"{page_id}-btn_3m-state", "data"),
@@ -432,16 +448,11 @@ _TIME_INPUTS = [
 
 # Z-Score chart
 @callback(Output('cushing-zscore', 'figure'), _TIME_INPUTS)
+@figure_cache.cached('wps_stats')
 def update_zscore_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
-    df = get_line_data_for_ids(('W_EPC0_SAX_YCUOK_MBBL',))
-    df = df.dropna(subset=['W_EPC0_SAX_YCUOK_MBBL']).sort_values('period')
-
-    col = 'W_EPC0_SAX_YCUOK_MBBL'
-    window = 156  # ~3 years of weekly data
-    df['rolling_mean'] = df[col].rolling(window=window, min_periods=52).mean()
-    df['rolling_std'] = df[col].rolling(window=window, min_periods=52).std()
-    df['zscore'] = (df[col] - df['rolling_mean']) / df['rolling_std']
-    df = df.dropna(subset=['zscore'])
+    # 3yr rolling, precomputed at ingest
+    periods, zscores = _stats().zscore('W_EPC0_SAX_YCUOK_MBBL')
+    df = pd.DataFrame({'period': periods, 'zscore': zscores})
 
     df = _apply_time_filter(df, btn_1m, btn_3m, btn_12m, btn_36m, btn_60m)
 
@@ -485,21 +496,11 @@ def update_zscore_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
 
 # Seasonal Deviation chart
 @callback(Output('cushing-seasonal-deviation', 'figure'), _TIME_INPUTS)
+@figure_cache.cached('wps_stats')
 def update_seasonal_deviation_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
-    df = get_line_data_for_ids(('W_EPC0_SAX_YCUOK_MBBL',))
-    df = df.dropna(subset=['W_EPC0_SAX_YCUOK_MBBL']).sort_values('period')
-
-    col = 'W_EPC0_SAX_YCUOK_MBBL'
-    df['week'] = df['period'].dt.isocalendar().week.astype(int)
-
-    # 5-year seasonal average
-    cutoff = df['period'].max() - pd.DateOffset(years=5)
-    hist = df[df['period'] >= cutoff]
-    seasonal_avg = hist.groupby('week')[col].mean()
-
-    df['seasonal_avg'] = df['week'].map(seasonal_avg)
-    df['deviation'] = (df[col] - df['seasonal_avg']) * 1000  # kb
-    df = df.dropna(subset=['deviation'])
+    # Against the average of the same week over the last 5 years, in kb
+    periods, deviations = _stats().seasonal_deviation('W_EPC0_SAX_YCUOK_MBBL')
+    df = pd.DataFrame({'period': periods, 'deviation': deviations})
 
     df = _apply_time_filter(df, btn_1m, btn_3m, btn_12m, btn_36m, btn_60m)
 
@@ -536,16 +537,11 @@ def update_seasonal_deviation_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
 
 # Percentile Rank chart
 @callback(Output('cushing-percentile', 'figure'), _TIME_INPUTS)
+@figure_cache.cached('wps_stats')
 def update_percentile_chart(btn_1m, btn_3m, btn_12m, btn_36m, btn_60m):
-    df = get_line_data_for_ids(('W_EPC0_SAX_YCUOK_MBBL',))
-    df = df.dropna(subset=['W_EPC0_SAX_YCUOK_MBBL']).sort_values('period')
-
-    col = 'W_EPC0_SAX_YCUOK_MBBL'
-    window = 156  # 3 years
-    df['percentile'] = df[col].rolling(window=window, min_periods=52).apply(
-        lambda x: (x.iloc[-1] >= x).sum() / len(x) * 100, raw=False
-    )
-    df = df.dropna(subset=['percentile'])
+    # 3yr rolling, precomputed at ingest
+    periods, percentiles = _stats().percentile('W_EPC0_SAX_YCUOK_MBBL')
+    df = pd.DataFrame({'period': periods, 'percentile': percentiles})
 
     df = _apply_time_filter(df, btn_1m, btn_3m, btn_12m, btn_36m, btn_60m)
 
@@ -3,26 +3,16 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from src.wps.ag_calculations import DataProcessor
+from src.utils import datasets
 from src.utils.variables import default_start_date_eia_wps_table, default_end_date_eia_wps_table
 from src.utils.colors import (
     RED, BLUE, ORANGE, GREEN, PURPLE, POSITIVE, NEGATIVE,
     GRAY_50, GRAY_200, GRAY_300, GRAY_500, BLACK
 )
 
-# Initialize the data processor
-processor = DataProcessor()
-
 default_start_date = default_start_date_eia_wps_table
 default_end_date = default_end_date_eia_wps_table
 
-try:
-    df, columnDefinitions = processor.get_data(default_start_date, default_end_date)
-except Exception as e:
-    print(f"Error loading initial data for page2_6: {e}")
-    df = pd.DataFrame()
-    columnDefinitions = []
-
 # ── PADD Series ID Map ────────────────────────────────────────────────
 PADD_SERIES = {
     'US': {
@@ -86,43 +76,9 @@ PADD_LABELS = {
 
 # ── Helpers ───────────────────────────────────────────────────────────
 
-def extract_time_series(data_row):
-    if data_row is None or (isinstance(data_row, pd.Series) and data_row.empty):
-        return [], []
-    metadata_cols = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
-    date_cols = [col for col in data_row.index if col not in metadata_cols]
-    pairs = []
-    for col in date_cols:
-        try:
-            date = pd.to_datetime(col, format='%m/%d/%y')
-            value = data_row[col]
-            if pd.notna(value):
-                pairs.append((date, float(value)))
-        except Exception:
-            continue
-    pairs.sort(key=lambda x: x[0])
-    dates = [p[0] for p in pairs]
-    values = [p[1] for p in pairs]
-    return dates, values
-
-
-def get_series_row(df, series_id):
-    row = df[df['id'] == series_id]
-    if row.empty:
-        return None
-    return row.iloc[0]
-
-
-def compute_ratio_series(dates_num, vals_num, dates_den, vals_den):
-    num_map = dict(zip(dates_num, vals_num))
-    den_map = dict(zip(dates_den, vals_den))
-    common = sorted(set(dates_num) & set(dates_den))
-    out_dates, out_vals = [], []
-    for d in common:
-        if den_map[d] != 0:
-            out_dates.append(d)
-            out_vals.append(num_map[d] / den_map[d] * 100)
-    return out_dates, out_vals
+def _store(data):
+    """The typed series store (src/utils/series_store.py) behind the page's data store"""
+    return datasets.resolve(data)
 
 
 def _empty_fig(msg="No data available"):
@@ -258,7 +214,7 @@ layout = html.Div([
     ], style={"padding": "20px", "height": "88vh", "overflow": "auto", "backgroundColor": GRAY_50}),
 
     # Hidden store
-    dcc.Store(id='current-data-store-p13', data=df.to_dict('records') if not df.empty else []),
+    dcc.Store(id='current-data-store-p13', data=datasets.handle('wps_ag_series', start=default_start_date, end=default_end_date)),
 
 ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
@@ -271,12 +227,7 @@ layout = html.Div([
      Input("date-picker-range-p13", "end_date")]
 )
 def update_data_store(start_date, end_date):
-    try:
-        df, _ = processor.get_data(start_date, end_date)
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Error updating data store: {e}")
-        return []
+    return datasets.handle('wps_ag_series', start=start_date, end=end_date)
 
 
 # 2. KPI strip
@@ -288,7 +239,7 @@ def update_data_store(start_date, end_date):
 def update_kpi_strip(data, padd):
     if not data:
         return html.Div("No data available")
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
     cards = []
 
@@ -301,10 +252,9 @@ def update_kpi_strip(data, padd):
     ]
 
     for key, label, unit in metrics:
-        row = get_series_row(df, series[key])
-        if row is not None:
-            dates, values = extract_time_series(row)
-            if values:
+        if series[key] in store:
+            dates, values = store.series(series[key])
+            if len(values):
                 current = values[-1]
                 if unit == '%':
                     val_str = f"{current:.1f}%"
@@ -327,13 +277,9 @@ def update_kpi_strip(data, padd):
             cards.append(_kpi_card(label, "—"))
 
     # Imports as % of runs (computed)
-    imp_row = get_series_row(df, series['crude_imports'])
-    run_row = get_series_row(df, series['crude_runs'])
-    if imp_row is not None and run_row is not None:
-        imp_d, imp_v = extract_time_series(imp_row)
-        run_d, run_v = extract_time_series(run_row)
-        ratio_d, ratio_v = compute_ratio_series(imp_d, imp_v, run_d, run_v)
-        if ratio_v:
+    if series['crude_imports'] in store and series['crude_runs'] in store:
+        ratio_d, ratio_v = store.ratio(series['crude_imports'], series['crude_runs'])
+        if len(ratio_v):
             current = ratio_v[-1]
             val_str = f"{current:.1f}%"
             if len(ratio_v) >= 2:
@@ -361,7 +307,7 @@ def update_kpi_strip(data, padd):
 def update_runs_vs_capacity(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
     fig = go.Figure()
 
@@ -372,27 +318,19 @@ def update_runs_vs_capacity(data, padd):
     ]
 
     for key, name, color, dash in traces:
-        row = get_series_row(df, series[key])
-        if row is not None:
-            dates, values = extract_time_series(row)
-            if dates:
+        if series[key] in store:
+            dates, values = store.series(series[key])
+            if len(dates):
                 fig.add_trace(go.Scatter(
                     x=dates, y=values, mode='lines', name=name,
                     line=dict(color=color, width=2.5, dash=dash),
                 ))
 
     # Add fill between capacity and crude runs to show spare capacity
-    cap_row = get_series_row(df, series['capacity'])
-    run_row = get_series_row(df, series['crude_runs'])
-    if cap_row is not None and run_row is not None:
-        cap_d, cap_v = extract_time_series(cap_row)
-        run_d, run_v = extract_time_series(run_row)
-        cap_map = dict(zip(cap_d, cap_v))
-        run_map = dict(zip(run_d, run_v))
-        common = sorted(set(cap_d) & set(run_d))
-        if common:
-            spare_dates = common
-            spare_vals = [cap_map[d] - run_map[d] for d in common]
+    if series['capacity'] in store and series['crude_runs'] in store:
+        spare_dates, (cap_v, run_v) = store.align(series['capacity'], series['crude_runs'])
+        if len(spare_dates):
+            spare_vals = cap_v - run_v
             fig.add_trace(go.Scatter(
                 x=spare_dates, y=spare_vals, mode='lines', name='Spare Capacity',
                 line=dict(color=GREEN, width=1.5, dash='dot'),
@@ -420,19 +358,15 @@ def update_runs_vs_capacity(data, padd):
 def update_imports_pct(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    imp_row = get_series_row(df, series['crude_imports'])
-    run_row = get_series_row(df, series['crude_runs'])
-    if imp_row is None or run_row is None:
+    if series['crude_imports'] not in store or series['crude_runs'] not in store:
         return _empty_fig("Import or runs data not available")
 
-    imp_d, imp_v = extract_time_series(imp_row)
-    run_d, run_v = extract_time_series(run_row)
-    ratio_d, ratio_v = compute_ratio_series(imp_d, imp_v, run_d, run_v)
+    ratio_d, ratio_v = store.ratio(series['crude_imports'], series['crude_runs'])
 
-    if not ratio_v:
+    if not len(ratio_v):
         return _empty_fig("Could not compute import ratio")
 
     fig = go.Figure()
@@ -444,7 +378,7 @@ def update_imports_pct(data, padd):
 
     # 52-week moving average as reference
     if len(ratio_v) >= 52:
-        ma_vals = pd.Series(ratio_v).rolling(52).mean().tolist()
+        ma_vals = pd.Series(ratio_v).rolling(52).mean().to_numpy()
         fig.add_trace(go.Scatter(
             x=ratio_d, y=ma_vals, mode='lines', name='52-Week Avg',
             line=dict(color=GRAY_300, width=2, dash='dash'),
@@ -466,15 +400,14 @@ def update_imports_pct(data, padd):
 def update_utilization_trend(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    row = get_series_row(df, series['utilization'])
-    if row is None:
+    if series['utilization'] not in store:
         return _empty_fig("Utilization data not available")
 
-    dates, values = extract_time_series(row)
-    if not dates:
+    dates, values = store.series(series['utilization'])
+    if not len(dates):
         return _empty_fig("No utilization data")
 
     fig = go.Figure()
@@ -511,15 +444,14 @@ def update_utilization_trend(data, padd):
 def update_utilization_seasonality(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    row = get_series_row(df, series['utilization'])
-    if row is None:
+    if series['utilization'] not in store:
         return _empty_fig("Utilization data not available")
 
-    dates, values = extract_time_series(row)
-    if not dates:
+    dates, values = store.series(series['utilization'])
+    if not len(dates):
         return _empty_fig("No utilization data")
 
     ts = pd.DataFrame({'date': dates, 'value': values})
@@ -569,15 +501,14 @@ def update_utilization_seasonality(data, padd):
 def update_feedstock_solo(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    feed_row = get_series_row(df, series['feedstock_runs'])
-    if feed_row is None:
+    if series['feedstock_runs'] not in store:
         return _empty_fig("Feedstock data not available")
 
-    dates, values = extract_time_series(feed_row)
-    if not dates:
+    dates, values = store.series(series['feedstock_runs'])
+    if not len(dates):
         return _empty_fig("No feedstock data")
 
     fig = go.Figure()
@@ -591,7 +522,7 @@ def update_feedstock_solo(data, padd):
 
     # 4-week moving average
     if len(values) >= 4:
-        ma4 = pd.Series(values).rolling(4).mean().tolist()
+        ma4 = pd.Series(values).rolling(4).mean().to_numpy()
         fig.add_trace(go.Scatter(
             x=dates, y=ma4, mode='lines', name='4-Week Avg',
             line=dict(color=RED, width=2.5),
@@ -613,38 +544,22 @@ def update_feedstock_solo(data, padd):
 def update_gross_attribution(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    crude_row = get_series_row(df, series['crude_runs'])
-    feed_row = get_series_row(df, series['feedstock_runs'])
-    gross_row = get_series_row(df, series['gross_runs'])
-
-    if crude_row is None or feed_row is None or gross_row is None:
+    runs = [series['crude_runs'], series['feedstock_runs'], series['gross_runs']]
+    if not all(series_id in store for series_id in runs):
         return _empty_fig("Runs data not available")
 
-    c_d, c_v = extract_time_series(crude_row)
-    f_d, f_v = extract_time_series(feed_row)
-    g_d, g_v = extract_time_series(gross_row)
-
-    c_map = dict(zip(c_d, c_v))
-    f_map = dict(zip(f_d, f_v))
-    g_map = dict(zip(g_d, g_v))
-    common = sorted(set(c_d) & set(f_d) & set(g_d))
+    common, (c_v, f_v, g_v) = store.align(*runs)
 
-    if not common:
+    if not len(common):
         return _empty_fig("Could not align runs data")
 
-    crude_pct = []
-    feed_pct = []
-    for d in common:
-        gross = g_map[d]
-        if gross > 0:
-            crude_pct.append(c_map[d] / gross * 100)
-            feed_pct.append(f_map[d] / gross * 100)
-        else:
-            crude_pct.append(None)
-            feed_pct.append(None)
+    # Weeks without gross runs are left as gaps
+    gross = np.where(g_v > 0, g_v, np.nan)
+    crude_pct = c_v / gross * 100
+    feed_pct = f_v / gross * 100
 
     fig = go.Figure()
 
@@ -654,7 +569,7 @@ def update_gross_attribution(data, padd):
         line=dict(color=RED, width=1), opacity=0.4,
     ))
     if len(common) >= 4:
-        crude_ma = pd.Series(crude_pct).rolling(4, min_periods=1).mean().tolist()
+        crude_ma = pd.Series(crude_pct).rolling(4, min_periods=1).mean().to_numpy()
         fig.add_trace(go.Scatter(
             x=common, y=crude_ma, mode='lines', name='Crude / Gross (4wk avg)',
             line=dict(color=RED, width=2.5),
@@ -667,7 +582,7 @@ def update_gross_attribution(data, padd):
         yaxis='y2',
     ))
     if len(common) >= 4:
-        feed_ma = pd.Series(feed_pct).rolling(4, min_periods=1).mean().tolist()
+        feed_ma = pd.Series(feed_pct).rolling(4, min_periods=1).mean().to_numpy()
         fig.add_trace(go.Scatter(
             x=common, y=feed_ma, mode='lines', name='Feedstock / Gross (4wk avg)',
             line=dict(color=ORANGE, width=2.5),
@@ -692,7 +607,7 @@ def update_gross_attribution(data, padd):
 
 def _compute_stats(dates, values):
     """Compute statistical metrics for a time series."""
-    if not values or len(values) < 2:
+    if len(values) < 2:
         return None
     s = pd.Series(values, index=dates)
     current = s.iloc[-1]
@@ -753,14 +668,13 @@ def _fmt(val, fmt_str=".1f", suffix=""):
 def update_zscore_chart(data, padd):
     if not data:
         return _empty_fig()
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
-    row = get_series_row(df, series['crude_runs'])
-    if row is None:
+    if series['crude_runs'] not in store:
         return _empty_fig("Crude runs data not available")
 
-    dates, values = extract_time_series(row)
+    dates, values = store.series(series['crude_runs'])
     if len(dates) < 12:
         return _empty_fig("Not enough data for z-score")
 
@@ -849,7 +763,7 @@ def update_zscore_chart(data, padd):
 def update_stats_summary(data, padd):
     if not data:
         return html.Div("No data available")
-    df = pd.DataFrame(data)
+    store = _store(data)
     series = PADD_SERIES.get(padd, PADD_SERIES['US'])
 
     # Prepare 5 series
@@ -857,24 +771,15 @@ def update_stats_summary(data, padd):
     kbd_cols = set()
 
     for key, label in [('crude_runs', 'Crude'), ('gross_runs', 'Gross'), ('feedstock_runs', 'Feedstock')]:
-        row = get_series_row(df, series[key])
-        if row is not None:
-            d, v = extract_time_series(row)
-            columns[label] = _compute_stats(d, v)
+        if series[key] in store:
+            columns[label] = _compute_stats(*store.series(series[key]))
             kbd_cols.add(label)
 
-    row = get_series_row(df, series['utilization'])
-    if row is not None:
-        d, v = extract_time_series(row)
-        columns['Util %'] = _compute_stats(d, v)
-
-    imp_row = get_series_row(df, series['crude_imports'])
-    run_row = get_series_row(df, series['crude_runs'])
-    if imp_row is not None and run_row is not None:
-        imp_d, imp_v = extract_time_series(imp_row)
-        run_d, run_v = extract_time_series(run_row)
-        ratio_d, ratio_v = compute_ratio_series(imp_d, imp_v, run_d, run_v)
-        columns['Imp %'] = _compute_stats(ratio_d, ratio_v)
+    if series['utilization'] in store:
+        columns['Util %'] = _compute_stats(*store.series(series['utilization']))
+
+    if series['crude_imports'] in store and series['crude_runs'] in store:
+        columns['Imp %'] = _compute_stats(*store.ratio(series['crude_imports'], series['crude_runs']))
 
     if not columns:
         return html.Div("No data available for statistics")
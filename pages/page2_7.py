@@ -5,12 +5,12 @@ import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 import plotly.graph_objects as go
 from src.utils.data_loader import loader
+from src.utils import datasets
 from src.utils.colors import (
     RED, BLUE, GREEN, ORANGE, PURPLE, BLACK,
     POSITIVE, NEGATIVE,
     GRAY_50, GRAY_200, GRAY_300, GRAY_500, GRAY_800,
 )
-from src.utils.variables import years_last_five_years_range
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -150,24 +150,9 @@ def _find_year_ago(df, target_period):
     return df.loc[idx]
 
 
-def _five_year_avg(df, target_week, col):
-    """Compute 5-year average for a column at a given ISO week."""
-    mask = (df["period"].dt.isocalendar().week.astype(int) == target_week) & (
-        df["period"].dt.year.isin(years_last_five_years_range)
-    )
-    subset = df.loc[mask, col]
-    return subset.mean() if len(subset) > 0 else np.nan
-
-
-def _five_year_stats(df, col):
-    """Return a DataFrame with week -> (mean, min, max) for 5-year range."""
-    mask = df["period"].dt.year.isin(years_last_five_years_range)
-    sub = df.loc[mask].copy()
-    sub["week"] = sub["period"].dt.isocalendar().week.astype(int)
-    if col not in sub.columns:
-        return pd.DataFrame(columns=["week", "mean", "min", "max"])
-    grouped = sub.groupby("week")[col].agg(["mean", "min", "max"]).reset_index()
-    return grouped
+def _stats():
+    """Seasonal bands of every WPS series (dash_eia.transforms.wps_stats), built at ingest."""
+    return datasets.resolve(datasets.handle("wps_stats"))
 
 
 def build_balance_data():
@@ -180,6 +165,10 @@ def build_balance_data():
     prior = df.iloc[-2] if len(df) >= 2 else latest
     yago = _find_year_ago(df, latest["period"])
     latest_week = int(latest["period"].isocalendar().week)
+    stats = _stats()
+
+    def _five_year_avg(sid):
+        return stats.five_year_avg(sid, latest_week) if sid in stats else np.nan
 
     latest_date = latest["period"]
     prior_date = prior["period"]
@@ -205,7 +194,7 @@ def build_balance_data():
             fv = five_yr_override
         elif series_key:
             sid_for_avg = SERIES.get(series_key, series_key)
-            fv = _five_year_avg(df, latest_week, sid_for_avg)
+            fv = _five_year_avg(sid_for_avg)
         else:
             fv = np.nan
 
@@ -241,7 +230,7 @@ def build_balance_data():
     balance_y = supply_y - demand_y if pd.notna(supply_y) and pd.notna(demand_y) else np.nan
 
     # 5-yr averages for computed rows
-    _5yr = lambda key: _five_year_avg(df, latest_week, SERIES[key])
+    _5yr = lambda key: _five_year_avg(SERIES[key])
     supply_5yr = _sum_safe(_5yr("crude_prod"), _5yr("crude_imp"), _5yr("crude_adj"))
     demand_5yr = _sum_safe(_5yr("crude_runs"), _5yr("crude_exp"))
     balance_5yr = supply_5yr - demand_5yr if pd.notna(supply_5yr) and pd.notna(demand_5yr) else np.nan
@@ -306,7 +295,7 @@ def build_balance_data():
         "latest_date": latest_date.strftime("%m/%d"),
         "prior_date": prior_date.strftime("%m/%d"),
         "yago_date": yago_date.strftime("%m/%d/%y"),
-        "pivot_json": df.to_json(date_format="iso", orient="split"),
+        "pivot": datasets.handle("wps_pivot"),
     }
 
 
@@ -455,123 +444,125 @@ def _build_grid_col_defs(latest_date, prior_date, yago_date):
 # Layout
 # ---------------------------------------------------------------------------
 
-# Pre-build data for initial render
-_initial = build_balance_data()
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    # Pre-build data for initial render
+    initial = build_balance_data()
 
-layout = html.Div([
-    # Title
-    html.Div([
-        html.Div("US PETROLEUM BALANCE", style={
-            "fontSize": "0.75rem", "fontWeight": "700",
-            "letterSpacing": "0.08em", "color": GRAY_500,
-            "marginBottom": "0.25rem",
-        }),
-        html.H2("Supply / Demand Balance", style={
-            "fontSize": "1.75rem", "fontWeight": "700",
-            "color": GRAY_800, "margin": "0",
+    return html.Div([
+        # Title
+        html.Div([
+            html.Div("US PETROLEUM BALANCE", style={
+                "fontSize": "0.75rem", "fontWeight": "700",
+                "letterSpacing": "0.08em", "color": GRAY_500,
+                "marginBottom": "0.25rem",
+            }),
+            html.H2("Supply / Demand Balance", style={
+                "fontSize": "1.75rem", "fontWeight": "700",
+                "color": GRAY_800, "margin": "0",
+            }),
+        ], style={"marginBottom": "1.5rem"}),
+
+        # KPI Strip
+        _build_kpi_strip(),
+
+        # Balance Table
+        dbc.Card([
+            dbc.CardBody([
+                dag.AgGrid(
+                    id="balance-grid-p14",
+                    rowData=initial["rows"] if initial else [],
+                    columnDefs=_build_grid_col_defs(
+                        initial["latest_date"] if initial else "",
+                        initial["prior_date"] if initial else "",
+                        initial["yago_date"] if initial else "",
+                    ),
+                    defaultColDef={"resizable": True, "sortable": False, "filter": False},
+                    dashGridOptions={
+                        "domLayout": "autoHeight",
+                        "suppressRowHoverHighlight": False,
+                        "getRowStyle": {"styleConditions": [
+                            {
+                                "condition": "params.data.is_header",
+                                "style": {"backgroundColor": GRAY_200, "fontWeight": "700"},
+                            },
+                            {
+                                "condition": "params.data.indent === 1",
+                                "style": {"fontWeight": "600"},
+                            },
+                            {
+                                "condition": "params.data.indent === 2",
+                                "style": {"color": GRAY_500, "fontSize": "0.8rem"},
+                            },
+                        ]},
+                    },
+                    className="ag-theme-alpine",
+                    style={"width": "100%"},
+                ),
+            ], style={"padding": "0.75rem"}),
+        ], style={
+            "backgroundColor": "white",
+            "borderRadius": "4px",
+            "boxShadow": "0 1px 3px rgba(0,0,0,0.08)",
+            "border": f"1px solid {GRAY_200}",
+            "marginBottom": "1.5rem",
         }),
-    ], style={"marginBottom": "1.5rem"}),
-
-    # KPI Strip
-    _build_kpi_strip(),
 
-    # Balance Table
-    dbc.Card([
-        dbc.CardBody([
-            dag.AgGrid(
-                id="balance-grid-p14",
-                rowData=_initial["rows"] if _initial else [],
-                columnDefs=_build_grid_col_defs(
-                    _initial["latest_date"] if _initial else "",
-                    _initial["prior_date"] if _initial else "",
-                    _initial["yago_date"] if _initial else "",
-                ),
-                defaultColDef={"resizable": True, "sortable": False, "filter": False},
-                dashGridOptions={
-                    "domLayout": "autoHeight",
-                    "suppressRowHoverHighlight": False,
-                    "getRowStyle": {"styleConditions": [
-                        {
-                            "condition": "params.data.is_header",
-                            "style": {"backgroundColor": GRAY_200, "fontWeight": "700"},
-                        },
-                        {
-                            "condition": "params.data.indent === 1",
-                            "style": {"fontWeight": "600"},
-                        },
-                        {
-                            "condition": "params.data.indent === 2",
-                            "style": {"color": GRAY_500, "fontSize": "0.8rem"},
-                        },
-                    ]},
-                },
-                className="ag-theme-alpine",
-                style={"width": "100%"},
+        # Product selector
+        html.Div([
+            html.Div("PRODUCT VIEW", style={
+                "fontSize": "0.75rem", "fontWeight": "700",
+                "letterSpacing": "0.08em", "color": GRAY_500,
+                "marginBottom": "0.5rem",
+            }),
+            dbc.RadioItems(
+                id="product-selector-p14",
+                options=[
+                    {"label": "Crude Oil", "value": "crude"},
+                    {"label": "Gasoline", "value": "gasoline"},
+                    {"label": "Distillate", "value": "distillate"},
+                    {"label": "Jet Fuel", "value": "jet"},
+                ],
+                value="crude",
+                inline=True,
+                className="mb-3",
+                inputStyle={"marginRight": "5px"},
+                labelStyle={"marginRight": "1.5rem", "fontWeight": "500"},
             ),
-        ], style={"padding": "0.75rem"}),
-    ], style={
-        "backgroundColor": "white",
-        "borderRadius": "4px",
-        "boxShadow": "0 1px 3px rgba(0,0,0,0.08)",
-        "border": f"1px solid {GRAY_200}",
-        "marginBottom": "1.5rem",
-    }),
-
-    # Product selector
-    html.Div([
-        html.Div("PRODUCT VIEW", style={
-            "fontSize": "0.75rem", "fontWeight": "700",
-            "letterSpacing": "0.08em", "color": GRAY_500,
-            "marginBottom": "0.5rem",
-        }),
-        dbc.RadioItems(
-            id="product-selector-p14",
-            options=[
-                {"label": "Crude Oil", "value": "crude"},
-                {"label": "Gasoline", "value": "gasoline"},
-                {"label": "Distillate", "value": "distillate"},
-                {"label": "Jet Fuel", "value": "jet"},
-            ],
-            value="crude",
-            inline=True,
-            className="mb-3",
-            inputStyle={"marginRight": "5px"},
-            labelStyle={"marginRight": "1.5rem", "fontWeight": "500"},
-        ),
-    ], style={"marginBottom": "0.5rem"}),
-
-    # Charts Row 1: Balance over time + Demand seasonality
-    dbc.Row([
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="balance-timeseries-p14", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="demand-seasonal-p14", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-    ], className="mb-4"),
-
-    # Charts Row 2: Stock change vs seasonal + Days of supply
-    dbc.Row([
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="stock-surprise-p14", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-        dbc.Col(dbc.Card([
-            dbc.CardBody(dcc.Graph(id="days-of-supply-p14", config={"displayModeBar": False}))
-        ], style={"backgroundColor": "white", "borderRadius": "4px",
-                  "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
-            lg=6),
-    ], className="mb-4"),
-
-    # Hidden store for pivot data
-    dcc.Store(id="pivot-store-p14", data=_initial["pivot_json"] if _initial else None),
-
-], style=PAGE_STYLE)
+        ], style={"marginBottom": "0.5rem"}),
+
+        # Charts Row 1: Balance over time + Demand seasonality
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="balance-timeseries-p14", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="demand-seasonal-p14", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+        ], className="mb-4"),
+
+        # Charts Row 2: Stock change vs seasonal + Days of supply
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="stock-surprise-p14", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+            dbc.Col(dbc.Card([
+                dbc.CardBody(dcc.Graph(id="days-of-supply-p14", config={"displayModeBar": False}))
+            ], style={"backgroundColor": "white", "borderRadius": "4px",
+                      "boxShadow": "0 1px 3px rgba(0,0,0,0.08)", "border": f"1px solid {GRAY_200}"}),
+                lg=6),
+        ], className="mb-4"),
+
+        # Hidden store for pivot data
+        dcc.Store(id="pivot-store-p14", data=initial["pivot"] if initial else None),
+
+    ], style=PAGE_STYLE)
 
 
 # ---------------------------------------------------------------------------
@@ -582,11 +573,56 @@ def _rebuild_df(pivot_json):
     """Reconstruct DataFrame from stored JSON."""
     if not pivot_json:
         return pd.DataFrame()
-    df = pd.read_json(pivot_json, orient="split")
+    if isinstance(pivot_json, dict):
+        df = datasets.resolve(pivot_json)
+    else:
+        # JSON written by sessions opened before the store held a handle
+        df = pd.read_json(pivot_json, orient="split")
     df["period"] = pd.to_datetime(df["period"])
     return df.sort_values("period").reset_index(drop=True)
 
 
+def _seasonal_figure(stats, band, values, current_year):
+    """5-year range and average, with the year-ago and current year, by week of year."""
+    fig = go.Figure()
+
+    # 5-year range band
+    if not band.empty:
+        fig.add_trace(go.Scatter(
+            x=band["week"], y=band["max"],
+            mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=band["week"], y=band["min"],
+            mode="lines", line=dict(width=0), fill="tonexty",
+            fillcolor="rgba(0,0,0,0.06)", name="5-Yr Range", hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=band["week"], y=band["mean"],
+            mode="lines", line=dict(color=GRAY_300, width=1.5, dash="dash"),
+            name="5-Yr Avg",
+        ))
+
+    # Year-ago
+    weeks, year_values = stats.by_year(values, current_year - 1)
+    if len(weeks):
+        fig.add_trace(go.Scatter(
+            x=weeks, y=year_values,
+            mode="lines", line=dict(color=BLUE, width=1.5),
+            name=str(current_year - 1),
+        ))
+
+    # Current year
+    weeks, year_values = stats.by_year(values, current_year)
+    if len(weeks):
+        fig.add_trace(go.Scatter(
+            x=weeks, y=year_values,
+            mode="lines", line=dict(color=BLACK, width=2.5),
+            name=str(current_year),
+        ))
+    return fig
+
+
 @callback(
     Output("balance-timeseries-p14", "figure"),
     Input("product-selector-p14", "value"),
@@ -673,51 +709,12 @@ def update_demand_seasonal(product, pivot_json):
 
     cfg = PRODUCT_CONFIG[product]
     demand_sid = SERIES[cfg["demand"]]
-    if demand_sid not in df.columns:
+    stats = _stats()
+    if demand_sid not in df.columns or demand_sid not in stats:
         return go.Figure().update_layout(title="Data not available")
 
-    fig = go.Figure()
-
-    # 5-year range band
-    stats = _five_year_stats(df, demand_sid)
-    if not stats.empty:
-        fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["max"],
-            mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
-        ))
-        fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["min"],
-            mode="lines", line=dict(width=0), fill="tonexty",
-            fillcolor="rgba(0,0,0,0.06)", name="5-Yr Range", hoverinfo="skip",
-        ))
-        fig.add_trace(go.Scatter(
-            x=stats["week"], y=stats["mean"],
-            mode="lines", line=dict(color=GRAY_300, width=1.5, dash="dash"),
-            name="5-Yr Avg",
-        ))
-
-    # Year-ago
     current_year = df["period"].dt.year.max()
-    ya_mask = df["period"].dt.year == (current_year - 1)
-    ya = df.loc[ya_mask].copy()
-    if not ya.empty:
-        ya["week"] = ya["period"].dt.isocalendar().week.astype(int)
-        fig.add_trace(go.Scatter(
-            x=ya["week"], y=ya[demand_sid],
-            mode="lines", line=dict(color=BLUE, width=1.5),
-            name=str(current_year - 1),
-        ))
-
-    # Current year
-    cur_mask = df["period"].dt.year == current_year
-    cur = df.loc[cur_mask].copy()
-    if not cur.empty:
-        cur["week"] = cur["period"].dt.isocalendar().week.astype(int)
-        fig.add_trace(go.Scatter(
-            x=cur["week"], y=cur[demand_sid],
-            mode="lines", line=dict(color=BLACK, width=2.5),
-            name=str(current_year),
-        ))
+    fig = _seasonal_figure(stats, stats.band(demand_sid), stats.row(demand_sid), current_year)
 
     layout = {**CHART_LAYOUT}
     layout["title"] = dict(text=f"{cfg['label']} — {cfg['demand_label']} Seasonality (kbd)", font=dict(size=14))
@@ -739,23 +736,25 @@ def update_stock_surprise(product, pivot_json):
 
     cfg = PRODUCT_CONFIG[product]
     stock_sid = SERIES[cfg["stock"]]
-    if stock_sid not in df.columns:
+    stats = _stats()
+    if stock_sid not in df.columns or stock_sid not in stats:
         return go.Figure().update_layout(title="Data not available")
 
     # Compute weekly stock changes
-    df["stk_chg"] = df[stock_sid].diff()
-    df["week"] = df["period"].dt.isocalendar().week.astype(int)
+    stk_chg = np.diff(stats.row(stock_sid), prepend=np.nan)
 
     # 5-year seasonal average stock change
-    mask_5yr = df["period"].dt.year.isin(years_last_five_years_range)
-    seasonal_avg = df.loc[mask_5yr].groupby("week")["stk_chg"].mean()
+    seasonal_avg = stats.bands_of(stk_chg).set_index("week")["mean"]
 
     # Last 12 weeks
-    recent = df.tail(12).copy()
+    recent = pd.DataFrame({
+        "period": stats.periods[-12:],
+        "stk_chg": stk_chg[-12:],
+        "seasonal_avg": seasonal_avg.reindex(stats.weeks[-12:]).to_numpy(),
+    })
     if recent.empty:
         return go.Figure().update_layout(title="No data available")
 
-    recent["seasonal_avg"] = recent["week"].map(seasonal_avg)
     recent["surprise"] = recent["stk_chg"] - recent["seasonal_avg"]
 
     fig = go.Figure()
@@ -798,51 +797,13 @@ def update_days_of_supply(product, pivot_json):
         return go.Figure().update_layout(title="Data not available")
 
     # Days of supply = stocks (kb) / (demand kbd * 7)
-    df["dos"] = df[stock_sid] / (df[demand_sid] * 7)
-    df["week"] = df["period"].dt.isocalendar().week.astype(int)
-
-    fig = go.Figure()
-
-    # 5-year range band
-    stats = _five_year_stats(df.assign(**{"dos_col": df["dos"]}), "dos_col")
-    # Recompute properly
-    mask_5yr = df["period"].dt.year.isin(years_last_five_years_range)
-    sub_5yr = df.loc[mask_5yr].copy()
-    if not sub_5yr.empty:
-        grouped = sub_5yr.groupby("week")["dos"].agg(["mean", "min", "max"]).reset_index()
-        fig.add_trace(go.Scatter(
-            x=grouped["week"], y=grouped["max"],
-            mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
-        ))
-        fig.add_trace(go.Scatter(
-            x=grouped["week"], y=grouped["min"],
-            mode="lines", line=dict(width=0), fill="tonexty",
-            fillcolor="rgba(0,0,0,0.06)", name="5-Yr Range", hoverinfo="skip",
-        ))
-        fig.add_trace(go.Scatter(
-            x=grouped["week"], y=grouped["mean"],
-            mode="lines", line=dict(color=GRAY_300, width=1.5, dash="dash"),
-            name="5-Yr Avg",
-        ))
+    stats = _stats()
+    if stock_sid not in stats or demand_sid not in stats:
+        return go.Figure().update_layout(title="Data not available")
+    dos = stats.row(stock_sid) / (stats.row(demand_sid) * 7)
 
-    # Year-ago
     current_year = df["period"].dt.year.max()
-    ya = df[df["period"].dt.year == (current_year - 1)].copy()
-    if not ya.empty:
-        fig.add_trace(go.Scatter(
-            x=ya["week"], y=ya["dos"],
-            mode="lines", line=dict(color=BLUE, width=1.5),
-            name=str(current_year - 1),
-        ))
-
-    # Current year
-    cur = df[df["period"].dt.year == current_year].copy()
-    if not cur.empty:
-        fig.add_trace(go.Scatter(
-            x=cur["week"], y=cur["dos"],
-            mode="lines", line=dict(color=BLACK, width=2.5),
-            name=str(current_year),
-        ))
+    fig = _seasonal_figure(stats, stats.bands_of(dos), dos, current_year)
 
     layout = {**CHART_LAYOUT}
     layout["title"] = dict(text=f"{cfg['label']} — Days of Supply", font=dict(size=14))
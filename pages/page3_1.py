@@ -111,9 +111,14 @@ def graph_sections_input(page_id):
 from src.app import app
 import os
 from src.steo.calcs import create_callbacks, create_layout
-from src.steo.chart_dpr import get_regional_dict_data
+from src.steo.chart_dpr import EVOLUTIONS_PATH, PIVOT_PATH, get_dpr_evolutions
+from src.utils import registry
+
+
+# Regional DPR evolutions, loaded by the first chart request rather than at
+# import, and again after a refresh
+region_dct = registry.dataset("dpr_evolutions", get_dpr_evolutions, PIVOT_PATH, EVOLUTIONS_PATH)
 
-region_dct = get_regional_dict_data(None)
 
 idents_list = idents
 
@@ -127,11 +132,9 @@ num_graphs = len(idents_list)
 layout = create_layout(page_id, "Region: ", graph_sections_input(page_id))
 
 # Create callbacks for the app
-create_callbacks(app, page_id, num_graphs, idents_list, region_dct)
+update_graphs = create_callbacks(app, page_id, num_graphs, idents_list, region_dct)
 
 if __name__ == "__main__":
-    # region_dct = get_regional_dict_data(None)
-    # print(region_dct)
     app.layout = layout
     app.run_server(debug=True, port=8051)
     
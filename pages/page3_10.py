@@ -7,97 +7,47 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import math
+from src.utils import datasets
 from src.utils.data_loader import loader
 from src.utils.colors import BLUE, CHART_SEQUENCE
 
-df = loader.load_steo_dpr_data()
-mapping_df = loader.load_dpr_mapping()
+# The DPR frame is loaded on first use rather than at import, so that
+# importing this page to register its callbacks stays cheap.
+def _dpr_long():
+    return loader.load_dpr_long()
 
-# Get date columns (all columns that are not metadata)
-metadata_cols = ['id', 'name', 'release_date', 'uom']
-date_columns = [col for col in df.columns if col not in metadata_cols]
 
-# Melt the dataframe to have delivery_month as a column
-df_melted = pd.melt(df, 
-                    id_vars=metadata_cols,
-                    value_vars=date_columns,
-                    var_name='delivery_month',
-                    value_name='value')
+def _release_dates():
+    """Release dates, most recent first"""
+    return sorted(_dpr_long()['release_date'].unique(), reverse=True)
 
-# Convert delivery_month to datetime
-df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
 
-# Merge with mapping to get region information
-df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
-
-# Get unique release dates sorted (most recent first)
-release_dates = sorted(df_melted['release_date'].unique(), reverse=True)
+def _metrics(release_date):
+    """Per-region, per-month DPR metrics of a release (dash_eia.transforms.dpr_metrics), cached"""
+    return datasets.resolve(datasets.handle('dpr_metrics', release=pd.Timestamp(release_date).strftime('%Y-%m-%d')))
 regions = ['Permian', 'Bakken', 'Eagle Ford', 'Appalachia', 'Haynesville', 'Rest of L48 ex GOM']
 
-def get_radar_chart_data(df_melted, release_date, month):
+def get_radar_chart_data(release_date, month):
     """Calculate multi-dimensional performance metrics for radar chart"""
-    month_dt = pd.to_datetime(month)
-    
-    # Filter for specific release and month
-    df_filtered = df_melted[
-        (df_melted['release_date'] == release_date) & 
-        (df_melted['delivery_month'] == month_dt)
-    ].copy()
+    metrics = _metrics(release_date)
+    metrics = metrics[metrics['month'] == pd.to_datetime(month)]
     
-    if df_filtered.empty:
+    if metrics.empty:
         return pd.DataFrame()
     
-    # Create pivot table
-    pivot_data = df_filtered.pivot_table(
-        index='region',
-        columns='id',
-        values='value',
-        aggfunc='first'
-    ).reset_index()
-    
-    radar_data = []
-    
-    for _, row in pivot_data.iterrows():
-        region = row['region']
-        
-        if region not in regions:
-            continue
-            
-        # Get region abbreviation
-        region_abbrev = {
-            'Permian': 'PM', 'Bakken': 'BK', 'Eagle Ford': 'EF',
-            'Appalachia': 'AP', 'Haynesville': 'HA', 'Rest of L48 ex GOM': 'R48'
-        }.get(region, '')
-        
-        if region_abbrev:
-            production = row.get(f'COPR{region_abbrev}', 0) or 0
-            rigs = row.get(f'RIGS{region_abbrev}', 1) or 1
-            wells_drilled = row.get(f'NWD{region_abbrev}', 0) or 0
-            wells_completed = row.get(f'NWC{region_abbrev}', 0) or 0
-            ducs = row.get(f'DUCS{region_abbrev}', 0) or 0
-            new_well_prod = row.get(f'CONW{region_abbrev}', 0) or 0
-            
-            # Calculate normalized performance metrics (0-100 scale)
-            production_per_rig = production / max(rigs, 1)
-            wells_per_rig = wells_drilled / max(rigs, 1)
-            completion_rate = (wells_completed / max(wells_drilled, 1)) * 100 if wells_drilled > 0 else 0
-            duc_efficiency = max(0, 100 - (ducs / max(wells_drilled, 1)) * 100) if wells_drilled > 0 else 0
-            new_well_productivity = new_well_prod / max(wells_completed, 1) if wells_completed > 0 else 0
-            rig_utilization = min(100, (wells_drilled / max(rigs * 12, 1)) * 100)  # Assuming 12 wells/rig/year max
-            
-            radar_data.append({
-                'region': region,
-                'production_per_rig': production_per_rig,
-                'wells_per_rig': wells_per_rig,
-                'completion_rate': completion_rate,
-                'duc_efficiency': duc_efficiency,
-                'new_well_productivity': new_well_productivity,
-                'rig_utilization': rig_utilization,
-                'total_production': production,
-                'total_rigs': rigs
-            })
-    
-    return pd.DataFrame(radar_data)
+    wells_drilled = metrics['wells_drilled']
+    return pd.DataFrame({
+        'region': metrics['region'],
+        'production_per_rig': metrics['production_per_rig'],
+        'wells_per_rig': metrics['wells_per_rig'],
+        'completion_rate': metrics['completion_rate'] * 100,
+        'duc_efficiency': (100 - metrics['duc_ratio'] * 100).clip(lower=0).where(wells_drilled > 0, 0.0),
+        'new_well_productivity': metrics['oil_per_well'],
+        # Assuming 12 wells/rig/year max
+        'rig_utilization': (metrics['wells_per_rig'] / 12 * 100).clip(upper=100),
+        'total_production': metrics['production'],
+        'total_rigs': metrics['rigs'],
+    }).reset_index(drop=True)
 
 def normalize_radar_metrics(radar_df):
     """Normalize metrics to 0-100 scale for radar chart"""
@@ -286,61 +236,64 @@ def create_metric_comparison_chart(radar_df, selected_regions):
     return fig
 
 # Layout
-layout = html.Div([
-    html.H1("Regional Performance Radar Analysis", style={'textAlign': 'center', 'marginBottom': 30}),
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    release_dates = _release_dates()
+    return html.Div([
+        html.H1("Regional Performance Radar Analysis", style={'textAlign': 'center', 'marginBottom': 30}),
     
-    # Controls
-    html.Div([
+        # Controls
         html.Div([
-            html.Label("Release Date:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-10-release-dropdown',
-                options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
-                value=release_dates[0].isoformat() if release_dates else None,
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("Release Date:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-10-release-dropdown',
+                    options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
+                    value=release_dates[0].isoformat() if release_dates else None,
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
-        html.Div([
-            html.Label("Analysis Month:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-10-month-dropdown',
-                options=[],  # Will be populated by callback
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("Analysis Month:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-10-month-dropdown',
+                    options=[],  # Will be populated by callback
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
+            html.Div([
+                html.Label("Regions for Comparison:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-10-region-multi-dropdown',
+                    options=[{'label': region, 'value': region} for region in regions],
+                    value=['Permian', 'Bakken'],
+                    multi=True,
+                    style={'width': '300px'}
+                )
+            ], style={'display': 'inline-block'})
+        ], style={'textAlign': 'center', 'marginBottom': 30}),
+    
+        # Radar Chart
         html.Div([
-            html.Label("Regions for Comparison:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-10-region-multi-dropdown',
-                options=[{'label': region, 'value': region} for region in regions],
-                value=['Permian', 'Bakken'],
-                multi=True,
-                style={'width': '300px'}
-            )
-        ], style={'display': 'inline-block'})
-    ], style={'textAlign': 'center', 'marginBottom': 30}),
+            html.H3("Multi-Dimensional Performance Radar", style={'textAlign': 'center'}),
+            dcc.Graph(id='page3-10-radar-chart', style={'height': '700px'})
+        ], style={'marginBottom': 40}),
     
-    # Radar Chart
-    html.Div([
-        html.H3("Multi-Dimensional Performance Radar", style={'textAlign': 'center'}),
-        dcc.Graph(id='page3-10-radar-chart', style={'height': '700px'})
-    ], style={'marginBottom': 40}),
-    
-    # Performance Ranking
-    html.Div([
+        # Performance Ranking
         html.Div([
-            html.H3("Performance Ranking", style={'textAlign': 'center'}),
-            dcc.Graph(id='page3-10-ranking-chart', style={'height': '500px'})
-        ], style={'width': '48%', 'display': 'inline-block'}),
+            html.Div([
+                html.H3("Performance Ranking", style={'textAlign': 'center'}),
+                dcc.Graph(id='page3-10-ranking-chart', style={'height': '500px'})
+            ], style={'width': '48%', 'display': 'inline-block'}),
         
-        html.Div([
-            html.H3("Detailed Metrics Comparison", style={'textAlign': 'center'}),
-            dcc.Graph(id='page3-10-comparison-chart', style={'height': '500px'})
-        ], style={'width': '48%', 'float': 'right', 'display': 'inline-block'})
+            html.Div([
+                html.H3("Detailed Metrics Comparison", style={'textAlign': 'center'}),
+                dcc.Graph(id='page3-10-comparison-chart', style={'height': '500px'})
+            ], style={'width': '48%', 'float': 'right', 'display': 'inline-block'})
+        ])
     ])
-])
 
 @callback(
     [Output('page3-10-month-dropdown', 'options'),
@@ -348,6 +301,7 @@ layout = html.Div([
     Input('page3-10-release-dropdown', 'value')
 )
 def update_month_options(release_date_str):
+    df_melted = _dpr_long()
     if not release_date_str:
         return [], None
     
@@ -383,7 +337,7 @@ def update_radar_analysis(release_date_str, month_str, selected_regions):
     release_date = pd.to_datetime(release_date_str)
     
     # Get radar chart data
-    radar_df = get_radar_chart_data(df_melted, release_date, month_str)
+    radar_df = get_radar_chart_data(release_date, month_str)
     
     if radar_df.empty:
         return go.Figure(), go.Figure(), go.Figure()
@@ -7,32 +7,20 @@ import numpy as np
 from src.utils.data_loader import loader
 from src.utils.colors import RED
 
-df = loader.load_steo_dpr_other_data()
-mapping_df = loader.load_dpr_other_mapping()
+# The DPR Other frame is loaded on first use rather than at import, so that
+# importing this page to register its callbacks stays cheap.
+def _dpr_long():
+    return loader.load_dpr_long(other=True)
 
-# Get date columns (all columns that are not metadata)
-metadata_cols = ['id', 'name', 'release_date', 'uom']
-date_columns = [col for col in df.columns if col not in metadata_cols]
 
-# Melt the dataframe to have delivery_month as a column
-df_melted = pd.melt(df, 
-                    id_vars=metadata_cols,
-                    value_vars=date_columns,
-                    var_name='delivery_month',
-                    value_name='value')
+def _release_dates():
+    """Release dates, most recent first"""
+    return sorted(_dpr_long()['release_date'].unique(), reverse=True)
 
-# Convert delivery_month to datetime
-df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
-
-# Merge with mapping to get region information
-df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
-
-# Get unique release dates sorted (most recent first)
-release_dates = sorted(df_melted['release_date'].unique(), reverse=True)
-current_release_index = 0  # Start with most recent
 
 def prepare_data(release_date, show_evolution=False, prior_release_date=None):
     """Prepare data for the selected release date"""
+    df_melted = _dpr_long()
     # Filter data for the selected release date
     filtered_df = df_melted[df_melted['release_date'] == release_date].copy()
     
@@ -156,111 +144,114 @@ def convert_to_serializable(df, delivery_months):
     
     return result_df
 
-# Initialize with most recent release date
-current_df, delivery_months = prepare_data(release_dates[0])
-current_df_serializable = convert_to_serializable(current_df, delivery_months)
-columnDefinitions = create_column_defs(delivery_months)
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    release_dates = _release_dates()
+    # Initialize with most recent release date
+    current_df, delivery_months = prepare_data(release_dates[0])
+    current_df_serializable = convert_to_serializable(current_df, delivery_months)
+    columnDefinitions = create_column_defs(delivery_months)
 
-# Page layout
-layout = html.Div([
-    # Header section
-    html.Div([
+    # Page layout
+    return html.Div([
+        # Header section
         html.Div([
-            html.H1("STEO DPR Other", style={"fontSize": "3em", "color": RED, "margin": "0"}),
-        ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-start"}),
+            html.Div([
+                html.H1("STEO DPR Other", style={"fontSize": "3em", "color": RED, "margin": "0"}),
+            ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-start"}),
         
-        html.Div([
-            html.Button("◄", id="prev-release-btn-other", n_clicks=0, 
-                       style={"fontSize": "1.5em", "padding": "5px 15px", "margin": "0 5px",
-                              "backgroundColor": "white", "border": f"2px solid {RED}",
-                              "color": RED, "cursor": "pointer", "borderRadius": "4px"}),
-            html.Div(id="release-date-display-other", 
-                    children=f"Release: {release_dates[0].strftime('%B %Y')}",
-                    style={"fontSize": "1.3em", "padding": "0 20px", "color": "#333"}),
-            html.Button("►", id="next-release-btn-other", n_clicks=0,
-                       style={"fontSize": "1.5em", "padding": "5px 15px", "margin": "0 5px",
-                              "backgroundColor": "white", "border": f"2px solid {RED}",
-                              "color": RED, "cursor": "pointer", "borderRadius": "4px"}),
             html.Div([
-                html.Label("Evolution: ", style={"marginLeft": "30px", "marginRight": "10px", "fontSize": "1.1em"}),
-                daq.BooleanSwitch(
-                    id="evolution-switch-other",
-                    on=False,
-                    color=RED,
-                    disabled=False
-                )
-            ], style={"display": "flex", "alignItems": "center", "marginLeft": "20px"})
-        ], style={"flex": "2", "display": "flex", "alignItems": "center", "justifyContent": "center"}),
+                html.Button("◄", id="prev-release-btn-other", n_clicks=0, 
+                           style={"fontSize": "1.5em", "padding": "5px 15px", "margin": "0 5px",
+                                  "backgroundColor": "white", "border": f"2px solid {RED}",
+                                  "color": RED, "cursor": "pointer", "borderRadius": "4px"}),
+                html.Div(id="release-date-display-other", 
+                        children=f"Release: {release_dates[0].strftime('%B %Y')}",
+                        style={"fontSize": "1.3em", "padding": "0 20px", "color": "#333"}),
+                html.Button("►", id="next-release-btn-other", n_clicks=0,
+                           style={"fontSize": "1.5em", "padding": "5px 15px", "margin": "0 5px",
+                                  "backgroundColor": "white", "border": f"2px solid {RED}",
+                                  "color": RED, "cursor": "pointer", "borderRadius": "4px"}),
+                html.Div([
+                    html.Label("Evolution: ", style={"marginLeft": "30px", "marginRight": "10px", "fontSize": "1.1em"}),
+                    daq.BooleanSwitch(
+                        id="evolution-switch-other",
+                        on=False,
+                        color=RED,
+                        disabled=False
+                    )
+                ], style={"display": "flex", "alignItems": "center", "marginLeft": "20px"})
+            ], style={"flex": "2", "display": "flex", "alignItems": "center", "justifyContent": "center"}),
         
+            html.Div([
+                html.Button("📊 Graphs", id="graph-view-btn-other", n_clicks=0,
+                           style={"fontSize": "1.3em", "padding": "10px", "margin": "0 10px",
+                                  "backgroundColor": "white", "border": f"2px solid {RED}",
+                                  "color": RED, "cursor": "pointer"}),
+                html.Button("Download CSV", id="csv-button-dpr-other", n_clicks=0, 
+                           style={"fontSize": "1.3em", "padding": "10px", "margin": "0",
+                                  "backgroundColor": "white", "border": "2px solid #f0f0f0",
+                                  "color": RED, "cursor": "pointer"}),
+            ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-end"})
+        ], style={"height": "6vh", "display": "flex", "alignItems": "center",
+                  "justifyContent": "space-between", "padding": "0 20px"}),
+    
+        # Main content area with AG Grid and Graphs
         html.Div([
-            html.Button("📊 Graphs", id="graph-view-btn-other", n_clicks=0,
-                       style={"fontSize": "1.3em", "padding": "10px", "margin": "0 10px",
-                              "backgroundColor": "white", "border": f"2px solid {RED}",
-                              "color": RED, "cursor": "pointer"}),
-            html.Button("Download CSV", id="csv-button-dpr-other", n_clicks=0, 
-                       style={"fontSize": "1.3em", "padding": "10px", "margin": "0",
-                              "backgroundColor": "white", "border": "2px solid #f0f0f0",
-                              "color": RED, "cursor": "pointer"}),
-        ], style={"flex": "1", "display": "flex", "alignItems": "center", "justifyContent": "flex-end"})
-    ], style={"height": "6vh", "display": "flex", "alignItems": "center",
-              "justifyContent": "space-between", "padding": "0 20px"}),
-    
-    # Main content area with AG Grid and Graphs
-    html.Div([
-        # AG Grid container
-        html.Div([
-            dag.AgGrid(
-                id="steo-dpr-grid-other",
-                columnDefs=columnDefinitions,
-                defaultColDef={
-                    "sortable": True,
-                    "resizable": True,
-                },
-                rowData=current_df_serializable.to_dict('records'),
-                csvExportParams={
-                    "fileName": "steo_dpr_other_data.csv",
-                },
-                dashGridOptions={
-                    "rowSelection": "single",
-                    "animateRows": False,
-                    "domLayout": "normal",
-                },
-                className="ag-theme-alpine",
-                style={"height": "100%", "width": "100%"}
-            )
-        ], id="grid-container-other", style={"height": "100%", "width": "100%", "transition": "width 0.3s ease"}),
+            # AG Grid container
+            html.Div([
+                dag.AgGrid(
+                    id="steo-dpr-grid-other",
+                    columnDefs=columnDefinitions,
+                    defaultColDef={
+                        "sortable": True,
+                        "resizable": True,
+                    },
+                    rowData=current_df_serializable.to_dict('records'),
+                    csvExportParams={
+                        "fileName": "steo_dpr_other_data.csv",
+                    },
+                    dashGridOptions={
+                        "rowSelection": "single",
+                        "animateRows": False,
+                        "domLayout": "normal",
+                    },
+                    className="ag-theme-alpine",
+                    style={"height": "100%", "width": "100%"}
+                )
+            ], id="grid-container-other", style={"height": "100%", "width": "100%", "transition": "width 0.3s ease"}),
         
-        # Graph panel (initially hidden)
-        html.Div([
+            # Graph panel (initially hidden)
             html.Div([
-                html.H3("Data Visualization", style={"margin": "10px 0", "color": RED, "fontSize": "1.5em"}),
-                html.Button("✕", id="close-graph-btn-other", n_clicks=0,
-                           style={"position": "absolute", "top": "10px", "right": "10px",
-                                  "background": "transparent", "border": "none",
-                                  "fontSize": "1.5em", "cursor": "pointer", "color": "#666"})
-            ], style={"position": "relative", "padding": "0 20px", "height": "50px"}),
+                html.Div([
+                    html.H3("Data Visualization", style={"margin": "10px 0", "color": RED, "fontSize": "1.5em"}),
+                    html.Button("✕", id="close-graph-btn-other", n_clicks=0,
+                               style={"position": "absolute", "top": "10px", "right": "10px",
+                                      "background": "transparent", "border": "none",
+                                      "fontSize": "1.5em", "cursor": "pointer", "color": "#666"})
+                ], style={"position": "relative", "padding": "0 20px", "height": "50px"}),
             
-            # Line graph
-            html.Div([
-                html.H4("Historical Trend", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
-                dcc.Graph(id="line-graph-other", style={"height": "calc(100% - 30px)"})
-            ], style={"padding": "0 20px", "height": "calc(50% - 25px)"}),
+                # Line graph
+                html.Div([
+                    html.H4("Historical Trend", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
+                    dcc.Graph(id="line-graph-other", style={"height": "calc(100% - 30px)"})
+                ], style={"padding": "0 20px", "height": "calc(50% - 25px)"}),
             
-            # Seasonality graph
-            html.Div([
-                html.H4("Seasonality (All Years)", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
-                dcc.Graph(id="seasonality-graph-other", style={"height": "calc(100% - 30px)"})
-            ], style={"padding": "0 20px", "height": "calc(50% - 25px)"})
-        ], id="graph-panel-other", style={"height": "100%", "width": "0%", "backgroundColor": "#f8f8f8",
-                                    "borderLeft": "2px solid #e0e0e0", "overflow": "auto",
-                                    "transition": "width 0.3s ease", "display": "none"}),
-    ], style={"height": "85vh", "display": "flex", "padding": "0 20px"}),
-    
-    # Hidden stores
-    dcc.Store(id='current-release-index-other', data=0),
-    dcc.Store(id='graph-view-state-other', data=False)
-    
-], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
+                # Seasonality graph
+                html.Div([
+                    html.H4("Seasonality (All Years)", style={"margin": "5px 0", "fontSize": "1.1em", "color": "#333"}),
+                    dcc.Graph(id="seasonality-graph-other", style={"height": "calc(100% - 30px)"})
+                ], style={"padding": "0 20px", "height": "calc(50% - 25px)"})
+            ], id="graph-panel-other", style={"height": "100%", "width": "0%", "backgroundColor": "#f8f8f8",
+                                        "borderLeft": "2px solid #e0e0e0", "overflow": "auto",
+                                        "transition": "width 0.3s ease", "display": "none"}),
+        ], style={"height": "85vh", "display": "flex", "padding": "0 20px"}),
+    
+        # Hidden stores
+        dcc.Store(id='current-release-index-other', data=0),
+        dcc.Store(id='graph-view-state-other', data=False)
+    
+    ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # Callbacks
 @callback(
@@ -288,6 +279,7 @@ def export_data_as_csv(n_clicks):
 )
 def update_release_date(prev_clicks, next_clicks, evolution_on, current_index):
     # Determine which button was clicked
+    release_dates = _release_dates()
     if not ctx.triggered:
         # Initial load
         new_index = 0
@@ -388,6 +380,8 @@ def toggle_graph_panel(graph_btn_clicks, close_btn_clicks, graph_state):
 )
 def update_graphs(selected_rows, current_index):
     # Default empty figures
+    df_melted = _dpr_long()
+    release_dates = _release_dates()
     empty_fig = go.Figure()
     empty_fig.update_layout(
         title="Select a row to view data",
@@ -3,6 +3,7 @@ import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from src.utils import datasets
 from src.utils.data_loader import loader
 from src.utils.colors import (
     COLORSCALE_EFFICIENCY,
@@ -13,26 +14,24 @@ from src.utils.colors import (
 
 # ── Data Loading ──────────────────────────────────────────────────────────────
 
-df = loader.load_steo_dpr_data()
-mapping_df = loader.load_dpr_mapping()
+# The DPR frame is loaded on first use rather than at import, so that
+# importing this page to register its callbacks stays cheap.
+def _dpr_long():
+    return loader.load_dpr_long()
 
-metadata_cols = ['id', 'name', 'release_date', 'uom']
-date_columns = [col for col in df.columns if col not in metadata_cols]
 
-df_melted = pd.melt(df, id_vars=metadata_cols, value_vars=date_columns,
-                    var_name='delivery_month', value_name='value')
-df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
-df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
+def _release_dates():
+    """Release dates, most recent first"""
+    return sorted(_dpr_long()['release_date'].unique(), reverse=True)
 
-release_dates = sorted(df_melted['release_date'].unique(), reverse=True)
+
+def _metrics(release_date):
+    """Per-region, per-month DPR metrics of a release (dash_eia.transforms.dpr_metrics), cached"""
+    return datasets.resolve(datasets.handle('dpr_metrics', release=pd.Timestamp(release_date).strftime('%Y-%m-%d')))
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
 REGIONS_ORDER = ['Permian', 'Bakken', 'Eagle Ford', 'Appalachia', 'Haynesville', 'Rest of L48 ex GOM']
-REGION_ABBREVS = {
-    'Permian': 'PM', 'Bakken': 'BK', 'Eagle Ford': 'EF',
-    'Appalachia': 'AP', 'Haynesville': 'HA', 'Rest of L48 ex GOM': 'R48',
-}
 REGION_COLORS = {
     'Permian': BLUE, 'Bakken': RED, 'Eagle Ford': GREEN,
     'Appalachia': ORANGE, 'Haynesville': PURPLE, 'Rest of L48 ex GOM': GRAY_500,
@@ -58,59 +57,14 @@ PAGE_STYLE = {"padding": "2rem", "backgroundColor": GRAY_50, "minHeight": "100vh
 
 # ── Calculation ───────────────────────────────────────────────────────────────
 
-def calculate_efficiency_metrics(df_melted, release_date):
-    """Calculate efficiency metrics by region and time, dropping NaN rows."""
-    df_filtered = df_melted[df_melted['release_date'] == release_date].copy()
-
-    pivot_data = df_filtered.pivot_table(
-        index=['delivery_month', 'region'], columns='id',
-        values='value', aggfunc='first'
-    ).reset_index()
-
-    efficiency_metrics = []
-    for _, row in pivot_data.iterrows():
-        region = row['region']
-        month = row['delivery_month']
-
-        if pd.isna(region) or region not in REGIONS_ORDER:
-            continue
-
-        abbr = REGION_ABBREVS.get(region, '')
-        if not abbr:
-            continue
-
-        production = row.get(f'COPR{abbr}', np.nan)
-        rigs = row.get(f'RIGS{abbr}', np.nan)
-        wells_drilled = row.get(f'NWD{abbr}', np.nan)
-        wells_completed = row.get(f'NWC{abbr}', np.nan)
-        ducs = row.get(f'DUCS{abbr}', np.nan)
-
-        # Skip rows where rig count is missing — can't compute efficiency
-        if pd.isna(rigs) or rigs == 0:
-            continue
-        if pd.isna(production):
-            continue
-
-        wells_drilled = wells_drilled if pd.notna(wells_drilled) else 0
-        wells_completed = wells_completed if pd.notna(wells_completed) else 0
-        ducs = ducs if pd.notna(ducs) else 0
-
-        prod_per_rig = production / rigs
-        wells_per_rig = wells_drilled / rigs
-        completion_rate = wells_completed / wells_drilled if wells_drilled > 0 else 0
-        duc_ratio = ducs / wells_drilled if wells_drilled > 0 else 0
-
-        efficiency_metrics.append({
-            'region': region, 'month': month,
-            'production_per_rig': prod_per_rig,
-            'wells_per_rig': wells_per_rig,
-            'completion_rate': completion_rate,
-            'duc_ratio': duc_ratio,
-            'total_production': production,
-            'total_rigs': rigs,
-        })
-
-    return pd.DataFrame(efficiency_metrics)
+def calculate_efficiency_metrics(release_date):
+    """Efficiency metrics by region and month, dropping months without rigs or production."""
+    metrics = _metrics(release_date)
+    metrics = metrics[(metrics['rigs'] > 0) & metrics['production'].notna()]
+    return metrics[['region', 'month', 'production_per_rig', 'wells_per_rig',
+                    'completion_rate', 'duc_ratio']].assign(
+        total_production=metrics['production'], total_rigs=metrics['rigs'],
+    ).reset_index(drop=True)
 
 # ── Formatting ────────────────────────────────────────────────────────────────
 
@@ -407,117 +361,120 @@ def _build_summary_table(efficiency_df, metric):
 
 # ── Layout ────────────────────────────────────────────────────────────────────
 
-layout = html.Div([
-    # Page Hero
-    html.Div([
-        html.Div('DPR ANALYTICS', className='page-eyebrow'),
-        html.H1('Efficiency Heatmap', className='page-title'),
-        html.P(
-            'Regional drilling efficiency across major U.S. basins — production per rig, '
-            'completion rates, and DUC ratios over time.',
-            className='page-summary',
-        ),
-    ], className='page-hero'),
-
-    # Controls Row
-    dbc.Row([
-        # Release Date
-        dbc.Col([
-            html.Label('Release Date', style={
-                'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
-                'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
-                'display': 'block',
-            }),
-            dcc.Dropdown(
-                id='page3-7-release-dropdown',
-                options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
-                value=release_dates[0].isoformat() if release_dates else None,
-                clearable=False,
-                style={'fontFamily': 'Montserrat'},
-            ),
-        ], lg=2, md=3, sm=12),
-
-        # Metric Selector (pill buttons)
-        dbc.Col([
-            html.Label('Metric', style={
-                'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
-                'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
-                'display': 'block',
-            }),
-            dbc.RadioItems(
-                id='page3-7-metric-selector',
-                options=[
-                    {'label': cfg['label'], 'value': key}
-                    for key, cfg in METRIC_CONFIG.items()
-                ],
-                value='production_per_rig',
-                inline=True,
-                className='btn-group',
-                inputClassName='btn-check',
-                labelClassName='btn btn-outline-primary btn-sm',
-                labelCheckedClassName='active',
-            ),
-        ], lg=6, md=5, sm=12),
-
-        # Time Range
-        dbc.Col([
-            html.Label('Time Range', style={
-                'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
-                'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
-                'display': 'block',
-            }),
-            dbc.RadioItems(
-                id='page3-7-range-selector',
-                options=[{'label': k, 'value': str(v) if v else 'all'} for k, v in TIME_RANGES.items()],
-                value='12',
-                inline=True,
-                className='btn-group',
-                inputClassName='btn-check',
-                labelClassName='btn btn-outline-secondary btn-sm',
-                labelCheckedClassName='active',
-            ),
-        ], lg=2, md=2, sm=6),
-
-        # Z-Score Toggle
-        dbc.Col([
-            html.Label('Normalize', style={
-                'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
-                'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
-                'display': 'block',
-            }),
-            dbc.Switch(
-                id='page3-7-zscore-toggle',
-                label='Z-Score',
-                value=False,
-                style={'marginTop': '0.2rem'},
-            ),
-        ], lg=2, md=2, sm=6),
-    ], className='g-3 align-items-end', style={'marginBottom': '1.5rem'}),
-
-    # KPI Strip
-    html.Div(id='page3-7-kpi-strip', style={'marginBottom': '1.5rem'}),
-
-    # Heatmap Card
-    dbc.Card([
-        dbc.CardBody([
-            dcc.Graph(
-                id='page3-7-efficiency-heatmap',
-                config={'displayModeBar': False},
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    release_dates = _release_dates()
+    return html.Div([
+        # Page Hero
+        html.Div([
+            html.Div('DPR ANALYTICS', className='page-eyebrow'),
+            html.H1('Efficiency Heatmap', className='page-title'),
+            html.P(
+                'Regional drilling efficiency across major U.S. basins — production per rig, '
+                'completion rates, and DUC ratios over time.',
+                className='page-summary',
             ),
-        ], style={'padding': '1rem'}),
-    ], className='surface-card', style={'marginBottom': '1.5rem'}),
-
-    # Summary Table Card
-    dbc.Card([
-        dbc.CardBody([
-            html.Div('REGIONAL SUMMARY', style={
-                'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.1em',
-                'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.8rem',
-            }),
-            html.Div(id='page3-7-efficiency-summary'),
-        ]),
-    ], className='surface-card'),
-], style=PAGE_STYLE)
+        ], className='page-hero'),
+
+        # Controls Row
+        dbc.Row([
+            # Release Date
+            dbc.Col([
+                html.Label('Release Date', style={
+                    'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
+                    'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
+                    'display': 'block',
+                }),
+                dcc.Dropdown(
+                    id='page3-7-release-dropdown',
+                    options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
+                    value=release_dates[0].isoformat() if release_dates else None,
+                    clearable=False,
+                    style={'fontFamily': 'Montserrat'},
+                ),
+            ], lg=2, md=3, sm=12),
+
+            # Metric Selector (pill buttons)
+            dbc.Col([
+                html.Label('Metric', style={
+                    'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
+                    'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
+                    'display': 'block',
+                }),
+                dbc.RadioItems(
+                    id='page3-7-metric-selector',
+                    options=[
+                        {'label': cfg['label'], 'value': key}
+                        for key, cfg in METRIC_CONFIG.items()
+                    ],
+                    value='production_per_rig',
+                    inline=True,
+                    className='btn-group',
+                    inputClassName='btn-check',
+                    labelClassName='btn btn-outline-primary btn-sm',
+                    labelCheckedClassName='active',
+                ),
+            ], lg=6, md=5, sm=12),
+
+            # Time Range
+            dbc.Col([
+                html.Label('Time Range', style={
+                    'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
+                    'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
+                    'display': 'block',
+                }),
+                dbc.RadioItems(
+                    id='page3-7-range-selector',
+                    options=[{'label': k, 'value': str(v) if v else 'all'} for k, v in TIME_RANGES.items()],
+                    value='12',
+                    inline=True,
+                    className='btn-group',
+                    inputClassName='btn-check',
+                    labelClassName='btn btn-outline-secondary btn-sm',
+                    labelCheckedClassName='active',
+                ),
+            ], lg=2, md=2, sm=6),
+
+            # Z-Score Toggle
+            dbc.Col([
+                html.Label('Normalize', style={
+                    'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.06em',
+                    'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.35rem',
+                    'display': 'block',
+                }),
+                dbc.Switch(
+                    id='page3-7-zscore-toggle',
+                    label='Z-Score',
+                    value=False,
+                    style={'marginTop': '0.2rem'},
+                ),
+            ], lg=2, md=2, sm=6),
+        ], className='g-3 align-items-end', style={'marginBottom': '1.5rem'}),
+
+        # KPI Strip
+        html.Div(id='page3-7-kpi-strip', style={'marginBottom': '1.5rem'}),
+
+        # Heatmap Card
+        dbc.Card([
+            dbc.CardBody([
+                dcc.Graph(
+                    id='page3-7-efficiency-heatmap',
+                    config={'displayModeBar': False},
+                ),
+            ], style={'padding': '1rem'}),
+        ], className='surface-card', style={'marginBottom': '1.5rem'}),
+
+        # Summary Table Card
+        dbc.Card([
+            dbc.CardBody([
+                html.Div('REGIONAL SUMMARY', style={
+                    'fontSize': '0.72rem', 'fontWeight': '700', 'letterSpacing': '0.1em',
+                    'textTransform': 'uppercase', 'color': GRAY_500, 'marginBottom': '0.8rem',
+                }),
+                html.Div(id='page3-7-efficiency-summary'),
+            ]),
+        ], className='surface-card'),
+    ], style=PAGE_STYLE)
 
 # ── Callback ──────────────────────────────────────────────────────────────────
 
@@ -535,7 +492,7 @@ def update_efficiency_analysis(release_date_str, metric, time_range, use_zscore)
         return go.Figure(), '', html.Div()
 
     release_date = pd.to_datetime(release_date_str)
-    efficiency_df = calculate_efficiency_metrics(df_melted, release_date)
+    efficiency_df = calculate_efficiency_metrics(release_date)
 
     if efficiency_df.empty:
         return go.Figure(), 'No data available for selected parameters.', html.Div()
@@ -6,6 +6,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from dash_eia.transforms import dpr_metrics
+from src.utils import datasets
 from src.utils.data_loader import loader
 from src.utils.colors import (
     RED, BLUE, GREEN, ORANGE, PURPLE, BLACK,
@@ -34,11 +36,6 @@ CHART_LAYOUT = dict(
 
 REGIONS = ['Permian', 'Bakken', 'Eagle Ford', 'Appalachia', 'Haynesville', 'Rest of L48 ex GOM']
 
-REGION_ABBREV = {
-    'Permian': 'PM', 'Bakken': 'BK', 'Eagle Ford': 'EF',
-    'Appalachia': 'AP', 'Haynesville': 'HA', 'Rest of L48 ex GOM': 'R48',
-}
-
 REGION_COLORS = {
     'Permian': RED, 'Bakken': BLUE, 'Eagle Ford': ORANGE,
     'Appalachia': GREEN, 'Haynesville': PURPLE, 'Rest of L48 ex GOM': GRAY_300,
@@ -53,18 +50,20 @@ REGION_SHORT = {
 # ---------------------------------------------------------------------------
 # Data Loading
 # ---------------------------------------------------------------------------
-df_raw = loader.load_steo_dpr_data()
-mapping_df = loader.load_dpr_mapping()
+# The DPR frame is loaded on first use rather than at import, so that
+# importing this page to register its callbacks stays cheap.
+def _dpr_long():
+    return loader.load_dpr_long()
+
 
-metadata_cols = ['id', 'name', 'release_date', 'uom']
-date_columns = [col for col in df_raw.columns if col not in metadata_cols]
+def _release_dates():
+    """Release dates, most recent first"""
+    return sorted(_dpr_long()['release_date'].unique(), reverse=True)
 
-df_melted = pd.melt(df_raw, id_vars=metadata_cols, value_vars=date_columns,
-                    var_name='delivery_month', value_name='value')
-df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
-df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
 
-release_dates = sorted(df_melted['release_date'].unique(), reverse=True)
+def _metrics(release_date):
+    """Per-region, per-month DPR metrics of a release (dash_eia.transforms.dpr_metrics), cached"""
+    return datasets.resolve(datasets.handle('dpr_metrics', release=pd.Timestamp(release_date).strftime('%Y-%m-%d')))
 
 
 # ---------------------------------------------------------------------------
@@ -94,105 +93,43 @@ def _hex_to_rgba(hex_color, alpha):
 
 
 def _get_region_data(release_date, region):
-    """Get pivoted time series for a single region and release date."""
-    abbrev = REGION_ABBREV.get(region, '')
-    if not abbrev:
+    """Get the monthly series and metrics of a single region and release date."""
+    if region not in REGIONS:
         return pd.DataFrame()
 
-    df_f = df_melted[
-        (df_melted['release_date'] == release_date) &
-        (df_melted['region'] == region)
-    ].copy()
-
-    if df_f.empty:
+    metrics = _metrics(release_date)
+    series = metrics.loc[metrics['region'] == region, ['month', *dpr_metrics.SERIES]]
+    if series.empty:
         return pd.DataFrame()
 
-    pivot = df_f.pivot_table(index='delivery_month', columns='id',
-                             values='value', aggfunc='first').reset_index()
-    pivot = pivot.sort_values('delivery_month')
-
-    result = pd.DataFrame({'month': pivot['delivery_month']})
-    for metric, prefix in [('wells_drilled', 'NWD'), ('wells_completed', 'NWC'),
-                           ('ducs', 'DUCS'), ('rigs', 'RIGS'),
-                           ('new_well_oil', 'CONW'), ('new_well_oil_per_rig', 'CONWR'),
-                           ('new_well_gas', 'NGNW'), ('new_well_gas_per_rig', 'NGNWR'),
-                           ('wells_per_rig', 'NWR'),
-                           ('existing_oil_decline', 'COEOP'), ('existing_gas_decline', 'NGEOP')]:
-        col = f'{prefix}{abbrev}'
-        result[metric] = pivot[col].values if col in pivot.columns else 0
-
-    result = result.fillna(0)
+    result = series.fillna(0).reset_index(drop=True)
 
     # Drop trailing rows where all key metrics are zero (empty forecast months)
     key_cols = ['wells_drilled', 'wells_completed', 'ducs']
     has_data = result[key_cols].any(axis=1)
     if has_data.any():
         last_valid = has_data[::-1].idxmax()
-        result = result.loc[:last_valid].copy()
-
-    result['duc_change'] = result['wells_drilled'] - result['wells_completed']
-    result['completion_rate'] = np.where(
-        result['wells_drilled'] > 0,
-        result['wells_completed'] / result['wells_drilled'] * 100, 0)
-    result['months_supply'] = np.where(
-        result['wells_completed'] > 0,
-        result['ducs'] / result['wells_completed'], 0)
-    result['oil_per_well'] = np.where(
-        result['wells_completed'] > 0,
-        result['new_well_oil'] / result['wells_completed'], 0)
-    result['gas_per_well'] = np.where(
-        result['wells_completed'] > 0,
-        result['new_well_gas'] / result['wells_completed'], 0)
+        result = result.loc[:last_valid]
 
+    result = dpr_metrics.derive(result)
+    result['wells_per_rig'] = result['drilled_per_rig']
+    result['completion_rate'] = result['completion_rate'] * 100
     return result
 
 
 def _get_all_regions_data(release_date):
     """Get aggregated data across all regions."""
-    frames = {}
-    for region in REGIONS:
-        rd = _get_region_data(release_date, region)
-        if not rd.empty:
-            frames[region] = rd
+    frames = [_get_region_data(release_date, region) for region in REGIONS]
+    frames = [f for f in frames if not f.empty]
 
     if not frames:
         return pd.DataFrame()
 
-    # Use intersection of months across all regions
-    common_months = None
-    for f in frames.values():
-        months_set = set(f['month'])
-        common_months = months_set if common_months is None else common_months & months_set
-    common_months = sorted(common_months)
-
-    # Align all frames to common months
-    aligned = {}
-    for region, f in frames.items():
-        aligned[region] = f[f['month'].isin(common_months)].sort_values('month').reset_index(drop=True)
-
-    agg = pd.DataFrame({'month': common_months})
-    sum_cols = ['wells_drilled', 'wells_completed', 'ducs', 'rigs',
-                'new_well_oil', 'new_well_gas', 'existing_oil_decline', 'existing_gas_decline']
-    for col in sum_cols:
-        agg[col] = sum(f[col].values for f in aligned.values())
-
-    agg['duc_change'] = agg['wells_drilled'] - agg['wells_completed']
-    agg['completion_rate'] = np.where(
-        agg['wells_drilled'] > 0,
-        agg['wells_completed'] / agg['wells_drilled'] * 100, 0)
-    agg['months_supply'] = np.where(
-        agg['wells_completed'] > 0,
-        agg['ducs'] / agg['wells_completed'], 0)
-    agg['oil_per_well'] = np.where(
-        agg['wells_completed'] > 0,
-        agg['new_well_oil'] / agg['wells_completed'], 0)
-    agg['gas_per_well'] = np.where(
-        agg['wells_completed'] > 0,
-        agg['new_well_gas'] / agg['wells_completed'], 0)
-    agg['wells_per_rig'] = np.where(
-        agg['rigs'] > 0,
-        agg['wells_drilled'] / agg['rigs'], 0)
-
+    # Sum the regions over the months they all have
+    agg = pd.concat(frames).groupby('month')[list(dpr_metrics.SERIES)].agg(['sum', 'count'])
+    agg = agg.xs('sum', axis=1, level=1)[agg[('wells_drilled', 'count')] == len(frames)]
+    agg = dpr_metrics.derive(agg.reset_index())
+    agg['completion_rate'] = agg['completion_rate'] * 100
     return agg
 
 
@@ -301,102 +238,105 @@ def _fmt(val, fmt_str=".1f", suffix=""):
 # ---------------------------------------------------------------------------
 # Layout
 # ---------------------------------------------------------------------------
-layout = html.Div([
-
-    # Header
-    html.Div([
-        html.Div([
-            html.Div("DRILLING PRODUCTIVITY REPORT", style={
-                "fontSize": "0.7rem", "fontWeight": "700", "letterSpacing": "0.15em",
-                "color": GRAY_500, "marginBottom": "4px",
-            }),
-            html.H2("DUC Analysis", style={
-                "color": GRAY_800, "fontWeight": "800", "margin": "0",
-            }),
-        ], style={"flex": "1"}),
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    release_dates = _release_dates()
+    return html.Div([
 
-        # Controls
+        # Header
         html.Div([
             html.Div([
-                html.Label("Region", style={"fontSize": "0.75rem", "fontWeight": "600",
-                                            "color": GRAY_500, "marginBottom": "2px"}),
-                dcc.Dropdown(
-                    id='p38-region',
-                    options=[{'label': 'All Regions', 'value': 'All Regions'}] +
-                            [{'label': r, 'value': r} for r in REGIONS],
-                    value='Permian',
-                    style={'width': '190px'},
-                    clearable=False,
-                ),
-            ], style={'display': 'inline-block', 'marginRight': '16px'}),
+                html.Div("DRILLING PRODUCTIVITY REPORT", style={
+                    "fontSize": "0.7rem", "fontWeight": "700", "letterSpacing": "0.15em",
+                    "color": GRAY_500, "marginBottom": "4px",
+                }),
+                html.H2("DUC Analysis", style={
+                    "color": GRAY_800, "fontWeight": "800", "margin": "0",
+                }),
+            ], style={"flex": "1"}),
+
+            # Controls
             html.Div([
-                html.Label("Release Date", style={"fontSize": "0.75rem", "fontWeight": "600",
+                html.Div([
+                    html.Label("Region", style={"fontSize": "0.75rem", "fontWeight": "600",
+                                                "color": GRAY_500, "marginBottom": "2px"}),
+                    dcc.Dropdown(
+                        id='p38-region',
+                        options=[{'label': 'All Regions', 'value': 'All Regions'}] +
+                                [{'label': r, 'value': r} for r in REGIONS],
+                        value='Permian',
+                        style={'width': '190px'},
+                        clearable=False,
+                    ),
+                ], style={'display': 'inline-block', 'marginRight': '16px'}),
+                html.Div([
+                    html.Label("Release Date", style={"fontSize": "0.75rem", "fontWeight": "600",
+                                                       "color": GRAY_500, "marginBottom": "2px"}),
+                    dcc.Dropdown(
+                        id='p38-release',
+                        options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
+                        value=release_dates[0].isoformat() if release_dates else None,
+                        style={'width': '160px'},
+                        clearable=False,
+                    ),
+                ], style={'display': 'inline-block', 'marginRight': '16px'}),
+                html.Div([
+                    html.Label("Commodity", style={"fontSize": "0.75rem", "fontWeight": "600",
                                                    "color": GRAY_500, "marginBottom": "2px"}),
-                dcc.Dropdown(
-                    id='p38-release',
-                    options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
-                    value=release_dates[0].isoformat() if release_dates else None,
-                    style={'width': '160px'},
-                    clearable=False,
-                ),
-            ], style={'display': 'inline-block', 'marginRight': '16px'}),
-            html.Div([
-                html.Label("Commodity", style={"fontSize": "0.75rem", "fontWeight": "600",
-                                               "color": GRAY_500, "marginBottom": "2px"}),
-                dcc.RadioItems(
-                    id='p38-commodity',
-                    options=[{'label': ' Oil', 'value': 'oil'}, {'label': ' Gas', 'value': 'gas'}],
-                    value='oil',
-                    inline=True,
-                    style={"fontSize": "0.9rem", "marginTop": "6px"},
-                    inputStyle={"marginRight": "4px"},
-                    labelStyle={"marginRight": "14px"},
-                ),
-            ], style={'display': 'inline-block'}),
-        ], style={"display": "flex", "alignItems": "flex-end"}),
-    ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "flex-end",
-              "marginBottom": "1.5rem", "flexWrap": "wrap", "gap": "1rem"}),
-
-    # KPI Strip
-    html.Div(id='p38-kpi-strip'),
-
-    # Section 2: Inventory Dynamics
-    _section_heading("Inventory Dynamics"),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-waterfall'), lg=6),
-        dbc.Col(dcc.Graph(id='p38-duc-stacked'), lg=6),
-    ]),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-duc-share'), lg=6),
-        dbc.Col(dcc.Graph(id='p38-duc-heatmap'), lg=6),
-    ], style={"marginTop": "8px"}),
-
-    # Section 3: Drilling & Completion Efficiency
-    _section_heading("Drilling & Completion Efficiency"),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-completion-rate'), lg=6),
-        dbc.Col(dcc.Graph(id='p38-months-supply'), lg=6),
-    ]),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-rigs-completions'), lg=6),
-        dbc.Col(dcc.Graph(id='p38-wells-per-rig'), lg=6),
-    ], style={"marginTop": "8px"}),
-
-    # Section 4: Production Impact
-    _section_heading("Production Impact"),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-prod-vs-completions'), lg=6),
-        dbc.Col(dcc.Graph(id='p38-prod-per-well'), lg=6),
-    ]),
-
-    # Section 5: Statistical Analysis
-    _section_heading("Statistical Analysis"),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id='p38-zscore'), lg=6),
-        dbc.Col(html.Div(id='p38-stats-table'), lg=6),
-    ]),
-
-], style=PAGE_STYLE)
+                    dcc.RadioItems(
+                        id='p38-commodity',
+                        options=[{'label': ' Oil', 'value': 'oil'}, {'label': ' Gas', 'value': 'gas'}],
+                        value='oil',
+                        inline=True,
+                        style={"fontSize": "0.9rem", "marginTop": "6px"},
+                        inputStyle={"marginRight": "4px"},
+                        labelStyle={"marginRight": "14px"},
+                    ),
+                ], style={'display': 'inline-block'}),
+            ], style={"display": "flex", "alignItems": "flex-end"}),
+        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "flex-end",
+                  "marginBottom": "1.5rem", "flexWrap": "wrap", "gap": "1rem"}),
+
+        # KPI Strip
+        html.Div(id='p38-kpi-strip'),
+
+        # Section 2: Inventory Dynamics
+        _section_heading("Inventory Dynamics"),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-waterfall'), lg=6),
+            dbc.Col(dcc.Graph(id='p38-duc-stacked'), lg=6),
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-duc-share'), lg=6),
+            dbc.Col(dcc.Graph(id='p38-duc-heatmap'), lg=6),
+        ], style={"marginTop": "8px"}),
+
+        # Section 3: Drilling & Completion Efficiency
+        _section_heading("Drilling & Completion Efficiency"),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-completion-rate'), lg=6),
+            dbc.Col(dcc.Graph(id='p38-months-supply'), lg=6),
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-rigs-completions'), lg=6),
+            dbc.Col(dcc.Graph(id='p38-wells-per-rig'), lg=6),
+        ], style={"marginTop": "8px"}),
+
+        # Section 4: Production Impact
+        _section_heading("Production Impact"),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-prod-vs-completions'), lg=6),
+            dbc.Col(dcc.Graph(id='p38-prod-per-well'), lg=6),
+        ]),
+
+        # Section 5: Statistical Analysis
+        _section_heading("Statistical Analysis"),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id='p38-zscore'), lg=6),
+            dbc.Col(html.Div(id='p38-stats-table'), lg=6),
+        ]),
+
+    ], style=PAGE_STYLE)
 
 
 # ---------------------------------------------------------------------------
@@ -6,96 +6,49 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.preprocessing import MinMaxScaler
+from src.utils import datasets
 from src.utils.data_loader import loader
 from src.utils.colors import RED, COLORSCALE_SEQUENTIAL
 
-df = loader.load_steo_dpr_data()
-mapping_df = loader.load_dpr_mapping()
+# The DPR frame is loaded on first use rather than at import, so that
+# importing this page to register its callbacks stays cheap.
+def _dpr_long():
+    return loader.load_dpr_long()
 
-# Get date columns (all columns that are not metadata)
-metadata_cols = ['id', 'name', 'release_date', 'uom']
-date_columns = [col for col in df.columns if col not in metadata_cols]
 
-# Melt the dataframe to have delivery_month as a column
-df_melted = pd.melt(df, 
-                    id_vars=metadata_cols,
-                    value_vars=date_columns,
-                    var_name='delivery_month',
-                    value_name='value')
+def _release_dates():
+    """Release dates, most recent first"""
+    return sorted(_dpr_long()['release_date'].unique(), reverse=True)
 
-# Convert delivery_month to datetime
-df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
 
-# Merge with mapping to get region information
-df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
-
-# Get unique release dates sorted (most recent first)
-release_dates = sorted(df_melted['release_date'].unique(), reverse=True)
+def _metrics(release_date):
+    """Per-region, per-month DPR metrics of a release (dash_eia.transforms.dpr_metrics), cached"""
+    return datasets.resolve(datasets.handle('dpr_metrics', release=pd.Timestamp(release_date).strftime('%Y-%m-%d')))
 regions = ['Permian', 'Bakken', 'Eagle Ford', 'Appalachia', 'Haynesville', 'Rest of L48 ex GOM']
 
-def get_productivity_matrix_data(df_melted, release_date):
+def get_productivity_matrix_data(release_date):
     """Calculate productivity matrix data for scatter plot analysis"""
-    # Filter for specific release
-    df_filtered = df_melted[df_melted['release_date'] == release_date].copy()
+    metrics = _metrics(release_date)
     
-    if df_filtered.empty:
+    if metrics.empty:
         return pd.DataFrame()
     
-    # Create pivot table
-    pivot_data = df_filtered.pivot_table(
-        index=['delivery_month', 'region'],
-        columns='id',
-        values='value',
-        aggfunc='first'
-    ).reset_index()
-    
-    productivity_data = []
-    
-    for _, row in pivot_data.iterrows():
-        region = row['region']
-        month = row['delivery_month']
-        
-        if region not in regions:
-            continue
-            
-        # Get region abbreviation
-        region_abbrev = {
-            'Permian': 'PM', 'Bakken': 'BK', 'Eagle Ford': 'EF',
-            'Appalachia': 'AP', 'Haynesville': 'HA', 'Rest of L48 ex GOM': 'R48'
-        }.get(region, '')
-        
-        if region_abbrev:
-            production = row.get(f'COPR{region_abbrev}', 0) or 0
-            rigs = row.get(f'RIGS{region_abbrev}', 1) or 1
-            wells_drilled = row.get(f'NWD{region_abbrev}', 0) or 0
-            wells_completed = row.get(f'NWC{region_abbrev}', 0) or 0
-            ducs = row.get(f'DUCS{region_abbrev}', 0) or 0
-            new_well_prod = row.get(f'CONW{region_abbrev}', 0) or 0
-            
-            # Calculate productivity metrics
-            production_per_rig = production / max(rigs, 1)
-            wells_per_rig = wells_drilled / max(rigs, 1)
-            production_per_well = production / max(wells_completed, 1) if wells_completed > 0 else 0
-            new_well_productivity = new_well_prod / max(wells_completed, 1) if wells_completed > 0 else 0
-            rig_efficiency = (wells_drilled * production_per_well) / max(rigs, 1)
-            
-            productivity_data.append({
-                'region': region,
-                'month': month,
-                'production_per_rig': production_per_rig,
-                'wells_per_rig': wells_per_rig,
-                'production_per_well': production_per_well,
-                'new_well_productivity': new_well_productivity,
-                'rig_efficiency': rig_efficiency,
-                'total_production': production,
-                'total_rigs': rigs,
-                'wells_drilled': wells_drilled,
-                'wells_completed': wells_completed,
-                'ducs_inventory': ducs
-            })
-    
-    return pd.DataFrame(productivity_data)
+    rigs = metrics['rigs']
+    rig_efficiency = metrics['wells_drilled'] * metrics['production_per_well'] / rigs
+    return pd.DataFrame({
+        'region': metrics['region'],
+        'month': metrics['month'],
+        'production_per_rig': metrics['production_per_rig'],
+        'wells_per_rig': metrics['wells_per_rig'],
+        'production_per_well': metrics['production_per_well'],
+        'new_well_productivity': metrics['oil_per_well'],
+        'rig_efficiency': rig_efficiency.where(rigs > 0, 0.0),
+        'total_production': metrics['production'],
+        'total_rigs': rigs,
+        'wells_drilled': metrics['wells_drilled'],
+        'wells_completed': metrics['wells_completed'],
+        'ducs_inventory': metrics['ducs'],
+    })
 
 def create_productivity_scatter(productivity_df, x_metric, y_metric, size_metric, color_metric):
     """Create scatter plot for productivity analysis"""
@@ -110,6 +63,7 @@ def create_productivity_scatter(productivity_df, x_metric, y_metric, size_metric
         return go.Figure()
     
     # Normalize size values for better bubble sizing
+    from sklearn.preprocessing import MinMaxScaler
     scaler = MinMaxScaler(feature_range=(10, 50))
     size_values = scaler.fit_transform(clean_df[[size_metric]].values).flatten()
     
@@ -218,94 +172,97 @@ def create_efficiency_frontier(productivity_df):
     return fig
 
 # Layout
-layout = html.Div([
-    html.H1("Drilling Productivity Matrix Analysis", style={'textAlign': 'center', 'marginBottom': 30}),
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    release_dates = _release_dates()
+    return html.Div([
+        html.H1("Drilling Productivity Matrix Analysis", style={'textAlign': 'center', 'marginBottom': 30}),
     
-    # Controls
-    html.Div([
+        # Controls
         html.Div([
-            html.Label("Release Date:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-9-release-dropdown',
-                options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
-                value=release_dates[0].isoformat() if release_dates else None,
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("Release Date:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-9-release-dropdown',
+                    options=[{'label': d.strftime('%Y-%m-%d'), 'value': d.isoformat()} for d in release_dates],
+                    value=release_dates[0].isoformat() if release_dates else None,
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
-        html.Div([
-            html.Label("X-Axis Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-9-x-metric-dropdown',
-                options=[
-                    {'label': 'Wells per Rig', 'value': 'wells_per_rig'},
-                    {'label': 'Production per Rig', 'value': 'production_per_rig'},
-                    {'label': 'Production per Well', 'value': 'production_per_well'},
-                    {'label': 'Total Rigs', 'value': 'total_rigs'}
-                ],
-                value='wells_per_rig',
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("X-Axis Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-9-x-metric-dropdown',
+                    options=[
+                        {'label': 'Wells per Rig', 'value': 'wells_per_rig'},
+                        {'label': 'Production per Rig', 'value': 'production_per_rig'},
+                        {'label': 'Production per Well', 'value': 'production_per_well'},
+                        {'label': 'Total Rigs', 'value': 'total_rigs'}
+                    ],
+                    value='wells_per_rig',
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
-        html.Div([
-            html.Label("Y-Axis Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-9-y-metric-dropdown',
-                options=[
-                    {'label': 'Production per Rig', 'value': 'production_per_rig'},
-                    {'label': 'Wells per Rig', 'value': 'wells_per_rig'},
-                    {'label': 'Production per Well', 'value': 'production_per_well'},
-                    {'label': 'New Well Productivity', 'value': 'new_well_productivity'}
-                ],
-                value='production_per_rig',
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("Y-Axis Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-9-y-metric-dropdown',
+                    options=[
+                        {'label': 'Production per Rig', 'value': 'production_per_rig'},
+                        {'label': 'Wells per Rig', 'value': 'wells_per_rig'},
+                        {'label': 'Production per Well', 'value': 'production_per_well'},
+                        {'label': 'New Well Productivity', 'value': 'new_well_productivity'}
+                    ],
+                    value='production_per_rig',
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
-        html.Div([
-            html.Label("Bubble Size:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-9-size-metric-dropdown',
-                options=[
-                    {'label': 'Total Production', 'value': 'total_production'},
-                    {'label': 'Total Rigs', 'value': 'total_rigs'},
-                    {'label': 'Wells Drilled', 'value': 'wells_drilled'},
-                    {'label': 'DUC Inventory', 'value': 'ducs_inventory'}
-                ],
-                value='total_production',
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block', 'marginRight': 20}),
+            html.Div([
+                html.Label("Bubble Size:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-9-size-metric-dropdown',
+                    options=[
+                        {'label': 'Total Production', 'value': 'total_production'},
+                        {'label': 'Total Rigs', 'value': 'total_rigs'},
+                        {'label': 'Wells Drilled', 'value': 'wells_drilled'},
+                        {'label': 'DUC Inventory', 'value': 'ducs_inventory'}
+                    ],
+                    value='total_production',
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block', 'marginRight': 20}),
         
-        html.Div([
-            html.Label("Color Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
-            dcc.Dropdown(
-                id='page3-9-color-metric-dropdown',
-                options=[
-                    {'label': 'Rig Efficiency', 'value': 'rig_efficiency'},
-                    {'label': 'New Well Productivity', 'value': 'new_well_productivity'},
-                    {'label': 'Production per Well', 'value': 'production_per_well'},
-                    {'label': 'Wells per Rig', 'value': 'wells_per_rig'}
-                ],
-                value='rig_efficiency',
-                style={'width': '200px'}
-            )
-        ], style={'display': 'inline-block'})
-    ], style={'textAlign': 'center', 'marginBottom': 30}),
+            html.Div([
+                html.Label("Color Metric:", style={'fontWeight': 'bold', 'marginBottom': 5}),
+                dcc.Dropdown(
+                    id='page3-9-color-metric-dropdown',
+                    options=[
+                        {'label': 'Rig Efficiency', 'value': 'rig_efficiency'},
+                        {'label': 'New Well Productivity', 'value': 'new_well_productivity'},
+                        {'label': 'Production per Well', 'value': 'production_per_well'},
+                        {'label': 'Wells per Rig', 'value': 'wells_per_rig'}
+                    ],
+                    value='rig_efficiency',
+                    style={'width': '200px'}
+                )
+            ], style={'display': 'inline-block'})
+        ], style={'textAlign': 'center', 'marginBottom': 30}),
     
-    # Productivity Matrix Scatter Plot
-    html.Div([
-        html.H3("Productivity Matrix Scatter Plot", style={'textAlign': 'center'}),
-        dcc.Graph(id='page3-9-productivity-scatter', style={'height': '700px'})
-    ], style={'marginBottom': 40}),
+        # Productivity Matrix Scatter Plot
+        html.Div([
+            html.H3("Productivity Matrix Scatter Plot", style={'textAlign': 'center'}),
+            dcc.Graph(id='page3-9-productivity-scatter', style={'height': '700px'})
+        ], style={'marginBottom': 40}),
     
-    # Efficiency Frontier
-    html.Div([
-        html.H3("Drilling Efficiency Frontier", style={'textAlign': 'center'}),
-        dcc.Graph(id='page3-9-efficiency-frontier', style={'height': '600px'})
+        # Efficiency Frontier
+        html.Div([
+            html.H3("Drilling Efficiency Frontier", style={'textAlign': 'center'}),
+            dcc.Graph(id='page3-9-efficiency-frontier', style={'height': '600px'})
+        ])
     ])
-])
 
 @callback(
     [Output('page3-9-productivity-scatter', 'figure'),
@@ -323,7 +280,7 @@ def update_productivity_analysis(release_date_str, x_metric, y_metric, size_metr
     release_date = pd.to_datetime(release_date_str)
     
     # Get productivity data
-    productivity_df = get_productivity_matrix_data(df_melted, release_date)
+    productivity_df = get_productivity_matrix_data(release_date)
     
     if productivity_df.empty:
         return go.Figure(), go.Figure()
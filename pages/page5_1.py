@@ -13,10 +13,7 @@ processor = CLIDataProcessor()
 
 def generate_market_summary_table(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     summary = filtered_processor.get_market_summary(period_months=1)
     
@@ -91,10 +88,7 @@ def generate_market_summary_table(padd_filter='US'):
 
 def generate_disruption_alerts_table(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     alerts = filtered_processor.get_supply_disruption_alerts(threshold_pct=20)
     
@@ -140,10 +134,7 @@ def generate_disruption_alerts_table(padd_filter='US'):
 
 def create_volume_time_series(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly_data = filtered_processor.get_monthly_trends(n_months=36)
     
@@ -180,10 +171,7 @@ def create_volume_time_series(padd_filter='US'):
 
 def create_top_importers_chart(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_importers = filtered_processor.get_top_importers(n=10, period_months=1)
     
@@ -209,10 +197,7 @@ def create_top_importers_chart(padd_filter='US'):
 
 def create_country_sources_chart(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     country_data = filtered_processor.get_country_analysis(n=10)
     
@@ -261,10 +246,7 @@ def create_padd_distribution_chart():
 
 def create_quality_heatmap(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     df_recent = filtered_processor.get_date_filtered_data(
         start_date=datetime.now() - timedelta(days=365)
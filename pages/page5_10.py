@@ -12,12 +12,7 @@ from src.utils.colors import BLUE, PURPLE, GRAY_300
 processor = CLIDataProcessor()
 
 def generate_supply_disruption_alerts(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get disruption alerts with lower threshold for more sensitivity
     alerts = filtered_processor.get_supply_disruption_alerts(threshold_pct=10)
@@ -85,12 +80,7 @@ def generate_supply_disruption_alerts(padd_filter='US'):
     )
 
 def create_alert_timeline(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate monthly volatility and identify alert periods
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
@@ -157,12 +147,7 @@ def create_alert_timeline(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_concentration_risk_gauge(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate various concentration metrics
     
@@ -248,12 +233,7 @@ def create_concentration_risk_gauge(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_anomaly_detection_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get monthly data and detect anomalies
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
@@ -353,12 +333,7 @@ def create_anomaly_detection_chart(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_risk_heatmap(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate risk metrics by country
     countries = filtered_processor.df.groupby('CNTRY_NAME')['QUANTITY'].sum().nlargest(10).index
@@ -410,12 +385,7 @@ def create_risk_heatmap(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def generate_key_metrics_cards(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate key metrics
     total_volume = filtered_processor.df['QUANTITY'].sum()
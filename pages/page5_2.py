@@ -12,12 +12,7 @@ from src.utils.colors import RED, BLUE, ORANGE, GREEN, PURPLE, GRAY_300, NEGATIV
 processor = CLIDataProcessor()
 
 def generate_top_importers_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_importers = filtered_processor.get_top_importers(n=20)
     
@@ -113,12 +108,7 @@ def generate_top_importers_table(padd_filter='US'):
     )
 
 def generate_dependency_matrix(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     matrix = filtered_processor.get_company_country_matrix(top_n=10)
     
@@ -149,12 +139,7 @@ def generate_dependency_matrix(padd_filter='US'):
     )
 
 def create_company_trends_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_5_companies = filtered_processor.get_top_importers(n=5).index
     
@@ -192,12 +177,7 @@ def create_company_trends_chart(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_market_share_evolution(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_7 = filtered_processor.get_top_importers(n=7)
     
@@ -244,12 +224,7 @@ def create_market_share_evolution(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_dependency_scatter(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     company_stats = []
     for company in filtered_processor.df['R_S_NAME'].unique():
@@ -301,12 +276,7 @@ def create_dependency_scatter(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_quality_profile_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_10 = filtered_processor.get_top_importers(n=10)
     
@@ -346,12 +316,7 @@ def create_quality_profile_chart(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_monthly_pattern_heatmap(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_companies = filtered_processor.get_top_importers(n=12).index
     
@@ -396,12 +361,7 @@ def create_monthly_pattern_heatmap(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_padd_distribution_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_companies = filtered_processor.get_top_importers(n=8).index
     
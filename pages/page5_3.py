@@ -12,10 +12,7 @@ processor = CLIDataProcessor()
 
 def generate_quality_distribution_table(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('P', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     quality_dist = filtered_processor.get_quality_distribution()
     
@@ -60,10 +57,7 @@ def generate_quality_distribution_table(padd_filter='US'):
 
 def generate_arbitrage_table(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('P', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     arbitrage = filtered_processor.get_quality_arbitrage_opportunities()
     
@@ -96,10 +90,7 @@ def generate_arbitrage_table(padd_filter='US'):
 
 def create_api_sulfur_scatter(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('P', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     df_recent = filtered_processor.get_date_filtered_data(
         start_date=datetime.now() - timedelta(days=365)
@@ -137,10 +128,7 @@ def create_api_sulfur_scatter(padd_filter='US'):
 
 def create_quality_evolution(padd_filter='US'):
     # Filter data by PADD if specified
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('P', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD').agg({
         'APIGRAVITY': 'mean',
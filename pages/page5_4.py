@@ -130,31 +130,33 @@ def create_padd_source_mix():
     
     return dcc.Graph(figure=fig)
 
-layout = html.Div([
-    html.Div([
-        html.H1('EIA CLI - Regional/PADD Analysis',
-                style={'textAlign': 'center', 'marginBottom': '30px'}),
-        
+def layout():
+    """Built on first navigation (see src/config/routes.py)"""
+    return html.Div([
         html.Div([
-            html.H3('PADD Summary Statistics', style={'marginBottom': '20px'}),
-            generate_padd_summary_table()
-        ], style={'marginBottom': '40px'}),
+            html.H1('EIA CLI - Regional/PADD Analysis',
+                    style={'textAlign': 'center', 'marginBottom': '30px'}),
         
-        html.Hr(),
+            html.Div([
+                html.H3('PADD Summary Statistics', style={'marginBottom': '20px'}),
+                generate_padd_summary_table()
+            ], style={'marginBottom': '40px'}),
         
-        html.Div([
-            html.H3('Top Ports of Entry', style={'marginBottom': '20px'}),
-            generate_port_analysis_table()
-        ], style={'marginBottom': '40px'}),
+            html.Hr(),
         
-        html.Hr(),
+            html.Div([
+                html.H3('Top Ports of Entry', style={'marginBottom': '20px'}),
+                generate_port_analysis_table()
+            ], style={'marginBottom': '40px'}),
         
-        html.Div([
-            html.Div([create_padd_trends()],
-                    style={'width': '48%', 'display': 'inline-block'}),
-            html.Div([create_padd_source_mix()],
-                    style={'width': '48%', 'display': 'inline-block', 'float': 'right'})
-        ], style={'marginBottom': '30px'})
+            html.Hr(),
+        
+            html.Div([
+                html.Div([create_padd_trends()],
+                        style={'width': '48%', 'display': 'inline-block'}),
+                html.Div([create_padd_source_mix()],
+                        style={'width': '48%', 'display': 'inline-block', 'float': 'right'})
+            ], style={'marginBottom': '30px'})
         
-    ], style={'padding': '20px', 'maxWidth': '1600px', 'margin': 'auto'})
-])
+        ], style={'padding': '20px', 'maxWidth': '1600px', 'margin': 'auto'})
+    ])
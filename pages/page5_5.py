@@ -11,12 +11,7 @@ from src.utils.colors import COLORSCALE_HEATMAP, GRAY_300
 processor = CLIDataProcessor()
 
 def generate_country_risk_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     country_stats = filtered_processor.get_country_analysis(n=15)
     
@@ -65,12 +60,7 @@ def generate_country_risk_table(padd_filter='US'):
     )
 
 def create_country_trends(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     top_countries = filtered_processor.get_country_analysis(n=10).index[:5]
     
@@ -100,12 +90,7 @@ def create_country_trends(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_geographic_distribution(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     country_data = filtered_processor.get_country_analysis(n=20)
     
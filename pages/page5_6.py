@@ -10,12 +10,7 @@ from src.utils.colors import GRAY_300, NEGATIVE
 processor = CLIDataProcessor()
 
 def generate_seasonality_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     seasonality = filtered_processor.get_seasonality_analysis()
     
@@ -48,12 +43,7 @@ def generate_seasonality_table(padd_filter='US'):
     )
 
 def create_seasonal_decomposition(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
     
@@ -90,12 +80,7 @@ def create_seasonal_decomposition(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_monthly_pattern(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     seasonality = filtered_processor.get_seasonality_analysis()
     
@@ -120,12 +105,7 @@ def create_monthly_pattern(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_forecast_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
     
@@ -1,88 +1,27 @@
 import pandas as pd
 import numpy as np
-from dash import html, dash_table, dcc, Input, Output, callback
+from dash import html, dash_table, dcc, Input, Output, State, callback
+from dash.exceptions import PreventUpdate
 from dash.dash_table.Format import Format
 import plotly.graph_objects as go
 from src.cli.cli_data_processor import CLIDataProcessor
 from datetime import datetime, timedelta
 from src.app import app
 from src.utils.colors import BLUE, PURPLE, ORANGE, GRAY_300, NEGATIVE
-from sklearn.linear_model import LinearRegression
-from statsmodels.tsa.seasonal import seasonal_decompose
-from statsmodels.tsa.arima.model import ARIMA
+from src.cli.forecast import arima_forecast
+from src.components.jobs import POLL_INTERVAL, job_status
+from dash_eia import jobs
 
 processor = CLIDataProcessor()
 
-def create_arima_forecast(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
-    
-    monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
-    
-    # Fit ARIMA model with automatic parameter selection
-    try:
-        from pmdarima import auto_arima
-        # Use auto_arima for better parameter selection
-        auto_model = auto_arima(monthly, 
-                               seasonal=True, 
-                               m=12,  # monthly seasonality
-                               suppress_warnings=True,
-                               stepwise=True,
-                               trace=False,
-                               max_p=3, max_q=3, max_d=2,
-                               max_P=2, max_Q=2, max_D=1)
-        
-        # Get forecast with proper confidence intervals
-        forecast_result = auto_model.predict(n_periods=12, return_conf_int=True)
-        forecast = forecast_result[0]
-        conf_int = forecast_result[1]
-        lower_bound = conf_int[:, 0]
-        upper_bound = conf_int[:, 1]
-        
-        future_dates = pd.date_range(start=monthly.index[-1] + pd.DateOffset(months=1), periods=12, freq='MS')
-        
-    except:
-        # Enhanced ARIMA with seasonal decomposition
-        try:
-            # Try SARIMA model with seasonal parameters
-            model = ARIMA(monthly, order=(1,1,1), seasonal_order=(1,1,1,12))
-            fitted_model = model.fit()
-            
-            # Get forecast with prediction intervals
-            forecast_df = fitted_model.get_forecast(steps=12)
-            forecast = forecast_df.predicted_mean
-            conf_int = forecast_df.conf_int(alpha=0.05)
-            lower_bound = conf_int.iloc[:, 0]
-            upper_bound = conf_int.iloc[:, 1]
-            
-        except:
-            # Fallback to ARIMA with trend and seasonality
-            decomposition = seasonal_decompose(monthly[-36:], model='multiplicative', period=12)
-            seasonal_factor = decomposition.seasonal[-12:].values
-            
-            # Deseasonalize the data
-            deseasonalized = monthly / decomposition.seasonal.reindex(monthly.index, method='ffill').fillna(1)
-            
-            # Fit ARIMA on deseasonalized data
-            model = ARIMA(deseasonalized, order=(2,1,2))
-            fitted_model = model.fit()
-            forecast_deseasonalized = fitted_model.forecast(steps=12)
-            
-            # Reapply seasonality
-            forecast = forecast_deseasonalized * np.tile(seasonal_factor, 1)[:12]
-            
-            # Calculate more realistic confidence intervals
-            residuals = fitted_model.resid
-            forecast_std = np.std(residuals) * np.sqrt(1 + np.arange(1, 13) * 0.1)
-            upper_bound = forecast + 1.96 * forecast_std
-            lower_bound = forecast - 1.96 * forecast_std
-        
-        future_dates = pd.date_range(start=monthly.index[-1] + pd.DateOffset(months=1), periods=12, freq='MS')
-    
+def create_arima_forecast(result):
+    """Chart of an `src.cli.forecast.arima_forecast` result."""
+    monthly = pd.Series(result['history'], index=pd.DatetimeIndex(result['history_dates']))
+    future_dates = pd.DatetimeIndex(result['dates'])
+    forecast = result['forecast']
+    lower_bound = result['lower']
+    upper_bound = result['upper']
+
     fig = go.Figure()
     
     # Historical data
@@ -131,8 +70,9 @@ def create_arima_forecast(padd_filter='US'):
     y_max = np.nanmax(all_values) * 1.05
     
     # Add a vertical line at the forecast start
-    # Keep as timestamp for plotly compatibility
-    forecast_start = monthly.index[-1]
+    # As epoch milliseconds: plotly averages x to place the annotation, which a
+    # Timestamp does not support
+    forecast_start = monthly.index[-1].timestamp() * 1000
     fig.add_vline(x=forecast_start, 
                   line_dash="dash", 
                   line_color="gray", 
@@ -162,12 +102,7 @@ def create_arima_forecast(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_trend_analysis(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
     
@@ -223,12 +158,7 @@ def create_trend_analysis(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_yoy_comparison(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     current_year = datetime.now().year
     years = [current_year - 2, current_year - 1, current_year]
@@ -260,12 +190,7 @@ def create_yoy_comparison(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_volatility_analysis(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
     
@@ -307,12 +232,10 @@ def create_volatility_analysis(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def generate_forecast_metrics_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    from sklearn.linear_model import LinearRegression
+    from statsmodels.tsa.seasonal import seasonal_decompose
+
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
     
@@ -415,7 +338,10 @@ layout = html.Div([
             ], style={'width': '30%', 'display': 'inline-block', 'verticalAlign': 'top'}),
             
             html.Div([
-                html.Div(id='arima-forecast-chart')
+                html.Div(id='arima-forecast-chart'),
+                # The ARIMA fit runs as a background job, polled until it finishes
+                dcc.Store(id='arima-forecast-job'),
+                dcc.Interval(id='arima-forecast-poll', interval=POLL_INTERVAL, disabled=True)
             ], style={'width': '68%', 'display': 'inline-block', 'float': 'right'})
         ], style={'marginBottom': '40px'}),
         
@@ -442,14 +368,39 @@ layout = html.Div([
      Output('arima-forecast-chart', 'children'),
      Output('trend-analysis-chart', 'children'),
      Output('forecast-yoy-comparison-chart', 'children'),
-     Output('volatility-analysis-chart', 'children')],
+     Output('volatility-analysis-chart', 'children'),
+     Output('arima-forecast-job', 'data'),
+     Output('arima-forecast-poll', 'disabled')],
     Input('padd-filter-forecast', 'value')
 )
 def update_forecast_charts(padd_filter):
+    # Viewers of the same PADD share one fit while it runs
+    job_id = jobs.default_queue().submit(arima_forecast, padd_filter,
+                                         key=f'arima_forecast:{padd_filter}')
     return (
         generate_forecast_metrics_table(padd_filter),
-        create_arima_forecast(padd_filter),
+        job_status(jobs.default_queue().status(job_id), 'ARIMA forecast'),
         create_trend_analysis(padd_filter),
         create_yoy_comparison(padd_filter),
-        create_volatility_analysis(padd_filter)
+        create_volatility_analysis(padd_filter),
+        job_id,
+        False
     )
+
+@callback(
+    [Output('arima-forecast-chart', 'children', allow_duplicate=True),
+     Output('arima-forecast-poll', 'disabled', allow_duplicate=True)],
+    Input('arima-forecast-poll', 'n_intervals'),
+    State('arima-forecast-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_arima_forecast(n_intervals, job_id):
+    if not job_id:
+        raise PreventUpdate
+    queue = jobs.default_queue()
+    job = queue.status(job_id)
+    if job is not None and job.active:
+        return job_status(job, 'ARIMA forecast'), False
+    if job is not None and job.status == jobs.DONE:
+        return create_arima_forecast(queue.result(job_id)), True
+    return job_status(job, 'ARIMA forecast'), True
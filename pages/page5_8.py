@@ -12,12 +12,7 @@ from src.utils.colors import COLORSCALE_SEQUENTIAL, GRAY_300
 processor = CLIDataProcessor()
 
 def generate_port_summary_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate monthly aggregates first
     monthly_by_port = filtered_processor.df.groupby(['PORT_CITY', 'RPT_PERIOD'])['QUANTITY'].sum().reset_index()
@@ -81,12 +76,7 @@ def generate_port_summary_table(padd_filter='US'):
     )
 
 def create_port_volume_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get top 10 ports
     top_ports = filtered_processor.df.groupby('PORT_CITY')['QUANTITY'].sum().nlargest(10).index
@@ -124,12 +114,7 @@ def create_port_volume_chart(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_port_efficiency_scatter(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate port efficiency metrics
     port_metrics = []
@@ -185,12 +170,7 @@ def create_port_efficiency_scatter(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_port_quality_heatmap(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get top ports and countries
     top_ports = filtered_processor.df.groupby('PORT_CITY')['QUANTITY'].sum().nlargest(10).index
@@ -232,12 +212,7 @@ def create_port_quality_heatmap(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_port_utilization_gauge(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get top 6 ports for gauge charts
     top_ports = filtered_processor.df.groupby('PORT_CITY')['QUANTITY'].sum().nlargest(6).index
@@ -288,12 +263,7 @@ def create_port_utilization_gauge(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_port_padd_distribution(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get PADD distribution
     padd_volumes = filtered_processor.df.groupby('PORT_PADD')['QUANTITY'].sum()
@@ -12,12 +12,7 @@ from src.utils.colors import RED, BLUE, ORANGE, GREEN, PURPLE, GRAY_300
 processor = CLIDataProcessor()
 
 def create_sankey_diagram(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get top countries, companies, and PADDs
     top_countries = filtered_processor.df.groupby('CNTRY_NAME')['QUANTITY'].sum().nlargest(8).index
@@ -93,12 +88,7 @@ def create_sankey_diagram(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_trade_matrix_heatmap(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Create company-country matrix
     matrix = filtered_processor.get_company_country_matrix(top_n=12)
@@ -127,12 +117,7 @@ def create_trade_matrix_heatmap(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_route_analysis_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Analyze country-PADD routes
     route_data = []
@@ -174,12 +159,7 @@ def create_route_analysis_chart(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def create_diversification_analysis(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate diversification metrics
     diversification_data = []
@@ -244,12 +224,7 @@ def create_diversification_analysis(padd_filter='US'):
     return dcc.Graph(figure=fig)
 
 def generate_trade_balance_table(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Calculate trade metrics by country
     country_stats = []
@@ -317,12 +292,7 @@ def generate_trade_balance_table(padd_filter='US'):
     )
 
 def create_flow_timeline_chart(padd_filter='US'):
-    filtered_processor = CLIDataProcessor()
-    if padd_filter != 'US':
-        padd_num = int(padd_filter.replace('PADD ', ''))
-        filtered_processor.df = filtered_processor.df[filtered_processor.df['PORT_PADD'] == padd_num]
-    else:
-        filtered_processor = processor
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
     
     # Get top 5 countries
     top_countries = filtered_processor.df.groupby('CNTRY_NAME')['QUANTITY'].sum().nlargest(5).index
@@ -1,7 +1,6 @@
 import os
 from dash import Dash
 import dash_bootstrap_components as dbc
-import pandas as pd
 
 # Project root is one level up from src/
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,22 +10,18 @@ app = Dash(__name__, suppress_callback_exceptions=True,
            external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server
 
+
+@server.before_request
+def _check_data_version():
+    """Let the in-memory datasets pick up a refresh (throttled, see src.utils.registry)"""
+    from src.utils import registry
+    registry.check()
+
+
 def load_data():
-    """Load initial data"""
-    try:
-        from src.utils.data_loader import loader
-        df = loader.load_wps_pivot_data()
-        return df.to_dict('records')
-    except Exception as e:
-        print(f"Failed to load data: {e}")
-        # Fallback to direct file loading
-        try:
-            return pd.read_feather('./data/wps/wps_gte_2015_pivot.feather').to_dict('records')
-        except:
-            try:
-                return pd.read_csv('./data/wps/wps_gte_2015_pivot.csv').to_dict('records')
-            except FileNotFoundError:
-                return []
+    """Handle to the WPS pivot; the frame itself stays on the server (see src.utils.datasets)"""
+    from src.utils.datasets import handle
+    return handle('wps_pivot')
 
 # Load the data into a variable
-initial_data = load_data()
\ No newline at end of file
+initial_data = load_data()
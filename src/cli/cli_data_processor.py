@@ -1,47 +1,202 @@
+import os
+import threading
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from functools import lru_cache
 import warnings
+from src.cli.cube import build_cube, cube_path_for
+from src.cli.store import CRUDE, dataset_version, read_imports
+from src.utils import registry
 warnings.filterwarnings('ignore')
 
+# The partitioned store (src/cli/store.py), of which the pages read the crude rows
+DEFAULT_DATA_PATH = 'data/cli/companylevelimports'
+
+# One enriched frame (and one aggregate cube) per data path per process,
+# keyed by absolute path and replaced when the file's (mtime, size) changes so a
+# data refresh is picked up without a restart. PADD views are cut once per load
+# and reused.
+_shared_frames = {}
+_shared_frames_lock = threading.RLock()
+
+
+def _file_version(path):
+    if os.path.isdir(path):
+        return dataset_version(path)
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_imports(path):
+    """The crude rows of a partitioned store, or a single parquet file as is."""
+    if os.path.isdir(path):
+        return read_imports(path, products=CRUDE)
+    return pd.read_parquet(path)
+
+
+def enrich_frame(df):
+    """Add the derived columns every CLI page relies on to a raw import frame."""
+    df = df.copy()
+    df['RPT_PERIOD'] = pd.to_datetime(df['RPT_PERIOD'])
+
+    # Calculate days in each month for kbd conversion
+    df['DAYS_IN_MONTH'] = df['RPT_PERIOD'].dt.daysinmonth
+
+    # Store original QUANTITY in thousand barrels for reference
+    df['QUANTITY_MB'] = df['QUANTITY']
+
+    # Convert QUANTITY to kbd (thousands of barrels per day)
+    # QUANTITY is monthly total in thousand barrels, divide by days in month
+    df['QUANTITY'] = df['QUANTITY_MB'] / df['DAYS_IN_MONTH']
+
+    df['YEAR'] = df['RPT_PERIOD'].dt.year
+    df['MONTH'] = df['RPT_PERIOD'].dt.month
+    # One strftime per distinct month rather than per row
+    df['YEAR_MONTH'] = df['RPT_PERIOD'].dt.to_period('M').astype(str)
+
+    df['API_CATEGORY'] = pd.cut(
+        df['APIGRAVITY'],
+        bins=[0, 22, 31, 100],
+        labels=['Heavy (<22)', 'Medium (22-31)', 'Light (>31)']
+    )
+
+    df['SULFUR_CATEGORY'] = pd.cut(
+        df['SULFUR'],
+        bins=[-np.inf, 0.5, 1.5, np.inf],
+        labels=['Sweet (<0.5%)', 'Medium (0.5-1.5%)', 'Sour (>1.5%)']
+    )
+    return df
+
+
+def parse_padd_filter(padd_filter):
+    """Map a dropdown value ('US', 'PADD 3', 'P3', 3) to a PADD number, or None for all US."""
+    if padd_filter is None or padd_filter == 'US':
+        return None
+    return int(str(padd_filter).replace('PADD ', '').replace('P', ''))
+
+
+def _shared_view(cache_key, version, load, padd_filter):
+    padd_num = parse_padd_filter(padd_filter)
+    with _shared_frames_lock:
+        entry = _shared_frames.get(cache_key)
+        if entry is None or entry['version'] != version:
+            entry = {'version': version, 'frame': load(), 'views': {}}
+            _shared_frames[cache_key] = entry
+        if padd_num is None:
+            return entry['frame']
+        view = entry['views'].get(padd_num)
+        if view is None:
+            frame = entry['frame']
+            view = frame[frame['PORT_PADD'] == padd_num]
+            entry['views'][padd_num] = view
+        return view
+
+
+def get_shared_frame(data_path=DEFAULT_DATA_PATH, padd_filter='US'):
+    """Return the process-wide enriched CLI frame, optionally narrowed to one PADD.
+
+    The frame is shared by every caller in the worker and must be treated as
+    read-only; take a ``.copy()`` before adding or overwriting columns.
+    """
+    key = os.path.abspath(data_path)
+    return _shared_view(
+        ('frame', key),
+        _file_version(key),
+        lambda: enrich_frame(_read_imports(key)),
+        padd_filter,
+    )
+
+
+def get_shared_cube(data_path=DEFAULT_DATA_PATH, padd_filter='US'):
+    """Return the aggregate cube for a CLI parquet file, optionally narrowed to one PADD.
+
+    The cube written by `src/cli/main.py` is used when it is at least as new as
+    its source; otherwise it is built once from the shared frame.
+    """
+    key = os.path.abspath(data_path)
+    source_version = _file_version(key)
+    cube_file = cube_path_for(key)
+    cube_version = _file_version(cube_file) if os.path.exists(cube_file) else None
+    is_current = cube_version is not None and cube_version[0] >= source_version[0]
+
+    def load():
+        if is_current:
+            return pd.read_parquet(cube_file)
+        return build_cube(get_shared_frame(key))
+
+    return _shared_view(('cube', key), (source_version, cube_version), load, padd_filter)
+
+
+def clear_shared_frames():
+    """Drop every cached frame; the next access reloads from disk."""
+    with _shared_frames_lock:
+        _shared_frames.clear()
+
+
+# Frees the previous frame as soon as a refresh lands rather than on next use
+registry.on_change([DEFAULT_DATA_PATH], clear_shared_frames)
+
+
 class CLIDataProcessor:
-    def __init__(self, data_path='data/cli/companylevelimports_crude.parquet'):
+    def __init__(self, data_path=DEFAULT_DATA_PATH, padd_filter='US'):
         self.data_path = data_path
-        self.df = None
-        self.load_data()
-    
-    def load_data(self):
-        self.df = pd.read_parquet(self.data_path)
-        self.df['RPT_PERIOD'] = pd.to_datetime(self.df['RPT_PERIOD'])
-        
-        # Calculate days in each month for kbd conversion
-        # Get the last day of each month
-        self.df['DAYS_IN_MONTH'] = self.df['RPT_PERIOD'].dt.daysinmonth
-        
-        # Store original QUANTITY in thousand barrels for reference
-        self.df['QUANTITY_MB'] = self.df['QUANTITY']
-        
-        # Convert QUANTITY to kbd (thousands of barrels per day)
-        # QUANTITY is monthly total in thousand barrels, divide by days in month
-        self.df['QUANTITY'] = self.df['QUANTITY_MB'] / self.df['DAYS_IN_MONTH']
-        
-        self.df['YEAR'] = self.df['RPT_PERIOD'].dt.year
-        self.df['MONTH'] = self.df['RPT_PERIOD'].dt.month
-        self.df['YEAR_MONTH'] = self.df['RPT_PERIOD'].dt.strftime('%Y-%m')
-        
-        self.df['API_CATEGORY'] = pd.cut(
-            self.df['APIGRAVITY'],
-            bins=[0, 22, 31, 100],
-            labels=['Heavy (<22)', 'Medium (22-31)', 'Light (>31)']
-        )
-        
-        self.df['SULFUR_CATEGORY'] = pd.cut(
-            self.df['SULFUR'],
-            bins=[-np.inf, 0.5, 1.5, np.inf],
-            labels=['Sweet (<0.5%)', 'Medium (0.5-1.5%)', 'Sour (>1.5%)']
+        self.padd_filter = padd_filter
+        self._df = None
+
+    @property
+    def df(self):
+        """The enriched frame: an explicitly assigned one, else the shared cached view."""
+        if self._df is not None:
+            return self._df
+        return get_shared_frame(self.data_path, self.padd_filter)
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+
+    @property
+    def cube(self):
+        """The monthly aggregate cube matching ``df`` (see src/cli/cube.py)."""
+        if self._df is not None:
+            return build_cube(self._df)
+        return get_shared_cube(self.data_path, self.padd_filter)
+
+    @staticmethod
+    def _summarize_cube(cube, entity):
+        """Per-entity volume and row-level quality statistics from cube cells.
+
+        Average kbd is total thousand barrels over total days in the months the
+        entity imported, and the API/sulfur means are plain row means, exactly
+        as they were when computed from the raw rows.
+        """
+        monthly = cube.groupby([entity, 'RPT_PERIOD']).agg({
+            'QUANTITY_MB': 'sum',
+            'DAYS_IN_MONTH': 'first'
+        })
+        stats = monthly.groupby(entity).agg({
+            'QUANTITY_MB': 'sum',
+            'DAYS_IN_MONTH': 'sum'
+        })
+        sums = cube.groupby(entity)[['API_SUM', 'API_COUNT', 'SULFUR_SUM', 'SULFUR_COUNT']].sum()
+        stats['APIGRAVITY'] = (sums['API_SUM'] / sums['API_COUNT']).round(2)
+        stats['SULFUR'] = (sums['SULFUR_SUM'] / sums['SULFUR_COUNT']).round(2)
+        stats['Avg kbd'] = (stats['QUANTITY_MB'] / stats['DAYS_IN_MONTH']).round(1)
+        return stats
+
+    @staticmethod
+    def _primary_padd(cube, entity):
+        """The PADD with the most raw rows per entity, ties going to the first seen."""
+        padds = cube.groupby([entity, 'PORT_PADD'], as_index=False).agg(
+            ROW_COUNT=('ROW_COUNT', 'sum'),
+            FIRST_ROW=('FIRST_ROW', 'min')
         )
-    
+        padds = padds.sort_values([entity, 'ROW_COUNT', 'FIRST_ROW'], ascending=[True, False, True])
+        return padds.drop_duplicates(entity).set_index(entity)['PORT_PADD']
+
+    def load_data(self):
+        self._df = None
+        return self.df
+
     def get_date_filtered_data(self, start_date=None, end_date=None):
         df = self.df.copy()
         if start_date:
@@ -50,7 +205,6 @@ class CLIDataProcessor:
             df = df[df['RPT_PERIOD'] <= pd.to_datetime(end_date)]
         return df
     
-    @lru_cache(maxsize=32)
     def get_market_summary(self, period_months=1):
         latest_date = self.df['RPT_PERIOD'].max()
         start_date = latest_date - pd.DateOffset(months=period_months)
@@ -116,119 +270,49 @@ class CLIDataProcessor:
         return pd.DataFrame(alerts).sort_values('Change %')
     
     def get_top_importers(self, n=10, period_months=None):
-        df = self.df.copy()
+        cube = self.cube
         if period_months:
-            latest_date = df['RPT_PERIOD'].max()
+            latest_date = cube['RPT_PERIOD'].max()
             start_date = latest_date - pd.DateOffset(months=period_months)
-            df = df[df['RPT_PERIOD'] >= start_date]
-        
-        # First aggregate by company and month to get monthly totals
-        monthly = df.groupby(['R_S_NAME', 'RPT_PERIOD']).agg({
-            'QUANTITY_MB': 'sum',
-            'DAYS_IN_MONTH': 'first'  # Take first since all records in month have same days
-        })
-        
-        # Now aggregate by company
-        top = monthly.groupby('R_S_NAME').agg({
-            'QUANTITY_MB': 'sum',  # Total thousand barrels
-            'DAYS_IN_MONTH': 'sum'  # Total days across all months
-        })
-        
-        # Count number of months for each company to get proper average
-        month_counts = monthly.groupby('R_S_NAME').size()
-        top = top.join(month_counts.rename('MONTH_COUNT'))
-        
-        # Add other statistics from original data
-        other_stats = df.groupby('R_S_NAME').agg({
-            'CNTRY_NAME': 'nunique',
-            'APIGRAVITY': 'mean',
-            'SULFUR': 'mean',
-            'PORT_PADD': lambda x: x.value_counts().index[0] if len(x) > 0 else None
-        }).round(2)
-        
-        top = top.join(other_stats)
-        
-        # Calculate average kbd properly: total barrels / total days
-        top['Avg kbd'] = (top['QUANTITY_MB'] / top['DAYS_IN_MONTH']).round(1)
-        
-        top = top.drop(['QUANTITY_MB', 'DAYS_IN_MONTH', 'MONTH_COUNT'], axis=1)
-        top.columns = ['Source Countries', 'Avg API', 'Avg Sulfur', 'Primary PADD', 'Avg kbd']
-        
-        # Reorder columns
+            cube = cube[cube['RPT_PERIOD'] >= start_date]
+
+        top = self._summarize_cube(cube, 'R_S_NAME')
+        top['Source Countries'] = cube.groupby('R_S_NAME')['CNTRY_NAME'].nunique()
+        top['Primary PADD'] = self._primary_padd(cube, 'R_S_NAME')
+
+        top = top.rename(columns={'APIGRAVITY': 'Avg API', 'SULFUR': 'Avg Sulfur'})
         top = top[['Avg kbd', 'Source Countries', 'Avg API', 'Avg Sulfur', 'Primary PADD']]
-        
+
         # Calculate market share based on average kbd
         top['Market Share %'] = (top['Avg kbd'] / top['Avg kbd'].sum() * 100).round(1)
-        
+
         return top.sort_values('Avg kbd', ascending=False).head(n)
-    
+
     def get_country_analysis(self, n=10):
-        # First aggregate by country and month
-        monthly = self.df.groupby(['CNTRY_NAME', 'RPT_PERIOD']).agg({
-            'QUANTITY_MB': 'sum',
-            'DAYS_IN_MONTH': 'first'
-        })
-        
-        # Now aggregate by country
-        country_stats = monthly.groupby('CNTRY_NAME').agg({
-            'QUANTITY_MB': 'sum',
-            'DAYS_IN_MONTH': 'sum'
-        })
-        
-        # Add other statistics
-        other_stats = self.df.groupby('CNTRY_NAME').agg({
-            'R_S_NAME': 'nunique',
-            'APIGRAVITY': 'mean',
-            'SULFUR': 'mean',
-            'PORT_PADD': lambda x: x.value_counts().index[0] if len(x) > 0 else None
-        }).round(2)
-        
-        country_stats = country_stats.join(other_stats)
-        
-        # Calculate average kbd
-        country_stats['Avg kbd'] = (country_stats['QUANTITY_MB'] / country_stats['DAYS_IN_MONTH']).round(1)
-        country_stats = country_stats.drop(['QUANTITY_MB', 'DAYS_IN_MONTH'], axis=1)
-        
-        country_stats.columns = ['Importers', 'Avg API', 'Avg Sulfur', 'Primary PADD', 'Avg kbd']
+        cube = self.cube
+        country_stats = self._summarize_cube(cube, 'CNTRY_NAME')
+        country_stats['Importers'] = cube.groupby('CNTRY_NAME')['R_S_NAME'].nunique()
+        country_stats['Primary PADD'] = self._primary_padd(cube, 'CNTRY_NAME')
+
+        country_stats = country_stats.rename(columns={'APIGRAVITY': 'Avg API', 'SULFUR': 'Avg Sulfur'})
         country_stats = country_stats[['Avg kbd', 'Importers', 'Avg API', 'Avg Sulfur', 'Primary PADD']]
         country_stats['Market Share %'] = (country_stats['Avg kbd'] / country_stats['Avg kbd'].sum() * 100).round(1)
-        
+
         return country_stats.sort_values('Avg kbd', ascending=False).head(n)
-    
+
     def get_padd_summary(self):
-        # First aggregate by PADD and month
-        monthly = self.df.groupby(['PORT_PADD', 'RPT_PERIOD']).agg({
-            'QUANTITY_MB': 'sum',
-            'DAYS_IN_MONTH': 'first'
-        })
-        
-        # Now aggregate by PADD
-        padd_stats = monthly.groupby('PORT_PADD').agg({
-            'QUANTITY_MB': 'sum',
-            'DAYS_IN_MONTH': 'sum'
-        })
-        
-        # Add other statistics
-        other_stats = self.df.groupby('PORT_PADD').agg({
-            'R_S_NAME': 'nunique',
-            'CNTRY_NAME': 'nunique',
-            'APIGRAVITY': 'mean',
-            'SULFUR': 'mean'
-        }).round(2)
-        
-        padd_stats = padd_stats.join(other_stats)
-        
-        # Calculate average kbd
-        padd_stats['Avg kbd'] = (padd_stats['QUANTITY_MB'] / padd_stats['DAYS_IN_MONTH']).round(1)
-        padd_stats = padd_stats.drop(['QUANTITY_MB', 'DAYS_IN_MONTH'], axis=1)
-        
-        padd_stats.columns = ['Companies', 'Countries', 'Avg API', 'Avg Sulfur', 'Avg kbd']
+        cube = self.cube
+        padd_stats = self._summarize_cube(cube, 'PORT_PADD')
+        padd_stats['Companies'] = cube.groupby('PORT_PADD')['R_S_NAME'].nunique()
+        padd_stats['Countries'] = cube.groupby('PORT_PADD')['CNTRY_NAME'].nunique()
+
+        padd_stats = padd_stats.rename(columns={'APIGRAVITY': 'Avg API', 'SULFUR': 'Avg Sulfur'})
         padd_stats = padd_stats[['Avg kbd', 'Companies', 'Countries', 'Avg API', 'Avg Sulfur']]
         padd_stats['Market Share %'] = (padd_stats['Avg kbd'] / padd_stats['Avg kbd'].sum() * 100).round(1)
         padd_stats.index = [f'PADD {int(x)}' for x in padd_stats.index]
-        
+
         return padd_stats.sort_values('Avg kbd', ascending=False)
-    
+
     def get_quality_distribution(self):
         api_dist = self.df.groupby('API_CATEGORY')['QUANTITY'].sum()
         sulfur_dist = self.df.groupby('SULFUR_CATEGORY')['QUANTITY'].sum()
@@ -262,14 +346,15 @@ class CLIDataProcessor:
         return monthly.round(1)
     
     def get_company_country_matrix(self, top_n=10):
-        top_companies = self.df.groupby('R_S_NAME')['QUANTITY'].sum().nlargest(top_n).index
-        top_countries = self.df.groupby('CNTRY_NAME')['QUANTITY'].sum().nlargest(top_n).index
-        
-        filtered = self.df[
-            (self.df['R_S_NAME'].isin(top_companies)) & 
-            (self.df['CNTRY_NAME'].isin(top_countries))
+        cube = self.cube
+        top_companies = cube.groupby('R_S_NAME')['QUANTITY'].sum().nlargest(top_n).index
+        top_countries = cube.groupby('CNTRY_NAME')['QUANTITY'].sum().nlargest(top_n).index
+
+        filtered = cube[
+            (cube['R_S_NAME'].isin(top_companies)) &
+            (cube['CNTRY_NAME'].isin(top_countries))
         ]
-        
+
         matrix = filtered.pivot_table(
             index='R_S_NAME',
             columns='CNTRY_NAME',
@@ -277,28 +362,29 @@ class CLIDataProcessor:
             aggfunc='sum',
             fill_value=0
         )
-        
+
         matrix = matrix.div(matrix.sum(axis=1), axis=0) * 100
-        
+
         return matrix.round(1)
-    
+
     def get_port_analysis(self, n=15):
-        port_stats = self.df.groupby(['PORT_CITY', 'PORT_STATE']).agg({
-            'QUANTITY': 'sum',
-            'R_S_NAME': 'nunique',
-            'CNTRY_NAME': 'nunique',
-            'PORT_PADD': lambda x: x.iloc[0] if len(x) > 0 else None
-        }).round(2)
-        
-        port_stats.columns = ['Total Volume', 'Companies', 'Countries', 'PADD']
-        port_stats['Total Volume'] = port_stats['Total Volume'].round(1)
+        cube = self.cube
+        ports = cube.groupby(['PORT_CITY', 'PORT_STATE'])
+        port_stats = pd.DataFrame({
+            'Total Volume': ports['QUANTITY'].sum().round(2).round(1),
+            'Companies': ports['R_S_NAME'].nunique(),
+            'Countries': ports['CNTRY_NAME'].nunique(),
+            # PADD of the port's first raw row
+            'PADD': cube.sort_values('FIRST_ROW').groupby(['PORT_CITY', 'PORT_STATE'])['PORT_PADD'].first(),
+        })
+
         port_stats['Market Share %'] = (port_stats['Total Volume'] / port_stats['Total Volume'].sum() * 100).round(1)
         port_stats = port_stats.reset_index()
         port_stats['Port'] = port_stats['PORT_CITY'] + ', ' + port_stats['PORT_STATE']
         port_stats = port_stats.drop(['PORT_CITY', 'PORT_STATE'], axis=1)
-        
+
         return port_stats.sort_values('Total Volume', ascending=False).head(n)
-    
+
     def get_time_series_data(self, metric='volume', groupby='month', entities=None, entity_type='company'):
         df = self.df.copy()
         
@@ -0,0 +1,58 @@
+"""Monthly aggregate cube for the company level imports.
+
+The CLI summary tables only ever group by period, PADD, country, company and
+port, so the raw import rows are collapsed once at ingest to one row per
+(RPT_PERIOD, PORT_PADD, CNTRY_NAME, R_S_NAME, PORT_CITY, PORT_STATE) cell.
+
+Every statistic the processor reports can be recovered exactly from the cell
+sums: row-level means from API_SUM / API_COUNT, kbd totals from QUANTITY (the
+per-row kbd values summed, which is the cell's QUANTITY_MB over the month's
+days), and first-occurrence tie-breaks from FIRST_ROW, the position of the
+cell's first raw row.
+"""
+import pandas as pd
+
+CUBE_KEYS = ['RPT_PERIOD', 'PORT_PADD', 'CNTRY_NAME', 'R_S_NAME', 'PORT_CITY', 'PORT_STATE']
+
+
+def cube_path_for(data_path):
+    """companylevelimports_crude.parquet -> companylevelimports_crude_cube.parquet
+
+    A partitioned dataset (a directory, see src/cli/store.py) is read for its
+    crude rows, so companylevelimports -> companylevelimports_crude_cube.parquet.
+    """
+    data_path = str(data_path).rstrip('/')
+    if not data_path.endswith('.parquet'):
+        return f'{data_path}_crude_cube.parquet'
+    return f'{data_path[:-len('.parquet')]}_cube.parquet'
+
+
+def build_cube(df):
+    """Collapse an enriched import frame (see cli_data_processor.enrich_frame) to the cube."""
+    df = df[CUBE_KEYS + ['DAYS_IN_MONTH', 'QUANTITY_MB', 'QUANTITY', 'APIGRAVITY', 'SULFUR']]
+    df = df.assign(
+        FIRST_ROW=range(len(df)),
+        API_X_MB=df['APIGRAVITY'] * df['QUANTITY_MB'],
+        SULFUR_X_MB=df['SULFUR'] * df['QUANTITY_MB'],
+    )
+    cube = df.groupby(CUBE_KEYS, dropna=False, observed=True, sort=True).agg(
+        DAYS_IN_MONTH=('DAYS_IN_MONTH', 'first'),
+        QUANTITY_MB=('QUANTITY_MB', 'sum'),
+        QUANTITY=('QUANTITY', 'sum'),
+        ROW_COUNT=('QUANTITY_MB', 'size'),
+        API_SUM=('APIGRAVITY', 'sum'),
+        API_COUNT=('APIGRAVITY', 'count'),
+        SULFUR_SUM=('SULFUR', 'sum'),
+        SULFUR_COUNT=('SULFUR', 'count'),
+        API_X_MB=('API_X_MB', 'sum'),
+        SULFUR_X_MB=('SULFUR_X_MB', 'sum'),
+        FIRST_ROW=('FIRST_ROW', 'min'),
+    )
+    return cube.reset_index()
+
+
+def write_cube(df, path):
+    """Materialize the cube for an enriched frame next to its source parquet."""
+    cube = build_cube(df)
+    cube.to_parquet(path, index=False, compression='zstd', engine='pyarrow')
+    return cube
@@ -1,13 +1,27 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
 import pandas as pd
-from datetime import datetime
+import pyarrow as pa
+import requests
 from dateutil.relativedelta import relativedelta
 
-def create_date_range(start, end):
-    """Create a DataFrame with year and month columns for data pulling."""
-    years = range(start, end + 1)
-    months = range(1, 13)
-    data = [{'year': year, 'month': f'{month:02d}'} for year in years for month in months]
-    return pd.DataFrame(data)
+from dash_eia.config.paths import WorkspacePaths
+from src.cli.store import DATASET_DIR, SCHEMA, partition_path, write_partition
+from src.utils import workbooks
+
+ARCHIVE_URL = 'https://www.eia.gov/petroleum/imports/companylevel/archive/{year}/{year}_{month:02d}/data/import.xlsx'
+MANIFEST_NAME = 'manifest.json'
+DOWNLOAD_WORKERS = 4
+TIMEOUT = 60
+
+# Statuses of a month after a fetch
+NEW, CHANGED, UNCHANGED, MISSING, FAILED = 'new', 'changed', 'unchanged', 'missing', 'failed'
 
 def get_most_recent_release():
     """Get the release date for the most recent data (3 months ago)."""
@@ -15,6 +29,16 @@ def get_most_recent_release():
     three_months_ago = today - relativedelta(months=2)
     return three_months_ago.year, three_months_ago.month
 
+def archive_months(start=2017, end=None):
+    """Months from January of `start` to `end` (default: the most recent release) as 'YYYY-MM'."""
+    if end is None:
+        end = '{}-{:02d}'.format(*get_most_recent_release())
+    return [str(period) for period in pd.period_range(f'{start}-01', end, freq='M')]
+
+def archive_url(month):
+    year, number = month.split('-')
+    return ARCHIVE_URL.format(year=year, month=int(number))
+
 def clean_data(df):
     """Clean the raw DataFrame."""
     df = df.copy()
@@ -24,27 +48,132 @@ def clean_data(df):
         df['GCTRY_CODE'] = df['GCTRY_CODE'].astype(str)
     return df
 
-def main(start=2017, end=2030):
-    """Fetch archived data from the EIA website."""
-    date_range = create_date_range(start, end)
-    max_year, max_month = get_most_recent_release()
-    archived_data = pd.DataFrame()
-
-    for _, row in date_range.iterrows():
-        year, month = row['year'], row['month']
-        url = f"https://www.eia.gov/petroleum/imports/companylevel/archive/{year}/{year}_{month}/data/import.xlsx"
-        print(f"Fetching: {year}-{month}")
-        
+# ---------------------------------------------------------------------------
+# Raw files and manifest
+# ---------------------------------------------------------------------------
+def raw_directory():
+    """Where monthly workbooks and their manifest are kept: <workspace>/data/raw/cli."""
+    return WorkspacePaths.discover().raw / 'cli'
+
+def raw_path(directory, month):
+    return Path(directory) / f'{month}_import.xlsx'
+
+def read_manifest(directory):
+    """{month: {url, etag, last_modified, sha256, fetched}} for the months downloaded so far."""
+    try:
+        with open(Path(directory) / MANIFEST_NAME) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+def write_manifest(directory, manifest):
+    path = Path(directory) / MANIFEST_NAME
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'w') as file:
+        json.dump(dict(sorted(manifest.items())), file, indent=2)
+    os.replace(tmp, path)
+
+def fetch_month(url, path, entry=None):
+    """Fetch one month's workbook unless the server reports it unchanged.
+
+    `entry` is the month's manifest entry from the last fetch; its validators
+    are sent as If-None-Match / If-Modified-Since. Returns (status, entry).
+    """
+    path = Path(path)
+    headers = {}
+    if entry and path.exists():
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = requests.get(url, headers=headers, timeout=TIMEOUT)
+    if response.status_code == 304:
+        return UNCHANGED, entry
+    if response.status_code == 404:
+        return MISSING, entry
+    response.raise_for_status()
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    fetched = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': digest,
+        'fetched': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    if entry and path.exists() and entry.get('sha256') == digest:
+        return UNCHANGED, fetched
+
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(response.content)
+    os.replace(tmp, path)
+    return (CHANGED if entry else NEW), fetched
+
+def fetch_months(months, directory=None, workers=DOWNLOAD_WORKERS):
+    """Bring the raw workbooks of `months` up to date; returns {month: status}.
+
+    Months are fetched concurrently with conditional requests, so a month the
+    server has not changed costs one 304. The manifest is rewritten once at
+    the end with the validators of every month fetched.
+    """
+    directory = Path(directory) if directory is not None else raw_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(directory)
+
+    def fetch(month):
         try:
-            df = pd.read_excel(url, sheet_name='IMPORTS')
-            archived_data = pd.concat([archived_data, df])
-        except:
-            print(f"Error: {year}-{month}")
-            break
+            return fetch_month(archive_url(month), raw_path(directory, month), manifest.get(month))
+        except (requests.RequestException, OSError) as error:
+            print(f'Error: {month} ({error})')
+            return FAILED, manifest.get(month)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = dict(zip(months, pool.map(fetch, months)))
+
+    statuses = {}
+    for month, (status, entry) in results.items():
+        statuses[month] = status
+        if entry is not None and status != MISSING:
+            manifest[month] = entry
+    write_manifest(directory, manifest)
+    return statuses
+
+# ---------------------------------------------------------------------------
+# Month partitions (src/cli/store.py)
+# ---------------------------------------------------------------------------
+def read_month(path):
+    """One month's workbook as a table with the store's schema."""
+    df = clean_data(workbooks.read_workbook(path, sheet_name='IMPORTS'))
+    df = df.reindex(columns=SCHEMA.names)
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+def update_partitions(statuses, raw_dir=None, directory=DATASET_DIR):
+    """Rewrite the partitions of months that are new or changed, or have no partition yet."""
+    raw_dir = Path(raw_dir) if raw_dir is not None else raw_directory()
+    written = []
+    for month, status in sorted(statuses.items()):
+        source = raw_path(raw_dir, month)
+        stale = status in (NEW, CHANGED) or not partition_path(directory, month).exists()
+        if stale and source.exists():
+            write_partition(directory, month, read_month(source))
+            written.append(month)
+    return written
 
-    return clean_data(archived_data)
+def main(start=2017, end=None, workers=DOWNLOAD_WORKERS, raw_dir=None, directory=DATASET_DIR):
+    """Fetch new or changed archive months and update their partitions; returns the months written."""
+    months = archive_months(start, end)
+    statuses = fetch_months(months, raw_dir, workers)
+    counts = pd.Series(statuses).value_counts().to_dict()
+    print('Months: ' + ', '.join(f'{count} {status}' for status, count in counts.items()))
+    written = update_partitions(statuses, raw_dir, directory)
+    print(f'Partitions written: {len(written)}')
+    return written
 
 # Main code execution
 if __name__ == "__main__":
-    df = main()
-    df.to_parquet("./data/cli/companylevelimports.parquet", index=False,compression='zstd',engine='pyarrow')
+    parser = argparse.ArgumentParser(description='Fetch the company level imports archive, month by month')
+    parser.add_argument('--start', type=int, default=2017, help='first year to fetch')
+    parser.add_argument('--workers', type=int, default=DOWNLOAD_WORKERS, help='concurrent downloads')
+    args = parser.parse_args()
+    main(args.start, workers=args.workers)
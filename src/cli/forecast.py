@@ -0,0 +1,92 @@
+"""Twelve-month ARIMA forecast of monthly crude imports.
+
+Fitting takes seconds, so the forecasting page runs `arima_forecast` as a
+background job (see `dash_eia.jobs`) and draws the returned arrays.
+"""
+import numpy as np
+import pandas as pd
+
+from dash_eia.jobs import report_progress
+from src.cli.cli_data_processor import CLIDataProcessor
+
+
+def arima_forecast(padd_filter='US'):
+    """Monthly history and a 12-month forecast with its 95% interval, as a dict of arrays."""
+    # statsmodels is imported on first use: it costs more than the rest of the module
+    from statsmodels.tsa.seasonal import seasonal_decompose
+    from statsmodels.tsa.arima.model import ARIMA
+
+    report_progress(0.1, 'Loading imports')
+    filtered_processor = CLIDataProcessor(padd_filter=padd_filter)
+
+    monthly = filtered_processor.df.groupby('RPT_PERIOD')['QUANTITY'].sum()
+
+    report_progress(0.3, 'Fitting ARIMA')
+    # Fit ARIMA model with automatic parameter selection
+    try:
+        from pmdarima import auto_arima
+        # Use auto_arima for better parameter selection
+        auto_model = auto_arima(monthly,
+                               seasonal=True,
+                               m=12,  # monthly seasonality
+                               suppress_warnings=True,
+                               stepwise=True,
+                               trace=False,
+                               max_p=3, max_q=3, max_d=2,
+                               max_P=2, max_Q=2, max_D=1)
+
+        # Get forecast with proper confidence intervals
+        forecast_result = auto_model.predict(n_periods=12, return_conf_int=True)
+        forecast = forecast_result[0]
+        conf_int = forecast_result[1]
+        lower_bound = conf_int[:, 0]
+        upper_bound = conf_int[:, 1]
+
+        future_dates = pd.date_range(start=monthly.index[-1] + pd.DateOffset(months=1), periods=12, freq='MS')
+
+    except:
+        # Enhanced ARIMA with seasonal decomposition
+        try:
+            # Try SARIMA model with seasonal parameters
+            model = ARIMA(monthly, order=(1,1,1), seasonal_order=(1,1,1,12))
+            fitted_model = model.fit()
+
+            # Get forecast with prediction intervals
+            forecast_df = fitted_model.get_forecast(steps=12)
+            forecast = forecast_df.predicted_mean
+            conf_int = forecast_df.conf_int(alpha=0.05)
+            lower_bound = conf_int.iloc[:, 0]
+            upper_bound = conf_int.iloc[:, 1]
+
+        except:
+            # Fallback to ARIMA with trend and seasonality
+            decomposition = seasonal_decompose(monthly[-36:], model='multiplicative', period=12)
+            seasonal_factor = decomposition.seasonal[-12:].values
+
+            # Deseasonalize the data
+            deseasonalized = monthly / decomposition.seasonal.reindex(monthly.index, method='ffill').fillna(1)
+
+            # Fit ARIMA on deseasonalized data
+            model = ARIMA(deseasonalized, order=(2,1,2))
+            fitted_model = model.fit()
+            forecast_deseasonalized = fitted_model.forecast(steps=12)
+
+            # Reapply seasonality
+            forecast = forecast_deseasonalized * np.tile(seasonal_factor, 1)[:12]
+
+            # Calculate more realistic confidence intervals
+            residuals = fitted_model.resid
+            forecast_std = np.std(residuals) * np.sqrt(1 + np.arange(1, 13) * 0.1)
+            upper_bound = forecast + 1.96 * forecast_std
+            lower_bound = forecast - 1.96 * forecast_std
+
+        future_dates = pd.date_range(start=monthly.index[-1] + pd.DateOffset(months=1), periods=12, freq='MS')
+
+    return {
+        'history_dates': monthly.index.values,
+        'history': monthly.values,
+        'dates': future_dates.values,
+        'forecast': np.asarray(forecast, dtype=float),
+        'lower': np.asarray(lower_bound, dtype=float),
+        'upper': np.asarray(upper_bound, dtype=float),
+    }
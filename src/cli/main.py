@@ -2,14 +2,20 @@ import pandas as pd
 # from src.cli.uploader import cloud
 from src.cli.findallupdates import updatecompiler
 from src.cli.download import main as download
+from src.cli.cli_data_processor import enrich_frame
+from src.cli.cube import cube_path_for, write_cube
+from src.cli.store import CRUDE, DATASET_DIR, dataset_files, read_imports
+
+def write_crude_cube(directory=DATASET_DIR):
+    """Materialize the aggregate cube of the crude rows next to the dataset."""
+    df = read_imports(directory, products=CRUDE)
+    write_cube(enrich_frame(df), cube_path_for(directory))
+    return df
 
 def checkIfFileExists():
-    import os
-    if not os.path.exists('./data/cli/companylevelimports.parquet'):
-        df = download()
-        df.to_parquet('./data/cli/companylevelimports.parquet', index=False, compression='zstd', engine='pyarrow')
-        df = df[df['PROD_NAME']=='Crude Oil']
-        df.to_parquet('./data/cli/companylevelimports_crude.parquet', index=False, compression='zstd', engine='pyarrow')
+    if not dataset_files(DATASET_DIR):
+        download()
+        write_crude_cube()
 
 
 def main():
@@ -23,13 +29,9 @@ def main():
     if needsUpdating:
         try:
             print('New data available. Updating...')
-            df = download()
-            df.to_parquet('data/companylevelimports.parquet', index=False, compression='zstd', engine='pyarrow')
-            # cloud(df, 'regulatory/eia/companylevel', 'companylevelimports.csv',df_index=False)
-            
-            df = df[df['PROD_NAME']=='Crude Oil']
-            df.to_parquet('data/companylevelimports_crude.parquet', index=False, compression='zstd', engine='pyarrow')
-            # cloud(df, 'regulatory/eia/companylevel', 'companylevelimports_crude.csv',df_index=False)
+            if download():
+                write_crude_cube()
+            # cloud(read_imports(), 'regulatory/eia/companylevel', 'companylevelimports.csv',df_index=False)
 
             releaseFile = pd.DataFrame({'category': ['wps'], 'release_date': [release_date]})
             releaseFile.to_csv('./lookup/release_dates.csv', index=False)
@@ -40,4 +42,4 @@ def main():
         print('No new data available. Using existing data.')
         
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
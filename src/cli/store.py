@@ -0,0 +1,134 @@
+"""Company level imports stored as a parquet dataset partitioned by month.
+
+Each month of the archive is one file, ``year=YYYY/month=MM/part-0.parquet``,
+holding the month's rows in the order of EIA's workbook. `read_imports` turns
+date, PADD and product filters into a dataset filter: the date bounds prune
+whole partitions before anything is opened, and the PADD and product filters
+are applied by the reader as it scans the files that remain, so no caller has
+to load the archive to look at a few months of one PADD. The crude subset
+is read this way too rather than kept as a second file.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DATASET_DIR = './data/cli/companylevelimports'
+CRUDE = 'Crude Oil'
+PART_NAME = 'part-0.parquet'
+
+SCHEMA = pa.schema([
+    ('RPT_PERIOD', pa.timestamp('ns')),
+    ('R_S_NAME', pa.string()),
+    ('LINE_NUM', pa.int64()),
+    ('PROD_CODE', pa.int64()),
+    ('PROD_NAME', pa.string()),
+    ('PORT_CODE', pa.int64()),
+    ('PORT_CITY', pa.string()),
+    ('PORT_STATE', pa.string()),
+    ('PORT_PADD', pa.int64()),
+    ('GCTRY_CODE', pa.string()),
+    ('CNTRY_NAME', pa.string()),
+    ('QUANTITY', pa.int64()),
+    ('SULFUR', pa.float64()),
+    ('APIGRAVITY', pa.float64()),
+    ('PCOMP_RNAM', pa.string()),
+    ('PCOMP_SITEID', pa.float64()),
+    ('PCOMP_SNAM', pa.string()),
+    ('PCOMP_STAT', pa.string()),
+    ('STATE_NAME', pa.string()),
+    ('PCOMP_PADD', pa.float64()),
+])
+PARTITION_SCHEMA = pa.schema([('year', pa.int32()), ('month', pa.int32())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+
+def partition_path(directory, month):
+    """directory/year=YYYY/month=MM/part-0.parquet for a 'YYYY-MM' month."""
+    year, number = month.split('-')
+    return Path(directory) / f'year={year}' / f'month={number}' / PART_NAME
+
+
+def dataset_files(directory=DATASET_DIR):
+    """Partition files, oldest month first."""
+    return sorted(str(path) for path in Path(directory).glob(f'year=*/month=*/{PART_NAME}'))
+
+
+def dataset_version(directory=DATASET_DIR):
+    """(newest mtime, total size, file count) of the partitions; changes whenever one is rewritten."""
+    stats = [os.stat(path) for path in dataset_files(directory)]
+    if not stats:
+        raise FileNotFoundError(f'No company level imports partitions under {directory}')
+    return max(s.st_mtime_ns for s in stats), sum(s.st_size for s in stats), len(stats)
+
+
+def write_partition(directory, month, table):
+    """Replace one month's partition atomically."""
+    path = partition_path(directory, month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    pq.write_table(table.cast(SCHEMA), tmp, compression='zstd')
+    os.replace(tmp, path)
+    return path
+
+
+def write_dataset(df, directory=DATASET_DIR):
+    """Write a full import frame as one partition per RPT_PERIOD month; returns the months written."""
+    df = df.reindex(columns=SCHEMA.names)
+    months = df['RPT_PERIOD'].dt.strftime('%Y-%m')
+    for month, rows in df.groupby(months, sort=True):
+        write_partition(directory, month, pa.Table.from_pandas(rows, schema=SCHEMA, preserve_index=False))
+    return sorted(months.unique())
+
+
+def _filter(padd=None, start=None, end=None, products=None):
+    """The dataset expression for a query; None when nothing is filtered."""
+    conditions = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        # The partition columns let whole months be skipped unopened
+        conditions.append((ds.field('year') > start.year) | (
+            (ds.field('year') == start.year) & (ds.field('month') >= start.month)))
+        conditions.append(ds.field('RPT_PERIOD') >= pa.scalar(start.as_unit('ns'), pa.timestamp('ns')))
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append((ds.field('year') < end.year) | (
+            (ds.field('year') == end.year) & (ds.field('month') <= end.month)))
+        conditions.append(ds.field('RPT_PERIOD') <= pa.scalar(end.as_unit('ns'), pa.timestamp('ns')))
+    if padd is not None:
+        padds = [padd] if isinstance(padd, (int, str)) else list(padd)
+        conditions.append(ds.field('PORT_PADD').isin([int(p) for p in padds]))
+    if products is not None:
+        products = [products] if isinstance(products, str) else list(products)
+        conditions.append(ds.field('PROD_NAME').isin(products))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def dataset(directory=DATASET_DIR):
+    """The partitions as a pyarrow dataset, fragments in month order."""
+    return ds.dataset(
+        dataset_files(directory), schema=pa.unify_schemas([SCHEMA, PARTITION_SCHEMA]), format='parquet',
+        partitioning=PARTITIONING, partition_base_dir=str(directory),
+    )
+
+
+def read_imports(directory=DATASET_DIR, padd=None, start=None, end=None, products=None, columns=None):
+    """Import rows matching the filters, oldest month first and in workbook order within a month.
+
+    ``padd`` is a PADD number or a list of them, ``start``/``end`` bound
+    RPT_PERIOD (inclusive), ``products`` is a PROD_NAME or a list of them.
+    Returns an empty frame with the store's columns when there is no data.
+    """
+    columns = list(columns) if columns is not None else SCHEMA.names
+    if not dataset_files(directory):
+        return SCHEMA.empty_table().select(columns).to_pandas()
+    table = dataset(directory).to_table(columns=columns, filter=_filter(padd, start, end, products))
+    return table.to_pandas()
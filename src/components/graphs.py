@@ -0,0 +1,24 @@
+"""Placeholder graphs a page lays out before its figures are drawn."""
+
+from functools import lru_cache
+
+from dash import dcc, html
+import plotly.graph_objects as go
+
+
+@lru_cache(maxsize=1)
+def blank_graph():
+    # One figure shared by every placeholder: building a go.Figure costs ~10ms,
+    # and the WPS pages lay out over a hundred of them.
+    return go.Figure().update_layout(
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+
+
+def create_loading_graph(graph_id):
+    return html.Div(
+        dcc.Graph(id=graph_id, figure=blank_graph()), className="graph-container"
+    )
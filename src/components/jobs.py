@@ -0,0 +1,27 @@
+"""Progress display for background jobs polled by a page (see dash_eia.jobs)."""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+from dash_eia.jobs import CANCELLED, FAILED, RUNNING
+
+# How often a page polls a running job, in milliseconds
+POLL_INTERVAL = 1000
+
+
+def job_status(job, label):
+    """A progress bar for an active job, or a one-line note for one that did not finish."""
+    if job is None:
+        return html.Div(f'{label}: job not found', className='text-muted')
+    if job.status == FAILED:
+        # The last line of the traceback names the exception
+        reason = (job.error or '').strip().splitlines()[-1:] or ['unknown error']
+        return html.Div(f'{label} failed: {reason[0]}', className='text-danger')
+    if job.status == CANCELLED:
+        return html.Div(f'{label} cancelled', className='text-muted')
+    message = job.message or ('Running' if job.status == RUNNING else 'Queued')
+    return html.Div([
+        html.Div(f'{label}: {message}', className='small text-muted'),
+        dbc.Progress(value=round(job.progress * 100), striped=True, animated=True,
+                     style={'height': '8px'}),
+    ])
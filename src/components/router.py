@@ -0,0 +1,38 @@
+"""Resolve a URL path to its page layout, building each layout once."""
+
+import importlib
+import threading
+
+
+class PageRouter:
+    """Route table lookup with a per-page layout cache.
+
+    A page exports `layout` either as a component or as a function that builds
+    one. Either way the router imports the module and builds the layout on the
+    first visit to one of its routes and serves the same tree afterwards;
+    `clear()` drops the built layouts so the next visit rebuilds them. The app
+    clears them whenever a data file changes, since layouts embed data.
+    """
+
+    def __init__(self, routes, default):
+        self.routes = routes
+        self.default = default
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def module_for(self, pathname):
+        return self.routes.get(pathname, self.default)
+
+    def layout(self, pathname):
+        module_name = self.module_for(pathname)
+        with self._lock:
+            if module_name in self._layouts:
+                return self._layouts[module_name]
+        module = importlib.import_module(module_name)
+        layout = module.layout() if callable(module.layout) else module.layout
+        with self._lock:
+            return self._layouts.setdefault(module_name, layout)
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
@@ -0,0 +1,44 @@
+"""Declarative route table: URL path -> page module.
+
+`src/index.py` imports every page up front so their callbacks are registered,
+which is cheap because pages hold no data at import. A page's layout is built
+from this table the first time its route is visited.
+"""
+
+DEFAULT_PAGE = "pages.page1"
+
+ROUTES = {
+    "/": "pages.page1",
+    "/home": "pages.page1",
+    # EIA Weekly
+    "/stats/headline": "pages.page2_1",
+    "/stats/graphing": "pages.page2_2",
+    "/stats/stats_table": "pages.page2_3",
+    "/stats/padd_regional": "pages.page2_4",
+    "/stats/cushing_analysis": "pages.page2_5",
+    "/stats/runs_analysis": "pages.page2_6",
+    "/stats/supply_demand": "pages.page2_7",
+    "/stats/time_series_analytics": "pages.page2_8",
+    # EIA DPR
+    "/dpr/dpr_charts": "pages.page3_1",
+    "/dpr/dpr_table": "pages.page3_2",
+    "/dpr/efficiency_heatmap": "pages.page3_7",
+    "/dpr/duc_waterfall": "pages.page3_8",
+    "/dpr/productivity_matrix": "pages.page3_9",
+    "/dpr/performance_radar": "pages.page3_10",
+    # EIA STEO
+    **{f"/steo/tbd{i}": f"pages.page4_{i}" for i in range(1, 7)},
+    # EIA CLI
+    "/cli/market_overview": "pages.page5_1",
+    "/cli/company_analysis": "pages.page5_2",
+    "/cli/quality_analysis": "pages.page5_3",
+    "/cli/regional_padd": "pages.page5_4",
+    "/cli/country_risk": "pages.page5_5",
+    "/cli/seasonal_patterns": "pages.page5_6",
+    "/cli/forecasting": "pages.page5_7",
+    "/cli/port_analysis": "pages.page5_8",
+    "/cli/trade_flow": "pages.page5_9",
+    "/cli/market_alerts": "pages.page5_10",
+    # EIA PSM
+    **{f"/psm/tbd{i}": f"pages.page6_{i}" for i in range(1, 7)},
+}
@@ -7,6 +7,7 @@ from collections.abc import Sequence
 
 from dash_eia.apps.runner import APP_NAMES
 from dash_eia.config.paths import WorkspacePaths
+from dash_eia.pipelines.dag import WORKERS, PipelineError
 
 
 def _bootstrap(args: argparse.Namespace) -> int:
@@ -15,6 +16,40 @@ def _bootstrap(args: argparse.Namespace) -> int:
     return run(WorkspacePaths.discover(args.workspace))
 
 
+def _refresh(args: argparse.Namespace) -> int:
+    from dash_eia.pipelines.refresh import run
+
+    try:
+        return run(
+            WorkspacePaths.discover(args.workspace),
+            args.only,
+            dry_run=args.dry_run,
+            workers=args.workers,
+        )
+    except PipelineError as exc:
+        raise SystemExit(f"dash-eia refresh: {exc}") from exc
+
+
+def _snapshots(args: argparse.Namespace) -> int:
+    from dash_eia.pipelines.publish import Publisher, PublishError
+
+    publisher = Publisher(WorkspacePaths.discover(args.workspace).data)
+    try:
+        if args.publish:
+            publisher.publish(args.group)
+        elif args.rollback:
+            publisher.rollback(None if args.rollback is True else args.rollback)
+    except PublishError as exc:
+        raise SystemExit(f"dash-eia snapshots: {exc}") from exc
+    current = publisher.current()
+    for snapshot in publisher.snapshots():
+        manifest = snapshot.manifest
+        marker = "*" if current is not None and snapshot.id == current.id else " "
+        groups = ", ".join(manifest["groups"])
+        print(f"{marker} {snapshot.id}  {groups:<10}{len(manifest['files']):3d} files")
+    return 0
+
+
 def _app(args: argparse.Namespace) -> int:
     from dash_eia.apps.runner import run_app
 
@@ -34,6 +69,21 @@ def build_parser() -> argparse.ArgumentParser:
     commands = parser.add_subparsers(dest="command")
     bootstrap = commands.add_parser("bootstrap")
     bootstrap.set_defaults(handler=_bootstrap)
+    refresh = commands.add_parser("refresh")
+    refresh.add_argument(
+        "--only", action="append", metavar="NAME", help="a branch (wps, steo, cli) or node"
+    )
+    refresh.add_argument("--dry-run", action="store_true")
+    refresh.add_argument("--workers", type=int, default=WORKERS)
+    refresh.set_defaults(handler=_refresh)
+    snapshots = commands.add_parser("snapshots")
+    action = snapshots.add_mutually_exclusive_group()
+    action.add_argument("--publish", action="store_true")
+    action.add_argument("--rollback", nargs="?", const=True, metavar="SNAPSHOT")
+    snapshots.add_argument(
+        "--group", action="append", help="with --publish: wps or steo (default: both)"
+    )
+    snapshots.set_defaults(handler=_snapshots)
     app = commands.add_parser("app")
     app.add_argument("name", choices=APP_NAMES)
     app.add_argument("--host", default="127.0.0.1")
@@ -0,0 +1,399 @@
+"""Background jobs for work too long to run inside a Dash callback.
+
+A `JobQueue` runs callables in a process pool and records every job in a
+SQLite table under the workspace state directory, so that any server worker
+process can poll a job's progress, cancel it or read its result, not only the
+one that submitted it. Results are pickled next to the table.
+
+A callback submits the job and returns its id at once; a `dcc.Interval` then
+polls `JobQueue.status` until the job finishes. A job reports progress with
+`report_progress`, which is also where a cancellation request takes effect:
+a job still queued is never started, and a running job stops at its next
+progress report. Jobs submitted with the same ``key`` share one run while it
+is active, so users pressing the same button do not queue duplicate work.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dash_eia.config.paths import WorkspacePaths
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE = (QUEUED, RUNNING)
+
+MAX_WORKERS = 2
+# Finished jobs and their results are dropped after a day.
+RETENTION_SECONDS = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    key TEXT,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner INTEGER NOT NULL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status);
+"""
+
+
+class JobError(RuntimeError):
+    pass
+
+
+class JobCancelled(JobError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    id: str
+    key: str | None
+    name: str
+    status: str
+    progress: float
+    message: str
+    error: str | None
+    submitted: float
+    started: float | None
+    finished: float | None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE
+
+
+def _connect(database: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(database, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+@contextmanager
+def _transaction(database: Path) -> Iterator[sqlite3.Connection]:
+    """A write transaction, taken up front so concurrent submitters serialize."""
+    with closing(_connect(database)) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+def _update(database: Path, job_id: str, **values: Any) -> None:
+    assignments = ", ".join(f"{column} = ?" for column in values)
+    with _transaction(database) as connection:
+        connection.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ?", (*values.values(), job_id)
+        )
+
+
+def _result_path(database: Path, job_id: str) -> Path:
+    return database.parent / f"{job_id}.pkl"
+
+
+# The job running in this worker, read by `report_progress`.
+_current: contextvars.ContextVar[tuple[Path, str] | None] = contextvars.ContextVar(
+    "current_job", default=None
+)
+
+
+def report_progress(fraction: float, message: str = "") -> None:
+    """Record the running job's progress (0 to 1) and stop it if it was cancelled.
+
+    Outside a job this does nothing, so long-running functions can report
+    progress whether or not they run as jobs.
+    """
+    current = _current.get()
+    if current is None:
+        return
+    database, job_id = current
+    with _transaction(database) as connection:
+        cancelled = connection.execute(
+            "UPDATE jobs SET progress = ?, message = ? WHERE id = ? AND NOT cancel_requested",
+            (min(max(float(fraction), 0.0), 1.0), message, job_id),
+        ).rowcount == 0
+    if cancelled:
+        raise JobCancelled(job_id)
+
+
+def _execute(
+    database: Path,
+    job_id: str,
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> None:
+    """Run one job in a worker, recording its outcome in the table."""
+    with _transaction(database) as connection:
+        row = connection.execute(
+            "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None or row["cancel_requested"]:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+                (CANCELLED, time.time(), job_id),
+            )
+            return
+        connection.execute(
+            "UPDATE jobs SET status = ?, started = ? WHERE id = ?", (RUNNING, time.time(), job_id)
+        )
+
+    token = _current.set((database, job_id))
+    try:
+        result = fn(*args, **kwargs)
+    except JobCancelled:
+        _update(database, job_id, status=CANCELLED, finished=time.time())
+        return
+    except Exception:
+        _update(
+            database, job_id, status=FAILED, error=traceback.format_exc(), finished=time.time()
+        )
+        return
+    finally:
+        _current.reset(token)
+
+    # Written aside and renamed, so a reader never sees a partial result
+    path = _result_path(database, job_id)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as file:
+        pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    _update(database, job_id, status=DONE, progress=1.0, finished=time.time())
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Jobs run in a process pool and tracked in ``directory/jobs.sqlite3``.
+
+    ``executor`` replaces the default pool of ``max_workers`` spawned
+    processes; the callables and arguments given to it must be picklable.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        max_workers: int = MAX_WORKERS,
+        executor: Executor | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.database = self.directory / "jobs.sqlite3"
+        self.max_workers = max_workers
+        self._executor = executor
+        self._futures: dict[str, Future[None]] = {}
+        self._lock = threading.Lock()
+        with closing(_connect(self.database)) as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(_SCHEMA)
+        self._recover()
+        self.prune()
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the server process runs threads.
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _recover(self) -> None:
+        """Fail the active jobs of processes that no longer exist."""
+        with _transaction(self.database) as connection:
+            rows = connection.execute(
+                "SELECT id, owner FROM jobs WHERE status IN (?, ?)", ACTIVE
+            ).fetchall()
+            for row in rows:
+                if not _alive(row["owner"]):
+                    connection.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                        (FAILED, "interrupted: the server stopped", time.time(), row["id"]),
+                    )
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, key: str | None = None, **kwargs: Any
+    ) -> str:
+        """Queue ``fn(*args, **kwargs)`` and return the job id.
+
+        While a job with the same ``key`` is queued or running, its id is
+        returned instead and nothing new is queued.
+        """
+        with _transaction(self.database) as connection:
+            if key is not None:
+                row = connection.execute(
+                    "SELECT id FROM jobs WHERE key = ? AND status IN (?, ?)"
+                    " ORDER BY submitted DESC LIMIT 1",
+                    (key, *ACTIVE),
+                ).fetchone()
+                if row is not None:
+                    return str(row["id"])
+            job_id = uuid.uuid4().hex
+            name = f"{fn.__module__}.{getattr(fn, '__qualname__', repr(fn))}"
+            connection.execute(
+                "INSERT INTO jobs (id, key, name, status, owner, submitted)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, key, name, QUEUED, os.getpid(), time.time()),
+            )
+
+        try:
+            future = self._pool().submit(_execute, self.database, job_id, fn, args, kwargs)
+        except Exception:
+            _update(
+                self.database,
+                job_id,
+                status=FAILED,
+                error=traceback.format_exc(),
+                finished=time.time(),
+            )
+            raise
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._settle(job_id, done))
+        return job_id
+
+    def _settle(self, job_id: str, future: Future[None]) -> None:
+        """Record jobs the worker could not, e.g. when it died or the job did not pickle."""
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            status, error = CANCELLED, None
+        elif future.exception() is not None:
+            status, error = FAILED, repr(future.exception())
+        else:
+            return
+        with _transaction(self.database) as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?"
+                " WHERE id = ? AND status IN (?, ?)",
+                (status, error, time.time(), job_id, *ACTIVE),
+            )
+
+    def status(self, job_id: str) -> Job | None:
+        with closing(_connect(self.database)) as connection:
+            row = connection.execute(
+                "SELECT id, key, name, status, progress, message, error, submitted, started,"
+                " finished FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return None if row is None else Job(**dict(row))
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a job to stop; False when it had already finished.
+
+        A queued job is dropped; a running one stops at its next
+        `report_progress`.
+        """
+        with _transaction(self.database) as connection:
+            updated = connection.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN (?, ?)",
+                (job_id, *ACTIVE),
+            ).rowcount
+        if not updated:
+            return False
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        return True
+
+    def result(self, job_id: str) -> Any:
+        """The return value of a finished job.
+
+        Raises `JobCancelled` for a cancelled job and `JobError` for one that
+        failed, is still active or is unknown.
+        """
+        job = self.status(job_id)
+        if job is None:
+            raise JobError(f"Unknown job: {job_id}")
+        if job.status == CANCELLED:
+            raise JobCancelled(job_id)
+        if job.status == FAILED:
+            raise JobError(f"Job {job_id} ({job.name}) failed:\n{job.error}")
+        if job.status != DONE:
+            raise JobError(f"Job {job_id} is {job.status}")
+        with open(_result_path(self.database, job_id), "rb") as file:
+            return pickle.load(file)
+
+    def wait(self, job_id: str, timeout: float | None = None, interval: float = 0.05) -> Job:
+        """Poll until the job finishes, or raise TimeoutError."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None:
+                raise JobError(f"Unknown job: {job_id}")
+            if not job.active:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} is still {job.status}")
+            time.sleep(interval)
+
+    def prune(self, max_age: float = RETENTION_SECONDS) -> None:
+        """Drop finished jobs older than ``max_age`` seconds, with their results."""
+        cutoff = time.time() - max_age
+        with _transaction(self.database) as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE status NOT IN (?, ?) AND finished < ?",
+                (*ACTIVE, cutoff),
+            ).fetchall()
+            connection.executemany("DELETE FROM jobs WHERE id = ?", [(row["id"],) for row in rows])
+        for row in rows:
+            _result_path(self.database, row["id"]).unlink(missing_ok=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default: JobQueue | None = None
+_default_lock = threading.Lock()
+
+
+def default_queue() -> JobQueue:
+    """The workspace's queue, under ``WorkspacePaths.state / "jobs"``."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = JobQueue(WorkspacePaths.discover().state / "jobs")
+        return _default
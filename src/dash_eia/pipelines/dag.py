@@ -0,0 +1,395 @@
+"""Pipelines of file-producing steps, rerun only where their inputs changed.
+
+A `Node` names a function, the workspace files it reads and the files it
+writes. Nodes reading what another node writes run after it; nodes with no
+path between them form separate branches, which run in parallel processes.
+
+Every successful run records a fingerprint of the node: its code version and
+the sha256 of each input. A later run skips the node while that fingerprint
+and the digests of its outputs are unchanged, so a download that fetched the
+same bytes as last time stops the steps after it. Records are kept under
+``WorkspacePaths.state / "pipelines"``, together with the digests of the files
+read, which are only recomputed when a file's size or modification time
+changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import traceback
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from dash_eia.apps.compat import working_directory
+from dash_eia.config.paths import WorkspacePaths
+
+RAN = "ran"
+SKIPPED = "skipped"
+FAILED = "failed"
+# Not run because a node before it failed.
+BLOCKED = "blocked"
+# Dry runs: the node is out of date, or runs only if a node before it writes new outputs.
+WOULD_RUN = "would run"
+MAY_RUN = "may run"
+
+# Branches run at once; the WPS, STEO and CLI refreshes are three.
+WORKERS = 3
+CHUNK_SIZE = 1 << 20
+
+State = dict[str, dict[str, Any]]
+
+
+class PipelineError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Node:
+    """``target`` ("module:function", imported from the workspace) called with ``kwargs``.
+
+    ``inputs`` and ``outputs`` are workspace-relative files or directories.
+    Bump ``version`` when a change to the code changes what the node writes.
+    A ``remote`` node reads from outside the workspace, a download, and so
+    runs every time; the nodes after it still skip when it wrote the same
+    bytes as before.
+    """
+
+    name: str
+    target: str
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    version: str = "1"
+    remote: bool = False
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def branch(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+@dataclass(frozen=True, slots=True)
+class NodeResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def _normalize(path: str) -> str:
+    return PurePosixPath(path.replace("\\", "/")).as_posix().removeprefix("./")
+
+
+def _overlaps(a: str, b: str) -> bool:
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+# ---------------------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------------------
+def _file_digest(path: Path, relative: str, files: dict[str, Any]) -> str:
+    stat = path.stat()
+    known = files.get(relative)
+    if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return str(known[2])
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    files[relative] = [stat.st_size, stat.st_mtime_ns, sha.hexdigest()]
+    return sha.hexdigest()
+
+
+def digest(root: Path, relative: str, files: dict[str, Any]) -> str | None:
+    """sha256 of a workspace file, or of a directory's file names and contents; None if missing.
+
+    ``files`` maps paths to their last (size, mtime_ns, sha256) and is updated.
+    """
+    path = root / relative
+    if path.is_file():
+        return _file_digest(path, relative, files)
+    if not path.is_dir():
+        return None
+    sha = hashlib.sha256()
+    for child in sorted(p for p in path.rglob("*") if p.is_file()):
+        name = child.relative_to(root).as_posix()
+        sha.update(f"{name}\0{_file_digest(child, name, files)}\n".encode())
+    return sha.hexdigest()
+
+
+def fingerprint(root: Path, node: Node, files: dict[str, Any]) -> str:
+    """What a node's outputs are a function of: its code, arguments and inputs."""
+    inputs = {path: digest(root, path, files) for path in node.inputs}
+    described = [node.target, node.version, dict(node.kwargs), inputs]
+    return hashlib.sha256(json.dumps(described, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _call(target: str, kwargs: Mapping[str, Any]) -> None:
+    module, _, name = target.partition(":")
+    function: Callable[..., Any] = getattr(importlib.import_module(module), name)
+    function(**kwargs)
+
+
+def _report(result: NodeResult) -> None:
+    timing = f"{result.seconds:8.1f} s" if result.status in (RAN, FAILED) else ""
+    print(f"{result.name:<20}{result.status:<10}{timing}".rstrip(), flush=True)
+
+
+def _run_branch(
+    root: Path,
+    nodes: Sequence[Node],
+    upstream: Mapping[str, tuple[str, ...]],
+    state: State,
+    dry_run: bool,
+) -> tuple[list[NodeResult], dict[str, Any], dict[str, Any]]:
+    """Run (or plan) one branch in order; returns its results, new records and file digests."""
+    files = dict(state["files"])
+    records: dict[str, Any] = {}
+    statuses: dict[str, str] = {}
+    results = []
+    with working_directory(root):
+        for node in nodes:
+            before = {statuses[name] for name in upstream[node.name] if name in statuses}
+            if before & {FAILED, BLOCKED}:
+                result = NodeResult(node.name, BLOCKED)
+            else:
+                record = state["nodes"].get(node.name)
+                result, record = _run_node(root, node, record, files, before, dry_run)
+                if record is not None or result.status == FAILED:
+                    records[node.name] = record
+            statuses[node.name] = result.status
+            results.append(result)
+            _report(result)
+    return results, records, files
+
+
+def _run_node(
+    root: Path,
+    node: Node,
+    record: Mapping[str, Any] | None,
+    files: dict[str, Any],
+    before: set[str],
+    dry_run: bool,
+) -> tuple[NodeResult, dict[str, Any] | None]:
+    current = fingerprint(root, node, files)
+    unchanged = (
+        not node.remote
+        and record is not None
+        and record["fingerprint"] == current
+        and all(digest(root, path, files) == record["outputs"].get(path) for path in node.outputs)
+    )
+    if dry_run:
+        if not unchanged:
+            return NodeResult(node.name, WOULD_RUN), None
+        return NodeResult(node.name, MAY_RUN if before & {WOULD_RUN, MAY_RUN} else SKIPPED), None
+    if unchanged:
+        return NodeResult(node.name, SKIPPED), None
+
+    start = time.perf_counter()
+    try:
+        _call(node.target, node.kwargs)
+    except Exception:
+        seconds = time.perf_counter() - start
+        return NodeResult(node.name, FAILED, seconds, traceback.format_exc()), None
+    seconds = time.perf_counter() - start
+    outputs = {path: digest(root, path, files) for path in node.outputs}
+    record = {
+        "fingerprint": current,
+        "outputs": outputs,
+        "finished": time.time(),
+        "seconds": seconds,
+    }
+    return NodeResult(node.name, RAN, seconds), record
+
+
+class Pipeline:
+    """Named nodes, ordered by the paths they read and write."""
+
+    def __init__(self, name: str, nodes: Iterable[Node]) -> None:
+        self.name = name
+        self.nodes: dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise PipelineError(f"Duplicate node: {node.name}")
+            self.nodes[node.name] = replace(
+                node,
+                inputs=tuple(_normalize(path) for path in node.inputs),
+                outputs=tuple(_normalize(path) for path in node.outputs),
+            )
+        writers: dict[str, str] = {}
+        for node in self.nodes.values():
+            for path in node.outputs:
+                clash = next((w for p, w in writers.items() if _overlaps(p, path)), None)
+                if clash is not None:
+                    raise PipelineError(f"{node.name} and {clash} both write {path}")
+                writers[path] = node.name
+        self.upstream = {
+            node.name: tuple(
+                dict.fromkeys(
+                    writer
+                    for path in node.inputs
+                    for written, writer in writers.items()
+                    if writer != node.name and _overlaps(path, written)
+                )
+            )
+            for node in self.nodes.values()
+        }
+        self.order = self._sort()
+
+    def _sort(self) -> list[Node]:
+        order: list[Node] = []
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise PipelineError(f"Cycle through {name}")
+            visiting.add(name)
+            for before in self.upstream[name]:
+                visit(before)
+            visiting.discard(name)
+            done.add(name)
+            order.append(self.nodes[name])
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    @property
+    def branch_names(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(node.branch for node in self.nodes.values()))
+
+    def select(self, only: Sequence[str] | None = None) -> list[Node]:
+        """The nodes in run order, restricted to the branches or node names in ``only``."""
+        if not only:
+            return list(self.order)
+        unknown = set(only) - set(self.nodes) - set(self.branch_names)
+        if unknown:
+            choices = ", ".join((*self.branch_names, *self.nodes))
+            raise PipelineError(
+                f"Unknown node or branch {', '.join(sorted(unknown))}; choose from {choices}"
+            )
+        return [node for node in self.order if node.name in only or node.branch in only]
+
+    def branches(self, nodes: Sequence[Node]) -> list[list[Node]]:
+        """``nodes`` split into groups with no path between them, each in run order."""
+        group = {node.name: node.name for node in nodes}
+
+        def find(name: str) -> str:
+            while group[name] != name:
+                name = group[name]
+            return name
+
+        for node in nodes:
+            for before in self.upstream[node.name]:
+                if before in group:
+                    group[find(node.name)] = find(before)
+        grouped: dict[str, list[Node]] = {}
+        for node in nodes:
+            grouped.setdefault(find(node.name), []).append(node)
+        return list(grouped.values())
+
+    # -----------------------------------------------------------------------
+    # State
+    # -----------------------------------------------------------------------
+    def state_path(self, paths: WorkspacePaths) -> Path:
+        return paths.state / "pipelines" / f"{self.name}.json"
+
+    def load(self, paths: WorkspacePaths) -> State:
+        try:
+            with open(self.state_path(paths), encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            state = {}
+        return {"nodes": dict(state.get("nodes", {})), "files": dict(state.get("files", {}))}
+
+    def _save(self, paths: WorkspacePaths, state: State) -> None:
+        path = self.state_path(paths)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        files = {
+            name: known
+            for name, known in state["files"].items()
+            if (paths.root / name).is_file()
+        }
+        body = json.dumps({"nodes": state["nodes"], "files": files}, indent=1, sort_keys=True)
+        # Written aside and renamed, so an interrupted run leaves the last state
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(body)
+        os.replace(tmp, path)
+
+    # -----------------------------------------------------------------------
+    # Runs
+    # -----------------------------------------------------------------------
+    def run(
+        self,
+        paths: WorkspacePaths,
+        only: Sequence[str] | None = None,
+        *,
+        dry_run: bool = False,
+        workers: int = WORKERS,
+    ) -> list[NodeResult]:
+        """Run the out-of-date nodes of ``only`` (default: all), printing one line per node.
+
+        Branches run in ``workers`` spawned processes. A failed node blocks
+        the nodes after it, not the other branches. With ``dry_run`` nothing
+        is called and the results say which nodes would run.
+        """
+        state = self.load(paths)
+        groups = self.branches(self.select(only))
+        results: dict[str, NodeResult] = {}
+
+        def merge(outcome: tuple[list[NodeResult], dict[str, Any], dict[str, Any]]) -> None:
+            branch_results, records, files = outcome
+            results.update((result.name, result) for result in branch_results)
+            for name, record in records.items():
+                if record is None:
+                    state["nodes"].pop(name, None)
+                else:
+                    state["nodes"][name] = record
+            state["files"].update(files)
+            if not dry_run:
+                self._save(paths, state)
+
+        start = time.perf_counter()
+        if dry_run or workers <= 1 or len(groups) <= 1:
+            for nodes in groups:
+                merge(_run_branch(paths.root, nodes, self.upstream, state, dry_run))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(min(workers, len(groups)), mp_context=context) as pool:
+                futures = {
+                    pool.submit(
+                        _run_branch, paths.root, nodes, self.upstream, state, dry_run
+                    ): nodes
+                    for nodes in groups
+                }
+                for future in as_completed(futures):
+                    try:
+                        merge(future.result())
+                    except Exception as error:
+                        # The worker died, or a node's result did not pickle
+                        for node in futures[future]:
+                            results[node.name] = NodeResult(node.name, FAILED, error=repr(error))
+                            _report(results[node.name])
+
+        ordered = [results[node.name] for node in self.order if node.name in results]
+        counts: dict[str, int] = {}
+        for result in ordered:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+        print(f"{self.name}: {summary or 'nothing to run'} in {time.perf_counter() - start:.1f} s")
+        for result in ordered:
+            if result.error:
+                print(f"\n{result.name} failed:\n{result.error}")
+        return ordered
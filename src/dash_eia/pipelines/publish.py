@@ -0,0 +1,302 @@
+"""Immutable snapshots of the data files the dashboard reads.
+
+The refresh steps rewrite ``data/wps`` and ``data/steo`` in place, one file
+after another, while the dashboard may be reading them: a reader could map a
+half-written pivot, or pair a new pivot with the statistics of the previous
+week. The steps still write those working files, and once a group of them is
+complete it is published: copied into a new directory under
+``data/snapshots`` with a ``manifest.json`` (sha256, size, rows and schema of
+each file), then made current by atomically replacing the ``CURRENT``
+pointer file. Readers resolve each working path to its copy in the current
+snapshot, which never changes once published.
+
+Files unchanged since the current snapshot are hard links to it, so a
+snapshot costs the files that changed. The newest `KEEP` snapshots are kept;
+`Publisher.rollback` makes an earlier one current again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+
+# Published files by group, relative to the data directory. A group is
+# published once every step writing it has finished.
+ARTIFACTS: Mapping[str, tuple[str, ...]] = {
+    "wps": (
+        "wps/wps_gte_2015.feather",
+        "wps/wps_gte_2015_pivot.feather",
+        "wps/graph_line_data.feather",
+        "wps/seasonality_data.feather",
+        "wps/wps_stats.npz",
+    ),
+    "steo": (
+        "steo/steo_pivot.feather",
+        "steo/steo_pivot_dpr.feather",
+        "steo/steo_pivot_dpr_other.feather",
+        "steo/steo_pivot_dpr_evolutions.npz",
+    ),
+}
+KEEP = 5
+SNAPSHOTS = "snapshots"
+CURRENT = "CURRENT"
+MANIFEST = "manifest.json"
+# A publisher holding the lock longer than this is taken to have died.
+LOCK_TIMEOUT = 600.0
+CHUNK_SIZE = 1 << 20
+
+
+class PublishError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    id: str
+    path: Path
+
+    @property
+    def manifest(self) -> dict[str, Any]:
+        with open(self.path / MANIFEST, encoding="utf-8") as file:
+            return json.load(file)
+
+
+def _sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def describe(path: Path) -> dict[str, Any]:
+    """The manifest entry of one file: sha256, bytes, and rows and schema where known."""
+    entry: dict[str, Any] = {
+        "sha256": _sha256(path),
+        "bytes": path.stat().st_size,
+        "rows": None,
+        "schema": None,
+    }
+    if path.suffix == ".feather":
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            entry["rows"] = sum(
+                reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+            )
+            entry["schema"] = {field.name: str(field.type) for field in reader.schema}
+    elif path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as arrays:
+            entry["schema"] = {
+                name: [str(arrays[name].dtype), list(arrays[name].shape)] for name in arrays.files
+            }
+    return entry
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class Publisher:
+    """Snapshots of the ``artifacts`` of ``data`` under ``data / "snapshots"``."""
+
+    def __init__(
+        self,
+        data: str | os.PathLike[str],
+        artifacts: Mapping[str, tuple[str, ...]] = ARTIFACTS,
+        keep: int = KEEP,
+    ) -> None:
+        self.data = Path(data)
+        self.artifacts = artifacts
+        self.keep = max(1, keep)
+        self.root = self.data / SNAPSHOTS
+
+    # -----------------------------------------------------------------------
+    # Reading
+    # -----------------------------------------------------------------------
+    def current(self) -> Snapshot | None:
+        try:
+            snapshot_id = (self.root / CURRENT).read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        path = self.root / snapshot_id
+        return Snapshot(snapshot_id, path) if snapshot_id and path.is_dir() else None
+
+    def snapshots(self) -> list[Snapshot]:
+        """Every published snapshot, oldest first."""
+        if not self.root.is_dir():
+            return []
+        return [
+            Snapshot(path.name, path)
+            for path in sorted(self.root.iterdir())
+            if path.is_dir() and not path.name.startswith(".")
+        ]
+
+    def paths(self, *working: str | os.PathLike[str]) -> list[Path]:
+        """Where to read each working path: its copy in one snapshot, the current one.
+
+        Paths outside the data directory, and files the snapshot does not
+        hold, are returned as they are. Resolving files read together in one
+        call gives them all from the same snapshot.
+        """
+        snapshot = self.current()
+        data = self.data.resolve()
+        resolved = []
+        for path in map(Path, working):
+            if snapshot is not None:
+                try:
+                    relative = path.resolve().relative_to(data)
+                except ValueError:
+                    relative = None
+                if relative is not None and (snapshot.path / relative).is_file():
+                    path = snapshot.path / relative
+            resolved.append(path)
+        return resolved
+
+    def path(self, working: str | os.PathLike[str]) -> Path:
+        return self.paths(working)[0]
+
+    # -----------------------------------------------------------------------
+    # Writing
+    # -----------------------------------------------------------------------
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """One publisher or rollback at a time; refresh branches publish in parallel."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock = self.root / ".lock"
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    stale = time.time() - lock.stat().st_mtime > LOCK_TIMEOUT
+                except OSError:
+                    stale = False
+                if stale:
+                    lock.unlink(missing_ok=True)
+                elif time.monotonic() > deadline:
+                    raise PublishError(f"{lock} is held by another publisher") from None
+                else:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            lock.unlink(missing_ok=True)
+
+    def _new_id(self) -> str:
+        snapshot_id = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        latest = self.snapshots()
+        if latest and latest[-1].id >= snapshot_id:
+            raise PublishError(f"Snapshot {latest[-1].id} is newer than the clock")
+        return snapshot_id
+
+    def publish(self, groups: Iterable[str] | None = None) -> Snapshot | None:
+        """Publish the working files of ``groups`` (default: all) as the current snapshot.
+
+        Files of other groups are carried over from the current snapshot, or
+        taken from the working directory when nothing is published yet.
+        Returns the current snapshot, which is the previous one when no file
+        changed, or None when there is nothing to publish.
+        """
+        groups = list(self.artifacts) if groups is None else list(groups)
+        unknown = set(groups) - set(self.artifacts)
+        if unknown:
+            raise PublishError(f"Unknown artifact group: {', '.join(sorted(unknown))}")
+
+        with self._locked():
+            previous = self.current()
+            old = previous.manifest["files"] if previous is not None else {}
+            snapshot_id = self._new_id()
+            staging = self.root / f".{snapshot_id}.tmp"
+            files: dict[str, Any] = {}
+            try:
+                for group, relatives in self.artifacts.items():
+                    for relative in relatives:
+                        target = staging / relative
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        working = self.data / relative
+                        if (group in groups or previous is None) and working.is_file():
+                            shutil.copy2(working, target)
+                            entry = describe(target)
+                            if old.get(relative, {}).get("sha256") == entry["sha256"]:
+                                target.unlink()
+                                _link_or_copy(previous.path / relative, target)
+                        elif previous is not None and relative in old:
+                            _link_or_copy(previous.path / relative, target)
+                            entry = old[relative]
+                        else:
+                            continue
+                        files[relative] = entry
+
+                if not files or (previous is not None and files == old):
+                    shutil.rmtree(staging, ignore_errors=True)
+                    return previous
+                manifest = {
+                    "id": snapshot_id,
+                    "created": datetime.now(UTC).isoformat(),
+                    "previous": previous.id if previous is not None else None,
+                    "groups": groups,
+                    "files": files,
+                }
+                _write_atomic(staging / MANIFEST, json.dumps(manifest, indent=1, sort_keys=True))
+                os.rename(staging, self.root / snapshot_id)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            _write_atomic(self.root / CURRENT, snapshot_id)
+            self._prune()
+        return Snapshot(snapshot_id, self.root / snapshot_id)
+
+    def rollback(self, snapshot_id: str | None = None) -> Snapshot:
+        """Make ``snapshot_id`` (default: the one before the current) current."""
+        with self._locked():
+            snapshots = self.snapshots()
+            current = self.current()
+            if snapshot_id is None:
+                earlier = [s for s in snapshots if current is None or s.id < current.id]
+                if not earlier:
+                    raise PublishError("No earlier snapshot to roll back to")
+                target = earlier[-1]
+            else:
+                target = next((s for s in snapshots if s.id == snapshot_id), None)
+                if target is None:
+                    raise PublishError(f"Unknown snapshot: {snapshot_id}")
+            _write_atomic(self.root / CURRENT, target.id)
+        return target
+
+    def _prune(self) -> None:
+        """Drop all but the newest `keep` snapshots, never the current one.
+
+        A reader still holding a dropped file keeps reading it on POSIX; on
+        Windows the directory stays until a later publish can remove it.
+        """
+        current = self.current()
+        for snapshot in self.snapshots()[: -self.keep]:
+            if current is None or snapshot.id != current.id:
+                shutil.rmtree(snapshot.path, ignore_errors=True)
@@ -0,0 +1,91 @@
+"""The data refresh behind ``dash-eia refresh``, declared as a `Pipeline`.
+
+One branch per EIA source, each a download followed by the files derived
+from it; the three branches share no files and run in parallel. The steps
+are still the workspace's legacy modules, imported from the workspace root
+like the dashboard itself (see `dash_eia.apps.compat`), and they read and
+write paths relative to it.
+
+The WPS ingest keeps writing the line, seasonality and statistics files
+itself: it splices only the new or revised weeks into them, which a separate
+node rebuilding each file from the pivot would undo. The WPS ingest and the
+STEO DPR step end by publishing their group of files as a snapshot
+(`dash_eia.pipelines.publish`), which the WPS models and figures then read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from dash_eia.config.paths import WorkspacePaths
+from dash_eia.pipelines.dag import BLOCKED, FAILED, WORKERS, Node, Pipeline
+
+WPS_RAW = "data/wps/eia_weekly_psw09.xls"
+WPS_PIVOT = "data/wps/wps_gte_2015_pivot.feather"
+WPS_LINE = "data/wps/graph_line_data.feather"
+WPS_SEASONALITY = "data/wps/seasonality_data.feather"
+STEO_PIVOT = "data/steo/steo_pivot.feather"
+CLI_DATASET = "data/cli/companylevelimports"
+
+NODES = (
+    Node(
+        "wps.download",
+        "src.wps.download_xlsx:download_raw_file",
+        outputs=(WPS_RAW,),
+        remote=True,
+    ),
+    Node(
+        "wps.ingest",
+        "src.wps.download_xlsx:update",
+        inputs=(WPS_RAW,),
+        outputs=(
+            "data/wps/wps_gte_2015.feather",
+            WPS_PIVOT,
+            WPS_LINE,
+            WPS_SEASONALITY,
+            "data/wps/wps_stats.npz",
+            "data/wps/eia_weekly_psw09.sha256",
+        ),
+    ),
+    # The model and figure caches are keyed by data version; they are outputs
+    # nobody else reads, and pages add figures to them, so they are not tracked.
+    Node("wps.models", "src.wps.models:precompute", inputs=(WPS_PIVOT,)),
+    Node("wps.figures", "src.wps.figures:warm", inputs=(WPS_LINE, WPS_SEASONALITY)),
+    Node(
+        "steo.download",
+        "src.steo.download:main",
+        outputs=(STEO_PIVOT,),
+        remote=True,
+        kwargs={"offset_months": 5, "more_files": False},
+    ),
+    Node(
+        "steo.dpr",
+        "src.steo.create_more_files:main",
+        inputs=(STEO_PIVOT, "lookup/steo/mapping_dpr.csv", "lookup/steo/mapping_dpr_other.csv"),
+        outputs=(
+            "data/steo/steo_pivot_dpr.feather",
+            "data/steo/steo_pivot_dpr_other.feather",
+            "data/steo/steo_pivot_dpr_evolutions.npz",
+        ),
+    ),
+    Node("cli.download", "src.cli.download:main", outputs=(CLI_DATASET,), remote=True),
+    Node(
+        "cli.cube",
+        "src.cli.main:write_crude_cube",
+        inputs=(CLI_DATASET,),
+        outputs=("data/cli/companylevelimports_crude_cube.parquet",),
+    ),
+)
+
+PIPELINE = Pipeline("refresh", NODES)
+
+
+def run(
+    paths: WorkspacePaths,
+    only: Sequence[str] | None = None,
+    *,
+    dry_run: bool = False,
+    workers: int = WORKERS,
+) -> int:
+    results = PIPELINE.run(paths, only, dry_run=dry_run, workers=workers)
+    return 1 if any(result.status in (FAILED, BLOCKED) for result in results) else 0
@@ -0,0 +1 @@
+"""Dataset transforms shared by the dashboard and the download pipelines."""
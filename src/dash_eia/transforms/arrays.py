@@ -0,0 +1,113 @@
+"""Per-series arrays saved as ``.npz`` files next to the data they are built from.
+
+`DPREvolutions` (transforms/dpr.py) and `WPSStats` (transforms/wps_stats.py)
+are built from data files at ingest, written next to them and read by the
+pages. `SeriesArrays` is what they share: the position of each series id, the
+digest of the source files the arrays were built from, and the atomic ``.npz``
+round trip. `load` reads a saved file, or builds the arrays again when their
+sources changed since it was written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Self
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def source_digest(*paths: str | os.PathLike[str]) -> str:
+    """Digest of the files a set of arrays is built from."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True, eq=False, kw_only=True)
+class SeriesArrays:
+    """Arrays with one row per series of ``ids``.
+
+    Subclasses declare ``ids`` and their arrays as fields, name the fields
+    saved to the ``.npz`` file in ``KEYS`` and the kind of series in
+    ``KIND``. ``digest`` is the `source_digest` of what they were built from.
+    """
+
+    KEYS: ClassVar[tuple[str, ...]] = ()
+    KIND: ClassVar[str] = ""
+
+    digest: str = ""
+    _positions: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        positions = {str(series_id): i for i, series_id in enumerate(self.ids)}
+        object.__setattr__(self, "_positions", positions)
+
+    def __contains__(self, series_id: object) -> bool:
+        return series_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def position(self, series_id: str) -> int:
+        try:
+            return self._positions[series_id]
+        except KeyError:
+            raise KeyError(f"Not a {self.KIND} series: {series_id}") from None
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write to ``path`` (an ``.npz``), replacing it atomically."""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as file:
+                np.savez(
+                    file,
+                    digest=np.array(self.digest),
+                    **{key: getattr(self, key) for key in self.KEYS},
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def read(cls, path: str | os.PathLike[str]) -> Self:
+        with np.load(path, allow_pickle=False) as stored:
+            return cls(**{key: stored[key] for key in cls.KEYS}, digest=str(stored["digest"]))
+
+
+def load[T: SeriesArrays](
+    kind: type[T],
+    path: str | os.PathLike[str],
+    digest: str,
+    build: Callable[[], T],
+    *,
+    write: bool = True,
+) -> T:
+    """The ``kind`` arrays saved at ``path`` if built from ``digest``, else ``build()``.
+
+    A new build is saved to ``path``, unless not ``write`` (``path`` is a
+    published copy, which never changes); one that cannot be saved is still
+    returned.
+    """
+    try:
+        stored = kind.read(path)
+    except (OSError, ValueError, KeyError):
+        stored = None
+    if stored is not None and stored.digest == digest:
+        return stored
+    built = build()
+    if write:
+        try:
+            built.save(path)
+        except OSError:
+            logger.warning("Could not write %s; using an in-memory build", path, exc_info=True)
+    return built
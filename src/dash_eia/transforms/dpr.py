@@ -0,0 +1,146 @@
+"""Drilling Productivity Report series as one (series x release x month) array.
+
+Each STEO release restates every DPR series, and the DPR pages chart the last
+few releases of a series against each other. `DPREvolutions` holds the whole
+history of `steo_pivot_dpr.feather` as a dense float array indexed by series,
+release (newest first) and delivery month, with index maps from series ids and
+the months each series has data for, so "the last N releases of a series from
+a given year" is a view of that array.
+
+The array is written next to the pivot at STEO ingest and loaded by the
+pages; `load` rebuilds it when the pivot or the DPR mapping changed since.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dash_eia.transforms import arrays
+from dash_eia.transforms.arrays import SeriesArrays, source_digest
+
+_ID_COLUMNS = ("id", "name", "release_date", "uom")
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class DPREvolutions(SeriesArrays):
+    """DPR values by (series, release, month); releases newest first.
+
+    ``bounds[s]`` is the [first, last + 1) range of months in which series
+    ``s`` has a value in any release. Values are rounded to two decimals.
+    """
+
+    values: np.ndarray
+    ids: np.ndarray
+    names: np.ndarray
+    regions: np.ndarray
+    uoms: np.ndarray
+    releases: np.ndarray
+    periods: np.ndarray
+    bounds: np.ndarray
+
+    KEYS = ("values", "ids", "names", "regions", "uoms", "releases", "periods", "bounds")
+    KIND = "DPR"
+
+    def meta(self, series_id: str) -> tuple[str, str, str]:
+        """(name, region, unit) of a series."""
+        s = self.position(series_id)
+        return str(self.names[s]), str(self.regions[s]), str(self.uoms[s])
+
+    def labels(self, count: int | None = None) -> list[str]:
+        """Release months as ``YYYY-MM``, newest first."""
+        return [str(release) for release in self.releases[:count]]
+
+    def evolutions(
+        self, series_id: str, count: int | None = None, start: str | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Months and the (release x month) values of the ``count`` newest releases.
+
+        Months run over those with data for the series, from ``start`` (a date
+        string such as ``"2023"``) when given. Both arrays are views.
+        """
+        s = self.position(series_id)
+        first, stop = self.bounds[s]
+        if start is not None:
+            first = max(first, int(np.searchsorted(self.periods, np.datetime64(start))))
+            first = min(first, stop)
+        return self.periods[first:stop], self.values[s, :count, first:stop]
+
+
+def build(pivot: pd.DataFrame, meta: pd.DataFrame, digest: str = "") -> DPREvolutions:
+    """The array for the mapped series of a STEO pivot (id, name, release_date, uom, months...).
+
+    Names, regions and units come from ``meta`` (the DPR mapping). Series
+    with no values at all are left out.
+    """
+    meta = meta.drop_duplicates("id").set_index("id")
+    pivot = pivot[pivot["id"].isin(meta.index)]
+    month_columns = [column for column in pivot.columns if column not in _ID_COLUMNS]
+    periods = pd.to_datetime(pd.Index(month_columns))
+    order = np.argsort(periods.values, kind="stable")
+    periods = periods[order]
+
+    releases = pd.to_datetime(pivot["release_date"]).dt.to_period("M")
+    release_index = pd.PeriodIndex(sorted(releases.unique(), reverse=True), freq="M")
+    has_data = pivot[month_columns].notna().any(axis=1).groupby(pivot["id"]).any()
+    ids = pd.Index([series_id for series_id in pivot["id"].unique() if has_data[series_id]])
+
+    values = np.full((len(ids), len(release_index), len(periods)), np.nan)
+    rows = ids.get_indexer(pivot["id"])
+    kept = rows >= 0
+    matrix = pivot[month_columns].to_numpy(dtype=float)[:, order]
+    values[rows[kept], release_index.get_indexer(releases)[kept]] = np.round(matrix[kept], 2)
+
+    present = ~np.isnan(values).all(axis=1)
+    bounds = np.stack(
+        [present.argmax(axis=1), len(periods) - present[:, ::-1].argmax(axis=1)], axis=1
+    )
+
+    return DPREvolutions(
+        values=values,
+        ids=ids.to_numpy(dtype=str),
+        names=meta.loc[ids, "name"].to_numpy(dtype=str),
+        regions=meta.loc[ids, "region"].to_numpy(dtype=str),
+        uoms=meta.loc[ids, "uom"].to_numpy(dtype=str),
+        releases=release_index.to_timestamp().to_numpy().astype("datetime64[M]"),
+        periods=periods.to_numpy(),
+        bounds=bounds,
+        digest=digest,
+    )
+
+
+def materialize(
+    pivot_path: str | os.PathLike[str],
+    meta_path: str | os.PathLike[str],
+    path: str | os.PathLike[str],
+) -> DPREvolutions:
+    """Build the array from the pivot and mapping files and write it to ``path``."""
+    evolutions = build(
+        pd.read_feather(pivot_path), pd.read_csv(meta_path), source_digest(pivot_path, meta_path)
+    )
+    evolutions.save(path)
+    return evolutions
+
+
+def load(
+    pivot_path: str | os.PathLike[str],
+    meta_path: str | os.PathLike[str],
+    path: str | os.PathLike[str],
+    *,
+    write: bool = True,
+) -> DPREvolutions:
+    """The array at ``path``, rebuilt first if the pivot or mapping changed since.
+
+    See `arrays.load` for ``write``.
+    """
+    digest = source_digest(pivot_path, meta_path)
+    return arrays.load(
+        DPREvolutions,
+        path,
+        digest,
+        lambda: build(pd.read_feather(pivot_path), pd.read_csv(meta_path), digest),
+        write=write,
+    )
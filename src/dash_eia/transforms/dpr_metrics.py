@@ -0,0 +1,120 @@
+"""Per-region, per-month DPR metrics of one STEO release.
+
+The DPR efficiency, productivity, radar and DUC pages each pivoted the long
+DPR frame for a release and then walked the (month, region) rows one by one to
+build metric dicts. `region_metrics` pivots a release once, keeping the six
+DPR regions' series as named columns, and derives every ratio the pages show
+as a vectorized column expression. It is cached per release by
+`src/utils/datasets.py` (the ``dpr_metrics`` dataset).
+
+Every ratio is 0 where its denominator is missing or not positive, so a month
+without rigs or completions reads as no activity rather than as NaN.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Region -> the suffix of its series ids (COPRPM, RIGSBK, ...)
+REGIONS: dict[str, str] = {
+    "Permian": "PM",
+    "Bakken": "BK",
+    "Eagle Ford": "EF",
+    "Appalachia": "AP",
+    "Haynesville": "HA",
+    "Rest of L48 ex GOM": "R48",
+}
+
+# Column -> the prefix of its series ids
+SERIES: dict[str, str] = {
+    "production": "COPR",
+    "gas_production": "NGMP",
+    "rigs": "RIGS",
+    "wells_drilled": "NWD",
+    "wells_completed": "NWC",
+    "ducs": "DUCS",
+    "drilled_per_rig": "NWR",
+    "new_well_oil": "CONW",
+    "new_well_oil_per_rig": "CONWR",
+    "new_well_gas": "NGNW",
+    "new_well_gas_per_rig": "NGNWR",
+    "existing_oil_decline": "COEOP",
+    "existing_gas_decline": "NGEOP",
+}
+
+METRICS = (
+    "production_per_rig",
+    "wells_per_rig",
+    "completion_rate",
+    "duc_ratio",
+    "duc_change",
+    "months_supply",
+    "production_per_well",
+    "oil_per_well",
+    "gas_per_well",
+)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+    numerator = numerator.to_numpy(dtype=float)
+    denominator = denominator.to_numpy(dtype=float)
+    positive = denominator > 0
+    out = np.zeros(len(numerator))
+    out[positive] = numerator[positive] / denominator[positive]
+    return out
+
+
+def derive(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add the derived `METRICS` to a frame with the `SERIES` columns (a copy).
+
+    ``completion_rate`` is completions per well drilled (a fraction),
+    ``duc_ratio`` DUCs per well drilled and ``months_supply`` DUCs per
+    completion. Works on sums over regions as well as on one region.
+    """
+    frame = frame.copy()
+    frame["production_per_rig"] = _ratio(frame["production"], frame["rigs"])
+    frame["wells_per_rig"] = _ratio(frame["wells_drilled"], frame["rigs"])
+    frame["completion_rate"] = _ratio(frame["wells_completed"], frame["wells_drilled"])
+    frame["duc_ratio"] = _ratio(frame["ducs"], frame["wells_drilled"])
+    frame["duc_change"] = frame["wells_drilled"] - frame["wells_completed"]
+    frame["months_supply"] = _ratio(frame["ducs"], frame["wells_completed"])
+    frame["production_per_well"] = _ratio(frame["production"], frame["wells_completed"])
+    frame["oil_per_well"] = _ratio(frame["new_well_oil"], frame["wells_completed"])
+    frame["gas_per_well"] = _ratio(frame["new_well_gas"], frame["wells_completed"])
+    return frame
+
+
+def region_panel(long: pd.DataFrame, release: str | pd.Timestamp) -> pd.DataFrame:
+    """The regions' series in ``release`` as columns, one row per (month, region).
+
+    ``long`` is the melted DPR frame (id, release_date, delivery_month,
+    value, ...). Rows are sorted by month, then region; a (month, region)
+    is present when any of the region's series has a value that month, and
+    series without one are NaN.
+    """
+    regions = {}
+    columns = {}
+    for region, suffix in REGIONS.items():
+        for column, prefix in SERIES.items():
+            regions[f"{prefix}{suffix}"] = region
+            columns[f"{prefix}{suffix}"] = column
+
+    rows = long[(long["release_date"] == pd.Timestamp(release)) & long["id"].isin(columns.keys())]
+    rows = rows.dropna(subset=["value"])
+    if rows.empty:
+        return pd.DataFrame(columns=["month", "region", *SERIES])
+    panel = (
+        rows.assign(region=rows["id"].map(regions), column=rows["id"].map(columns))
+        .groupby(["delivery_month", "region", "column"])["value"]
+        .first()
+        .unstack("column")
+        .reindex(columns=list(SERIES))
+    )
+    panel.columns.name = None
+    return panel.reset_index().rename(columns={"delivery_month": "month"})
+
+
+def region_metrics(long: pd.DataFrame, release: str | pd.Timestamp) -> pd.DataFrame:
+    """`region_panel` with the derived `METRICS`."""
+    return derive(region_panel(long, release))
@@ -0,0 +1,160 @@
+"""Derived Weekly Petroleum Status series computed from psw09 source series.
+
+Feedstock runs and PADD 9 (PADDs 2+3+4) aggregates, the original crude
+adjustment factor, and refinery yields by product and PADD. Gasoline yields
+subtract ethanol blended into gasoline production, so they reflect what the
+refinery makes from crude; blended yields keep it for comparison. Distillate
+production is used as reported (weekly data has no biodiesel split).
+
+`generate_additional_tickers` adds them to parsed psw09 rows for the WPS and
+MSG ingests in src/ and eia_downloads/.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import pandas as pd
+
+from dash_eia.transforms.derived import Formula, FormulaSet
+
+_REGIONS = ["US", "P1", "P2", "P3", "P4", "P5"]
+
+
+def _padd(us: str, padd: str) -> dict[str, str]:
+    """Series ids by region, from the US id and a PADD id pattern with ``{n}``."""
+    return {"US": us, **{f"P{n}": padd.format(n=n) for n in range(1, 6)}}
+
+
+_CRUDE_RUNS = _padd("WCRRIUS2", "WCRRIP{n}2")
+_GROSS_RUNS = _padd("WGIRIUS2", "WGIRIP{n}2")
+_CRUDE_STOCKS = _padd("WCESTUS1", "WCESTP{n}1")
+_CRUDE_IMPORTS = _padd("WCEIMUS2", "WCEIMP{n}2")
+_CUSHING_STOCKS = "W_EPC0_SAX_YCUOK_MBBL"
+
+_GASOLINE = _padd("WGFRPUS2", "WGFRPP{n}2")
+_DISTILLATE = _padd("WDIRPUS2", "WDIRPP{n}2")
+_JET = _padd("WKJRPUS2", "WKJRPP{n}2")
+_FUEL_OIL = _padd("WRERPUS2", "WRERPP{n}2")
+_PROPANE = {"US": "WPRTP_NUS_2", "P1": "WPRNPP12", "P2": "WPRNPP22", "P3": "WPRNPP32"}
+_PROPANE_P4P5 = "W_EPLLPZ_YPT_R4N5_MBBLD"
+# Some PADDs report no ethanol production; missing counts as none.
+_ETHANOL = {
+    region: f"fillna({series}, 0)"
+    for region, series in _padd("W_EPOOXE_YOP_NUS_MBBLD", "W_EPOOXE_YOP_R{n}0_MBBLD").items()
+}
+
+
+def _p9(series: dict[str, str]) -> str:
+    return f"{series['P2']} + {series['P3']} + {series['P4']}"
+
+
+def _feedstock() -> list[Formula]:
+    # The P1 id's spelling is what the stored files and pages use.
+    ids = {"US": "feedstockRunsUS", "P1": "feddStockRunsP1"}
+    return [
+        Formula(
+            ids.get(region, f"feedstockRuns{region}"),
+            f"{_GROSS_RUNS[region]} - {_CRUDE_RUNS[region]}",
+            f"{region} Feedstock Runs (kbd)",
+            "kbd",
+        )
+        for region in _REGIONS
+    ] + [
+        Formula("crudeRunsP9", _p9(_CRUDE_RUNS), "P9 Crude Runs (kbd)", "kbd"),
+        Formula("grossRunsP9", _p9(_GROSS_RUNS), "P9 Gross Runs (kbd)", "kbd"),
+        Formula("feedstockRunsP9", "grossRunsP9 - crudeRunsP9", "P9 Feedstock Runs (kbd)", "kbd"),
+        Formula("crudeStocksP9", _p9(_CRUDE_STOCKS), "P9 Stocks (kb)", "kb"),
+        Formula("crudeImportsP9", _p9(_CRUDE_IMPORTS), "P9 Crude Imports (kbd)", "kbd"),
+        Formula(
+            "crudeStocksP2E", f"{_CRUDE_STOCKS['P2']} - {_CUSHING_STOCKS}", "P2E Stocks (kb)", "kb"
+        ),
+    ]
+
+
+# The balance of crude supply and disposition that weekly data leaves
+# unaccounted for. Stocks are a level, so their change is a weekly total spread
+# over seven days.
+_ADJUSTMENT = Formula(
+    "crudeOriginalAdjustment",
+    "(WCRFPUS2 + WCEIMUS2 - WCRRIUS2 - WCREXUS2 - diff(WCRSTUS1) / 7) * -1",
+    "OG Adjustment Factor (kbd)",
+    "kbd",
+    decimals=0,
+    drop_missing=True,
+)
+
+
+# P9 production, read by the P9 yields but not stored themselves.
+_P9_PRODUCTION = [
+    Formula("gasolineProductionP9", _p9(_GASOLINE), emit=False),
+    Formula(
+        "ethanolProductionP9",
+        " + ".join(_ETHANOL[region] for region in ["P2", "P3", "P4"]),
+        emit=False,
+    ),
+    Formula("distillateProductionP9", _p9(_DISTILLATE), emit=False),
+    Formula("jetProductionP9", _p9(_JET), emit=False),
+    Formula("fueloilProductionP9", _p9(_FUEL_OIL), emit=False),
+]
+
+
+def _yield(product: str, region: str, label: str, made: str, runs: str) -> Formula:
+    return Formula(
+        f"{product}{region}", f"({made} / {runs}) * 100", f"{region} {label} (pct)", "pct"
+    )
+
+
+def _yields(product: str, label: str, made: dict[str, str]) -> list[Formula]:
+    """Share of gross runs by region, ``made`` holding the produced volume per region."""
+    runs = {**_GROSS_RUNS, "P9": "grossRunsP9"}
+    return [_yield(product, region, label, made[region], runs[region]) for region in made]
+
+
+_NET_GASOLINE = {
+    **{region: f"({_GASOLINE[region]} - {_ETHANOL[region]})" for region in _REGIONS},
+    "P9": "(gasolineProductionP9 - ethanolProductionP9)",
+}
+
+WPS_FORMULAS = FormulaSet(
+    [
+        *_feedstock(),
+        _ADJUSTMENT,
+        *_P9_PRODUCTION,
+        *_yields("gasolineYield", "Gasoline Yield", _NET_GASOLINE),
+        *_yields(
+            "gasolineBlendedYield",
+            "Gasoline Blended Yield",
+            {**_GASOLINE, "P9": "gasolineProductionP9"},
+        ),
+        *_yields(
+            "distillateYield", "Distillate Yield", {**_DISTILLATE, "P9": "distillateProductionP9"}
+        ),
+        *_yields("jetYield", "Jet Yield", {**_JET, "P9": "jetProductionP9"}),
+        *_yields("fueloilYield", "Fuel Oil Yield", {**_FUEL_OIL, "P9": "fueloilProductionP9"}),
+        *_yields("propaneYield", "Propane Yield", _PROPANE),
+        # Propane is reported for PADDs 4 and 5 combined.
+        _yield(
+            "propaneYield",
+            "P4P5",
+            "Propane Yield",
+            _PROPANE_P4P5,
+            f"({_GROSS_RUNS['P4']} + {_GROSS_RUNS['P5']})",
+        ),
+    ]
+)
+
+
+def generate_additional_tickers(
+    df: pd.DataFrame, only: Iterable[str] | None = None
+) -> pd.DataFrame:
+    """Parsed psw09 rows plus a row per period for each derived ticker.
+
+    ``only`` limits the derived tickers to those ids, e.g.
+    ``WPS_FORMULAS.dependents(changed_ids)``.
+    """
+    df = df.drop(columns=["name"], errors="ignore")
+    derived = WPS_FORMULAS.evaluate_long(df, only).drop(columns=["name"])
+    df = pd.concat([df, derived])
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return df
@@ -0,0 +1,249 @@
+"""Seasonal and rolling statistics of every WPS series, precomputed per ingest.
+
+The stocks, Cushing and supply/demand pages each derived these on every
+callback: the ISO week of every row of the pivot, 5-year mean/min/max bands
+by week of year, a 156-week rolling z-score and percentile rank. `WPSStats`
+holds them for all series of `wps_gte_2015_pivot.feather` as arrays on the
+pivot's weekly index, so a page looks them up by series id.
+
+The arrays are written next to the pivot at WPS ingest and served to the
+pages by `src/utils/datasets.py` (the ``wps_stats`` dataset); `load`
+rebuilds them when the pivot or the band years changed since.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from dash_eia.transforms import arrays
+from dash_eia.transforms.arrays import SeriesArrays, source_digest
+
+WEEKS = 53
+# ~3 years of weekly data, scored once a year of it is available
+WINDOW = 156
+MIN_PERIODS = 52
+RECENT_YEARS = 5
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class WPSStats(SeriesArrays):
+    """WPS statistics by (series, week), periods ascending.
+
+    ``band_*[s, w - 1]`` is the mean, min or max of series ``s`` over the
+    weeks of ISO week ``w`` in the calendar ``years``; ``recent_mean`` is the
+    mean over the last `RECENT_YEARS` years up to the series' latest value.
+    ``zscores`` and ``percentiles`` are over the `WINDOW` latest values of a
+    series at each week, NaN where it has fewer than `MIN_PERIODS`.
+    """
+
+    values: np.ndarray
+    ids: np.ndarray
+    periods: np.ndarray
+    weeks: np.ndarray
+    years: np.ndarray
+    band_mean: np.ndarray
+    band_min: np.ndarray
+    band_max: np.ndarray
+    recent_mean: np.ndarray
+    zscores: np.ndarray
+    percentiles: np.ndarray
+    _in_band: np.ndarray = field(init=False, repr=False, compare=False)
+
+    KEYS = (
+        "values",
+        "ids",
+        "periods",
+        "weeks",
+        "years",
+        "band_mean",
+        "band_min",
+        "band_max",
+        "recent_mean",
+        "zscores",
+        "percentiles",
+    )
+    KIND = "WPS"
+
+    def __post_init__(self) -> None:
+        # Named: zero-argument super() fails in a slots dataclass
+        SeriesArrays.__post_init__(self)
+        years = self.periods.astype("datetime64[Y]").astype(int) + 1970
+        object.__setattr__(self, "_in_band", np.isin(years, self.years))
+
+    def row(self, series_id: str) -> np.ndarray:
+        """Every week's value of a series, NaN where it has none (a view)."""
+        return self.values[self.position(series_id)]
+
+    def series(self, series_id: str) -> tuple[np.ndarray, np.ndarray]:
+        """(periods, values) of the weeks a series has a value."""
+        return self._valid(self.row(series_id))
+
+    def band(self, series_id: str) -> pd.DataFrame:
+        """week, mean, min, max of a series over the band years."""
+        s = self.position(series_id)
+        weeks = self._band_weeks()
+        return pd.DataFrame(
+            {
+                "week": weeks,
+                "mean": self.band_mean[s, weeks - 1],
+                "min": self.band_min[s, weeks - 1],
+                "max": self.band_max[s, weeks - 1],
+            }
+        )
+
+    def bands_of(self, values: np.ndarray) -> pd.DataFrame:
+        """`band` for an array on ``periods``, such as a ratio of two series."""
+        stats = week_stats(np.asarray(values, dtype=float)[None, :], self.weeks, self._in_band)
+        weeks = self._band_weeks()
+        return pd.DataFrame(
+            {"week": weeks, **{key: stat[0, weeks - 1] for key, stat in stats.items()}}
+        )
+
+    def five_year_avg(self, series_id: str, week: int) -> float:
+        """The band mean of a series at ISO week ``week``."""
+        return float(self.band_mean[self.position(series_id), week - 1])
+
+    def by_year(self, values: np.ndarray, year: int) -> tuple[np.ndarray, np.ndarray]:
+        """(ISO weeks, values) of an array on ``periods`` within calendar ``year``."""
+        start = np.searchsorted(self.periods, np.datetime64(f"{year}-01-01"))
+        stop = np.searchsorted(self.periods, np.datetime64(f"{year + 1}-01-01"))
+        return self.weeks[start:stop], values[start:stop]
+
+    def zscore(self, series_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self._valid(self.zscores[self.position(series_id)])
+
+    def percentile(self, series_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self._valid(self.percentiles[self.position(series_id)])
+
+    def seasonal_deviation(self, series_id: str) -> tuple[np.ndarray, np.ndarray]:
+        """(periods, value - recent mean of its week) of a series."""
+        s = self.position(series_id)
+        return self._valid(self.values[s] - self.recent_mean[s, self.weeks - 1])
+
+    def _valid(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        valid = ~np.isnan(values)
+        return self.periods[valid], values[valid]
+
+    def _band_weeks(self) -> np.ndarray:
+        return np.unique(self.weeks[self._in_band])
+
+
+def week_stats(values: np.ndarray, weeks: np.ndarray, rows: np.ndarray) -> dict[str, np.ndarray]:
+    """mean, min and max of the ``rows`` columns of (series x period) ``values`` by week.
+
+    Each is a (series x `WEEKS`) array, NaN for weeks without a value.
+    """
+    frame = pd.DataFrame(values[:, rows].T)
+    grouped = frame.groupby(weeks[rows])
+    out = {}
+    for key in ("mean", "min", "max"):
+        stat = grouped.agg(key).reindex(range(1, WEEKS + 1))
+        out[key] = stat.to_numpy(dtype=float).T
+    return out
+
+
+def rolling_scores(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Z-score and percentile rank of each value within the `WINDOW` values up to it.
+
+    ``values`` is one series; missing weeks are skipped, so the window is
+    over the series' own observations.
+    """
+    zscores = np.full(len(values), np.nan)
+    percentiles = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < MIN_PERIODS:
+        return zscores, percentiles
+
+    observed = pd.Series(values[valid])
+    rolling = observed.rolling(window=WINDOW, min_periods=MIN_PERIODS)
+    zscores[valid] = ((observed - rolling.mean()) / rolling.std()).to_numpy()
+
+    padded = np.concatenate([np.full(WINDOW - 1, np.nan), observed.to_numpy()])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, WINDOW)
+    counts = (~np.isnan(windows)).sum(axis=1)
+    at_or_below = (windows <= windows[:, -1:]).sum(axis=1)
+    ranks = at_or_below / counts * 100
+    percentiles[valid] = np.where(counts >= MIN_PERIODS, ranks, np.nan)
+    return zscores, percentiles
+
+
+def build(pivot: pd.DataFrame, years: Iterable[int], digest: str = "") -> WPSStats:
+    """The statistics of every series of a WPS pivot (period, ids...)."""
+    pivot = pivot.sort_values("period")
+    periods = pd.DatetimeIndex(pd.to_datetime(pivot["period"]))
+    ids = [column for column in pivot.columns if column != "period"]
+    values = pivot[ids].to_numpy(dtype=float).T
+    weeks = periods.isocalendar().week.to_numpy(dtype=np.int64)
+    years = np.array(sorted(years), dtype=np.int64)
+
+    band = week_stats(values, weeks, periods.year.isin(years))
+
+    recent_mean = np.full((len(ids), WEEKS), np.nan)
+    zscores = np.full(values.shape, np.nan)
+    percentiles = np.full(values.shape, np.nan)
+    for s, series in enumerate(values):
+        valid = ~np.isnan(series)
+        if not valid.any():
+            continue
+        cutoff = periods[valid][-1] - pd.DateOffset(years=RECENT_YEARS)
+        recent = valid & (periods >= cutoff)
+        sums = np.bincount(weeks[recent] - 1, series[recent], minlength=WEEKS)
+        counts = np.bincount(weeks[recent] - 1, minlength=WEEKS)
+        recent_mean[s] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        zscores[s], percentiles[s] = rolling_scores(series)
+
+    return WPSStats(
+        values=values,
+        ids=np.array(ids, dtype=str),
+        periods=periods.to_numpy(dtype="datetime64[ns]"),
+        weeks=weeks,
+        years=years,
+        band_mean=band["mean"],
+        band_min=band["min"],
+        band_max=band["max"],
+        recent_mean=recent_mean,
+        zscores=zscores,
+        percentiles=percentiles,
+        digest=digest,
+    )
+
+
+def _digest(pivot_path: str | os.PathLike[str], years: Iterable[int]) -> str:
+    return f"{source_digest(pivot_path)}:{','.join(str(year) for year in sorted(years))}"
+
+
+def materialize(
+    pivot_path: str | os.PathLike[str], path: str | os.PathLike[str], years: Iterable[int]
+) -> WPSStats:
+    """Build the statistics of the pivot file and write them to ``path``."""
+    years = list(years)
+    stats = build(pd.read_feather(pivot_path), years, _digest(pivot_path, years))
+    stats.save(path)
+    return stats
+
+
+def load(
+    pivot_path: str | os.PathLike[str],
+    path: str | os.PathLike[str],
+    years: Iterable[int],
+    *,
+    write: bool = True,
+) -> WPSStats:
+    """The statistics at ``path``, rebuilt first if the pivot or band years changed since.
+
+    See `arrays.load` for ``write``.
+    """
+    years = list(years)
+    digest = _digest(pivot_path, years)
+    return arrays.load(
+        WPSStats,
+        path,
+        digest,
+        lambda: build(pd.read_feather(pivot_path), years, digest),
+        write=write,
+    )
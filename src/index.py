@@ -4,8 +4,14 @@ from dash.exceptions import PreventUpdate
 from src.app import app
 from src.app import initial_data
 from src.config.navigation import BRAND, HOME, NAV_SECTIONS
+from src.config.routes import DEFAULT_PAGE, ROUTES
 from src.components.shell import build_sidebar, compute_collapse_state
+from src.components.router import PageRouter
+from src.cli.cli_data_processor import DEFAULT_DATA_PATH as CLI_DATA_PATH
+from src.utils import registry, snapshots
 
+# Every page is imported here so its callbacks are registered before the first
+# request. Imports hold no data; `router` builds a page's layout on its first visit.
 import pages.page1      # Home
 import pages.page2_1    # Headline
 import pages.page2_2    # Graphing (Combined WPS)
@@ -48,6 +54,10 @@ import pages.page6_5    # EIA PSM - TBD
 import pages.page6_6    # EIA PSM - TBD
 
 sidebar = build_sidebar(BRAND, HOME, NAV_SECTIONS)
+router = PageRouter(ROUTES, DEFAULT_PAGE)
+# Built layouts hold data (the home page cards, the initial grids): build them
+# again once a refresh lands (see src.utils.registry)
+registry.on_change([*snapshots.sources(), CLI_DATA_PATH], router.clear)
 
 content = html.Div(id="page-content", className="content-area")
 
@@ -75,88 +85,5 @@ def toggle_nav_section(n_clicks_list, is_open_list):
 @app.callback(Output('page-content', 'children'),
               [Input('url', 'pathname')])
 def display_page(pathname):
-    # Default to home page if root path or None
-    if pathname == '/' or pathname is None:
-        return pages.page1.layout
-    elif pathname == '/home':
-        return pages.page1.layout
-    # EIA Weekly
-    elif pathname == '/stats/headline':
-        return pages.page2_1.layout
-    elif pathname == '/stats/graphing':
-        return pages.page2_2.layout
-    elif pathname == '/stats/stats_table':
-        return pages.page2_3.layout
-    elif pathname == '/stats/padd_regional':
-        return pages.page2_4.layout
-    elif pathname == '/stats/cushing_analysis':
-        return pages.page2_5.layout
-    elif pathname == '/stats/runs_analysis':
-        return pages.page2_6.layout
-    elif pathname == '/stats/supply_demand':
-        return pages.page2_7.layout
-    elif pathname == '/stats/time_series_analytics':
-        return pages.page2_8.layout
-    elif pathname == '/dpr/dpr_charts':
-        return pages.page3_1.layout
-    elif pathname == '/dpr/dpr_table':
-        return pages.page3_2.layout
-    elif pathname == '/dpr/efficiency_heatmap':
-        return pages.page3_7.layout
-    elif pathname == '/dpr/duc_waterfall':
-        return pages.page3_8.layout
-    elif pathname == '/dpr/productivity_matrix':
-        return pages.page3_9.layout
-    elif pathname == '/dpr/performance_radar':
-        return pages.page3_10.layout
-    # EIA STEO
-    elif pathname == '/steo/tbd1':
-        return pages.page4_1.layout
-    elif pathname == '/steo/tbd2':
-        return pages.page4_2.layout
-    elif pathname == '/steo/tbd3':
-        return pages.page4_3.layout
-    elif pathname == '/steo/tbd4':
-        return pages.page4_4.layout
-    elif pathname == '/steo/tbd5':
-        return pages.page4_5.layout
-    elif pathname == '/steo/tbd6':
-        return pages.page4_6.layout
-    # EIA CLI
-    elif pathname == '/cli/market_overview':
-        return pages.page5_1.layout
-    elif pathname == '/cli/company_analysis':
-        return pages.page5_2.layout() if callable(pages.page5_2.layout) else pages.page5_2.layout
-    elif pathname == '/cli/quality_analysis':
-        return pages.page5_3.layout
-    elif pathname == '/cli/regional_padd':
-        return pages.page5_4.layout
-    elif pathname == '/cli/country_risk':
-        return pages.page5_5.layout
-    elif pathname == '/cli/seasonal_patterns':
-        return pages.page5_6.layout
-    elif pathname == '/cli/forecasting':
-        return pages.page5_7.layout
-    elif pathname == '/cli/port_analysis':
-        return pages.page5_8.layout
-    elif pathname == '/cli/trade_flow':
-        return pages.page5_9.layout
-    elif pathname == '/cli/market_alerts':
-        return pages.page5_10.layout
-    # EIA PSM
-    elif pathname == '/psm/tbd1':
-        return pages.page6_1.layout
-    elif pathname == '/psm/tbd2':
-        return pages.page6_2.layout
-    elif pathname == '/psm/tbd3':
-        return pages.page6_3.layout
-    elif pathname == '/psm/tbd4':
-        return pages.page6_4.layout
-    elif pathname == '/psm/tbd5':
-        return pages.page6_5.layout
-    elif pathname == '/psm/tbd6':
-        return pages.page6_6.layout
-
-    else:
-        # Default to home page for any unrecognized path
-        return pages.page1.layout
+    # Unrecognized paths fall back to the home page
+    return router.layout(pathname)
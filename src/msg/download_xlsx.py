@@ -2,7 +2,7 @@ import requests
 import pandas as pd
 import numpy as np
 from src.msg.mapping import production_mapping
-from src.msg.generate_additional_tickers import generate_additional_tickers
+from dash_eia.transforms.wps import generate_additional_tickers
 from src.msg.generate_line_data import generate_line_data
 from src.msg.generate_seasonality_data import generate_seasonality_data
 
@@ -1,25 +1,18 @@
 import dash
-from dash import html, Input, Output, dcc
+from dash import html, Input, Output, State, dcc
 import plotly.graph_objects as go
 import pandas as pd
 from src.steo.graph_optionality import checklist_header
-from src.steo.chart_dpr import chart_dpr
+from src.steo.chart_dpr import dpr_figure, patch_dpr, start_year
 from src.steo.evolution_counter import evolution_counter
 from src.app import app
+from src.components.graphs import create_loading_graph
 
 
 
 
-def create_loading_graph(graph_id):
-    blank_graph = go.Figure().update_layout(
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-    )
-    return html.Div(
-        dcc.Graph(id=graph_id, figure=blank_graph), className="graph-container"
-    )
+# Graphs drawn before the browser reports which are on screen
+INITIAL_GRAPHS = 4
 
 
 def create_layout(page_id, commodity, graph_sections_input):
@@ -63,6 +56,10 @@ def create_layout(page_id, commodity, graph_sections_input):
 
     return html.Div(
         [
+            # Graph ids on screen, kept up to date by assets/dpr_viewport.js
+            dcc.Store(id=f"{page_id}-viewport"),
+            # [start year, evolutions] each graph was last drawn with
+            dcc.Store(id=f"{page_id}-drawn", data={}),
             evolution_counter(app),
             checklist_header(
                 app,
@@ -81,13 +78,25 @@ def create_layout(page_id, commodity, graph_sections_input):
             ],
         ],
         className="eia-weekly-graph-page-layout",
+        **{"data-viewport-store": f"{page_id}-viewport"},
     )
 
 
-def create_callbacks(app, page_id, num_graphs, idents, region_dct):
+def create_callbacks(app, page_id, num_graphs, idents, load_evolutions):
+    """Draw only the graphs on screen, and update drawn graphs with patches.
+
+    A graph is drawn in full the first time it scrolls into view. Afterwards a
+    year button only moves its axis ranges and the evolution counter only adds
+    or removes traces, so those clicks send a `Patch` per visible graph;
+    graphs off screen are left alone until they scroll into view. A view
+    records the digest of the evolutions it was drawn from: after a new
+    release is loaded, a graph is drawn again rather than patched.
+    """
+    graph_ids = [f"{page_id}-graph-{i}" for i in range(1, num_graphs + 1)]
 
     @app.callback(
-        [Output(f"{page_id}-graph-{i}", "figure") for i in range(1, num_graphs + 1)],
+        [Output(graph_id, "figure") for graph_id in graph_ids]
+        + [Output(f"{page_id}-drawn", "data")],
         [
             Input(f"{page_id}-btn_2020-state", "data"),
             Input(f"{page_id}-btn_2021-state", "data"),
@@ -97,7 +106,9 @@ def create_callbacks(app, page_id, num_graphs, idents, region_dct):
             Input(f"{page_id}-btn_2025-state", "data"),
             Input(f"{page_id}-btn_2026-state", "data"),
             Input(f"evolution-store", "data"),
+            Input(f"{page_id}-viewport", "data"),
         ],
+        State(f"{page_id}-drawn", "data"),
     )
     def update_graphs(
         btn_2020,
@@ -108,23 +119,35 @@ def create_callbacks(app, page_id, num_graphs, idents, region_dct):
         btn_2025,
         btn_2026,
         evolution_counter,
+        viewport,
+        drawn,
     ):
-        return [
-            chart_dpr(
-                ident,
-                region_dct,
-                btn_2020,
-                btn_2021,
-                btn_2022,
-                btn_2023,
-                btn_2024,
-                btn_2025,
-                btn_2026,
-                evolution_counter,
-            )
-            for ident in idents
-        ]
-        
+        start = start_year(btn_2020, btn_2021, btn_2022, btn_2023, btn_2024, btn_2025, btn_2026)
+        # Loaded once per process and per release (src.utils.registry)
+        evolutions = load_evolutions()
+        view = [start, evolution_counter, evolutions.digest]
+        visible = set(graph_ids[:INITIAL_GRAPHS] if viewport is None else viewport)
+        drawn = dict(drawn or {})
+
+        figures = []
+        changed = False
+        for graph_id, ident in zip(graph_ids, idents):
+            previous = drawn.get(graph_id)
+            if graph_id not in visible or previous == view:
+                figures.append(dash.no_update)
+                continue
+            if previous is not None and previous[2:] == view[2:]:
+                figures.append(patch_dpr(ident, evolutions, previous, start, evolution_counter))
+            else:
+                figures.append(dpr_figure(ident, evolutions, start, evolution_counter))
+            drawn[graph_id] = view
+            changed = True
+
+        return figures + [drawn if changed else dash.no_update]
+
+    return update_graphs
+
+
 if __name__ == "__main__":
     app.layout = create_layout("page3_1", "commodity", [("title", ["graph-1"])])
     app.run_server(debug=True, port=8051)        
@@ -1,175 +1,46 @@
 import plotly.graph_objects as go
+from dash import Patch
 import numpy as np
 import pandas as pd
 from src.utils.colors import BLACK, BLUE, RED, GREEN, ORANGE
 from src.utils.plotly_theme import apply_minimal_chrome
+from src.utils import snapshots
+from dash_eia.transforms import dpr
 
 DPR_CHART_COLORS = [BLACK, BLUE, RED, GREEN, ORANGE]
 
 
-def melt_pivot(df):
-    df = pd.melt(
-        df, id_vars=["id", "release_date"], var_name="period", value_name="value"
-    )
-    df = df.dropna(subset=["value"])
-    df["release_date"] = pd.to_datetime(df["release_date"])
-    df["period"] = pd.to_datetime(df["period"])
-    df["value"] = pd.to_numeric(df["value"])
-    df["value"] = df["value"].round(2)
-
-    return df
-
-
-def get_data(source, metasource):
-    df = pd.read_feather(source)
-    df_meta = pd.read_csv(metasource)
-    df = df[df["id"].isin(df_meta["id"])]
-    df["name"] = df["id"].map(df_meta.set_index("id")["name"])
-    df["uom"] = df["id"].map(df_meta.set_index("id")["uom"])
-    df.insert(1, "region", df["id"].map(df_meta.set_index("id")["region"]))
-
-    meta_name = df[["id", "name"]].drop_duplicates().set_index("id").to_dict()["name"]
-    meta_uom = df[["id", "uom"]].drop_duplicates().set_index("id").to_dict()["uom"]
-    meta_region = (
-        df[["id", "region"]].drop_duplicates().set_index("id").to_dict()["region"]
-    )
-
-    df = df.drop(columns=["name", "uom", "region"])
-
-    df = melt_pivot(df)
+YEAR_BUTTONS = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
+MAX_EVOLUTIONS = len(DPR_CHART_COLORS)
 
-    return df, meta_name, meta_region, meta_uom
 
+def start_year(*buttons):
+    """First year shown by the year buttons (2020 to 2026), None when none is on."""
+    years = [year for year, on in zip(YEAR_BUTTONS, buttons) if on]
+    return max(years) if years else None
 
-def make_data_dicts(source, metasource, region_lookup=None):
-    df, meta_name, meta_region, meta_uom = get_data(source, metasource)
-
-    dct = {}
-    for id in df["id"].unique():
-        dff = df[df["id"] == id].drop(columns=["id"]).set_index("period")
-        dff["release_date"] = dff["release_date"].dt.to_period("M")
-        dff = dff.pivot(columns="release_date", values="value")
-        dff = dff[dff.columns[::-1]]
-        name = meta_name[id]
-        region = meta_region[id]
-        uom = meta_uom[id]
-
-        if region_lookup is not None and region_lookup in region.lower():
-            dct[id] = {"name": name, "region": region, "uom": uom, "data": dff}
-        elif region_lookup is None:
-            dct[id] = {"name": name, "region": region, "uom": uom, "data": dff}
-            
-            
-    return dct
 
+def _trace(periods, values, labels, i):
+    """Line for the ``i``-th most recent release; the latest is drawn heavier."""
+    trace = go.Scatter(
+        x=periods,
+        y=values[i],
+        mode="lines",
+        name=labels[i],
+        line=dict(color=DPR_CHART_COLORS[i]),
+    )
+    if i == 0:
+        trace.line.width = 3
+    return trace
 
-def chart_dpr(
-    id,
-    dct,
-    btn_2020,
-    btn_2021,
-    btn_2022,
-    btn_2023,
-    btn_2024,
-    btn_2025,
-    btn_2026,
-    evolution_counter=5
-):
-    df = dct[id]["data"]
-    df = df.round(2)
-    graph_region = dct[id]["region"]
-    graph_name = dct[id]["name"]
-    graph_uom = dct[id]["uom"]
-    del dct
-
-    cols = df.columns.astype(str)
-
-    if btn_2020:
-        df = df[df.index >= "2020"]
-    if btn_2021:
-        df = df[df.index >= "2021"]
-    if btn_2022:
-        df = df[df.index >= "2022"]
-    if btn_2023:
-        df = df[df.index >= "2023"]
-    if btn_2024:
-        df = df[df.index >= "2024"]
-    if btn_2025:
-        df = df[df.index >= "2025"]
-    if btn_2026:
-        df = df[df.index >= "2026"]
-
-    period_as_array = df.index.to_numpy()
-
-    traces = []
-
-    # first trace
-    if evolution_counter > 0:
-        traces.append(
-            go.Scatter(
-                x=period_as_array,
-                y=df.iloc[:, 0],
-                mode="lines",
-                name=cols[0],
-                line=dict(color=DPR_CHART_COLORS[0]),
-                line_width=3,
-            )
-        )
-
-    # second trace
-    if evolution_counter > 1:
-        traces.append(
-            go.Scatter(
-                x=period_as_array,
-                y=df.iloc[:, 1],
-                mode="lines",
-                name=cols[1],
-                line=dict(color=DPR_CHART_COLORS[1]),
-            )
-        )
-
-    # third trace
-    if evolution_counter > 2:
-        traces.append(
-            go.Scatter(
-                x=period_as_array,
-                y=df.iloc[:, 2],
-                mode="lines",
-                name=cols[2],
-                line=dict(color=DPR_CHART_COLORS[2]),
-            )
-        )
-
-    # fourth trace
-    if evolution_counter > 3:
-        traces.append(
-            go.Scatter(
-                x=period_as_array,
-                y=df.iloc[:, 3],
-                mode="lines",
-                name=cols[3],
-                line=dict(color=DPR_CHART_COLORS[3]),
-            )
-        )
-
-    # fifth trace
-    if evolution_counter > 4:
-        traces.append(
-            go.Scatter(
-                x=period_as_array,
-                y=df.iloc[:, 4],
-                mode="lines",
-                name=cols[4],
-                line=dict(color=DPR_CHART_COLORS[4]),
-            )
-        )
 
+def _layout(graph_region, graph_name, graph_uom):
     if graph_uom == 'mbd' or graph_uom == 'bcfd':
         yaxis_tick_format = ".2f"
     else:
         yaxis_tick_format = ".0f"
 
-    layout = go.Layout(
+    return go.Layout(
         title=f"{graph_region}: {graph_name} ({graph_uom})",
         plot_bgcolor="rgba(0,0,0,0)",
         height=600,
@@ -191,27 +62,122 @@ def chart_dpr(
         ),
     )
 
+
+def chart_dpr(
+    id,
+    evolutions,
+    btn_2020,
+    btn_2021,
+    btn_2022,
+    btn_2023,
+    btn_2024,
+    btn_2025,
+    btn_2026,
+    evolution_counter=5
+):
+    """Chart of the newest ``evolution_counter`` releases of a series in `DPREvolutions`."""
+    graph_name, graph_region, graph_uom = evolutions.meta(id)
+    count = min(evolution_counter, MAX_EVOLUTIONS)
+
+    start = start_year(btn_2020, btn_2021, btn_2022, btn_2023, btn_2024, btn_2025, btn_2026)
+    periods, values = evolutions.evolutions(id, count, None if start is None else str(start))
+    labels = evolutions.labels(count)
+
+    traces = [_trace(periods, values, labels, i) for i in range(count)]
+
+    fig = go.Figure(data=traces, layout=_layout(graph_region, graph_name, graph_uom))
+    apply_minimal_chrome(fig.layout)
+    return fig
+
+
+# Figures drawn for partial updates (see src/steo/calcs.py) hold every period
+# of each release and show the selected years through the axis ranges, so a
+# year button only moves the ranges and the evolution counter only adds or
+# removes traces.
+
+
+def dpr_view(id, evolutions, start, evolution_counter):
+    """Axis ranges showing the first ``evolution_counter`` releases from ``start``."""
+    autorange = dict(autorange=True, range=None), dict(autorange=True, range=None)
+    if start is None:
+        return autorange
+
+    count = min(evolution_counter, MAX_EVOLUTIONS)
+    periods, values = evolutions.evolutions(id, count, str(start))
+    shown = np.flatnonzero(~np.isnan(values).all(axis=0))
+    if not len(shown):
+        return autorange
+
+    values = values[:, shown[0]:shown[-1] + 1]
+    low, high = np.nanmin(values), np.nanmax(values)
+    # The padding plotly's autorange gives a line chart
+    pad = (high - low) * 0.05 or abs(high) * 0.05 or 1
+    first, last = pd.Timestamp(periods[shown[0]]), pd.Timestamp(periods[shown[-1]])
+    xaxis = dict(autorange=False, range=[first, last])
+    yaxis = dict(autorange=False, range=[low - pad, high + pad])
+    return xaxis, yaxis
+
+
+def dpr_figure(id, evolutions, start, evolution_counter):
+    """`chart_dpr` over every period, with the selected years set as the axis ranges."""
+    graph_name, graph_region, graph_uom = evolutions.meta(id)
+    count = min(evolution_counter, MAX_EVOLUTIONS)
+    periods, values = evolutions.evolutions(id, count)
+    labels = evolutions.labels(count)
+
+    traces = [_trace(periods, values, labels, i) for i in range(count)]
+    layout = _layout(graph_region, graph_name, graph_uom)
+    xaxis, yaxis = dpr_view(id, evolutions, start, evolution_counter)
+    layout.xaxis.update(xaxis)
+    layout.yaxis.update(yaxis)
+
     fig = go.Figure(data=traces, layout=layout)
     apply_minimal_chrome(fig.layout)
     return fig
 
 
+def patch_dpr(id, evolutions, drawn, start, evolution_counter):
+    """Patch turning a `dpr_figure` drawn for ``drawn`` = [start, evolutions, ...] into the new view."""
+    patch = Patch()
+    drawn_count = min(drawn[1], MAX_EVOLUTIONS)
+    count = min(evolution_counter, MAX_EVOLUTIONS)
+
+    if count > drawn_count:
+        periods, values = evolutions.evolutions(id, count)
+        labels = evolutions.labels(count)
+        for i in range(drawn_count, count):
+            # Sent as plain lists: two-decimal values are shorter as text than packed
+            patch["data"].append(_trace(periods, values, labels, i).to_plotly_json())
+    for i in reversed(range(count, drawn_count)):
+        del patch["data"][i]
+
+    xaxis, yaxis = dpr_view(id, evolutions, start, evolution_counter)
+    for axis, view in [("xaxis", xaxis), ("yaxis", yaxis)]:
+        for key, value in view.items():
+            patch["layout"][axis][key] = value
+    return patch
+
+
 ### PARAMETERS ##########################################################
 
 
-def get_regional_dict_data(region_lookup=None):
-    source = "./data/steo/steo_pivot_dpr.feather"
-    meta = "./lookup/steo/mapping_dpr.csv"
-    dct_to_search = make_data_dicts(source, meta, region_lookup)
-    return dct_to_search
+PIVOT_PATH = "./data/steo/steo_pivot_dpr.feather"
+META_PATH = "./lookup/steo/mapping_dpr.csv"
+# Written next to the pivot at STEO ingest (see src/steo/create_more_files.py)
+EVOLUTIONS_PATH = "./data/steo/steo_pivot_dpr_evolutions.npz"
+
+
+def get_dpr_evolutions():
+    pivot_path, evolutions_path = snapshots.paths(PIVOT_PATH, EVOLUTIONS_PATH)
+    return dpr.load(pivot_path, META_PATH, evolutions_path,
+                    write=not snapshots.is_published(evolutions_path))
 
 
 if __name__ == "__main__":
-    region_lookup = None
-    dct = get_regional_dict_data(region_lookup)
+    evolutions = get_dpr_evolutions()
     fig = chart_dpr(
         "COPRAP",
-        dct,
+        evolutions,
         False,
         False,
         True,
@@ -1,4 +1,6 @@
 import pandas as pd
+from dash_eia.transforms import dpr
+from src.utils import snapshots
 
 def get_dpr_ids():
     df = pd.read_feather('./data/steo/steo_pivot.feather')
@@ -11,6 +13,9 @@ def get_dpr_ids():
     df = df.reset_index(drop=True)
     
     df.to_feather('data/steo/steo_pivot_dpr.feather')
+    # The DPR pages chart from this array rather than the pivot
+    dpr.materialize('data/steo/steo_pivot_dpr.feather', './lookup/steo/mapping_dpr.csv',
+                    'data/steo/steo_pivot_dpr_evolutions.npz')
     
     return df
 
@@ -29,6 +34,8 @@ def get_other_dpr_ids():
 def main():
     df = get_dpr_ids()
     get_other_dpr_ids()
+    # The STEO pivot and the DPR files written from it become visible together
+    snapshots.publish('steo')
     return df
     
 if __name__ == '__main__':
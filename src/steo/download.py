@@ -1,14 +1,34 @@
+import argparse
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
 import pandas as pd
+import requests
 from src.steo.find_last_update import updatecompiler
 from src.steo.create_more_files import main as create_more_files
+from dash_eia.config.paths import WorkspacePaths
+from src.utils import workbooks
+
+ARCHIVE_URL = 'https://www.eia.gov/outlooks/steo/archives/'
+# Releases are fetched and parsed a few at a time; EIA throttles wider fan-outs
+DOWNLOAD_WORKERS = 4
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+CHUNK_SIZE = 1 << 16
+TIMEOUT = 60
 
 def get_last_release():
     df = updatecompiler()
     end_date = df['new_release_date'][0].replace(day=1)  
     return end_date
 
-def get_download_list(offset_month):
-    end_month = get_last_release()
+def get_download_list(offset_month, end_month=None, base_url=ARCHIVE_URL):
+    if end_month is None:
+        end_month = get_last_release()
+    end_month = pd.Timestamp(end_month)
     start_month = end_month - pd.DateOffset(months=offset_month-1)
 
     months = pd.date_range(start_month,end_month,freq='MS')
@@ -17,18 +37,180 @@ def get_download_list(offset_month):
     df['year'] = df['date'].dt.strftime('%y').astype(str)
     df['monthStr'] = df['date'].dt.strftime('%b').str.lower()
     df['dates'] = df['monthStr'] + df['year']
-    df['url'] = 'https://www.eia.gov/outlooks/steo/archives/' + df['dates'] + '_base.xlsx'
+    df['url'] = base_url + df['dates'] + '_base.xlsx'
     df = df.sort_values(by='date',ascending=False).reset_index(drop=True)
     df = df.rename(columns={'date':'release_date'})
     return df
 
 
+def raw_directory():
+    '''Where release workbooks are cached: <workspace>/data/raw/steo.'''
+    return WorkspacePaths.discover().raw / 'steo'
+
+def release_path(directory, release_date):
+    return Path(directory) / f'{pd.Timestamp(release_date):%Y-%m}_base.xlsx'
+
+def _partial(path):
+    return path.with_name(path.name + '.part'), path.with_name(path.name + '.part.tag')
+
+def _full_size(response):
+    '''The size of the whole file a response carries all or part of, None if it does not say.'''
+    if response.headers.get('Content-Encoding', 'identity') != 'identity':
+        return None
+    content_range = response.headers.get('Content-Range', '')
+    if content_range:
+        size = content_range.rsplit('/', 1)[-1]
+        return int(size) if size.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if response.status_code == 200 and length and length.isdigit() else None
+
+def is_workbook(path, size=None):
+    '''Whether `path` holds a whole xlsx workbook: `size` bytes when given, and every member intact.'''
+    if size is not None and os.path.getsize(path) != size:
+        return False
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.testzip() is None
+    except (zipfile.BadZipFile, EOFError, OSError):
+        return False
+
+def fetch_release(url, path):
+    '''Download one workbook to `path`, continuing a partial download if one was left.
+
+    The bytes go to `<path>.part` first and are renamed once complete, so a
+    file at `path` is always a whole workbook. The ETag (or Last-Modified) of
+    the first response is kept in `<path>.part.tag` and sent as `If-Range` on
+    resume, so the server sends the whole file again if it changed since; a
+    part left without one is downloaded again from the start. A 416 answer
+    means the part already holds every byte. A part that is not a whole
+    workbook once written is discarded and fetched once more in full.
+    '''
+    path = Path(path)
+    part, tag = _partial(path)
+    headers = {}
+    if part.exists() and tag.exists():
+        headers = {'Range': f'bytes={part.stat().st_size}-', 'If-Range': tag.read_text()}
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        size = _full_size(response)
+        if not (headers and response.status_code == 416):
+            response.raise_for_status()
+            resumed = bool(headers) and response.status_code == 206
+            if not resumed:
+                validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                if validator:
+                    tag.write_text(validator)
+                else:
+                    tag.unlink(missing_ok=True)
+            with open(part, 'ab' if resumed else 'wb') as file:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    file.write(chunk)
+    if not is_workbook(part, size):
+        part.unlink()
+        tag.unlink(missing_ok=True)
+        if headers:
+            return fetch_release(url, path)
+        raise ValueError(f'{url} did not return an xlsx workbook')
+    os.replace(part, path)
+    tag.unlink(missing_ok=True)
+    return path
+
+def download_releases(releases, directory=None, workers=DOWNLOAD_WORKERS, refresh=False):
+    '''Cache the workbooks of `releases` (a `get_download_list` frame) under `directory`.
+
+    Releases already cached are skipped unless `refresh`. A release that fails
+    to download is reported and left out instead of stopping the others.
+    Returns ({release_date: path}, [failed release_dates]).
+    '''
+    directory = Path(directory) if directory is not None else raw_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths, pending = {}, {}
+    for release_date, url in zip(releases['release_date'], releases['url']):
+        path = release_path(directory, release_date)
+        if path.exists() and not refresh:
+            paths[release_date] = path
+        else:
+            pending[release_date] = (url, path)
+    if refresh:
+        for _, path in pending.values():
+            for leftover in _partial(path):
+                leftover.unlink(missing_ok=True)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            release_date: pool.submit(fetch_release, url, path)
+            for release_date, (url, path) in pending.items()
+        }
+        for release_date, future in futures.items():
+            url, _ = pending[release_date]
+            try:
+                paths[release_date] = future.result()
+                print(f'downloaded: {url}')
+            except (requests.RequestException, OSError, ValueError) as error:
+                print(f'error: {url} ({error})')
+                failed.append(release_date)
+    return paths, failed
+
+def parse_release(path, release_date):
+    df = steo().get_data(path)
+    df['release_date'] = release_date
+    return df
+
+def parse_releases(paths, workers=PARSE_WORKERS):
+    '''The long frames of cached workbooks ({release_date: path}), newest release first.
+
+    A workbook that fails to parse is reported, removed from the cache so the
+    next run downloads it again, and left out instead of stopping the others.
+    Returns (frame, [failed release_dates]).
+    '''
+    items = sorted(paths.items(), reverse=True)
+    if workers <= 1 or len(items) <= 1:
+        results = [_outcome(partial(parse_release, path, release_date)) for release_date, path in items]
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(items)), mp_context=context) as pool:
+            futures = [pool.submit(parse_release, path, release_date) for release_date, path in items]
+            results = [_outcome(future.result) for future in futures]
+
+    frames, failed = [], []
+    for (release_date, path), (frame, error) in zip(items, results):
+        if error is None:
+            frames.append(frame)
+            continue
+        print(f'error: could not parse {path} ({error!r})')
+        Path(path).unlink(missing_ok=True)
+        failed.append(release_date)
+    if not frames:
+        return pd.DataFrame(columns=['id', 'period', 'value', 'release_date']), failed
+    return pd.concat(frames, ignore_index=True), failed
+
+def _outcome(result):
+    '''(`result()`, None), or (None, the error) if it raised. A broken pool is raised as is.'''
+    try:
+        return result(), None
+    except BrokenExecutor:
+        raise
+    except Exception as error:
+        return None, error
+
+def collect(releases, directory=None, download_workers=DOWNLOAD_WORKERS, parse_workers=PARSE_WORKERS, refresh=False):
+    '''Download what is not cached yet and parse every release that is.'''
+    paths, failed = download_releases(releases, directory, download_workers, refresh)
+    df, unparsed = parse_releases(paths, parse_workers)
+    failed = sorted(failed + unparsed, reverse=True)
+    if failed:
+        print(f'skipped {len(failed)} release(s): ' + ', '.join(f'{r:%Y-%m}' for r in failed))
+    return df
+
+
 class steo:
     def __init__(self):
         self.meta = pd.read_csv("lookup/steo/metadata_steo.csv")
 
     def _get_file(self, pathname):
-        xlsx = pd.read_excel(pathname, sheet_name=None, header=2)
+        # Sheets in turn: parse_releases already runs one process per release
+        xlsx = workbooks.read_workbook(pathname, header=2, workers=1)
         del xlsx["Dates"]
         del xlsx["Contents"]
         df = pd.concat(xlsx, ignore_index=True)
@@ -92,25 +274,10 @@ class steo:
         df = self._unpivot_data(df)
         return df
 
-    def get_all(self,offset_months=3):
-
-        # df = self.get_data('https://www.eia.gov/outlooks/steo/archives/jan24_base.xlsx')
-
+    def get_all(self, offset_months=3, workers=DOWNLOAD_WORKERS, refresh=False, more_files=True):
         dfDates = get_download_list(offset_months)
 
-        df = pd.DataFrame()
-        for i in range(len(dfDates)):
-            pathname = "https://www.eia.gov/outlooks/steo/archives/{}_base.xlsx".format(
-                dfDates["dates"][i]
-            )
-            print(f"downloading: {pathname}")
-            try:
-                df2 = self.get_data(pathname)
-                df2["release_date"] = dfDates["release_date"][i]
-                df = pd.concat([df, df2], ignore_index=True)
-            except:
-                print(f"error: {pathname}")
-                break
+        df = collect(dfDates, download_workers=workers, refresh=refresh)
         df["id"] = df["id"].str.upper()
         df = self._add_meta(df)
         df = df.drop_duplicates()
@@ -120,12 +287,14 @@ class steo:
         df = pd.pivot_table(df, index=['id','name','release_date','uom'], columns='period', values='value').reset_index()
         df.to_feather('./data/steo/steo_pivot.feather')        
         
-        create_more_files()
+        # The refresh pipeline runs this as its own step (dash_eia.pipelines.refresh)
+        if more_files:
+            create_more_files()
         
         return df
 
-def main(offset_months=3):
-    df = steo().get_all(offset_months)
+def main(offset_months=3, workers=DOWNLOAD_WORKERS, refresh=False, more_files=True):
+    df = steo().get_all(offset_months, workers=workers, refresh=refresh, more_files=more_files)
     return df
 
 def read_pivot():
@@ -144,4 +313,9 @@ def melt_pivot():
     return df
 
 if __name__ == "__main__":
-    df = main(5)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Download STEO releases and rebuild the STEO pivot files')
+    parser.add_argument('--months', type=int, default=5, help='number of monthly releases to include, newest first')
+    parser.add_argument('--workers', type=int, default=DOWNLOAD_WORKERS, help='concurrent downloads')
+    parser.add_argument('--refresh', action='store_true', help='download releases again even if cached')
+    args = parser.parse_args()
+    df = main(args.months, workers=args.workers, refresh=args.refresh)
@@ -0,0 +1,194 @@
+"""Server-side datasets addressed from the browser by handle.
+
+A ``dcc.Store`` used to carry whole frames as ``to_dict('records')``: the WPS
+pivot went into the initial HTML twice, and every AG grid page re-serialized
+its table into the browser and back on each callback. Stores now carry a
+handle instead -- the dataset name, the parameters that produced it and the
+version of the file it was built from -- and callbacks resolve the handle
+against a per-process LRU cache.
+
+A handle is self-describing, so any worker can rebuild a frame it has not seen
+from the registered builder. If the source file has changed since the handle
+was issued, the rebuild picks up the new data, and the frames built from the
+earlier file are dropped when src.utils.registry finds the change.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.utils import registry, snapshots
+
+logger = logging.getLogger(__name__)
+
+WPS_PIVOT_PATH = './data/wps/wps_gte_2015_pivot.feather'
+WPS_STATS_PATH = './data/wps/wps_stats.npz'
+WPS_SEASONALITY_PATH = './data/wps/seasonality_data.feather'
+WPS_LINE_PATH = './data/wps/graph_line_data.feather'
+DPR_PIVOT_PATH = './data/steo/steo_pivot_dpr.feather'
+MAX_ENTRIES = 32
+
+_builders = {}
+_cache = OrderedDict()
+_build_locks = {}
+_lock = threading.Lock()
+
+
+def register(name, build, source):
+    """Register ``build(**params) -> DataFrame`` for a dataset read from ``source``."""
+    _builders[name] = (build, source)
+    registry.on_change([source], functools.partial(_drop_stale, name))
+
+
+def version(name):
+    """The version of the file ``name`` is built from: its mtime and size.
+
+    A published copy (src.utils.snapshots) keeps the mtime of the file it was
+    copied from, so publishing alone does not change a version.
+    """
+    _, source = _builders[name]
+    try:
+        stat = os.stat(snapshots.path(source))
+    except OSError:
+        return None
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+
+def _key(name, params, version):
+    return name, json.dumps(params, sort_keys=True, default=str), version
+
+
+def handle(name, **params):
+    """A JSON-safe reference to ``name`` built with ``params`` from the current file."""
+    if name not in _builders:
+        raise KeyError(f'Unknown dataset: {name}')
+    return {'dataset': name, 'params': params, 'version': version(name)}
+
+
+def publish(name, df, **params):
+    """Cache an already built frame and return its handle."""
+    ref = handle(name, **params)
+    with _lock:
+        _cache[_key(name, params, ref['version'])] = df
+        _cache.move_to_end(_key(name, params, ref['version']))
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return ref
+
+
+def resolve(data):
+    """The frame behind a store value.
+
+    Accepts a handle, or the records list older sessions still hold. The frame
+    is shared, so it is returned as a shallow copy: under copy-on-write a
+    callback can assign columns without touching the cached frame. Datasets
+    that are not frames (a SeriesStore) are read-only and returned as is.
+    """
+    if data is None:
+        return None
+    if not isinstance(data, dict):
+        return pd.DataFrame(data)
+
+    name, params = data['dataset'], data.get('params') or {}
+    key = _key(name, params, version(name))
+    with _lock:
+        df = _cache.get(key)
+        if df is not None:
+            _cache.move_to_end(key)
+            return _shared(df)
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # One build per key: callbacks fanned out from one store change resolve
+    # the same handle at the same time.
+    with build_lock:
+        try:
+            with _lock:
+                df = _cache.get(key)
+            if df is None:
+                build, _ = _builders[name]
+                logger.debug('Building dataset %s %s', name, params)
+                df = build(**params)
+                publish(name, df, **params)
+        finally:
+            with _lock:
+                _build_locks.pop(key, None)
+    return _shared(df)
+
+
+def _shared(df):
+    return df.copy(deep=False) if isinstance(df, pd.DataFrame) else df
+
+
+def _drop_stale(name):
+    """Drop the cached frames of ``name`` built from an earlier version of its file."""
+    if name not in _builders:
+        return
+    current = version(name)
+    with _lock:
+        for key in [key for key in _cache if key[0] == name and key[2] != current]:
+            del _cache[key]
+
+
+def sources():
+    """The files the registered datasets are built from."""
+    return sorted({source for _, source in _builders.values()})
+
+
+def clear():
+    """Drop every cached frame."""
+    with _lock:
+        _cache.clear()
+
+
+def _wps_pivot():
+    from src.utils.data_loader import loader
+    return loader.load_wps_pivot_data()
+
+
+def _wps_ag_table(start='1900-01-01', end='2030-12-31'):
+    from src.wps.ag_calculations import DataProcessor
+    return DataProcessor().get_table(start, end)
+
+
+def _wps_ag_series(start='1900-01-01', end='2030-12-31'):
+    from src.utils.series_store import SeriesStore
+    # Built from the cached table for the same dates when a grid page made one
+    return SeriesStore.from_table(resolve(handle('wps_ag_table', start=start, end=end)))
+
+
+def _wps_stats():
+    from dash_eia.transforms import wps_stats
+    from src.utils.variables import years_last_five_years_range
+    # Written at WPS ingest; rebuilt here only if the pivot changed since
+    pivot_path, stats_path = snapshots.paths(WPS_PIVOT_PATH, WPS_STATS_PATH)
+    return wps_stats.load(pivot_path, stats_path, years_last_five_years_range,
+                          write=not snapshots.is_published(stats_path))
+
+
+def _wps_seasonality():
+    from src.utils.data_loader import loader
+    return loader.load_seasonality_data()
+
+
+def _wps_line():
+    from src.utils.data_loader import loader
+    return loader.load_line_data()
+
+
+def _dpr_metrics(release):
+    from dash_eia.transforms.dpr_metrics import region_metrics
+    from src.utils.data_loader import loader
+    return region_metrics(loader.load_dpr_long(), release)
+
+
+register('wps_pivot', _wps_pivot, WPS_PIVOT_PATH)
+register('wps_ag_table', _wps_ag_table, WPS_PIVOT_PATH)
+register('wps_ag_series', _wps_ag_series, WPS_PIVOT_PATH)
+register('wps_stats', _wps_stats, WPS_PIVOT_PATH)
+register('wps_seasonality', _wps_seasonality, WPS_SEASONALITY_PATH)
+register('wps_line', _wps_line, WPS_LINE_PATH)
+register('dpr_metrics', _dpr_metrics, DPR_PIVOT_PATH)
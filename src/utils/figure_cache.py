@@ -0,0 +1,154 @@
+"""Rendered Plotly figures shared across callbacks, pages and workers.
+
+A WPS chart page redraws every one of its graphs -- 24 on the refining page,
+each 15-40 ms -- whenever a toggle changes, although a chart is a pure
+function of the callback that draws it, its inputs and the data files it
+reads. `figure` memoizes figures under (callback, normalized inputs, data
+version): one `ModelCache` per callback, held in memory and, under
+<workspace>/data/cache/figures/<callback>, on disk, so a figure drawn by one
+worker -- or warmed right after an ingest -- is reused by every other.
+
+The data version is that of the `src.utils.datasets` sources a figure is
+drawn from, so a refresh never serves a stale figure; `prune` drops the disk
+entries of earlier versions, and the in-memory ones are forgotten when
+src.utils.registry finds a new version. Disk entries are not keyed by the drawing code:
+after changing a chart, `clear(disk=True)` or the next ingest's warm-up
+retires them.
+"""
+import functools
+import json
+import logging
+import os
+import shutil
+import threading
+
+from plotly.basedatatypes import BaseFigure, BasePlotlyType
+
+from dash_eia.config.paths import WorkspaceNotFoundError, WorkspacePaths
+from src.utils import datasets, registry
+from src.utils.model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 256
+
+
+def _directory():
+    try:
+        return str(WorkspacePaths.discover().cache / 'figures')
+    except WorkspaceNotFoundError:
+        return None
+
+
+# None keeps figures in memory only
+DIRECTORY = _directory()
+
+_caches = {}
+_lock = threading.Lock()
+
+
+def _cache(callback):
+    with _lock:
+        if callback not in _caches:
+            directory = None if DIRECTORY is None else os.path.join(DIRECTORY, callback)
+            _caches[callback] = ModelCache(max_entries=MAX_ENTRIES, directory=directory)
+        return _caches[callback]
+
+
+def version(sources):
+    """The version of the data behind a figure: those of its ``sources`` datasets."""
+    versions = [datasets.version(name) for name in sources]
+    if None in versions:
+        return None
+    return '_'.join(versions)
+
+
+def key(callback, inputs, data_version):
+    return ModelCache.key(callback, data_version, json.dumps(list(inputs), sort_keys=True, default=str))
+
+
+def figure(callback, sources, render, *inputs):
+    """The figure ``render()`` draws for ``inputs`` of ``callback``, drawn once per data version.
+
+    ``inputs`` must be JSON-serializable and identify the figure together
+    with ``callback``; callers normalize them (n_clicks parity to booleans)
+    so equivalent states share an entry. The figure is returned as a dict,
+    shared between callers, who must not modify it. It is drawn uncached when a
+    source file is missing.
+    """
+    def draw():
+        return _plain(render())
+
+    data_version = version(sources)
+    if data_version is None:
+        return draw()
+    return _cache(callback).get_or_fit(key(callback, inputs, data_version), draw)
+
+
+def _plain(drawn):
+    """A figure as plain dicts and lists, which Dash takes as is.
+
+    Unpickling plotly objects validates every trace again and costs as much as
+    drawing the figure.
+    """
+    if isinstance(drawn, (BaseFigure, BasePlotlyType)):
+        return drawn.to_plotly_json()
+    if isinstance(drawn, dict):
+        return {name: _plain(value) for name, value in drawn.items()}
+    if isinstance(drawn, (list, tuple)):
+        return [_plain(value) for value in drawn]
+    return drawn
+
+
+def cached(*sources):
+    """Decorate a figure callback of the ``sources`` datasets with `figure`.
+
+    The callback is keyed by its module and name, and its arguments are the
+    inputs.
+    """
+    def decorate(render):
+        callback = f'{render.__module__}.{render.__qualname__}'
+
+        @functools.wraps(render)
+        def wrapper(*args):
+            return figure(callback, sources, lambda: render(*args), *args)
+
+        return wrapper
+
+    return decorate
+
+
+def prune(callback, sources):
+    """Drop the disk entries of ``callback`` drawn from earlier versions of ``sources``."""
+    data_version = version(sources)
+    if data_version is not None:
+        _cache(callback).prune(data_version)
+
+
+def stats():
+    """Hits, misses and in-memory entries per callback since the process started."""
+    with _lock:
+        caches = dict(_caches)
+    return {
+        callback: {'hits': cache.hits, 'misses': cache.misses, 'entries': len(cache._entries)}
+        for callback, cache in caches.items()
+    }
+
+
+def forget():
+    """Forget the in-memory figures, keeping the metrics; disk entries load again on demand."""
+    with _lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+registry.on_change(datasets.sources(), forget)
+
+
+def clear(disk=False):
+    """Forget every in-memory figure and the metrics; with ``disk``, the disk entries too."""
+    with _lock:
+        _caches.clear()
+    if disk and DIRECTORY is not None:
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
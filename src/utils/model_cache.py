@@ -0,0 +1,131 @@
+"""Fitted model results shared across callbacks, pages and processes.
+
+Statistical fits (STL, Holt-Winters, SARIMAX) are pure functions of a series,
+the data it was read from, a model specification and a holdout, and some of
+them take seconds. `ModelCache` memoizes their results under that key in a
+per-process LRU and, when given a directory, on disk, so a fit made by one
+worker -- or precomputed after an ingest -- is reused by every other.
+
+Disk entries are grouped by data version: a refresh writes under a new
+version and `prune` drops the directories of older ones.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 128
+
+
+class ModelCache:
+    """LRU of model results keyed by (series id, data version, model spec, holdout)."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._fit_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(series_id, version, spec, holdout=None):
+        return series_id, str(version), spec, holdout
+
+    def _path(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, key[1], f'{digest}.pkl')
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as file:
+                stored_key, result = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return (result,) if stored_key == key else None
+
+    def _write(self, key, result):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written aside and renamed, so a reader never sees a partial file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump((key, result), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning('Could not persist model result %s', key, exc_info=True)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fit(self, key, fit):
+        """The cached result for ``key``, fitting it with ``fit()`` on a miss.
+
+        Concurrent callers of one key wait for a single fit. An exception from
+        ``fit`` is not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            fit_lock = self._fit_locks.setdefault(key, threading.Lock())
+
+        with fit_lock:
+            try:
+                result = self._load_or_fit(key, fit)
+            finally:
+                with self._lock:
+                    self._fit_locks.pop(key, None)
+        return result
+
+    def _load_or_fit(self, key, fit):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+        stored = self._read(key)
+        if stored is not None:
+            result = stored[0]
+            with self._lock:
+                self.hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            logger.debug('Fitting %s', key)
+            result = fit()
+            self._write(key, result)
+        self._remember(key, result)
+        return result
+
+    def prune(self, version):
+        """Drop disk entries of every data version but ``version``."""
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name != str(version):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def clear(self):
+        """Forget the in-memory entries (disk entries are kept)."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,152 @@
+"""In-memory datasets of the running dashboard, reloaded when a new data version lands.
+
+Pages used to load their frames at import and keep them for the life of the
+process, so the numbers of a Wednesday refresh only showed after a restart.
+A page now holds a `Dataset` instead: calling it returns the frame, loaded on
+first use and loaded again once one of the files it is read from changes.
+
+Changes are found by polling: at most every `POLL_SECONDS`, `check` takes the
+version of every registered source -- the (mtime, size) of its copy in the
+current snapshot (src.utils.snapshots), or of the newest file under a
+directory. Only the datasets reading a changed source reload, and the caches
+subscribed to it with `on_change` are cleared in the same check. A reload
+builds the new frame aside and swaps it in with one assignment: callers get
+the previous frame or the new one, never a mix, and keep getting the previous
+one while another thread builds.
+"""
+import logging
+import os
+import threading
+import time
+
+from src.utils import snapshots
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 5.0
+
+_datasets = {}
+_subscribers = []
+_versions = {}
+_lock = threading.Lock()
+_checked = None
+
+
+def version(source):
+    """The version of ``source`` as read now: (mtime, size) of its file, None if it is missing.
+
+    For a directory, (newest mtime, total size, count) of the files under it.
+    """
+    path = snapshots.path(source)
+    try:
+        if not os.path.isdir(path):
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        stats = [
+            os.stat(os.path.join(root, name))
+            for root, _, names in os.walk(path)
+            for name in names
+        ]
+    except OSError:
+        return None
+    if not stats:
+        return None
+    return max(s.st_mtime_ns for s in stats), sum(s.st_size for s in stats), len(stats)
+
+
+class Dataset:
+    """A frame ``load()`` builds from ``sources``, reloaded when one of them changes."""
+
+    def __init__(self, name, load, sources):
+        self.name = name
+        self.load = load
+        self.sources = tuple(sources)
+        self._entry = None
+        self._reload_lock = threading.Lock()
+
+    def version(self):
+        """The versions of the sources as of the last check."""
+        with _lock:
+            return tuple(_versions.get(source) for source in self.sources)
+
+    def __call__(self):
+        check()
+        current = self.version()
+        entry = self._entry
+        if entry is not None and entry[0] == current:
+            return entry[1]
+        # Another thread is already reloading: keep serving the previous frame
+        if not self._reload_lock.acquire(blocking=entry is None):
+            return entry[1]
+        try:
+            entry = self._entry
+            if entry is None or entry[0] != current:
+                started = time.perf_counter()
+                entry = (current, self.load())
+                self._entry = entry
+                logger.info('Loaded dataset %s in %.2fs', self.name, time.perf_counter() - started)
+        finally:
+            self._reload_lock.release()
+        return entry[1]
+
+
+def _watch(sources):
+    for source in sources:
+        if source not in _versions:
+            _versions[source] = version(source)
+
+
+def dataset(name, load, *sources):
+    """Register and return the `Dataset` ``name``, built by ``load()`` from ``sources``.
+
+    Registering a name again (a page module imported again) replaces it.
+    """
+    registered = Dataset(name, load, sources)
+    with _lock:
+        _watch(registered.sources)
+        _datasets[name] = registered
+    return registered
+
+
+def on_change(sources, clear):
+    """Call ``clear()`` whenever a check finds one of ``sources`` changed."""
+    with _lock:
+        _watch(sources)
+        _subscribers.append((tuple(sources), clear))
+
+
+def check(force=False):
+    """Take the versions of the watched sources; return those that changed since the last check.
+
+    Does nothing until `POLL_SECONDS` have passed since the last check, unless
+    ``force``. Clears the caches subscribed to a changed source; the datasets
+    reading one reload the next time they are called.
+    """
+    global _checked
+    now = time.monotonic()
+    with _lock:
+        if not force and _checked is not None and now - _checked < POLL_SECONDS:
+            return set()
+        _checked = now
+        changed = set()
+        for source, previous in list(_versions.items()):
+            current = version(source)
+            if current != previous:
+                _versions[source] = current
+                changed.add(source)
+        clears = []
+        for sources, clear in _subscribers:
+            if clear not in clears and changed.intersection(sources):
+                clears.append(clear)
+
+    if changed:
+        logger.info('New data version of %s', ', '.join(sorted(changed)))
+    for clear in clears:
+        clear()
+    return changed
+
+
+def datasets():
+    """The registered datasets by name."""
+    with _lock:
+        return dict(_datasets)
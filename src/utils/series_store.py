@@ -0,0 +1,83 @@
+"""Typed WPS series for the analysis pages built on the AG grid table"""
+import numpy as np
+import pandas as pd
+
+METADATA_COLS = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
+
+
+class SeriesStore:
+    """WPS series on one sorted weekly index, as a (series x week) float64 array.
+
+    The AG grid table has one row per series and one '%m/%d/%y' string column
+    per week. Pages used to re-parse those headers cell by cell for every
+    series they plotted and line series up through dicts keyed by date. Here
+    the headers are parsed once, each series is a contiguous row of
+    ``values``, and every series shares ``periods``, so aligning, dividing or
+    differencing series is array arithmetic on the weeks they all have.
+
+    Instances are shared through src/utils/datasets.py and are read-only.
+    """
+
+    def __init__(self, periods, ids, values, meta=None):
+        self.periods = pd.DatetimeIndex(periods)
+        self.ids = [str(series_id) for series_id in ids]
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.values.flags.writeable = False
+        self.meta = meta if meta is not None else pd.DataFrame(index=pd.Index(self.ids, name='id'))
+        self._rows = {series_id: i for i, series_id in enumerate(self.ids)}
+
+    @classmethod
+    def from_table(cls, df):
+        """Build from the AG grid table (see src/wps/ag_calculations.py)"""
+        if df.empty:
+            return cls(pd.DatetimeIndex([]), [], np.empty((0, 0)))
+        date_cols = [col for col in df.columns if col not in METADATA_COLS]
+        periods = pd.to_datetime(pd.Index(date_cols), format='%m/%d/%y')
+        order = np.argsort(periods.values, kind='stable')
+        values = df[date_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        meta = df[[col for col in METADATA_COLS if col in df.columns]].set_index('id')
+        return cls(periods[order], df['id'], values[:, order], meta)
+
+    def __contains__(self, series_id):
+        return series_id in self._rows
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, series_id):
+        """Every week's value of a series, NaN where it has none (a view)"""
+        return self.values[self._rows[series_id]]
+
+    def series(self, series_id):
+        """(dates, values) of the weeks a series has a value; empty when the id is unknown"""
+        if series_id not in self._rows:
+            return self.periods[:0], np.empty(0)
+        values = self.row(series_id)
+        valid = ~np.isnan(values)
+        return self.periods[valid], values[valid]
+
+    def align(self, *series_ids):
+        """(dates, [values, ...]) over the weeks on which every series has a value"""
+        if not all(series_id in self._rows for series_id in series_ids):
+            return self.periods[:0], [np.empty(0) for _ in series_ids]
+        rows = self.values[[self._rows[series_id] for series_id in series_ids]]
+        valid = ~np.isnan(rows).any(axis=0)
+        return self.periods[valid], list(rows[:, valid])
+
+    def ratio(self, numerator, denominator, scale=100.0):
+        """numerator / denominator * scale on aligned weeks, skipping a zero denominator"""
+        dates, (num, den) = self.align(numerator, denominator)
+        nonzero = den != 0
+        return dates[nonzero], num[nonzero] / den[nonzero] * scale
+
+    def diff(self, series_id, periods=1):
+        """Change over ``periods`` observations of a series, dated at the later one"""
+        dates, values = self.series(series_id)
+        if len(values) <= periods:
+            return dates[:0], values[:0]
+        return dates[periods:], values[periods:] - values[:-periods]
+
+    def name(self, series_id, default=''):
+        if series_id in self._rows and 'name' in self.meta.columns:
+            return self.meta.at[series_id, 'name']
+        return default
@@ -3,6 +3,9 @@ import pandas as pd
 import os
 from datetime import datetime
 import logging
+from src.utils import snapshots
+from src.utils.wps_store import WPSStore
+from src.cli.store import CRUDE, read_imports
 
 logger = logging.getLogger(__name__)
 
@@ -13,61 +16,72 @@ class SimpleDataLoader:
     def __init__(self):
         self.data_dir = "./data"
         self.lookup_dir = "./lookup"
+        self._dpr_long = {}
 
     def load_wps_pivot_data(self) -> pd.DataFrame:
         """Load main WPS pivot data"""
-        file_path = f"{self.data_dir}/wps/wps_gte_2015_pivot.feather"
+        file_path = snapshots.path(f"{self.data_dir}/wps/wps_gte_2015_pivot.feather")
         df = pd.read_feather(file_path)
         df["period"] = pd.to_datetime(df["period"])
         return df
 
+    def wps_series(self, ids, start=None, end=None) -> pd.DataFrame:
+        """Load period plus the requested WPS pivot series, optionally within a date range"""
+        return WPSStore(snapshots.path(f"{self.data_dir}/wps/wps_gte_2015_pivot.feather")).read(ids, start, end)
+
+    def wps_series_ids(self) -> list:
+        """List the series available in the WPS pivot"""
+        return WPSStore(snapshots.path(f"{self.data_dir}/wps/wps_gte_2015_pivot.feather")).series_ids()
+
+    def line_series(self, ids, start=None, end=None) -> pd.DataFrame:
+        """Load period plus the requested line graph series, optionally within a date range"""
+        return WPSStore(snapshots.path(f"{self.data_dir}/wps/graph_line_data.feather")).read(ids, start, end)
+
+    def line_series_ids(self) -> list:
+        """List the series available in the line graph data"""
+        return WPSStore(snapshots.path(f"{self.data_dir}/wps/graph_line_data.feather")).series_ids()
+
     def load_wps_data(self) -> pd.DataFrame:
         """Load WPS data"""
-        file_path = f"{self.data_dir}/wps/wps_gte_2015.feather"
+        file_path = snapshots.path(f"{self.data_dir}/wps/wps_gte_2015.feather")
         df = pd.read_feather(file_path)
         df["period"] = pd.to_datetime(df["period"])
         return df
 
     def load_seasonality_data(self) -> pd.DataFrame:
         """Load seasonality data"""
-        file_path = f"{self.data_dir}/wps/seasonality_data.feather"
+        file_path = snapshots.path(f"{self.data_dir}/wps/seasonality_data.feather")
         return pd.read_feather(file_path)
 
     def load_line_data(self) -> pd.DataFrame:
         """Load line graph data"""
-        file_path = f"{self.data_dir}/wps/graph_line_data.feather"
+        file_path = snapshots.path(f"{self.data_dir}/wps/graph_line_data.feather")
         df = pd.read_feather(file_path)
         df["period"] = pd.to_datetime(df["period"])
         return df
 
     def load_steo_pivot_data(self) -> pd.DataFrame:
         """Load STEO pivot data"""
-        file_path = f"{self.data_dir}/steo/steo_pivot.feather"
+        file_path = snapshots.path(f"{self.data_dir}/steo/steo_pivot.feather")
         return pd.read_feather(file_path)
 
     def load_steo_dpr_data(self) -> pd.DataFrame:
         """Load STEO DPR data"""
-        file_path = f"{self.data_dir}/steo/steo_pivot_dpr.feather"
+        file_path = snapshots.path(f"{self.data_dir}/steo/steo_pivot_dpr.feather")
         return pd.read_feather(file_path)
 
     def load_steo_dpr_other_data(self) -> pd.DataFrame:
         """Load STEO DPR Other data"""
-        file_path = f"{self.data_dir}/steo/steo_pivot_dpr_other.feather"
+        file_path = snapshots.path(f"{self.data_dir}/steo/steo_pivot_dpr_other.feather")
         return pd.read_feather(file_path)
 
-    def load_cli_data(self) -> pd.DataFrame:
-        """Load Company Level Imports data"""
-        file_path = f"{self.data_dir}/cli/companylevelimports.parquet"
-        if os.path.exists(file_path):
-            return pd.read_parquet(file_path)
-        return pd.DataFrame()
+    def load_cli_data(self, padd=None, start=None, end=None, products=None, columns=None) -> pd.DataFrame:
+        """Load Company Level Imports data, reading only the months and rows the filters select"""
+        return read_imports(f"{self.data_dir}/cli/companylevelimports", padd, start, end, products, columns)
 
-    def load_cli_crude_data(self) -> pd.DataFrame:
+    def load_cli_crude_data(self, padd=None, start=None, end=None, columns=None) -> pd.DataFrame:
         """Load Company Level Crude Imports data"""
-        file_path = f"{self.data_dir}/cli/companylevelimports_crude.parquet"
-        if os.path.exists(file_path):
-            return pd.read_parquet(file_path)
-        return pd.DataFrame()
+        return self.load_cli_data(padd, start, end, CRUDE, columns)
 
     def load_dpr_mapping(self) -> pd.DataFrame:
         """Load DPR mapping"""
@@ -110,10 +124,39 @@ class SimpleDataLoader:
         """Process DPR data for a specific region or all regions"""
         start_time = datetime.now()
 
-        # Load base data
-        df = self.load_steo_dpr_data()
-        mapping_df = self.load_dpr_mapping()
+        df_melted = self._melt_dpr(self.load_steo_dpr_data(), self.load_dpr_mapping())
+
+        # Filter by region if specified
+        if region:
+            df_melted = df_melted[df_melted['region'] == region]
+
+        # Log processing time
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Processed DPR data for region={region} in {elapsed:.3f}s")
+
+        return df_melted
 
+    def load_dpr_long(self, other=False) -> pd.DataFrame:
+        """Long-format DPR (or DPR Other) frame shared by the DPR pages.
+
+        Built on first use rather than at page import, and rebuilt only when
+        the feather on disk changes. Callers filter it; they must not modify it.
+        """
+        name = "steo_pivot_dpr_other" if other else "steo_pivot_dpr"
+        file_path = snapshots.path(f"{self.data_dir}/steo/{name}.feather")
+        stat = os.stat(file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._dpr_long.get(other)
+        if cached is None or cached[0] != version:
+            mapping_df = self.load_dpr_other_mapping() if other else self.load_dpr_mapping()
+            cached = (version, self._melt_dpr(pd.read_feather(file_path), mapping_df))
+            self._dpr_long[other] = cached
+        return cached[1]
+
+    @staticmethod
+    def _melt_dpr(df, mapping_df) -> pd.DataFrame:
+        """(id, release) x delivery month pivot -> one row per (id, release, delivery month)"""
         # Get actual metadata columns from the dataframe
         metadata_cols = ['id', 'name', 'release_date', 'uom']
         date_columns = [col for col in df.columns if col not in metadata_cols]
@@ -129,17 +172,7 @@ class SimpleDataLoader:
         df_melted['delivery_month'] = pd.to_datetime(df_melted['delivery_month'])
 
         # Merge with mapping
-        df_melted = df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
-
-        # Filter by region if specified
-        if region:
-            df_melted = df_melted[df_melted['region'] == region]
-
-        # Log processing time
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Processed DPR data for region={region} in {elapsed:.3f}s")
-
-        return df_melted
+        return df_melted.merge(mapping_df[['id', 'region']], on='id', how='left')
 
 
 # Create a single instance to use throughout the app
@@ -154,5 +187,4 @@ def get_seasonality_data_for_ids(id_list: tuple) -> pd.DataFrame:
 
 def get_line_data_for_ids(id_list: tuple) -> pd.DataFrame:
     """Get line data for specific IDs"""
-    df = loader.load_line_data()
-    return df[["period"] + list(id_list)]
\ No newline at end of file
+    return loader.line_series(id_list)
\ No newline at end of file
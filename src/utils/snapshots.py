@@ -0,0 +1,42 @@
+"""Published copies of the WPS and STEO data files (dash_eia.pipelines.publish).
+
+Readers pass the working path they always read ('./data/wps/...') through
+`path`, and get the copy in the current snapshot, which no refresh rewrites.
+Before anything is published, or for a file no snapshot holds, the working
+path itself comes back. Writers call `publish` once every file of a group is
+written.
+"""
+import os
+
+from dash_eia.pipelines.publish import ARTIFACTS, SNAPSHOTS, Publisher
+
+DATA_DIR = './data'
+
+
+def path(working):
+    """Where to read ``working``: its copy in the current snapshot, else itself"""
+    return str(Publisher(DATA_DIR).path(working))
+
+
+def paths(*working):
+    """`path` of several files read together, all from the same snapshot"""
+    return [str(resolved) for resolved in Publisher(DATA_DIR).paths(*working)]
+
+
+def is_published(resolved):
+    """Whether ``resolved`` (as `path` returns it) is a snapshot's copy, which is never written"""
+    root = os.path.abspath(os.path.join(DATA_DIR, SNAPSHOTS))
+    return os.path.abspath(resolved).startswith(root + os.sep)
+
+
+def sources():
+    """The working paths of every published file, as readers pass them to `path`"""
+    return [f'{DATA_DIR}/{relative}' for relatives in ARTIFACTS.values() for relative in relatives]
+
+
+def publish(*groups):
+    """Publish the working files of ``groups`` ('wps', 'steo'; default all) as a new snapshot"""
+    snapshot = Publisher(DATA_DIR).publish(groups or None)
+    if snapshot is not None:
+        print(f'Current data snapshot: {snapshot.id}')
+    return snapshot
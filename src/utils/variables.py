@@ -4,6 +4,12 @@ years_normal_range = [2015, 2016, 2017, 2018, 2019]
 range_selector_last_five_years = '2125'
 years_last_five_years_range = [2021, 2022, 2023, 2024, 2025]
 
+# Seasonality range windows: column suffix -> years averaged
+seasonality_windows = {
+    range_selector_normal: years_normal_range,
+    range_selector_last_five_years: years_last_five_years_range,
+}
+
 
 year_1_string = '2024'
 year_2_string = '2025'
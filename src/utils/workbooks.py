@@ -0,0 +1,273 @@
+"""Excel workbooks read once per content, then from Arrow.
+
+The WPS, STEO and CLI ingests each parse their workbooks with
+``pd.read_excel`` on every run, seconds per workbook, even when the bytes
+have not changed since the last run. `read_workbook` reads like
+``pd.read_excel`` but keeps each parsed sheet as an Arrow IPC file under
+<workspace>/data/interim/workbooks, keyed by the sha256 of the workbook and
+the parse options. Re-runs and backfills of unchanged files read those files
+instead; the sheets still to parse are parsed in a process pool.
+
+Excel columns often mix types (a header row of strings over numbers or
+dates). Those come back from ``read_excel`` as object columns, which Arrow
+cannot hold as they are; they are stored as a struct of one child per Python
+type plus a tag, and rebuilt into the same objects. A sheet holding a type
+not handled here, or a value Arrow cannot hold (an integer beyond int64), is
+parsed as usual and not cached.
+
+Every weekly release is a new digest, so conversions not read for `MAX_AGE`
+seconds are removed whenever a workbook is parsed.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dash_eia.config.paths import WorkspaceNotFoundError, WorkspacePaths
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the stored layout changes, which retires earlier conversions
+FORMAT = 1
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+CHUNK_SIZE = 1 << 20
+# Conversions not read for this long are removed (see `prune`)
+MAX_AGE = 30 * 24 * 3600
+_METADATA_KEY = b'dash_eia.workbook'
+
+# Tag -> (child name, Arrow type) of an object column; None values are tag -1
+_KINDS = (
+    ('str', pa.string()),
+    ('bool', pa.bool_()),
+    ('int', pa.int64()),
+    ('float', pa.float64()),
+    ('datetime', pa.timestamp('us')),
+)
+_TAGS = {str: 0, bool: 1, int: 2, float: 3, datetime.datetime: 4, pd.Timestamp: 4}
+
+
+class Unsupported(ValueError):
+    """A sheet with a value or label that cannot be stored exactly."""
+
+
+def directory():
+    """Where conversions are kept: <workspace>/data/interim/workbooks, or None outside a workspace."""
+    try:
+        return WorkspacePaths.discover().interim / 'workbooks'
+    except WorkspaceNotFoundError:
+        return None
+
+
+def digest(path):
+    """sha256 of a file's bytes."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Sheet <-> Arrow
+# ---------------------------------------------------------------------------
+def _label(label):
+    if isinstance(label, (str, int, float)) and not isinstance(label, bool):
+        return [type(label).__name__, label]
+    raise Unsupported(f'column label {label!r}')
+
+
+def _unlabel(stored):
+    kind, value = stored
+    return {'str': str, 'int': int, 'float': float}[kind](value)
+
+
+def _encode_objects(values):
+    tags = np.array([_TAGS.get(type(value), -1 if value is None else -2) for value in values], dtype=np.int8)
+    if (tags == -2).any():
+        value = values[int(np.argmax(tags == -2))]
+        raise Unsupported(f'value {value!r} of type {type(value).__name__}')
+    children = [pa.array(tags, pa.int8())]
+    for tag, (_, kind) in enumerate(_KINDS):
+        mask = tags == tag
+        child = [value if hit else None for value, hit in zip(values, mask)] if mask.any() else [None] * len(values)
+        children.append(pa.array(child, kind))
+    return pa.StructArray.from_arrays(children, ['tag'] + [name for name, _ in _KINDS])
+
+
+def _decode_objects(column):
+    tags = column.field('tag').to_numpy()
+    values = np.full(len(tags), None, dtype=object)
+    for tag, (name, _) in enumerate(_KINDS):
+        mask = tags == tag
+        if mask.any():
+            child = np.array(column.field(name).to_pylist(), dtype=object)
+            values[mask] = child[mask]
+    return values
+
+
+def to_arrow(df):
+    """A parsed sheet as an Arrow table that `from_arrow` turns back into it."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise Unsupported('index')
+    arrays, columns = [], []
+    for position, label in enumerate(df.columns):
+        column = df.iloc[:, position]
+        if column.dtype == object:
+            arrays.append(_encode_objects(column.tolist()))
+            columns.append({'label': _label(label), 'objects': True})
+        else:
+            try:
+                arrays.append(pa.Array.from_pandas(column))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as error:
+                raise Unsupported(f'column {label!r}: {error}') from None
+            columns.append({'label': _label(label), 'objects': False, 'dtype': str(column.dtype)})
+    names = [str(position) for position in range(len(arrays))]
+    metadata = {_METADATA_KEY: json.dumps({'columns': columns, 'rows': len(df)})}
+    return pa.Table.from_arrays(arrays, names=names).replace_schema_metadata(metadata)
+
+
+def from_arrow(table):
+    """The sheet stored by `to_arrow`."""
+    stored = json.loads(table.schema.metadata[_METADATA_KEY])
+    data = {}
+    for position, column in enumerate(stored['columns']):
+        array = table.column(position).combine_chunks()
+        if column['objects']:
+            data[position] = _decode_objects(array)
+        else:
+            data[position] = pd.Series(array.to_pandas()).astype(column['dtype'])
+    df = pd.DataFrame(data, index=pd.RangeIndex(stored['rows']))
+    df.columns = [_unlabel(column['label']) for column in stored['columns']]
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def _sheet_file(entry, sheet):
+    return entry / f'{hashlib.sha1(sheet.encode()).hexdigest()}.arrow'
+
+
+def _write_atomic(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            write(file)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _read_sheet(path):
+    try:
+        with pa.memory_map(str(path)) as source:
+            return from_arrow(pa.ipc.open_file(source).read_all())
+    except (OSError, pa.ArrowInvalid, KeyError, ValueError):
+        return None
+
+
+def _save_sheet(path, df):
+    try:
+        table = to_arrow(df)
+    except (Unsupported, OverflowError, pa.ArrowInvalid, pa.ArrowTypeError) as error:
+        logger.info('Not caching %s: unsupported %s', path.name, error)
+        return
+
+    def write(file):
+        with pa.ipc.new_file(file, table.schema) as writer:
+            writer.write_table(table)
+
+    try:
+        _write_atomic(path, write)
+    except OSError:
+        logger.warning('Could not cache workbook sheet %s', path, exc_info=True)
+
+
+def _sheet_names(path, entry):
+    names_path = entry / 'sheets.json'
+    try:
+        with open(names_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        pass
+    with pd.ExcelFile(path) as workbook:
+        names = [str(name) for name in workbook.sheet_names]
+    try:
+        _write_atomic(names_path, lambda file: file.write(json.dumps(names).encode()))
+    except OSError:
+        logger.warning('Could not cache the sheet names of %s', path, exc_info=True)
+    return names
+
+
+def _parse(path, sheet, header):
+    return pd.read_excel(path, sheet_name=sheet, header=header)
+
+
+def _parse_sheets(path, sheets, header, workers):
+    if workers <= 1 or len(sheets) <= 1:
+        return [_parse(path, sheet, header) for sheet in sheets]
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(sheets)), mp_context=context) as pool:
+        return list(pool.map(_parse, [path] * len(sheets), sheets, [header] * len(sheets)))
+
+
+def prune(cache_dir, max_age=MAX_AGE):
+    """Remove the conversions of ``cache_dir`` not read for ``max_age`` seconds."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(Path(cache_dir).iterdir())
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            stale = entry.is_dir() and entry.stat().st_mtime < cutoff
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def read_workbook(path, sheet_name=None, header=0, workers=PARSE_WORKERS, cache_dir=None):
+    """``pd.read_excel(path, sheet_name=sheet_name, header=header)``, parsed once per content.
+
+    ``sheet_name`` is None for every sheet ({name: frame}, in workbook order)
+    or one sheet's name. Sheets not cached yet are parsed ``workers`` at a
+    time. ``cache_dir`` defaults to `directory()`; without one, this is
+    ``pd.read_excel``.
+    """
+    cache_dir = directory() if cache_dir is None else Path(cache_dir)
+    if cache_dir is None:
+        return pd.read_excel(path, sheet_name=sheet_name, header=header)
+
+    entry = cache_dir / f'{digest(path)}-h{header}-v{FORMAT}'
+    sheets = _sheet_names(path, entry) if sheet_name is None else [sheet_name]
+
+    frames = {sheet: _read_sheet(_sheet_file(entry, sheet)) for sheet in sheets}
+    missing = [sheet for sheet, df in frames.items() if df is None]
+    if missing:
+        logger.debug('Parsing %d sheet(s) of %s', len(missing), path)
+        for sheet, df in zip(missing, _parse_sheets(path, missing, header, workers)):
+            _save_sheet(_sheet_file(entry, sheet), df)
+            frames[sheet] = df
+        prune(cache_dir)
+    # The entry's mtime is when it was last read, which `prune` goes by
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+    return frames if sheet_name is None else frames[sheet_name]
+
@@ -0,0 +1,60 @@
+"""Column-projected reads of the wide WPS Arrow files"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def write_wps_table(df: pd.DataFrame, file_path) -> None:
+    """Write a wide (period x series) WPS frame as an uncompressed Arrow IPC file.
+
+    Feather v2 is the Arrow IPC file format, but the lz4 default compresses each
+    column buffer, so a reader has to decompress it into fresh memory. Written
+    uncompressed, a column read from a memory map is a view of the page cache.
+    """
+    df.to_feather(file_path, compression="uncompressed")
+
+
+class WPSStore:
+    """Memory-mapped access to one wide WPS file keyed by a sorted ``period`` column.
+
+    Each read maps the file, materializes only ``period`` plus the requested
+    series, and slices the requested date range, so the cost of a callback
+    tracks the series it asks for rather than the width of the file. The map
+    is not held between reads: a refresh can replace the file at any time.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def series_ids(self) -> list:
+        """Every series id in the file (reads the schema only)"""
+        with pa.memory_map(str(self.file_path)) as source:
+            names = pa.ipc.open_file(source).schema.names
+        return [name for name in names if name != "period"]
+
+    def read(self, ids, start=None, end=None) -> pd.DataFrame:
+        """Return ``period`` plus ``ids`` for start <= period <= end."""
+        ids = [ids] if isinstance(ids, str) else list(ids)
+        with pa.memory_map(str(self.file_path)) as source:
+            reader = pa.ipc.open_file(source)
+            batches = [
+                reader.get_batch(i).select(["period"] + ids)
+                for i in range(reader.num_record_batches)
+            ]
+            table = pa.Table.from_batches(batches)
+        if start is not None or end is not None:
+            periods = table.column("period").to_numpy()
+            if np.all(periods[:-1] <= periods[1:]):
+                lo = 0 if start is None else np.searchsorted(periods, np.datetime64(pd.Timestamp(start)), "left")
+                hi = len(periods) if end is None else np.searchsorted(periods, np.datetime64(pd.Timestamp(end)), "right")
+                table = table.slice(lo, max(hi - lo, 0))
+            else:
+                mask = np.ones(len(periods), dtype=bool)
+                if start is not None:
+                    mask &= periods >= np.datetime64(pd.Timestamp(start))
+                if end is not None:
+                    mask &= periods <= np.datetime64(pd.Timestamp(end))
+                table = table.filter(pa.array(mask))
+        df = table.to_pandas()
+        df["period"] = pd.to_datetime(df["period"])
+        return df
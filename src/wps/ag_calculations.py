@@ -1,37 +1,59 @@
+import numpy as np
 import pandas as pd
 from src.wps.ag_mapping import ag_mapping
 from src.utils.data_loader import loader
 
+METADATA_COLS = ['id', 'name', 'padd', 'commodity', 'type', 'uom']
+
+# Units shown with one decimal in the grid; the rest are whole numbers
+ONE_DECIMAL_UOMS = ['mb', 'pct']
+
+
+def format_grid_display_data(df):
+    """Format visible grid values without changing the raw data used by graphs.
+
+    Zero and missing values show as '-', negatives in parentheses, with one
+    decimal for the units in ONE_DECIMAL_UOMS. The value columns are formatted
+    as one array per block of rows sharing a number of decimals rather than
+    cell by cell, so a wide date range renders without a stall.
+    """
+    if df.empty:
+        return df
+
+    value_cols = [col for col in df.columns if col not in METADATA_COLS]
+    values = df[value_cols]
+    text_cols = values.columns[[not pd.api.types.is_numeric_dtype(dtype) for dtype in values.dtypes]]
+    if len(text_cols):
+        values = values.assign(**{col: pd.to_numeric(values[col], errors='coerce') for col in text_cols})
+    values = values.to_numpy(dtype=float)
+    one_decimal = df['uom'].isin(ONE_DECIMAL_UOMS).to_numpy()
+
+    formatted = np.full(values.shape, '-', dtype=object)
+    for decimals, rows in ((1, one_decimal), (0, ~one_decimal)):
+        block = values[rows]
+        shown = ~np.isnan(block) & (block != 0)
+        text = np.array(list(map(f'{{:,.{decimals}f}}'.format, np.abs(block[shown]))), dtype=object)
+        text = np.where(block[shown] < 0, '(' + text + ')', text)
+        cells = formatted[rows]
+        cells[shown] = text
+        formatted[rows] = cells
+
+    display_df = pd.DataFrame(formatted, index=df.index, columns=value_cols)
+    return pd.concat([df.drop(columns=value_cols), display_df], axis=1)[df.columns]
+
+
 class DataProcessor:
     def __init__(self, file_path='./data/wps/wps_gte_2015_pivot.feather'):
         self.file_path = file_path
 
-    def get_initial_data(self):
+    def get_initial_data(self, start=None, end=None):
         """Load data for AG Grid"""
-        df = loader.load_wps_pivot_data()
-        
-        # Ensure period column exists and is datetime
-        if 'period' not in df.columns:
-            # If period is not a column, it might be the index
-            if df.index.name == 'period':
-                df = df.reset_index()
-            else:
-                raise ValueError("Data does not contain 'period' column")
-        
-        # Convert period to datetime if it's not already
-        if not pd.api.types.is_datetime64_any_dtype(df['period']):
-            # Try common date formats to avoid the warning
-            date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%d/%m/%Y', '%Y/%m/%d']
-            for fmt in date_formats:
-                try:
-                    df['period'] = pd.to_datetime(df['period'], format=fmt)
-                    break
-                except (ValueError, TypeError):
-                    continue
-            else:
-                # If no format works, fall back to infer_datetime_format
-                df['period'] = pd.to_datetime(df['period'], infer_datetime_format=True)
-            
+        # Only the mapped series and the requested weeks are read from the pivot;
+        # mapped series the pivot does not hold are left out of the grid
+        available = set(loader.wps_series_ids())
+        ids = [id for id in loader.load_ag_mapping() if id in available]
+        df = loader.wps_series(ids, start, end)
+
         df['period'] = df['period'].dt.strftime('%m/%d/%y')
         df.set_index('period', inplace=True)
         df = df.T
@@ -54,7 +76,8 @@ class DataProcessor:
         df.insert(4, 'type', df['id'].map(id_to_type_mapping))
         df.insert(5, 'uom', df['id'].map(id_to_uom_mapping))
         
-        order_list = list(id_to_name_mapping.keys())        
+        present = set(df['id'])
+        order_list = [id for id in id_to_name_mapping if id in present]
         df = df.set_index('id').loc[order_list].reset_index()
         
         return df
@@ -93,7 +116,7 @@ class DataProcessor:
         return df
 
     def get_table(self, start='1900-01-01', end='2030-12-31'):
-        df = self.get_initial_data()
+        df = self.get_initial_data(start, end)
         df = self.get_ag_mapping(df)
         df = self.convert_kb_rows_to_mb(df)
         df = self.get_columns_to_include(df, start, end)
@@ -1,11 +1,12 @@
+from functools import cache
 from src.wps.mapping import production_mapping
 import dash
 from dash import Output, Input, dcc, html
 import pandas as pd
-from src.wps.graph_seag import chart_seasonality
-from src.wps.graph_line import chart_trend
+from src.wps import figures
 import plotly.graph_objects as go
 from src.wps.graph_optionality import checklist_header
+from src.components.graphs import create_loading_graph
 from src.app import app
 
 from src.utils.variables import year_1_string, year_2_string, year_3_string, year_4_string, year_5_string, full_year_range_normal_string, full_year_range_last_five_years_string
@@ -21,21 +22,6 @@ def get_initial_data():
     return loader.get_filtered_data("wps_pivot", "2015-01-01")
 
 
-### graph creation functions ###########################################
-
-
-def create_loading_graph(graph_id):
-    blank_graph = go.Figure().update_layout(
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-    )
-    return html.Div(
-        dcc.Graph(id=graph_id, figure=blank_graph), className="graph-container"
-    )
-
-
 ### layout creation functions ###########################################
 
 
@@ -167,72 +153,24 @@ def create_callbacks(app, page_id, num_graphs, idents):
         toggle_ma_3m = ((toggle_ma_3m or 0) % 2) == 1
         toggle_ma_12m = ((toggle_ma_12m or 0) % 2) == 1
 
-        seag_data = get_seasonality_data_for_ids(tuple(idents))
-        line_data = get_line_data_for_ids(tuple(idents))
-
-        def create_chart(
-            df,
-            seag_data,
-            id,
-            chart_toggle,
-            toggle_seag_range,
-            toggle_year_1,
-            toggle_year_2,
-            toggle_year_3,
-            toggle_year_4,
-            toggle_year_5,
-            btn_1m,
-            btn_3m,
-            btn_12m,
-            btn_36m,
-            btn_60m,
-            toggle_main_line,
-            toggle_ma_1m,
-            toggle_ma_3m,
-            toggle_ma_12m,
-        ):
-            seag_data_individual = seag_data[seag_data["id"] == id]
-            line_data_individual = line_data[["period", id]]
-
-            if chart_toggle:
-                return chart_seasonality(
-                    seag_data_individual,
-                    id,
-                    toggle_seag_range,
-                    toggle_year_1,
-                    toggle_year_2,
-                    toggle_year_3,
-                    toggle_year_4,
-                    toggle_year_5,
-                )
-            else:
-                return chart_trend(
-                    line_data_individual, id, btn_1m, btn_3m, btn_12m, btn_36m, btn_60m,
-                    toggle_main_line,
-                    toggle_ma_1m, toggle_ma_3m, toggle_ma_12m,
-                )
+        # Read once per callback, and only if some graph is not cached
+        @cache
+        def seag_data():
+            return get_seasonality_data_for_ids(tuple(idents))
 
+        @cache
+        def line_data():
+            return get_line_data_for_ids(tuple(idents))
+
+        if chart_toggle:
+            years = (toggle_year_1, toggle_year_2, toggle_year_3, toggle_year_4, toggle_year_5)
+            return [
+                figures.seasonality(ident, toggle_seag_range, years, seag_data)
+                for ident in idents
+            ]
+        ranges = (btn_1m, btn_3m, btn_12m, btn_36m, btn_60m)
+        moving_averages = (toggle_ma_1m, toggle_ma_3m, toggle_ma_12m)
         return [
-            create_chart(
-                line_data,
-                seag_data,
-                ident,
-                chart_toggle,
-                toggle_seag_range,
-                toggle_year_1,
-                toggle_year_2,
-                toggle_year_3,
-                toggle_year_4,
-                toggle_year_5,
-                btn_1m,
-                btn_3m,
-                btn_12m,
-                btn_36m,
-                btn_60m,
-                toggle_main_line,
-                toggle_ma_1m,
-                toggle_ma_3m,
-                toggle_ma_12m,
-            )
+            figures.trend(ident, ranges, toggle_main_line, moving_averages, line_data)
             for ident in idents
         ]
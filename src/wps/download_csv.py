@@ -1,7 +1,13 @@
 import pandas as pd
 import numpy as np
 from src.wps.mapping import production_mapping
-from src.wps.generate_additional_tickers import generate_additional_tickers
+from dash_eia.transforms.wps import generate_additional_tickers
+from src.wps.generate_line_data import generate_line_data
+from src.wps.generate_seasonality_data import generate_seasonality_data
+from src.utils import snapshots
+from src.utils.wps_store import write_wps_table
+from src.utils.variables import years_last_five_years_range
+from dash_eia.transforms import wps_stats
 
 def first_pass(df):    
     df = df.copy()
@@ -137,7 +143,13 @@ def main():
         df.to_feather('./data/wps/wps_gte_2015.feather')
         pv = pivot_data(df)
         pv.reset_index(drop=True,inplace=True)
-        pv.to_feather('./data/wps/wps_gte_2015_pivot.feather')    
+        write_wps_table(pv, './data/wps/wps_gte_2015_pivot.feather')
+        # Published with the pivot, so the derived files are rebuilt from it first
+        generate_line_data()
+        generate_seasonality_data()
+        wps_stats.materialize('./data/wps/wps_gte_2015_pivot.feather', './data/wps/wps_stats.npz',
+                              years_last_five_years_range)
+        snapshots.publish('wps')
     else:
         pv = pd.read_feather('./data/wps/wps_gte_2015_pivot.feather')
         pv['period'] = pd.to_datetime(pv['period'])
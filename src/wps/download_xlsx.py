@@ -1,21 +1,40 @@
+import argparse
+import hashlib
+import os
+
 import requests
 import pandas as pd
 import numpy as np
 from src.wps.mapping import production_mapping
-from src.wps.generate_additional_tickers import generate_additional_tickers
+from dash_eia.transforms.wps import generate_additional_tickers
 from src.wps.generate_line_data import generate_line_data
 from src.wps.generate_seasonality_data import generate_seasonality_data
+from src.wps import figures, incremental, models
+from src.utils import snapshots, workbooks
+from src.utils.wps_store import write_wps_table
+from src.utils.variables import years_last_five_years_range
+from dash_eia.jobs import JobCancelled, report_progress
+from dash_eia.transforms import wps_stats
+
+RAW_PATH = './data/wps/eia_weekly_psw09.xls'
+LONG_PATH = './data/wps/wps_gte_2015.feather'
+PIVOT_PATH = './data/wps/wps_gte_2015_pivot.feather'
+# Seasonal bands, z-scores and percentiles of every pivot series (dash_eia.transforms.wps_stats)
+STATS_PATH = './data/wps/wps_stats.npz'
+# Digest of the last psw09.xls ingested, so an unchanged release is not re-parsed
+DIGEST_PATH = './data/wps/eia_weekly_psw09.sha256'
+FIRST_PERIOD = '2014-12-26'
 
 def download_raw_file():
     url = "https://ir.eia.gov/wpsr/psw09.xls"
     response = requests.get(url)
-    file_path = "./data/wps/eia_weekly_psw09.xls"
-    with open(file_path, "wb") as file:
+    with open(RAW_PATH, "wb") as file:
         file.write(response.content)
+    return hashlib.sha256(response.content).hexdigest()
 
 def read_excel_file():
-    file_path = './data/wps/eia_weekly_psw09.xls'
-    sheets = pd.read_excel(file_path, sheet_name=None)
+    # Parsed once per release; later runs on the same bytes read the Arrow copy
+    sheets = workbooks.read_workbook(RAW_PATH)
     contents = sheets.pop('Contents')
     return sheets
 
@@ -31,9 +50,7 @@ def parse_data(df):
     return df
 
 def parse_all_data(sheets):
-    df = pd.DataFrame()
-    for sheet in sheets:
-        df = pd.concat([df, parse_data(sheets[sheet])])
+    df = pd.concat([parse_data(sheet) for sheet in sheets.values()])
     df = df.drop_duplicates(subset=['period', 'id'])
     df = df.drop('name', axis=1)  
     return df
@@ -60,38 +77,131 @@ def pivot_data(df):
     df = df.pivot(index='period',columns='id',values='value').reset_index()
     return df
 
-def main():
+def finish_data(df, periods=None):
+    """Stored long rows from raw plus derived tickers, optionally for ``periods`` only"""
+    df = df[df['period'] >= FIRST_PERIOD]
+    if periods is not None:
+        df = df[df['period'].isin(periods)]
+    df = filter_data(df)
+    df = map_name(df)
+    df = reorder_columns(df)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+def ingest_full(raw):
+    df = finish_data(generate_additional_tickers(raw))
+    df.to_feather(LONG_PATH)
+    pv = pivot_data(df)
+    pv.reset_index(drop=True,inplace=True)
+    write_wps_table(pv, PIVOT_PATH)
+
+    # Generate derived data after successful download
+    print("Generating line data...")
+    generate_line_data()
+    print("Generating seasonality data...")
+    generate_seasonality_data()
+    print("Generating statistics...")
+    wps_stats.materialize(PIVOT_PATH, STATS_PATH, years_last_five_years_range)
+    return pv
+
+def ingest_incremental(raw):
+    """Recompute and splice only the weeks that are new or revised since the last ingest"""
+    stored = pd.read_feather(LONG_PATH)
+    changed = incremental.changed_periods(raw[raw['period'] >= FIRST_PERIOD], stored)
+    pv = pd.read_feather(PIVOT_PATH)
+    if changed.empty:
+        print("No new or revised weeks")
+        return pv
+    print(f"New or revised weeks: {', '.join(changed.strftime('%Y-%m-%d'))}")
+
+    periods, inputs = incremental.recompute_window(changed, raw['period'])
+    df = finish_data(generate_additional_tickers(raw[raw['period'].isin(inputs)]), periods)
+    incremental.splice_periods(stored, df, periods).to_feather(LONG_PATH)
+    rows = pivot_data(df)
+    pv = incremental.splice_periods(pv, rows, periods)
+    write_wps_table(pv, PIVOT_PATH)
+
+    print("Updating line data...")
+    incremental.update_line_data(rows, periods)
+    print("Updating seasonality data...")
+    incremental.update_seasonality_data(pv, periods)
+    print("Updating statistics...")
+    wps_stats.materialize(PIVOT_PATH, STATS_PATH, years_last_five_years_range)
+    return pv
+
+def ingest(raw, full=False):
+    """Write the WPS artifacts for a parsed psw09 frame.
+
+    Appends to the stored files unless ``full`` is set or there is nothing
+    stored yet, in which case every artifact is rebuilt.
+    """
+    if full or not os.path.exists(LONG_PATH):
+        return ingest_full(raw)
+    return ingest_incremental(raw)
+
+def _read_digest():
     try:
-        download_raw_file()
-        sheets = read_excel_file()
-        df = parse_all_data(sheets)
-        df = generate_additional_tickers(df)
-        df = df[df['period'] >= '2014-12-26']
-        df = filter_data(df)
-        df = map_name(df)
-        df = reorder_columns(df)
-        df.reset_index(drop=True, inplace=True)
-        df.to_feather('./data/wps/wps_gte_2015.feather')
-        pv = pivot_data(df)
-        pv.reset_index(drop=True,inplace=True)
-        pv.to_feather('./data/wps/wps_gte_2015_pivot.feather')
-
-        # Generate derived data after successful download
-        print("Generating line data...")
-        generate_line_data()
-        print("Generating seasonality data...")
-        generate_seasonality_data()
+        with open(DIGEST_PATH) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+def update(full=False, digest=None):
+    """Parse the downloaded psw09.xls into the WPS files, record its digest and publish them"""
+    report_progress(0.1, 'Parsing psw09.xls')
+    sheets = read_excel_file()
+    raw = parse_all_data(sheets)
+    report_progress(0.3, 'Updating the WPS files')
+    pv = ingest(raw, full=full)
+    with open(DIGEST_PATH, "w") as file:
+        file.write(digest or workbooks.digest(RAW_PATH))
+    # The pages read the published copies; the pivot, long, line, seasonality
+    # and statistics files of this release become visible together
+    snapshots.publish('wps')
+    return pv
+
+def main(full=False, fit_models=True, warm_figures=True, fallback=False):
+    """Download and ingest psw09.xls, returning the WPS pivot.
+
+    A failure is raised, so a background job records it as failed. With
+    ``fallback`` (the command line) it is printed and the stored pivot returned.
+    """
+    try:
+        report_progress(0.0, 'Downloading psw09.xls')
+        digest = download_raw_file()
+        if not full and digest == _read_digest() and os.path.exists(LONG_PATH):
+            print("psw09.xls unchanged since the last ingest")
+            pv = pd.read_feather(PIVOT_PATH)
+        else:
+            pv = update(full=full, digest=digest)
+            if fit_models:
+                print("Fitting analytics models...")
+                models.precompute(progress=(0.4, 0.9))
+            if warm_figures:
+                print("Drawing the WPS charts...")
+                figures.warm(progress=(0.9, 1.0))
+        pv['period'] = pd.to_datetime(pv['period'])
         print("Data update complete!")
+    except JobCancelled:
+        raise
     except Exception as e:
+        if not fallback:
+            raise
         print(f'Error during download/processing: {e}')
         print('Using existing local files instead')
         import traceback
         traceback.print_exc()
-        pv = pd.read_feather('./data/wps/wps_gte_2015_pivot.feather')
+        pv = pd.read_feather(PIVOT_PATH)
         pv['period'] = pd.to_datetime(pv['period'])
         # Don't regenerate data if we're just reading existing files
 
     return pv
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Download psw09.xls and update the WPS data files')
+    parser.add_argument('--full', action='store_true', help='rebuild every file from the full history')
+    parser.add_argument('--skip-models', action='store_true', help='do not refit the analytics page models')
+    parser.add_argument('--skip-figures', action='store_true', help='do not redraw the cached WPS charts')
+    args = parser.parse_args()
+    main(full=args.full, fit_models=not args.skip_models, warm_figures=not args.skip_figures,
+         fallback=True)
@@ -0,0 +1,87 @@
+"""Seasonality and trend charts of the WPS chart pages, cached per data version.
+
+`src.wps.calculation.create_callbacks` draws every graph of a page through
+`seasonality` and `trend`, which memoize the figure in `src.utils.figure_cache`
+by series, normalized toggle states and the version of the file it is drawn
+from. `warm` draws each series' charts in the pages' initial state after an
+ingest, so the first visit after a release is a cache hit too.
+"""
+from dash_eia.jobs import report_progress
+from src.utils import figure_cache
+from src.utils.data_loader import get_line_data_for_ids, get_seasonality_data_for_ids, loader
+from src.wps.graph_line import chart_trend
+from src.wps.graph_seag import chart_seasonality
+from src.wps.mapping import production_mapping
+
+SEASONALITY = "wps.seasonality"
+TREND = "wps.trend"
+SEASONALITY_SOURCES = ("wps_seasonality",)
+TREND_SOURCES = ("wps_line",)
+
+# A page's toggles before any click: the 5-year range and no extra years, the
+# 60-month trend with its line and no moving averages
+INITIAL_SEASONALITY = (False, (False,) * 5)
+INITIAL_TREND = ((False, False, False, False, True), True, (False, False, False))
+
+
+def seasonality(series_id, seag_range, years, data=None):
+    """`chart_seasonality` of a series.
+
+    ``years`` are the five year toggles. ``data`` returns seasonality rows
+    that include the series and is called on a cache miss only, so a page can
+    read its series once for all of its graphs.
+    """
+    years = [bool(year) for year in years]
+
+    def render():
+        rows = data() if data is not None else get_seasonality_data_for_ids((series_id,))
+        return chart_seasonality(rows[rows["id"] == series_id], series_id, bool(seag_range), *years)
+
+    return figure_cache.figure(
+        SEASONALITY, SEASONALITY_SOURCES, render, series_id, bool(seag_range), years
+    )
+
+
+def trend(series_id, ranges, main_line, moving_averages, data=None):
+    """`chart_trend` of a series.
+
+    ``ranges`` are the 1m, 3m, 12m, 36m and 60m button states and
+    ``moving_averages`` the 1m, 3m and 12m toggles; ``data`` is as in
+    `seasonality`, returning line data with a column for the series.
+    """
+    ranges = [bool(state) for state in ranges]
+    moving_averages = [bool(state) for state in moving_averages]
+
+    def render():
+        rows = data() if data is not None else get_line_data_for_ids((series_id,))
+        return chart_trend(rows[["period", series_id]], series_id, *ranges, bool(main_line), *moving_averages)
+
+    return figure_cache.figure(
+        TREND, TREND_SOURCES, render, series_id, ranges, bool(main_line), moving_averages
+    )
+
+
+def warm(series_ids=None, progress=(0.0, 1.0)):
+    """Draw the initial charts of ``series_ids`` (default: every charted series) into the cache.
+
+    Run after an ingest: figures of earlier data versions are dropped from
+    disk first. Within a background job, progress is reported across the
+    ``progress`` (start, end) span.
+    """
+    figure_cache.prune(SEASONALITY, SEASONALITY_SOURCES)
+    figure_cache.prune(TREND, TREND_SOURCES)
+
+    seasonality_rows = loader.load_seasonality_data()
+    if series_ids is None:
+        charted = set(loader.line_series_ids()) & set(production_mapping)
+        series_ids = [sid for sid in seasonality_rows["id"].unique() if sid in charted]
+    series_ids = list(series_ids)
+    line_rows = get_line_data_for_ids(tuple(series_ids))
+
+    start, end = progress
+    for i, series_id in enumerate(series_ids):
+        if i % 20 == 0:
+            report_progress(start + (end - start) * i / len(series_ids), "Drawing the WPS charts")
+        seasonality(series_id, *INITIAL_SEASONALITY, data=lambda: seasonality_rows)
+        trend(series_id, *INITIAL_TREND, data=lambda: line_rows)
+    return figure_cache.stats()
@@ -1,28 +1,32 @@
 from src.wps.mapping import production_mapping
 from src.wps.calculation import get_initial_data 
 import pandas as pd
+from src.utils.wps_store import write_wps_table
+from src.utils import snapshots
 
-def format_value(val, column_name):
-    if "stocks" in column_name.lower():
-        val = val/1000
-    return val
+def scale_stocks(df):
+    """Stock series (kb) in millions of barrels; columns are WPS ids"""
+    df = df.copy()
+    stocks = [col for col in df.columns if 'stocks' in production_mapping[col].lower()]
+    df[stocks] = df[stocks] / 1000
+    return df
+
+def format_line_data(df):
+    """Graph-ready rows of a WPS pivot: stocks in millions, rounded to 0.1"""
+    df = df.set_index('period')
+    df = scale_stocks(df.apply(pd.to_numeric, errors='coerce'))
+    df = df.round(1)
+    df.reset_index(inplace=True)
+    df.columns.name = None
+    return df
 
 def generate_line_data():
     # Always read fresh data directly
     df = pd.read_feather('./data/wps/wps_gte_2015_pivot.feather')
     df['period'] = pd.to_datetime(df['period'])
-    
-    df.set_index('period', inplace=True)
-    cols = df.columns
-    df.columns = [production_mapping[col] for col in cols]
-    for column in df.columns:
-        df[column] = df[column].apply(lambda x: format_value(x, column))
-    reversed_mapping = {v: k for k, v in production_mapping.items()}
-    df.columns = [reversed_mapping[col] for col in df.columns]
-    df = df.apply(pd.to_numeric, errors='coerce')
-    df = df.round(1)
-    df.reset_index(inplace=True)
-    df.to_feather('./data/wps/graph_line_data.feather')
+    df = format_line_data(df)
+    write_wps_table(df, './data/wps/graph_line_data.feather')
     
 if __name__ == "__main__":
-    generate_line_data()    
\ No newline at end of file
+    generate_line_data()
+    snapshots.publish('wps')
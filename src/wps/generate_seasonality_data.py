@@ -1,136 +1,72 @@
 from src.wps.mapping import production_mapping
-from src.wps.calculation import get_initial_data 
+from src.wps.generate_line_data import scale_stocks
 import pandas as pd
 
-from src.utils.variables import range_selector_normal, range_selector_last_five_years
-
-from src.utils.variables import range_selector_normal, range_selector_last_five_years, years_normal_range, years_last_five_years_range, type_to_remove
-
-def add_weekOfYear_Year(df):
-    df = df.copy()
-    df.insert(0,'week_of_year',df['period'].dt.isocalendar().week)
-    df.insert(1,'year',df['period'].dt.year)
-    df = df[df['week_of_year'] <= 52]
-    return df
-
-def select_seasonality_range(df, range_selector):
-    df = df.copy()
-    
-    if range_selector == range_selector_normal:
-        years = years_normal_range
-    elif range_selector == range_selector_last_five_years:
-        years = years_last_five_years_range
-    
-    def get_min_max(df, min_or_max, years):
-        df = df.copy()
-        df = df[df['year'].isin(years)]
-        df = df.drop(columns=['period', 'year'])
-        if min_or_max == 'min':
-            df = df.groupby(['week_of_year']).min().reset_index()
-        elif min_or_max == 'max':
-            df = df.groupby(['week_of_year']).max().reset_index()
-        return df
-
-    def get_average(df, years):
-        df = df[df['year'].isin(years)]
-        df = df.drop(columns=['period', 'year'])
-        df = df.groupby(['week_of_year']).mean().reset_index()
-        df.insert(0, 'type', f'average_{range_selector}')    
-        return df
-
-    df_min = get_min_max(df, 'min', years)
-    df_min.insert(0, 'type', f'min_{range_selector}')
-    
-    df_max = get_min_max(df, 'max', years)
-    df_max.insert(0, 'type', f'max_{range_selector}')
-        
-    df_average = get_average(df, years)
-    
-    dff = pd.concat([df_min, df_max,df_average])
-    
-    return dff
-
-
-def get_seasonality_data(df):
-    df = df.copy()
-    # df = extend_df(df)
-    df = add_weekOfYear_Year(df)
-
-    df_range_old = select_seasonality_range(df, range_selector_normal)
-    df_range_new = select_seasonality_range(df, range_selector_last_five_years)    
-
-    df.insert(0, 'type', 'actual')
-    df['type'] = df['type'] + '_' + df['year'].astype(str)
-    df.drop(columns=['year'], inplace=True)
-
-    df = pd.concat([df,df_range_old, df_range_new])    
-    df['week_of_year'] = df['week_of_year'].astype(int)
-    
-    df['period'] = pd.to_datetime(df['period'])
-    
-    
-    def format_date(date):
-        return date.strftime('%b %d') if pd.notnull(date) else 'No Date'    
-    df['period'] = df['period'].apply(format_date)
-    
-    def format_value_case_insensitive(val, column_name):
-        if "stocks" in column_name.lower():
-            val = val/1000
-        return val
-        
-
-    df = df.set_index(['type','week_of_year','period'])
-    cols = df.columns
-    cols = [production_mapping[col] for col in cols]
-    df.columns = cols
-
-    for column in df.columns:
-        df[column] = df[column].apply(lambda x: format_value_case_insensitive(x, column))
-
-    reversed_mapping = {v: k for k, v in production_mapping.items()}
-    df.columns = [reversed_mapping[col] for col in df.columns]
-    
-    df = df.reset_index()
-    
-
-    return df
-
-def pivot_individual_data(df,id):
-    
-    def get_individual_data(df, id):
-        cols = ['type','week_of_year','period', id] 
-        df = df[cols]
-        df = df.rename(columns={id: 'value'})
-        df = df[~df['type'].isin(type_to_remove)]        
-        return df    
-    
-    df = df.copy()
-    df = get_individual_data(df, id)
-
-    pivot_values = df.pivot_table(index=['week_of_year'], columns='type', values='value', aggfunc='first')
-    pivot_dates = df[df['type'].str.contains('actual')].pivot_table(index=['week_of_year'], columns='type', values='period', aggfunc='first')
-    pivot_dates.columns = [f'dates_{col}' for col in pivot_dates.columns]
-    df = pd.concat([pivot_dates, pivot_values], axis=1)
-    df.reset_index(inplace=True)
-    df.columns.name = None
-    df.insert(0, 'id', id)
-    return df
-
-def generate_seasonality_data():
-    ids = list(production_mapping.keys())
-
+from src.utils.variables import seasonality_windows, type_to_remove
+from src.utils import snapshots
+
+def seasonality_long(df):
+    """One row per (id, week_of_year, year) of a WPS pivot, stocks in millions.
+
+    Weeks are ISO weeks; week 53 has no counterpart in most years and is dropped.
+    """
+    df = scale_stocks(df.set_index('period'))
+    periods = df.index.to_series()
+    weeks = periods.dt.isocalendar().week.astype(int)
+    keep = (weeks <= 52).to_numpy()
+    df = df[keep]
+    df.index = pd.MultiIndex.from_arrays(
+        [weeks[keep].to_numpy(), periods[keep].dt.year.to_numpy(), periods[keep].to_numpy()],
+        names=['week_of_year', 'year', 'period'],
+    )
+    df.columns.name = 'id'
+    return df.stack(future_stack=True).rename('value').reset_index()
+
+def build_seasonality(pivot, windows=seasonality_windows, ids=None, drop_types=type_to_remove):
+    """The seasonality table of a WPS pivot: one row per id and week of year.
+
+    Columns are ``actual_<year>`` with its ``dates_actual_<year>`` label for
+    every year not in ``drop_types``, and ``min_<key>``, ``max_<key>`` and
+    ``average_<key>`` over the years of each ``windows`` entry (key -> years).
+    Rows follow ``ids`` (default: ``production_mapping`` order).
+    """
+    ids = list(production_mapping.keys()) if ids is None else list(ids)
+    long = seasonality_long(pivot[['period'] + [id for id in ids if id in pivot.columns]])
+
+    # A week number can fall twice in one calendar year (ISO week 1 in late
+    # December); the first occurrence wins, as it always has.
+    actual = long[~('actual_' + long['year'].astype(str)).isin(drop_types)]
+    by_year = actual.groupby(['id', 'week_of_year', 'year'], sort=False)
+    values = by_year['value'].first().unstack('year')
+    values.columns = [f'actual_{year}' for year in values.columns]
+
+    first_dates = actual.groupby(['week_of_year', 'year'])['period'].first()
+    dates = first_dates.dt.strftime('%b %d').unstack('year')
+    dates.columns = [f'dates_actual_{year}' for year in dates.columns]
+
+    frames = [values]
+    for key, years in windows.items():
+        window = long[long['year'].isin(years)].groupby(['id', 'week_of_year'])['value']
+        stats = window.agg(['min', 'max', 'mean'])
+        stats.columns = [f'min_{key}', f'max_{key}', f'average_{key}']
+        frames.append(stats)
+    stats = pd.concat(frames, axis=1).dropna(axis=1, how='all')
+
+    rows = pd.MultiIndex.from_product(
+        [ids, sorted(long['week_of_year'].unique())], names=['id', 'week_of_year']
+    )
+    df = stats.reindex(rows).join(dates, on='week_of_year')
+    df = df[sorted(dates.columns) + sorted(stats.columns)]
+    return df.reset_index()
+
+def generate_seasonality_data(windows=seasonality_windows):
     # Always read fresh data directly
     data = pd.read_feather('./data/wps/wps_gte_2015_pivot.feather')
     data['period'] = pd.to_datetime(data['period'])
-    
-    df = get_seasonality_data(data)
-    dfs = pd.DataFrame()
-    for id in ids:
-        dfs = pd.concat([dfs, pivot_individual_data(df, id)])
-        # df = pivot_individual_data(raw, id)
-        # dfs = {**dfs, **{id: pivot_individual_data(df, id)}}
-    dfs.reset_index(drop=True, inplace=True)    
-    dfs.to_feather('./data/wps/seasonality_data.feather')    
-    
+
+    df = build_seasonality(data, windows)
+    df.to_feather('./data/wps/seasonality_data.feather')
+
 if __name__ == '__main__':
-    generate_seasonality_data()
\ No newline at end of file
+    generate_seasonality_data()
+    snapshots.publish('wps')
@@ -0,0 +1,104 @@
+"""Incremental weekly WPS ingest.
+
+psw09.xls carries the full weekly history, but a Wednesday release only adds
+one week and occasionally revises a few recent ones. Rather than rebuilding
+every artifact from scratch, the ingest finds the weeks that are new or whose
+values changed versus the stored long frame, recomputes the derived tickers
+for those weeks only (plus the lookback they depend on) and splices the
+result into the long, pivot, line and seasonality files.
+"""
+import numpy as np
+import pandas as pd
+
+from src.utils.wps_store import write_wps_table
+from src.wps.generate_line_data import format_line_data
+from src.wps.generate_seasonality_data import build_seasonality
+from src.wps.mapping import production_mapping
+
+LINE_PATH = './data/wps/graph_line_data.feather'
+SEASONALITY_PATH = './data/wps/seasonality_data.feather'
+
+# crudeOriginalAdjustment in dash_eia.transforms.wps.WPS_FORMULAS differences
+# crude stocks week over week (diff(WCRSTUS1)), so a week's derived tickers
+# read the week before it, and a revised week changes the adjustment factor of
+# the week after it.
+LOOKBACK_WEEKS = 1
+
+
+def changed_periods(raw, stored):
+    """Periods of ``raw`` that are missing from ``stored`` or carry different values.
+
+    Only the series ``stored`` holds are compared; missing values on both
+    sides compare equal. If ``raw`` has a mapped series ``stored`` lacks, every
+    period is reported, as the stored history would be incomplete.
+    """
+    raw_ids = set(raw['id'].unique())
+    stored_ids = set(stored['id'].unique())
+    if (raw_ids & set(production_mapping)) - stored_ids:
+        return pd.DatetimeIndex(sorted(raw['period'].unique()))
+
+    ids = sorted(raw_ids & stored_ids)
+    new = raw[raw['id'].isin(ids)].pivot(index='period', columns='id', values='value')
+    new = new.apply(pd.to_numeric, errors='coerce').astype(float)
+    old = stored[stored['id'].isin(ids)].pivot(index='period', columns='id', values='value')
+    old = old.reindex(index=new.index, columns=new.columns).astype(float)
+
+    missing = ~new.index.isin(stored['period'].unique())
+    revised = ~np.isclose(new.to_numpy(), old.to_numpy(), equal_nan=True).all(axis=1)
+    return new.index[missing | revised]
+
+
+def recompute_window(changed, periods, lookback=LOOKBACK_WEEKS):
+    """The periods to recompute for ``changed`` and the periods they read.
+
+    A changed week also changes the ``lookback`` weeks after it; each of those
+    needs the ``lookback`` weeks before it as input.
+    """
+    periods = pd.DatetimeIndex(sorted(pd.unique(periods)))
+    positions = periods.get_indexer(pd.DatetimeIndex(changed))
+    positions = positions[positions >= 0]
+    offsets = np.arange(lookback + 1)
+    out = np.unique((positions[:, None] + offsets).ravel())
+    out = out[out < len(periods)]
+    inputs = np.unique((out[:, None] - offsets).ravel())
+    inputs = inputs[inputs >= 0]
+    return periods[out], periods[inputs]
+
+
+def splice_periods(existing, rows, periods):
+    """``existing`` with the rows of ``periods`` replaced by ``rows``, sorted by period."""
+    kept = existing[~existing['period'].isin(periods)]
+    columns = list(existing.columns) + [col for col in rows.columns if col not in existing.columns]
+    df = pd.concat([kept, rows.reindex(columns=columns)], ignore_index=True)
+    return df.sort_values('period', kind='stable').reset_index(drop=True)
+
+
+def update_line_data(pivot_rows, periods, file_path=LINE_PATH):
+    """Replace ``periods`` in the line file with ``pivot_rows`` formatted for graphs."""
+    existing = pd.read_feather(file_path)
+    df = splice_periods(existing, format_line_data(pivot_rows), periods)
+    write_wps_table(df, file_path)
+
+
+def update_seasonality_data(pivot, periods, file_path=SEASONALITY_PATH):
+    """Rebuild the seasonality rows for the weeks of year ``periods`` fall in.
+
+    Every seasonality row is keyed by week of year, and its ranges and actuals
+    read only that week across years, so recomputing from the pivot restricted
+    to those weeks gives the same rows a full rebuild would.
+    """
+    weeks = set(pd.DatetimeIndex(periods).isocalendar().week.astype(int))
+    pivot = pivot[pivot['period'].dt.isocalendar().week.astype(int).isin(weeks)]
+    ids = list(production_mapping.keys())
+    rows = build_seasonality(pivot, ids=ids)
+
+    existing = pd.read_feather(file_path)
+    kept = existing[~existing['week_of_year'].isin(weeks)]
+    df = pd.concat([kept, rows], ignore_index=True)
+    dates = sorted(col for col in df.columns if col.startswith('dates_'))
+    values = sorted(col for col in df.columns if col not in ['id', 'week_of_year'] + dates)
+    df = df[['id', 'week_of_year'] + dates + values]
+    df['id'] = pd.Categorical(df['id'], categories=ids)
+    df = df.sort_values(['id', 'week_of_year'], kind='stable')
+    df['id'] = df['id'].astype(str)
+    df.reset_index(drop=True).to_feather(file_path)
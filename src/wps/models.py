@@ -0,0 +1,159 @@
+"""Statistical model fits for the WPS time-series analytics pages.
+
+STL decompositions and holdout forecasts (Holt-Winters, SARIMAX) are memoized
+in `src.utils.model_cache`, keyed by series, WPS pivot version, model spec and
+holdout. The analytics callbacks read them from here instead of fitting in
+the callback, and `precompute` fits the curated `ANALYTICS_SERIES` after each
+ingest so the first visit after a release is a cache hit too.
+
+A forecast is fitted once per holdout for the full holdout length; every
+horizon up to it is a prefix of that forecast. The holdout slider stops only
+at `HOLDOUTS`, and `precompute` fits each of them, so no slider position fits
+a model in the callback.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from dash_eia.jobs import report_progress
+from src.utils import datasets
+from src.utils.data_loader import loader
+from src.utils.model_cache import ModelCache
+
+ANALYTICS_SERIES = {
+    "WCESTUS1": "Crude Oil Stocks",
+    "WGTSTUS1": "Gasoline Stocks",
+    "WDISTUS1": "Distillate Stocks",
+    "WKJSTUS1": "Jet Fuel Stocks",
+    "WCRFPUS2": "Crude Production",
+    "W_EPC0_FPF_R48_MBBLD": "L48 Crude Production",
+    "WCEIMUS2": "Crude Imports",
+    "WCREXUS2": "Crude Exports",
+    "WCRRIUS2": "Refinery Inputs",
+    "WPULEUS3": "Refinery Utilization",
+    "WRPUPUS2": "Total Products Supplied",
+    "WGFUPUS2": "Gasoline Supplied",
+    "WDIUPUS2": "Distillate Supplied",
+    "WKJUPUS2": "Jet Fuel Supplied",
+    "WGFRPUS2": "Gasoline Production",
+    "WDIRPUS2": "Distillate Production",
+}
+
+# The forecast holdout slider's steps and initial value, all fitted by `precompute`
+HOLDOUTS = (8, 13, 26, 39, 52)
+DEFAULT_HOLDOUT = 26
+
+STL_SPEC = "STL(period=52, robust=True)"
+HOLT_WINTERS_SPEC = "ExponentialSmoothing(trend=add, seasonal=add, seasonal_periods=52)"
+SARIMAX_SPEC = "SARIMAX(1,1,1)(1,1,0,52) else ARIMA(1,1,1), maxiter=50"
+
+MODEL_DIR = "./data/cache/models"
+
+cache = ModelCache(directory=MODEL_DIR)
+
+
+def series(series_id):
+    """Return (dates, values) as numpy arrays, dropping NaNs."""
+    if series_id not in set(loader.wps_series_ids()):
+        return np.array([]), np.array([])
+    s = loader.wps_series([series_id]).dropna(subset=[series_id])
+    return s["period"].values, s[series_id].values.astype(float)
+
+
+def _version():
+    return datasets.version("wps_pivot")
+
+
+def stl(series_id):
+    """Observed, trend, seasonal and residual columns of a robust weekly STL."""
+
+    def fit():
+        from statsmodels.tsa.seasonal import STL
+
+        dates, vals = series(series_id)
+        result = STL(pd.Series(vals, index=pd.to_datetime(dates)), period=52, robust=True).fit()
+        return pd.DataFrame({
+            "observed": result.observed, "trend": result.trend,
+            "seasonal": result.seasonal, "resid": result.resid,
+        })
+
+    return cache.get_or_fit(cache.key(series_id, _version(), STL_SPEC), fit)
+
+
+def _train(series_id, holdout):
+    _, vals = series(series_id)
+    return vals[:len(vals) - holdout]
+
+
+def holt_winters(series_id, holdout):
+    """Additive Holt-Winters forecast of the ``holdout`` weeks held out, or None."""
+
+    def fit():
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+        try:
+            model = ExponentialSmoothing(_train(series_id, holdout), seasonal_periods=52,
+                                         trend="add", seasonal="add", use_boxcox=False)
+            return np.asarray(model.fit(optimized=True).forecast(holdout))
+        except Exception:
+            return None
+
+    return cache.get_or_fit(cache.key(series_id, _version(), HOLT_WINTERS_SPEC, holdout), fit)
+
+
+def sarimax(series_id, holdout):
+    """SARIMAX forecast of the ``holdout`` weeks held out, or None.
+
+    Returns a dict with the model ``label``, the ``mean`` forecast and, for
+    the seasonal model, a 95% interval (``lower``, ``upper``). Falls back to a
+    non-seasonal ARIMA(1,1,1) without an interval when the seasonal fit fails.
+    """
+
+    def fit():
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+        train = _train(series_id, holdout)
+        try:
+            model = SARIMAX(train, order=(1, 1, 1), seasonal_order=(1, 1, 0, 52),
+                            enforce_stationarity=False, enforce_invertibility=False)
+            pred = model.fit(disp=False, maxiter=50).get_forecast(holdout)
+            ci = pred.conf_int(alpha=0.05)
+            return {"label": "SARIMAX(1,1,1)(1,1,0,52)", "mean": np.asarray(pred.predicted_mean),
+                    "lower": ci[:, 0], "upper": ci[:, 1]}
+        except Exception:
+            pass
+        try:
+            model = SARIMAX(train, order=(1, 1, 1), enforce_stationarity=False, enforce_invertibility=False)
+            pred = model.fit(disp=False, maxiter=50).get_forecast(holdout)
+            return {"label": "ARIMA(1,1,1)", "mean": np.asarray(pred.predicted_mean)}
+        except Exception:
+            return None
+
+    return cache.get_or_fit(cache.key(series_id, _version(), SARIMAX_SPEC, holdout), fit)
+
+
+def precompute(series_ids=None, holdouts=HOLDOUTS, progress=(0.0, 1.0)):
+    """Fit every model for ``series_ids`` (default: `ANALYTICS_SERIES`) into the cache.
+
+    Run after an ingest: the pivot's new version invalidates earlier fits, and
+    their files are dropped. Within a background job, progress is reported
+    per series across the ``progress`` (start, end) span.
+    """
+    series_ids = list(ANALYTICS_SERIES) if series_ids is None else list(series_ids)
+    cache.prune(_version())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start, end = progress
+        for i, series_id in enumerate(series_ids):
+            report_progress(start + (end - start) * i / len(series_ids),
+                            f"Fitting models for {ANALYTICS_SERIES.get(series_id, series_id)}")
+            n = len(series(series_id)[1])
+            if n < 104:
+                continue
+            stl(series_id)
+            for holdout in holdouts:
+                if n < 104 + holdout:
+                    continue
+                holt_winters(series_id, holdout)
+                sarimax(series_id, holdout)
@@ -3,8 +3,13 @@
 # Do not remove. If a test fails with "Blocked a real ...", the test is missing
 # a mock, not the fixture being wrong.
 # ---------------------------------------------------------------------------
+import contextlib
+
 import pytest
 
+from dash_eia.config.paths import WORKSPACE_ENV_VAR
+from tests.local_http import serve
+
 try:  # botocore is absent in repos with no AWS surface
     import botocore.client as _botocore_client
 except ImportError:  # pragma: no cover
@@ -53,3 +58,41 @@ def block_network_and_aws(request, monkeypatch):
         monkeypatch.setattr(_botocore_client.BaseClient, "_make_api_call", _deny_aws)
     if _requests is not None:
         monkeypatch.setattr(_requests.Session, "request", _deny_http)
+
+
+# Taken at import, before the guard above replaces it for each test
+_SESSION_REQUEST = _requests.Session.request if _requests is not None else None
+
+
+@pytest.fixture
+def local_http(block_network_and_aws, monkeypatch):
+    """Serve handlers locally: ``local_http(handler, prefix)`` returns the served URL.
+
+    ``handler`` is a ``BaseHTTPRequestHandler`` class, started on a free port
+    (tests/local_http.py); the URL is its root joined with ``prefix``.
+    Requests under that URL reach the server, anything else still meets the
+    network guard. The servers stop at the end of the test.
+    """
+    with contextlib.ExitStack() as stack:
+
+        def start(handler, prefix="/"):
+            served = stack.enter_context(serve(handler)) + prefix
+            guard = _requests.Session.request
+
+            def local_only(self, method, url, *args, **kwargs):
+                request = _SESSION_REQUEST if str(url).startswith(served) else guard
+                return request(self, method, url, *args, **kwargs)
+
+            monkeypatch.setattr(_requests.Session, "request", local_only)
+            return served
+
+        yield start
+
+
+@pytest.fixture
+def tmp_workspace(tmp_path_factory, monkeypatch):
+    """A throwaway workspace root, so files a test caches under data/ stay out of the repo."""
+    root = tmp_path_factory.mktemp("workspace")
+    (root / "pyproject.toml").write_text('[project]\nname = "dash-eia"\n')
+    monkeypatch.setenv(WORKSPACE_ENV_VAR, str(root))
+    return root
@@ -0,0 +1,21 @@
+"""A local HTTP server for the download tests and benchmarks to talk to."""
+
+import contextlib
+import threading
+from http.server import ThreadingHTTPServer
+
+
+@contextlib.contextmanager
+def serve(handler):
+    """Serve ``handler`` (a `BaseHTTPRequestHandler` class) on a free local port.
+
+    Yields the root URL, ``http://127.0.0.1:<port>``; the server is shut down
+    when the block exits.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,113 @@
+"""The CLI pages share one enriched import frame per worker.
+
+Every chart builder on the CLI pages used to construct its own
+`CLIDataProcessor`, and each construction re-read the parquet file and rebuilt
+the derived columns -- six full loads for one PADD dropdown change on the port
+page. These tests pin the replacement: one load per file version, cheap PADD
+views, and a reload when the file on disk changes.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.cli import cli_data_processor
+from src.cli.cli_data_processor import CLIDataProcessor, get_shared_frame
+
+
+def _write_imports(path, quantities):
+    pd.DataFrame(
+        {
+            "RPT_PERIOD": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-01"]),
+            "R_S_NAME": ["A", "B", "A"],
+            "PORT_PADD": [1, 3, 3],
+            "PORT_CITY": ["BOSTON, MA", "HOUSTON, TX", "HOUSTON, TX"],
+            "PORT_STATE": ["MASSACHUSETTS", "TEXAS", "TEXAS"],
+            "CNTRY_NAME": ["CANADA", "MEXICO", "CANADA"],
+            "QUANTITY": quantities,
+            "APIGRAVITY": [20.0, 30.0, 40.0],
+            "SULFUR": [0.2, 1.0, 2.0],
+        }
+    ).to_parquet(path, index=False)
+
+
+@pytest.fixture
+def imports_file(tmp_path):
+    cli_data_processor.clear_shared_frames()
+    path = tmp_path / "imports.parquet"
+    _write_imports(path, [31, 62, 29])
+    yield path
+    cli_data_processor.clear_shared_frames()
+
+
+def test_processors_share_one_enriched_frame(imports_file, monkeypatch):
+    reads = []
+    real_read = pd.read_parquet
+    monkeypatch.setattr(
+        cli_data_processor.pd, "read_parquet", lambda p: reads.append(p) or real_read(p)
+    )
+
+    first = CLIDataProcessor(data_path=str(imports_file))
+    second = CLIDataProcessor(data_path=str(imports_file))
+
+    assert first.df is second.df
+    assert len(reads) == 1
+    assert first.df["QUANTITY"].tolist() == [1.0, 2.0, 1.0]
+    assert first.df["YEAR_MONTH"].tolist() == ["2024-01", "2024-01", "2024-02"]
+
+
+def test_padd_views_accept_every_dropdown_spelling(imports_file):
+    spellings = ["PADD 3", "P3", 3]
+    views = [get_shared_frame(str(imports_file), padd) for padd in spellings]
+
+    assert all(view is views[0] for view in views)
+    assert views[0]["PORT_PADD"].unique().tolist() == [3]
+    assert len(CLIDataProcessor(str(imports_file), padd_filter="US").df) == 3
+
+
+def test_a_rewritten_file_is_reloaded(imports_file):
+    before = CLIDataProcessor(data_path=str(imports_file)).df
+
+    _write_imports(imports_file, [62, 62, 58])
+    stat = os.stat(imports_file)
+    os.utime(imports_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    after = CLIDataProcessor(data_path=str(imports_file)).df
+    assert after is not before
+    assert after["QUANTITY"].tolist() == [2.0, 2.0, 2.0]
+
+
+# ---------------------------------------------------------------------------
+# The aggregate cube
+#
+# The summary tables answer from a (period, PADD, country, company, port) cube
+# rather than the raw rows. Their numbers must not move: average kbd is total
+# barrels over total days in the months imported, the quality means are plain
+# row means, and a primary-PADD tie goes to the PADD seen first.
+# ---------------------------------------------------------------------------
+def test_summaries_from_the_cube_match_the_raw_rows(imports_file):
+    top = CLIDataProcessor(data_path=str(imports_file)).get_top_importers(n=5)
+
+    # A: 31 kb over January's 31 days, 29 kb over February's 29 days.
+    assert top.loc["A", "Avg kbd"] == 1.0
+    assert top.loc["A", "Avg API"] == 30.0
+    assert top.loc["A", "Source Countries"] == 1
+    # A has one row in PADD 1 and one in PADD 3; PADD 1 comes first.
+    assert top.loc["A", "Primary PADD"] == 1
+
+
+def test_a_written_cube_is_used_only_while_it_is_current(imports_file):
+    from src.cli.cube import cube_path_for, write_cube
+
+    cube_file = cube_path_for(imports_file)
+    write_cube(cli_data_processor.enrich_frame(pd.read_parquet(imports_file)), cube_file)
+    from_disk = cli_data_processor.get_shared_cube(str(imports_file))
+    assert from_disk["ROW_COUNT"].sum() == 3
+
+    # A source rewritten after the cube makes the cube stale: build, don't read.
+    _write_imports(imports_file, [62, 62, 58])
+    stat = os.stat(cube_file)
+    os.utime(imports_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    rebuilt = cli_data_processor.get_shared_cube(str(imports_file))
+    assert rebuilt["QUANTITY_MB"].sum() == 182
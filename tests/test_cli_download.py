@@ -0,0 +1,152 @@
+"""Incremental company level imports archive fetch (`src.cli.download`).
+
+The archive used to be downloaded in full, one month after another, on every
+refresh. Months are now fetched concurrently with conditional requests
+against a manifest of ETags, Last-Modified dates and hashes, and each month is
+stored as its own parquet partition, so a revised month rewrites one file.
+These tests serve small workbooks from a local HTTP server; requests to
+anything else are still blocked by the network guard in conftest.
+"""
+
+import hashlib
+import io
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pandas as pd
+import pytest
+
+from src.cli import download, store
+
+# Parsed workbooks (`src.utils.workbooks`) go to a throwaway workspace
+pytestmark = pytest.mark.usefixtures("tmp_workspace")
+
+
+def _workbook(month, quantity):
+    df = pd.DataFrame(
+        {
+            "RPT_PERIOD": [f"{month}-28", f"{month}-28"],
+            "R_S_NAME": ["REFINER A", "REFINER B"],
+            "LINE_NUM": [1, 2],
+            "PROD_CODE": [20, 20],
+            "PROD_NAME": ["Crude Oil", "Crude Oil"],
+            "PORT_CODE": [5301, 5301],
+            "PORT_CITY": ["HOUSTON, TX", "HOUSTON, TX"],
+            "PORT_STATE": ["TEXAS", "TEXAS"],
+            "PORT_PADD": [3, 3],
+            "GCTRY_CODE": [220, 470],
+            "CNTRY_NAME": ["BRAZIL", "MEXICO"],
+            "QUANTITY": [quantity, quantity + 1],
+            "SULFUR": [0.5, 3.1],
+            "APIGRAVITY": [28.0, 21.5],
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_excel(buffer, sheet_name="IMPORTS", index=False)
+    return buffer.getvalue()
+
+
+class _Archive(BaseHTTPRequestHandler):
+    files = {}
+    requests = []
+
+    def do_GET(self):
+        month = "-".join(self.path.split("/")[-3].split("_"))
+        body = self.files.get(month)
+        self.requests.append((month, self.headers.get("If-None-Match")))
+        if body is None:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def archive(local_http, monkeypatch):
+    _Archive.files = {month: _workbook(month, 100) for month in ["2024-11", "2024-12", "2025-01"]}
+    _Archive.requests = []
+    served = local_http(_Archive, "/archive/")
+    monkeypatch.setattr(
+        download, "ARCHIVE_URL", served + "{year}/{year}_{month:02d}/data/import.xlsx"
+    )
+    return _Archive
+
+
+def _main(tmp_path):
+    download.main(2024, "2025-02", raw_dir=tmp_path / "raw", directory=tmp_path / "cli")
+    return store.read_imports(tmp_path / "cli")
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+def test_months_are_fetched_once_and_recorded_in_the_manifest(archive, tmp_path):
+    statuses = download.fetch_months(download.archive_months(2024, "2025-02"), tmp_path, workers=4)
+
+    assert [statuses[m] for m in ["2024-11", "2024-12", "2025-01", "2025-02"]] == [
+        "new",
+        "new",
+        "new",
+        "missing",
+    ]
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert sorted(manifest) == ["2024-11", "2024-12", "2025-01"]
+    assert manifest["2024-12"]["sha256"] == hashlib.sha256(archive.files["2024-12"]).hexdigest()
+
+    archive.requests.clear()
+    statuses = download.fetch_months(["2024-11", "2024-12", "2025-01"], tmp_path)
+
+    assert set(statuses.values()) == {"unchanged"}
+    assert all(etag for _, etag in archive.requests)
+
+
+def test_a_revised_month_is_fetched_again(archive, tmp_path):
+    months = ["2024-11", "2024-12"]
+    download.fetch_months(months, tmp_path)
+    archive.files["2024-12"] = _workbook("2024-12", 250)
+
+    statuses = download.fetch_months(months, tmp_path)
+
+    assert statuses == {"2024-11": "unchanged", "2024-12": "changed"}
+    assert (tmp_path / "2024-12_import.xlsx").read_bytes() == archive.files["2024-12"]
+
+
+# ---------------------------------------------------------------------------
+# Partitions
+# ---------------------------------------------------------------------------
+def test_a_revision_rewrites_only_its_partition(archive, tmp_path):
+    first = _main(tmp_path)
+    partitions = {m: store.partition_path(tmp_path / "cli", m) for m in archive.files}
+    written = {m: path.stat().st_mtime_ns for m, path in partitions.items()}
+
+    archive.files["2024-12"] = _workbook("2024-12", 250)
+    second = _main(tmp_path)
+
+    changed = [m for m, path in partitions.items() if path.stat().st_mtime_ns != written[m]]
+    assert changed == ["2024-12"]
+    assert first["QUANTITY"].tolist() == [100, 101] * 3
+    assert second["QUANTITY"].tolist() == [100, 101, 250, 251, 100, 101]
+
+
+def test_the_store_reads_back_as_the_concatenated_archive(archive, tmp_path):
+    df = _main(tmp_path)
+
+    assert df.columns.tolist() == store.SCHEMA.names
+    assert df["RPT_PERIOD"].dt.strftime("%Y-%m").unique().tolist() == [
+        "2024-11",
+        "2024-12",
+        "2025-01",
+    ]
+    assert df["GCTRY_CODE"].tolist()[:2] == ["220", "470"]
+    assert df["PCOMP_PADD"].isna().all()
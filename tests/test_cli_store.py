@@ -0,0 +1,127 @@
+"""The partitioned company level imports store (`src.cli.store`).
+
+The CLI data used to be two monolithic parquet files, the full archive and a
+crude-only copy of it, each read whole by every loader. It is now one file per
+month under ``year=YYYY/month=MM``; queries pass PADD, date and product
+filters to the reader, which skips months outside the dates unopened.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.cli import cli_data_processor, store
+from src.cli.cli_data_processor import CLIDataProcessor
+from src.cli.cube import cube_path_for
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def _imports():
+    periods = pd.to_datetime(["2024-11-01"] * 3 + ["2024-12-01"] * 3 + ["2025-01-01"] * 2)
+    return pd.DataFrame(
+        {
+            "RPT_PERIOD": periods,
+            "R_S_NAME": ["A", "B", "C", "A", "B", "C", "A", "B"],
+            "LINE_NUM": range(8),
+            "PROD_NAME": ["Crude Oil", "Propane/Ngl", "Crude Oil"] * 2 + ["Crude Oil"] * 2,
+            "PORT_CITY": ["HOUSTON, TX", "BOSTON, MA", "CHICAGO, IL"] * 2 + ["HOUSTON, TX"] * 2,
+            "PORT_STATE": ["TEXAS", "MASSACHUSETTS", "ILLINOIS"] * 2 + ["TEXAS"] * 2,
+            "PORT_PADD": [3, 1, 2, 3, 1, 2, 3, 3],
+            "CNTRY_NAME": ["MEXICO", "CANADA", "CANADA"] * 2 + ["BRAZIL", "MEXICO"],
+            "QUANTITY": [30, 10, 62, 31, 11, 60, 93, 31],
+            "APIGRAVITY": [21.0, 0.0, 20.0, 22.0, 0.0, 19.5, 28.0, 21.5],
+            "SULFUR": [3.2, 0.0, 3.5, 3.1, 0.0, 3.4, 0.6, 3.0],
+        }
+    )
+
+
+@pytest.fixture
+def imports_dir(tmp_path):
+    cli_data_processor.clear_shared_frames()
+    store.write_dataset(_imports(), tmp_path / "companylevelimports")
+    yield tmp_path / "companylevelimports"
+    cli_data_processor.clear_shared_frames()
+
+
+# ---------------------------------------------------------------------------
+# Layout and reads
+# ---------------------------------------------------------------------------
+def test_months_are_written_as_hive_partitions(imports_dir):
+    files = [Path(path).relative_to(imports_dir).as_posix() for path in store.dataset_files(imports_dir)]
+
+    assert files == [
+        "year=2024/month=11/part-0.parquet",
+        "year=2024/month=12/part-0.parquet",
+        "year=2025/month=01/part-0.parquet",
+    ]
+    df = store.read_imports(imports_dir)
+    assert df.columns.tolist() == store.SCHEMA.names
+    assert df["LINE_NUM"].tolist() == list(range(8))
+
+
+def test_date_filters_skip_months_unopened(imports_dir):
+    dataset = store.dataset(imports_dir)
+
+    fragments = list(dataset.get_fragments(filter=store._filter(start="2024-12", end="2024-12-31")))
+
+    assert [Path(f.path).parent.name for f in fragments] == ["month=12"]
+
+
+@pytest.mark.parametrize(
+    ("filters", "lines"),
+    [
+        ({"padd": 3}, [0, 3, 6, 7]),
+        ({"padd": [1, 2], "start": "2024-12-01"}, [4, 5]),
+        ({"products": "Crude Oil", "end": "2024-12-01"}, [0, 2, 3, 5]),
+        ({"padd": "3", "products": ["Crude Oil"], "start": "2024-12", "end": "2025-01"}, [3, 6, 7]),
+    ],
+)
+def test_filters_match_filtering_the_whole_frame(imports_dir, filters, lines):
+    df = store.read_imports(imports_dir)
+
+    read = store.read_imports(imports_dir, **filters)
+
+    pd.testing.assert_frame_equal(read, df[df["LINE_NUM"].isin(lines)].reset_index(drop=True))
+
+
+def test_an_empty_store_reads_as_an_empty_frame(tmp_path):
+    df = store.read_imports(tmp_path, columns=["RPT_PERIOD", "QUANTITY"])
+
+    assert df.empty and df.columns.tolist() == ["RPT_PERIOD", "QUANTITY"]
+
+
+def test_the_stored_archive_holds_the_crude_rows_the_pages_read():
+    crude = store.read_imports(_REPO / store.DATASET_DIR, products=store.CRUDE)
+
+    assert crude["PROD_NAME"].eq(store.CRUDE).all()
+    assert crude["RPT_PERIOD"].is_monotonic_increasing
+    assert Path(cube_path_for(_REPO / store.DATASET_DIR)).name == "companylevelimports_crude_cube.parquet"
+
+
+# ---------------------------------------------------------------------------
+# Processor
+# ---------------------------------------------------------------------------
+def test_the_processor_reads_the_crude_rows_of_a_store(imports_dir, tmp_path):
+    crude_file = tmp_path / "crude.parquet"
+    crude = store.read_imports(imports_dir)
+    crude[crude["PROD_NAME"] == "Crude Oil"].to_parquet(crude_file, index=False)
+
+    from_store = CLIDataProcessor(data_path=str(imports_dir))
+    from_file = CLIDataProcessor(data_path=str(crude_file))
+
+    pd.testing.assert_frame_equal(from_store.df, from_file.df.reset_index(drop=True))
+    pd.testing.assert_frame_equal(from_store.cube, from_file.cube)
+
+
+def test_a_rewritten_partition_reloads_the_shared_frame(imports_dir):
+    first = CLIDataProcessor(data_path=str(imports_dir)).df
+    revised = _imports()
+    revised.loc[revised["RPT_PERIOD"] == "2025-01-01", "QUANTITY"] = [62, 62]
+
+    store.write_dataset(revised[revised["RPT_PERIOD"] == "2025-01-01"], imports_dir)
+
+    second = CLIDataProcessor(data_path=str(imports_dir)).df
+    assert second is not first
+    assert second["QUANTITY_MB"].tolist()[-2:] == [62, 62]
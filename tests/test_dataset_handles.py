@@ -0,0 +1,141 @@
+"""Stores carry dataset handles, not frames.
+
+`src/app.py` used to put the whole WPS pivot into a session `dcc.Store` as
+`to_dict('records')`, `page2_1` did it again, and the AG grid pages shipped
+their tables into the browser and back on every callback -- about 3 MB of JSON
+in the initial layout alone. Stores now hold a small handle that callbacks
+resolve against a server-side cache (`src.utils.datasets`).
+
+The budget tests are the alarm for a frame creeping back into a layout.
+"""
+
+import importlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from plotly.utils import PlotlyJSONEncoder
+
+from dash_eia.apps.compat import working_directory
+from src.utils import datasets
+
+_REPO = Path(__file__).resolve().parents[1]
+
+# The app shell (sidebar, router, session store) and a page whose only data is
+# a store. Both were megabytes while the stores held records.
+SHELL_BUDGET = 64 * 1024
+STORE_PAGE_BUDGET = 32 * 1024
+STORE_PAGES = ["page2_1", "page2_6", "page2_11", "page2_12", "page2_13", "page2_14"]
+
+
+def _payload_size(component) -> int:
+    return len(json.dumps(component, cls=PlotlyJSONEncoder))
+
+
+def _render(layout):
+    """Most pages export a layout function, built on first navigation."""
+    return layout() if callable(layout) else layout
+
+
+@pytest.fixture
+def counted_dataset(tmp_path):
+    """A registered dataset over a file in tmp_path that counts its builds."""
+    source = tmp_path / "source.txt"
+    source.write_text("1")
+    builds = []
+
+    def build(scale=1):
+        builds.append(scale)
+        return pd.DataFrame({"value": [int(source.read_text()) * scale]})
+
+    datasets.register("counted", build, str(source))
+    yield source, builds
+    datasets._builders.pop("counted")
+    datasets.clear()
+
+
+# ---------------------------------------------------------------------------
+# Handles
+# ---------------------------------------------------------------------------
+def test_a_handle_builds_once_and_is_shared(counted_dataset):
+    _, builds = counted_dataset
+    ref = datasets.handle("counted", scale=2)
+
+    assert json.loads(json.dumps(ref)) == ref
+    assert datasets.resolve(ref)["value"].tolist() == [2]
+    assert datasets.resolve(ref)["value"].tolist() == [2]
+    assert builds == [2]
+
+
+def test_a_resolved_frame_can_be_modified_without_touching_the_cache(counted_dataset):
+    ref = datasets.handle("counted")
+
+    df = datasets.resolve(ref)
+    df["value"] = 99
+
+    assert datasets.resolve(ref)["value"].tolist() == [1]
+
+
+def test_a_rewritten_source_is_rebuilt(counted_dataset):
+    source, builds = counted_dataset
+    ref = datasets.handle("counted")
+    datasets.resolve(ref)
+
+    source.write_text("5")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # A handle issued before the refresh resolves to the new data.
+    assert datasets.resolve(ref)["value"].tolist() == [5]
+    assert len(builds) == 2
+
+
+def test_a_failed_build_leaves_no_lock_behind(counted_dataset):
+    source, builds = counted_dataset
+    source.write_text("not a number")
+    ref = datasets.handle("counted")
+
+    with pytest.raises(ValueError):
+        datasets.resolve(ref)
+    assert datasets._build_locks == {}
+
+    source.write_text("3")
+    assert datasets.resolve(datasets.handle("counted"))["value"].tolist() == [3]
+
+
+def test_records_from_older_sessions_still_resolve():
+    assert datasets.resolve([{"a": 1}, {"a": 2}])["a"].tolist() == [1, 2]
+    assert datasets.resolve(None) is None
+
+
+# ---------------------------------------------------------------------------
+# Layout payload budgets
+# ---------------------------------------------------------------------------
+def test_app_shell_payload_stays_under_budget():
+    with working_directory(_REPO):
+        index = importlib.import_module("src.index")
+
+    assert _payload_size(index.app.layout) < SHELL_BUDGET
+
+
+@pytest.mark.parametrize("name", STORE_PAGES)
+def test_store_page_payload_stays_under_budget(name):
+    with working_directory(_REPO):
+        module = importlib.import_module(f"pages.{name}")
+        layout = _render(module.layout)
+
+    assert _payload_size(layout) < STORE_PAGE_BUDGET
+
+
+def test_grid_page_store_holds_a_handle():
+    """`page2_3` still ships its grid rows, but its graph store is a handle."""
+    with working_directory(_REPO):
+        module = importlib.import_module("pages.page2_3")
+        store = next(
+            child for child in _render(module.layout).children
+            if getattr(child, "id", None) == "current-data-store"
+        )
+        assert store.data["dataset"] == "wps_ag_table"
+        assert not datasets.resolve(store.data).empty
@@ -0,0 +1,115 @@
+"""Declarative derived series (`dash_eia.transforms.derived`).
+
+The WPS formulas in `dash_eia.transforms.wps` replaced about 60 hand-written
+column expressions in three copies of `generate_additional_tickers`. The
+committed `wps_gte_2015.feather` was written by that code from the workbook,
+so its derived rows are the reference.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_eia.transforms.derived import Formula, FormulaError, FormulaSet
+from dash_eia.transforms.wps import WPS_FORMULAS
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def _frame(**columns):
+    index = pd.date_range("2025-01-03", periods=3, freq="W-FRI", name="period")
+    return pd.DataFrame(columns, index=index)
+
+
+# ---------------------------------------------------------------------------
+# WPS formulas
+# ---------------------------------------------------------------------------
+def test_wps_formulas_reproduce_the_committed_derived_series():
+    stored = pd.read_feather(_REPO / "data/wps/wps_gte_2015.feather")
+    source = stored[~stored["id"].isin(WPS_FORMULAS.ids)]
+
+    derived = WPS_FORMULAS.evaluate_long(source)
+
+    # The first stored week's stock change reads a week the store does not hold
+    first = stored["period"].min()
+    expected = stored[stored["id"].isin(WPS_FORMULAS.ids)]
+    expected = expected[~((expected["id"] == "crudeOriginalAdjustment") & (expected["period"] == first))]
+    key = ["id", "period"]
+    pd.testing.assert_frame_equal(
+        derived.sort_values(key).reset_index(drop=True)[stored.columns],
+        expected.sort_values(key).reset_index(drop=True),
+    )
+
+
+def test_a_revised_input_touches_only_the_formulas_that_read_it():
+    touched = WPS_FORMULAS.dependents(["WCRSTUS1"])
+    assert touched == ["crudeOriginalAdjustment"]
+
+    # Derived-of-derived: P9 gross runs feed P9 feedstock runs and every P9 yield
+    touched = WPS_FORMULAS.dependents(["WGIRIP32"])
+    assert {"grossRunsP9", "feedstockRunsP9", "feedstockRunsP3", "gasolineYieldP9"} <= set(touched)
+    assert "gasolineYieldP1" not in touched
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+def test_formulas_read_other_formulas_in_dependency_order():
+    formulas = FormulaSet(
+        [
+            Formula("doubled", "total * 2"),
+            Formula("total", "a + b", emit=False),
+        ]
+    )
+
+    result = formulas.evaluate(_frame(a=[1.0, 2.0, 3.0], b=[10.0, 20.0, 30.0]))
+
+    assert result.columns.tolist() == ["doubled"]
+    assert result["doubled"].tolist() == [22.0, 44.0, 66.0]
+
+
+def test_only_evaluates_the_requested_formulas():
+    formulas = FormulaSet([Formula("x", "a + 1"), Formula("y", "a / b")])
+
+    result = formulas.evaluate(_frame(a=[1.0, 2.0, 3.0]), only=["x"])
+
+    assert result.columns.tolist() == ["x"]
+
+
+def test_missing_sources_division_by_zero_and_diff_give_missing_values():
+    formulas = FormulaSet(
+        [
+            Formula("ratio", "a / b"),
+            Formula("change", "diff(a)", drop_missing=True),
+            Formula("filled", "fillna(c, 0) + a"),
+        ]
+    )
+    wide = _frame(a=[1.0, 2.0, 4.0], b=[0.0, 2.0, np.nan])
+
+    result = formulas.evaluate(wide)
+    assert result["ratio"].isna().tolist() == [True, False, True]
+    assert result["filled"].tolist() == [1.0, 2.0, 4.0]
+
+    long = wide.melt(ignore_index=False, var_name="id").reset_index()
+    rows = formulas.evaluate_long(long)
+    assert rows.loc[rows["id"] == "change", "value"].tolist() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "formulas",
+    [
+        [Formula("x", "y + 1"), Formula("y", "x + 1")],
+        [Formula("x", "a"), Formula("x", "b")],
+    ],
+)
+def test_cycles_and_duplicates_are_rejected(formulas):
+    with pytest.raises(FormulaError):
+        FormulaSet(formulas)
+
+
+@pytest.mark.parametrize("expression", ["a ** 2", "open(a)", "a.b", "a +"])
+def test_only_arithmetic_is_allowed(expression):
+    with pytest.raises(FormulaError):
+        Formula("x", expression)
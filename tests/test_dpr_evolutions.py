@@ -0,0 +1,115 @@
+"""The DPR evolution array (`dash_eia.transforms.dpr`).
+
+The DPR regional page used to build a dict of per-series frames from
+`steo_pivot_dpr.feather`, melting the pivot and then filtering, pivoting and
+reversing it once per series. It now slices one (series x release x month)
+array, written at STEO ingest next to the pivot, and its last N releases of a
+series are views of that array.
+"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_eia.transforms import dpr
+
+_REPO = Path(__file__).resolve().parents[1]
+_PIVOT = _REPO / "data/steo/steo_pivot_dpr.feather"
+_META = _REPO / "lookup/steo/mapping_dpr.csv"
+
+
+def _pivot():
+    months = ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01"]
+    rows = [
+        ("RIGSPM", "2026-01-01", [None, 300.0, 301.0, None]),
+        ("RIGSPM", "2026-02-01", [None, 302.0, 303.456, 304.0]),
+        ("COPRPM", "2026-02-01", [6.1, 6.2, 6.3, 6.4]),
+        ("UNMAPPED", "2026-02-01", [1.0, 1.0, 1.0, 1.0]),
+    ]
+    return pd.DataFrame(
+        [
+            {"id": i, "name": i, "release_date": pd.Timestamp(r), "uom": "", **dict(zip(months, v))}
+            for i, r, v in rows
+        ]
+    )
+
+
+def _meta():
+    return pd.DataFrame(
+        {
+            "id": ["COPRPM", "RIGSPM"],
+            "region": ["Permian", "Permian"],
+            "name": ["Crude oil production", "Rig count"],
+            "uom": ["mbd", "rigs"],
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+def test_releases_are_newest_first_and_months_limited_to_the_series_data():
+    evolutions = dpr.build(_pivot(), _meta())
+
+    assert "UNMAPPED" not in evolutions
+    assert evolutions.labels() == ["2026-02", "2026-01"]
+    assert evolutions.meta("RIGSPM") == ("Rig count", "Permian", "rigs")
+
+    periods, values = evolutions.evolutions("RIGSPM")
+    assert periods.astype("datetime64[M]").astype(str).tolist() == ["2024-02", "2024-03", "2024-04"]
+    np.testing.assert_array_equal(values, [[302.0, 303.46, 304.0], [300.0, 301.0, np.nan]])
+
+
+def test_evolution_queries_are_views():
+    evolutions = dpr.build(_pivot(), _meta())
+
+    periods, values = evolutions.evolutions("RIGSPM", 1, start="2024-03")
+
+    assert np.shares_memory(values, evolutions.values)
+    assert np.shares_memory(periods, evolutions.periods)
+    np.testing.assert_array_equal(values, [[303.46, 304.0]])
+
+
+def test_the_stored_array_matches_the_pivot():
+    evolutions = dpr.build(pd.read_feather(_PIVOT), pd.read_csv(_META))
+    pivot = pd.read_feather(_PIVOT).set_index(["id", "release_date"]).drop(columns=["name", "uom"])
+
+    periods, values = evolutions.evolutions("COPRPM", 2)
+    for release, row in zip(evolutions.releases[:2], values):
+        expected = pivot.loc[("COPRPM", pd.Timestamp(release))]
+        expected.index = pd.to_datetime(expected.index)
+        np.testing.assert_allclose(row, expected.reindex(periods).round(2).to_numpy())
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+def test_load_rebuilds_when_the_pivot_changes(tmp_path):
+    pivot, meta, path = tmp_path / "dpr.feather", tmp_path / "dpr.csv", tmp_path / "dpr.npz"
+    _pivot().to_feather(pivot)
+    _meta().to_csv(meta, index=False)
+
+    first = dpr.load(pivot, meta, path)
+    assert path.exists()
+    assert dpr.load(pivot, meta, path).digest == first.digest
+
+    changed = _pivot()
+    changed.loc[2, "2024-01-01"] = 9.9
+    changed.to_feather(pivot)
+    _, values = dpr.load(pivot, meta, path).evolutions("COPRPM")
+    assert values[0, 0] == 9.9
+
+
+def test_a_saved_array_reads_back_identically(tmp_path):
+    shutil.copy(_PIVOT, tmp_path / "dpr.feather")
+    saved = dpr.materialize(tmp_path / "dpr.feather", _META, tmp_path / "dpr.npz")
+
+    read = dpr.DPREvolutions.read(tmp_path / "dpr.npz")
+
+    for key in ["values", "ids", "names", "regions", "uoms", "releases", "periods", "bounds"]:
+        np.testing.assert_array_equal(getattr(read, key), getattr(saved, key))
+    with pytest.raises(KeyError, match="Not a DPR series"):
+        read.position("WCESTUS1")
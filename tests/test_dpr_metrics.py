@@ -0,0 +1,124 @@
+"""Per-region DPR metrics of a release (`dash_eia.transforms.dpr_metrics`).
+
+The efficiency, DUC, productivity and radar pages each pivoted the long DPR
+frame for a release and then walked the (month, region) rows one by one,
+each with its own guard against missing or zero denominators. They now read
+one cached frame per release, derived with column arithmetic, in which every
+ratio is 0 where its denominator is missing or not positive.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dash_eia.apps.compat import working_directory
+from dash_eia.transforms import dpr_metrics
+from src.utils import datasets
+from src.utils.data_loader import loader
+
+_REPO = Path(__file__).resolve().parents[1]
+
+_RELEASE = pd.Timestamp("2025-01-01")
+
+
+def _long():
+    """A melted DPR frame: Permian with and without rigs, Bakken one month, an older release."""
+    values = {
+        ("COPRPM", "2024-11-01"): 6.0,
+        ("RIGSPM", "2024-11-01"): 300.0,
+        ("NWDPM", "2024-11-01"): 500.0,
+        ("NWCPM", "2024-11-01"): 400.0,
+        ("DUCSPM", "2024-11-01"): 1000.0,
+        ("CONWPM", "2024-11-01"): 80.0,
+        ("COPRPM", "2024-12-01"): 6.5,
+        ("NWDPM", "2024-12-01"): 0.0,
+        ("COPRBK", "2024-12-01"): 1.2,
+        ("RIGSBK", "2024-12-01"): 30.0,
+        ("NWDBK", "2024-12-01"): 60.0,
+        ("NWCBK", "2024-12-01"): 90.0,
+        ("DUCSBK", "2024-12-01"): None,
+    }
+    rows = [
+        (series_id, _RELEASE, month, value) for (series_id, month), value in values.items()
+    ]
+    rows.append(("COPRPM", pd.Timestamp("2024-12-01"), "2024-11-01", 5.0))
+    rows.append(("WTIPUUS", _RELEASE, "2024-10-01", 70.0))
+    df = pd.DataFrame(rows, columns=["id", "release_date", "delivery_month", "value"])
+    return df.assign(delivery_month=pd.to_datetime(df["delivery_month"]))
+
+
+# ---------------------------------------------------------------------------
+# Panel
+# ---------------------------------------------------------------------------
+def test_one_row_per_region_month_with_a_value_sorted_by_month_then_region():
+    panel = dpr_metrics.region_panel(_long(), _RELEASE)
+
+    assert panel.columns.tolist() == ["month", "region", *dpr_metrics.SERIES]
+    assert list(zip(panel["month"].dt.strftime("%Y-%m"), panel["region"])) == [
+        ("2024-11", "Permian"),
+        ("2024-12", "Bakken"),
+        ("2024-12", "Permian"),
+    ]
+    assert panel["production"].tolist() == [6.0, 1.2, 6.5]
+    assert panel["ducs"].isna().tolist() == [False, True, True]
+
+
+def test_a_release_without_dpr_series_is_an_empty_panel():
+    metrics = dpr_metrics.region_metrics(_long(), "2023-01-01")
+
+    assert metrics.empty
+    assert set(dpr_metrics.METRICS) <= set(metrics.columns)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+def test_ratios_are_zero_where_the_denominator_is_missing_or_not_positive():
+    metrics = dpr_metrics.region_metrics(_long(), _RELEASE).set_index(["month", "region"])
+
+    permian = metrics.loc[(pd.Timestamp("2024-11-01"), "Permian")]
+    assert permian["production_per_rig"] == 6.0 / 300
+    assert permian["completion_rate"] == 400 / 500
+    assert permian["duc_ratio"] == 1000 / 500
+    assert permian["months_supply"] == 1000 / 400
+    assert permian["oil_per_well"] == 80 / 400
+    assert permian["duc_change"] == 100
+
+    no_rigs = metrics.loc[(pd.Timestamp("2024-12-01"), "Permian")]
+    ratios = ["production_per_rig", "wells_per_rig", "completion_rate", "production_per_well"]
+    assert no_rigs[ratios].tolist() == [0.0] * 4
+
+    # A missing numerator stays missing
+    bakken = metrics.loc[(pd.Timestamp("2024-12-01"), "Bakken")]
+    assert np.isnan(bakken["duc_ratio"]) and bakken["completion_rate"] == 1.5
+
+
+def test_derive_matches_the_per_row_arithmetic_on_sums_over_regions():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, size=(50, len(dpr_metrics.SERIES)))
+    frame = pd.DataFrame(values, columns=list(dpr_metrics.SERIES))
+
+    derived = dpr_metrics.derive(frame)
+
+    for _, row in derived.iterrows():
+        expected = row["ducs"] / row["wells_completed"] if row["wells_completed"] > 0 else 0
+        assert row["months_supply"] == expected
+        expected = row["wells_drilled"] / row["rigs"] if row["rigs"] > 0 else 0
+        assert row["wells_per_rig"] == expected
+    assert "months_supply" not in frame.columns
+
+
+# ---------------------------------------------------------------------------
+# Dataset handle
+# ---------------------------------------------------------------------------
+def test_the_metrics_handle_is_built_once_per_release():
+    with working_directory(_REPO):
+        long = loader.load_dpr_long()
+        release = long["release_date"].max().strftime("%Y-%m-%d")
+        ref = datasets.handle("dpr_metrics", release=release)
+        metrics = datasets.resolve(ref)
+
+    assert datasets._cache[datasets._key("dpr_metrics", {"release": release}, ref["version"])] is not None
+    assert metrics["region"].isin(dpr_metrics.REGIONS).all()
+    pd.testing.assert_frame_equal(metrics, dpr_metrics.region_metrics(long, release))
@@ -0,0 +1,144 @@
+"""Partial updates on the DPR regional page (`pages/page3_1.py`).
+
+The page has 82 graphs behind one callback, which used to rebuild and send
+every figure on each year button or evolution counter click. Graphs are now
+drawn when they come on screen and later clicks send `Patch`es: a year
+button moves the axis ranges, the evolution counter adds or removes traces.
+A patched graph must end up as the figure a fresh draw would give.
+"""
+
+import base64
+import importlib
+import json
+from pathlib import Path
+
+import dash
+import numpy as np
+import pytest
+from dash import Patch
+from plotly.io.json import to_json_plotly
+
+from dash_eia.apps.compat import working_directory
+from src.steo import chart_dpr
+
+_REPO = Path(__file__).resolve().parents[1]
+_YEARS = chart_dpr.YEAR_BUTTONS
+
+
+@pytest.fixture(scope="module")
+def page():
+    with working_directory(_REPO):
+        module = importlib.import_module("pages.page3_1")
+        module.region_dct()
+    return module
+
+
+def _buttons(year):
+    return [y == year for y in _YEARS]
+
+
+def _unpack(value):
+    """Plotly's packed ``{"dtype", "bdata"}`` arrays as plain lists, NaN sent as null."""
+    if isinstance(value, dict) and "bdata" in value:
+        array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+        return [None if item != item else item for item in array.tolist()]
+    if isinstance(value, dict):
+        return {key: _unpack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_unpack(item) for item in value]
+    return value
+
+
+def _wire(value):
+    """``value`` as the browser receives it, with packed arrays unpacked."""
+    return _unpack(json.loads(to_json_plotly(value)))
+
+
+def _apply(figure, patch):
+    """Apply a Patch's operations to a figure dict, as dash-renderer does."""
+    for op in _wire(patch)["operations"]:
+        *path, last = op["location"]
+        target = figure
+        for key in path:
+            target = target.setdefault(key, {}) if isinstance(target, dict) else target[key]
+        if op["operation"] == "Assign":
+            target[last] = op["params"]["value"]
+        elif op["operation"] == "Append":
+            target.setdefault(last, []).append(op["params"]["value"])
+        elif op["operation"] == "Delete":
+            del target[last]
+        else:
+            raise AssertionError(f"unexpected patch operation {op['operation']}")
+    return figure
+
+
+# ---------------------------------------------------------------------------
+# Figures
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    ("drawn", "view"),
+    [((2020, 3), (2023, 3)), ((2020, 3), (2020, 5)), ((2023, 5), (2021, 1))],
+)
+def test_a_patched_figure_matches_a_fresh_draw(page, drawn, view):
+    dct = page.region_dct()
+    figure = _wire(chart_dpr.dpr_figure("COPRPM", dct, *drawn))
+
+    patched = _apply(figure, chart_dpr.patch_dpr("COPRPM", dct, list(drawn), *view))
+
+    assert patched == _wire(chart_dpr.dpr_figure("COPRPM", dct, *view))
+
+
+def test_the_axis_range_spans_the_filtered_chart(page):
+    dct = page.region_dct()
+    filtered = chart_dpr.chart_dpr("NWDBK", dct, *_buttons(2023), 3)
+
+    xaxis, _ = chart_dpr.dpr_view("NWDBK", dct, 2023, 3)
+
+    periods = [x for trace in filtered.data for x, y in zip(trace.x, trace.y) if y == y]
+    assert xaxis["range"] == [min(periods), max(periods)]
+
+
+# ---------------------------------------------------------------------------
+# Callback
+# ---------------------------------------------------------------------------
+def test_only_graphs_on_screen_are_drawn(page):
+    result = page.update_graphs(*_buttons(2020), 3, None, {})
+    figures, drawn = result[:-1], result[-1]
+
+    drawn_ids = [f"page3_1-graph-{i}" for i in range(1, 5)]
+    assert sorted(drawn) == sorted(drawn_ids)
+    assert all(figure is not dash.no_update for figure in figures[:4])
+    assert all(figure is dash.no_update for figure in figures[4:])
+
+
+def test_a_year_click_patches_visible_graphs_and_skips_the_rest(page):
+    viewport = ["page3_1-graph-1", "page3_1-graph-2", "page3_1-graph-40"]
+    *_, drawn = page.update_graphs(*_buttons(2020), 3, viewport, {})
+
+    *figures, drawn = page.update_graphs(*_buttons(2024), 3, viewport, drawn)
+
+    patched = [i for i, figure in enumerate(figures, 1) if isinstance(figure, Patch)]
+    assert patched == [1, 2, 40]
+    assert all(figure is dash.no_update for figure in figures if not isinstance(figure, Patch))
+    assert drawn["page3_1-graph-40"] == [2024, 3, page.region_dct().digest]
+
+
+def test_a_new_release_redraws_instead_of_patching(page):
+    viewport = ["page3_1-graph-1", "page3_1-graph-2"]
+    *_, drawn = page.update_graphs(*_buttons(2020), 3, viewport, {})
+    # Drawn from the evolutions of an earlier release
+    drawn = {graph_id: [*view[:2], "earlier"] for graph_id, view in drawn.items()}
+
+    *figures, drawn = page.update_graphs(*_buttons(2020), 3, viewport, drawn)
+
+    assert [type(figure).__name__ for figure in figures[:2]] == ["Figure", "Figure"]
+    assert not any(isinstance(figure, Patch) for figure in figures)
+    assert drawn["page3_1-graph-1"][2] == page.region_dct().digest
+
+
+def test_an_unchanged_view_sends_nothing(page):
+    *_, drawn = page.update_graphs(*_buttons(2020), 3, None, {})
+
+    result = page.update_graphs(*_buttons(2020), 3, None, drawn)
+
+    assert all(item is dash.no_update for item in result)
@@ -0,0 +1,191 @@
+"""EIA API v2 client (`eia_downloads.api`).
+
+`steo.meta.download_api` walked the API one page after another, with no
+retry and no connection reuse. Pages are now fetched concurrently after the
+first one reports the row count, retried when throttled, checkpointed so an
+interrupted run resumes, and decoded into Arrow. These tests run against a
+local stand-in for api.eia.gov, and offline from recorded responses; requests
+to anything else are still blocked by the network guard in conftest.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow as pa
+import pytest
+
+from eia_downloads import api as api_module
+from eia_downloads import config
+from eia_downloads.api import ApiError, Cassette, EIAClient
+from eia_downloads.steo import meta
+
+_ROWS = [
+    {
+        "period": f"2025-{month:02d}",
+        "seriesId": f"S{n}",
+        "seriesDescription": f"Series {n}",
+        "value": str(n * 10 + month),
+        "unit": "million barrels per day",
+    }
+    for n in range(7)
+    for month in (1, 2)
+]
+
+
+class _Api(BaseHTTPRequestHandler):
+    rows = []
+    requests = []
+    # offset -> HTTP statuses to answer with before serving the page
+    failures = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        offset, length = int(query["offset"]), int(query["length"])
+        with self.lock:
+            self.requests.append((url.path, query))
+            pending = self.failures.get(offset) or []
+            status = pending.pop(0) if pending else 200
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        body = json.dumps(
+            {"response": {"total": str(len(self.rows)), "data": self.rows[offset : offset + length]}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(local_http):
+    _Api.rows, _Api.requests, _Api.failures = list(_ROWS), [], {}
+    return _Api, local_http(_Api, "/v2/")
+
+
+def _client(url, **kwargs):
+    return EIAClient(api_key="test-key", base_url=url, backoff=0, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Pages
+# ---------------------------------------------------------------------------
+def test_pages_are_fetched_concurrently_and_kept_in_order(api):
+    handler, url = api
+
+    with _client(url, workers=3) as client:
+        table = client.fetch("steo/data", {"frequency": "monthly"}, length=3)
+
+    assert table.to_pylist() == _ROWS
+    assert sorted(int(query["offset"]) for _, query in handler.requests) == [0, 3, 6, 9, 12]
+    assert {path for path, _ in handler.requests} == {"/v2/steo/data/"}
+    assert all(query["api_key"] == "test-key" for _, query in handler.requests)
+
+
+def test_a_schema_fixes_the_decoded_columns(api):
+    _, url = api
+    schema = pa.schema([("seriesId", pa.string()), ("period", pa.string()), ("value", pa.string())])
+
+    with _client(url) as client:
+        table = client.fetch("steo/data", length=5, schema=schema)
+
+    assert table.schema == schema
+    assert table.column("value").to_pylist() == [row["value"] for row in _ROWS]
+
+
+def test_throttled_requests_are_retried_and_lasting_failures_raise(api):
+    handler, url = api
+    handler.failures = {3: [429, 503]}
+
+    with _client(url) as client:
+        assert client.fetch("steo/data", length=3).num_rows == len(_ROWS)
+
+    handler.failures = {0: [500] * 3}
+    with _client(url, retries=2) as client:
+        with pytest.raises(ApiError, match="failed 3 times: HTTP 500") as error:
+            client.fetch("steo/data", length=3)
+    assert "test-key" not in str(error.value)
+
+
+def test_an_interrupted_fetch_resumes_from_its_checkpoint(api, tmp_path):
+    handler, url = api
+    handler.failures = {6: [400]}
+
+    with _client(url) as client:
+        with pytest.raises(ApiError, match="HTTP 400"):
+            client.fetch("steo/data", length=3, checkpoint=tmp_path)
+        handler.requests.clear()
+        table = client.fetch("steo/data", length=3, checkpoint=tmp_path)
+
+    assert table.to_pylist() == _ROWS
+    # The first page, for its row count, and the pages not in when the first run stopped
+    fetched = sorted(int(query["offset"]) for _, query in handler.requests)
+    assert fetched.count(0) == 1 and 6 in fetched
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("change", ["rows", "age"])
+def test_pages_of_an_earlier_state_are_not_resumed(api, tmp_path, change):
+    handler, url = api
+    handler.failures = {12: [400]}
+    # One page at a time, so every page before the last is stored
+    with _client(url, workers=1) as client:
+        with pytest.raises(ApiError):
+            client.fetch("steo/data", length=3, checkpoint=tmp_path)
+        # A later release: revised values and, for "rows", a new series
+        handler.rows = [dict(row, value="0") for row in _ROWS]
+        if change == "rows":
+            handler.rows.append(dict(_ROWS[0], seriesId="S7"))
+        else:
+            (total,) = tmp_path.glob("*/total.json")
+            old = time.time() - api_module.CHECKPOINT_MAX_AGE - 60
+            os.utime(total, (old, old))
+        handler.requests.clear()
+        table = client.fetch("steo/data", length=3, checkpoint=tmp_path)
+
+    assert table.to_pylist() == handler.rows
+    assert sorted(int(query["offset"]) for _, query in handler.requests) == [0, 3, 6, 9, 12]
+
+
+# ---------------------------------------------------------------------------
+# Record and replay
+# ---------------------------------------------------------------------------
+def test_recorded_responses_replay_without_a_server_or_key(api, tmp_path, monkeypatch):
+    _, url = api
+    with _client(url, cassette=Cassette(tmp_path, mode="record")) as client:
+        recorded = client.fetch("steo/data", {"frequency": "monthly"}, length=4)
+    assert "test-key" not in "".join(path.read_text() for path in tmp_path.iterdir())
+
+    monkeypatch.delenv("EIA_API_KEY", raising=False)
+    with EIAClient(base_url="http://127.0.0.1:1/v2/", cassette=Cassette(tmp_path)) as client:
+        assert client.fetch("steo/data", {"frequency": "monthly"}, length=4).equals(recorded)
+        with pytest.raises(ApiError, match="No recorded response"):
+            client.fetch("steo/data", {"frequency": "weekly"}, length=4)
+
+
+def test_steo_metadata_downloads_from_a_replayed_cassette(api, tmp_path, monkeypatch):
+    _, url = api
+    cassette = tmp_path / "cassette"
+    with _client(url, cassette=Cassette(cassette, mode="record")) as client:
+        client.fetch(
+            "steo/data", {"frequency": "monthly", "data[0]": "value", "start": "2015-01"}
+        )
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path / "data")
+    monkeypatch.delenv("EIA_API_KEY", raising=False)
+
+    df = meta.create_csv(meta.download_api(Cassette(cassette)))
+
+    assert df["id"].unique().tolist() == [f"S{n}" for n in range(7)]
+    assert df["uom"].notna().all() and len(df) == len(_ROWS)
@@ -0,0 +1,138 @@
+"""Cached chart figures (`src.utils.figure_cache`, `src.wps.figures`).
+
+The WPS chart pages redrew every graph on each toggle click, and each of the
+24 graphs of a page took tens of milliseconds. Figures are now memoized by
+callback, normalized inputs and the version of the data they are drawn from,
+in memory and on disk, and warmed after each ingest.
+"""
+
+import json
+from pathlib import Path
+
+import plotly
+import plotly.graph_objects as go
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from src.utils import datasets, figure_cache
+from src.utils.data_loader import get_line_data_for_ids, get_seasonality_data_for_ids
+from src.wps import figures
+from src.wps.graph_line import chart_trend
+from src.wps.graph_seag import chart_seasonality
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(autouse=True)
+def _figure_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(figure_cache, "DIRECTORY", str(tmp_path / "figures"))
+    figure_cache.clear()
+    yield
+    figure_cache.clear()
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    path = tmp_path / "source.feather"
+    path.write_bytes(b"v1")
+    monkeypatch.setitem(datasets._builders, "test_source", (None, str(path)))
+    return path
+
+
+def _drawer(draws):
+    def render():
+        draws.append(1)
+        return go.Figure(go.Scatter(x=[1, 2], y=[3, len(draws)]))
+
+    return render
+
+
+def _json(figure):
+    return json.loads(json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def test_a_figure_is_drawn_once_per_inputs_and_data_version(source):
+    draws = []
+
+    first = figure_cache.figure("chart", ["test_source"], _drawer(draws), "WCESTUS1", True)
+    again = figure_cache.figure("chart", ["test_source"], _drawer(draws), "WCESTUS1", True)
+    figure_cache.figure("chart", ["test_source"], _drawer(draws), "WCESTUS1", False)
+
+    assert again is first and len(draws) == 2
+    assert first["data"][0]["y"] == [3, 1]
+    assert figure_cache.stats() == {"chart": {"hits": 1, "misses": 2, "entries": 2}}
+
+    source.write_bytes(b"version 2")
+    figure_cache.figure("chart", ["test_source"], _drawer(draws), "WCESTUS1", True)
+    assert len(draws) == 3
+
+
+def test_figures_are_shared_through_disk_and_pruned_by_version(source):
+    draws = []
+    figure_cache.figure("chart", ["test_source"], _drawer(draws), "a")
+
+    # Another worker
+    figure_cache.clear()
+    figure_cache.figure("chart", ["test_source"], _drawer(draws), "a")
+    assert len(draws) == 1 and figure_cache.stats()["chart"]["hits"] == 1
+
+    directory = Path(figure_cache.DIRECTORY) / "chart"
+    source.write_bytes(b"version 2")
+    figure_cache.figure("chart", ["test_source"], _drawer(draws), "a")
+    assert len(list(directory.iterdir())) == 2
+    figure_cache.prune("chart", ["test_source"])
+    assert [p.name for p in directory.iterdir()] == [figure_cache.version(["test_source"])]
+
+
+def test_without_its_source_a_figure_is_drawn_every_time(monkeypatch):
+    monkeypatch.setitem(datasets._builders, "test_source", (None, "/nonexistent.feather"))
+    draws = []
+    for _ in range(2):
+        figure_cache.figure("chart", ["test_source"], _drawer(draws), "a")
+    assert len(draws) == 2 and figure_cache.stats() == {}
+
+
+def test_a_decorated_callback_is_keyed_by_its_arguments(source):
+    draws = []
+
+    @figure_cache.cached("test_source")
+    def update_chart(btn_1m, pivot_json):
+        draws.append((btn_1m, pivot_json))
+        return go.Figure()
+
+    update_chart(True, {"dataset": "wps_pivot", "version": "1"})
+    update_chart(True, {"version": "1", "dataset": "wps_pivot"})
+    update_chart(False, {"dataset": "wps_pivot", "version": "1"})
+
+    assert len(draws) == 2
+    assert list(figure_cache.stats()) == [f"{__name__}.{update_chart.__qualname__}"]
+
+
+# ---------------------------------------------------------------------------
+# WPS charts
+# ---------------------------------------------------------------------------
+def test_cached_wps_charts_match_the_chart_functions():
+    with working_directory(_REPO):
+        rows = get_seasonality_data_for_ids(("WCESTUS1",))
+        expected = chart_seasonality(rows, "WCESTUS1", True, True, False, True, False, False)
+        drawn = figures.seasonality("WCESTUS1", 1, [1, 0, 1, 0, 0])
+        assert _json(drawn) == _json(expected)
+
+        rows = get_line_data_for_ids(("WCESTUS1",))
+        expected = chart_trend(rows, "WCESTUS1", False, True, False, False, False, True, True, False, True)
+        drawn = figures.trend("WCESTUS1", [0, 1, 0, 0, 0], True, [1, 0, 1])
+        assert _json(drawn) == _json(expected)
+
+
+def test_warming_draws_the_initial_charts_the_pages_ask_for():
+    with working_directory(_REPO):
+        figures.warm(["WCESTUS1", "WCRFPUS2"])
+        figures.seasonality("WCESTUS1", False, [False] * 5)
+        figures.trend("WCRFPUS2", [False, False, False, False, True], True, [False] * 3)
+
+    stats = figure_cache.stats()
+    assert stats[figures.SEASONALITY] == {"hits": 1, "misses": 2, "entries": 2}
+    assert stats[figures.TREND] == {"hits": 1, "misses": 2, "entries": 2}
@@ -176,11 +176,12 @@ def test_working_directory_puts_the_workspace_on_the_import_path(tmp_path):
 def test_src_references_stay_inside_the_compat_layer():
     """The wheel ships only `src/dash_eia`, so `src.index` is reachable via compat alone.
 
-    `apps/runner.py` holds the transitional app spec and imports it inside
+    `apps/runner.py` holds the transitional app spec and `pipelines/refresh.py`
+    the transitional refresh steps; both are imported inside
     `working_directory`. A `src.` reference anywhere else would resolve in a
     checkout and fail once installed.
     """
-    allowed = {"apps/runner.py"}
+    allowed = {"apps/runner.py", "pipelines/refresh.py"}
     package = Path(__file__).resolve().parents[1] / "src" / "dash_eia"
     reference = re.compile(r"""(?:from|import)\s+src\.|["']src\.[A-Za-z_]""")
     offenders = {
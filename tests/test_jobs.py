@@ -0,0 +1,145 @@
+"""Background jobs (`dash_eia.jobs`).
+
+The WPS ingest on the headline page and the ARIMA fit on the CLI forecasting
+page used to run inside their callbacks, holding a server worker for the
+whole download or fit. They now run in a process pool, and the pages poll a
+job table under the workspace state directory for progress and the result.
+
+Most tests run jobs in a thread pool, which exercises the same table and
+worker code with callables that need not pickle; one runs a real process.
+"""
+
+import math
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dash_eia import jobs
+from dash_eia.jobs import JobCancelled, JobError, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs", executor=ThreadPoolExecutor(1))
+    yield queue
+    queue.shutdown()
+
+
+def _blocked(release, started=None):
+    """A job that reports progress, then waits for ``release``."""
+
+    def run():
+        jobs.report_progress(0.5, "Halfway")
+        if started is not None:
+            started.set()
+        release.wait(5)
+        jobs.report_progress(0.9, "Nearly done")
+        return "fitted"
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Submission, progress and results
+# ---------------------------------------------------------------------------
+def test_progress_is_polled_and_the_result_retrieved(queue):
+    release, started = threading.Event(), threading.Event()
+    job_id = queue.submit(_blocked(release, started))
+
+    started.wait(5)
+    job = queue.status(job_id)
+    assert (job.status, job.progress, job.message) == (jobs.RUNNING, 0.5, "Halfway")
+    with pytest.raises(JobError):
+        queue.result(job_id)
+
+    release.set()
+    assert queue.wait(job_id, timeout=5).status == jobs.DONE
+    assert queue.result(job_id) == "fitted"
+
+
+def test_an_active_job_is_shared_by_key(queue):
+    release = threading.Event()
+    first = queue.submit(_blocked(release), key="wps_ingest")
+
+    assert queue.submit(_blocked(release), key="wps_ingest") == first
+    release.set()
+    queue.wait(first, timeout=5)
+    assert queue.submit(_blocked(release), key="wps_ingest") != first
+
+
+def test_a_failure_is_recorded_with_its_traceback(queue):
+    job_id = queue.submit(lambda: 1 / 0)
+
+    job = queue.wait(job_id, timeout=5)
+    assert job.status == jobs.FAILED
+    assert "ZeroDivisionError" in job.error
+    with pytest.raises(JobError, match="ZeroDivisionError"):
+        queue.result(job_id)
+
+
+def test_the_table_is_shared_between_queues(queue):
+    job_id = queue.submit(lambda: [1, 2, 3])
+    queue.wait(job_id, timeout=5)
+
+    # Another server worker opens the same directory
+    other = JobQueue(queue.directory)
+    assert other.status(job_id).status == jobs.DONE
+    assert other.result(job_id) == [1, 2, 3]
+
+
+def test_jobs_run_in_worker_processes(tmp_path):
+    queue = JobQueue(tmp_path / "jobs", max_workers=1)
+    try:
+        job_id = queue.submit(math.factorial, 20)
+        assert queue.wait(job_id, timeout=60).status == jobs.DONE
+    finally:
+        queue.shutdown()
+    assert queue.result(job_id) == math.factorial(20)
+
+
+# ---------------------------------------------------------------------------
+# Cancellation
+# ---------------------------------------------------------------------------
+def test_a_queued_job_is_cancelled_before_it_starts(queue):
+    release = threading.Event()
+    running = queue.submit(_blocked(release))
+    queued = queue.submit(lambda: "never")
+
+    assert queue.cancel(queued)
+    release.set()
+    queue.wait(running, timeout=5)
+    assert queue.wait(queued, timeout=5).status == jobs.CANCELLED
+    with pytest.raises(JobCancelled):
+        queue.result(queued)
+
+
+def test_a_running_job_stops_at_its_next_progress_report(queue):
+    release, started = threading.Event(), threading.Event()
+    job_id = queue.submit(_blocked(release, started))
+
+    started.wait(5)
+    assert queue.cancel(job_id)
+    release.set()
+    job = queue.wait(job_id, timeout=5)
+    assert (job.status, job.progress) == (jobs.CANCELLED, 0.5)
+    assert not queue.cancel(job_id)
+
+
+def test_jobs_of_a_stopped_server_are_failed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs", executor=ThreadPoolExecutor(1))
+    release = threading.Event()
+    job_id = queue.submit(_blocked(release))
+    # Its owner is a process that has since exited
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    with jobs._transaction(queue.database) as connection:
+        connection.execute("UPDATE jobs SET owner = ? WHERE id = ?", (dead.pid, job_id))
+
+    job = JobQueue(queue.directory).status(job_id)
+    release.set()
+    queue.shutdown()
+    assert job.status == jobs.FAILED
+    assert "interrupted" in job.error
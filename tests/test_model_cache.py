@@ -0,0 +1,128 @@
+"""Memoized model fits (`src.utils.model_cache`, `src.wps.models`).
+
+The analytics page used to fit STL twice per series change and Holt-Winters
+plus a seasonal SARIMAX (about ten seconds) on every slider move. Fits are now
+cached by (series, data version, model spec, holdout), so moving the horizon
+slider, or revisiting a series, does not fit anything.
+"""
+
+import importlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from src.utils.model_cache import ModelCache
+from src.wps import models
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def _failing():
+    raise AssertionError("fit should have come from the cache")
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def test_a_result_is_fitted_once():
+    cache = ModelCache()
+    fits = []
+    key = cache.key("WCESTUS1", "v1", "spec", 26)
+
+    assert cache.get_or_fit(key, lambda: fits.append(1) or "fitted") == "fitted"
+    assert cache.get_or_fit(key, _failing) == "fitted"
+    assert (len(fits), cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ModelCache(max_entries=2)
+    keys = [cache.key(s, "v1", "spec") for s in ["a", "b", "c"]]
+    for key in keys:
+        cache.get_or_fit(key, lambda: "fitted")
+
+    cache.get_or_fit(keys[2], _failing)
+    with pytest.raises(AssertionError):
+        cache.get_or_fit(keys[0], _failing)
+
+
+def test_a_failed_fit_is_not_cached():
+    cache = ModelCache()
+    key = cache.key("a", "v1", "spec")
+
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_fit(key, lambda: 1 / 0)
+    assert cache.get_or_fit(key, lambda: "fitted") == "fitted"
+
+
+def test_results_persist_on_disk_per_data_version(tmp_path):
+    key = ModelCache.key("a", "v1", "spec", 26)
+    ModelCache(directory=tmp_path).get_or_fit(key, lambda: np.arange(3.0))
+
+    # Another process (here: another instance) reads the fit from disk
+    assert ModelCache(directory=tmp_path).get_or_fit(key, _failing).tolist() == [0.0, 1.0, 2.0]
+
+    ModelCache(directory=tmp_path).prune("v2")
+    assert not (tmp_path / "v1").exists()
+
+
+# ---------------------------------------------------------------------------
+# Analytics page
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def seeded(monkeypatch):
+    """A memory-only model cache holding forecasts for WCESTUS1 with a 26-week holdout."""
+    cache = ModelCache()
+    monkeypatch.setattr(models, "cache", cache)
+    with working_directory(_REPO):
+        version = models._version()
+        holdout = 26
+        cache.get_or_fit(cache.key("WCESTUS1", version, models.HOLT_WINTERS_SPEC, holdout),
+                         lambda: np.full(holdout, 400_000.0))
+        cache.get_or_fit(cache.key("WCESTUS1", version, models.SARIMAX_SPEC, holdout),
+                         lambda: {"label": "SARIMAX(1,1,1)(1,1,0,52)", "mean": np.arange(holdout) + 4e5,
+                                  "lower": np.zeros(holdout), "upper": np.ones(holdout)})
+        yield cache
+
+
+@pytest.mark.parametrize("horizon", [4, 12, 26])
+def test_moving_the_horizon_slider_fits_nothing(seeded, horizon):
+    with working_directory(_REPO):
+        page = importlib.import_module("pages.page2_8")
+        fig, _ = page.update_forecast("WCESTUS1", horizon, 26)
+
+    assert seeded.misses == 2  # the two seeded fits
+    sarimax = next(trace for trace in fig.data if trace.name == "SARIMAX")
+    assert list(sarimax.y) == list(np.arange(horizon) + 4e5)
+
+
+def test_every_holdout_the_slider_offers_is_precomputed(monkeypatch):
+    fitted = []
+    monkeypatch.setattr(models, "cache", ModelCache())
+    monkeypatch.setattr(models, "_version", lambda: "v1")
+    monkeypatch.setattr(models, "series", lambda series_id: (np.arange(300), np.ones(300)))
+    monkeypatch.setattr(models, "stl", lambda series_id: None)
+    monkeypatch.setattr(models, "holt_winters", lambda series_id, h: fitted.append(("hw", h)))
+    monkeypatch.setattr(models, "sarimax", lambda series_id, h: fitted.append(("sarimax", h)))
+
+    models.precompute(["WCESTUS1"])
+
+    assert sorted(h for kind, h in fitted if kind == "sarimax") == list(models.HOLDOUTS)
+    with working_directory(_REPO):
+        page = importlib.import_module("pages.page2_8")
+    layout = page.layout() if callable(page.layout) else page.layout
+    slider = _find(layout, "p15-fc-holdout")
+    assert slider.step is None and sorted(slider.marks) == list(models.HOLDOUTS)
+
+
+def _find(component, component_id):
+    if getattr(component, "id", None) == component_id:
+        return component
+    children = getattr(component, "children", None)
+    for child in children if isinstance(children, (list, tuple)) else [children]:
+        if child is not None and not isinstance(child, str):
+            found = _find(child, component_id)
+            if found is not None:
+                return found
+    return None
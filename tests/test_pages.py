@@ -131,26 +131,28 @@ def test_page_imports_and_builds_its_layout(name):
 
 
 def test_headline_tables_render_from_store_records():
-    """`page2_1` builds its 39 tables from `dcc.Store` records, not from a frame.
-
-    The distinction is load-bearing. `generate_main_table` transposes and calls
-    `reset_index()`, and the name of the resulting column depends on whether the
-    columns Index carried a name: a feather-loaded frame yields `id` and the
-    rename to `name` silently does nothing, while the records round-trip the
-    Store performs yields `index`, which renames correctly. Feeding this
-    function a frame straight off disk raises KeyError('name'), so the test has
-    to go through the same records path the callback does.
+    """`page2_1` builds its 39 tables from a `dcc.Store` value, handle or records.
+
+    The store now holds a dataset handle, but a session opened before that
+    change still holds records, so both must render. The records path used to
+    be the only one that worked: `generate_main_table` transposes and calls
+    `reset_index()`, and the name of the resulting column depended on whether
+    the columns Index carried a name -- `id` for a feather-loaded frame, which
+    raised KeyError('name'), and `index` after the records round-trip. The
+    axis is now named explicitly, and this test covers both store values.
     """
     import pandas as pd
 
     module = _import_page("page2_1")
     with working_directory(_REPO):
         raw = pd.read_feather("./data/wps/wps_gte_2015_pivot.feather")
-        result = module.update_tables(raw.to_dict("records"))
+        from_records = module.update_tables(raw.to_dict("records"))
+        from_handle = module.update_tables(module.initial_data)
 
-    assert hasattr(result, "to_plotly_json")
-    payload = str(result.to_plotly_json())
-    assert "US Commercial Stocks (kb)" in payload
+    for result in (from_records, from_handle):
+        assert hasattr(result, "to_plotly_json")
+        payload = str(result.to_plotly_json())
+        assert "US Commercial Stocks (kb)" in payload
 
 
 @pytest.mark.parametrize(
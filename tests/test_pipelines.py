@@ -0,0 +1,235 @@
+"""Refresh pipelines (`dash_eia.pipelines.dag`).
+
+The refresh chain was a set of hardwired calls that recomputed every file on
+every run, one source after another. Steps are now nodes declaring the files
+they read and write: a node is skipped while its code version and inputs are
+those of its last run, and sources sharing no files run in parallel
+processes. These tests run small pipelines whose steps live in a module of a
+temporary workspace, the way the refresh steps live in the real one.
+"""
+
+import os
+import sys
+
+import pytest
+
+from dash_eia.cli import main
+from dash_eia.config.paths import WorkspacePaths
+from dash_eia.pipelines.dag import (
+    BLOCKED,
+    FAILED,
+    MAY_RUN,
+    RAN,
+    SKIPPED,
+    WOULD_RUN,
+    Node,
+    Pipeline,
+    PipelineError,
+)
+
+_STEPS = '''
+import os
+from pathlib import Path
+
+
+def _log(name):
+    with open("calls.txt", "a") as file:
+        file.write(name + "\\n")
+
+
+def fetch():
+    _log("fetch")
+    Path("raw.txt").write_text(Path("remote.txt").read_text())
+
+
+def parse():
+    _log("parse")
+    Path("parsed.txt").write_text(Path("raw.txt").read_text().upper())
+
+
+def chart(scale=2):
+    _log("chart")
+    Path("chart.txt").write_text(Path("parsed.txt").read_text() * scale)
+
+
+def other():
+    _log("other")
+    Path("other.txt").write_text(str(os.getpid()))
+
+
+def broken():
+    _log("broken")
+    raise RuntimeError("no data")
+'''
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "dash-eia"\nversion = "0.0.0"\n', encoding="utf-8"
+    )
+    (tmp_path / "pipeline_steps.py").write_text(_STEPS, encoding="utf-8")
+    (tmp_path / "remote.txt").write_text("week 1", encoding="utf-8")
+    yield WorkspacePaths(tmp_path)
+    sys.modules.pop("pipeline_steps", None)
+
+
+def _pipeline(*extra, version="1"):
+    return Pipeline(
+        "test",
+        [
+            Node("a.chart", "pipeline_steps:chart", inputs=("parsed.txt",), outputs=("chart.txt",)),
+            Node("a.fetch", "pipeline_steps:fetch", outputs=("raw.txt",), remote=True),
+            Node(
+                "a.parse",
+                "pipeline_steps:parse",
+                inputs=("./raw.txt",),
+                outputs=("parsed.txt",),
+                version=version,
+            ),
+            Node("b.other", "pipeline_steps:other", outputs=("other.txt",)),
+            *extra,
+        ],
+    )
+
+
+def _calls(paths):
+    calls = paths.root / "calls.txt"
+    names = calls.read_text().split() if calls.exists() else []
+    calls.unlink(missing_ok=True)
+    return names
+
+
+def _statuses(results):
+    return {result.name: result.status for result in results}
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+def test_nodes_run_after_the_nodes_whose_outputs_they_read(workspace):
+    pipeline = _pipeline()
+
+    assert [node.name for node in pipeline.order] == ["a.fetch", "a.parse", "a.chart", "b.other"]
+    assert [[n.name for n in group] for group in pipeline.branches(pipeline.order)] == [
+        ["a.fetch", "a.parse", "a.chart"],
+        ["b.other"],
+    ]
+    assert [node.name for node in pipeline.select(["a.parse", "b"])] == ["a.parse", "b.other"]
+    with pytest.raises(PipelineError, match="Unknown node or branch c"):
+        pipeline.select(["c"])
+
+
+def test_cycles_and_shared_outputs_are_rejected():
+    with pytest.raises(PipelineError, match="Cycle"):
+        Pipeline(
+            "test",
+            [
+                Node("a.one", "m:f", inputs=("two.txt",), outputs=("one.txt",)),
+                Node("a.two", "m:f", inputs=("one.txt",), outputs=("two.txt",)),
+            ],
+        )
+    with pytest.raises(PipelineError, match="both write data/wps"):
+        Pipeline(
+            "test",
+            [
+                Node("a.one", "m:f", outputs=("data/wps",)),
+                Node("a.two", "m:f", outputs=("data/wps/pivot.feather",)),
+            ],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Skipping
+# ---------------------------------------------------------------------------
+def test_unchanged_nodes_are_skipped(workspace):
+    pipeline = _pipeline()
+
+    assert set(_statuses(pipeline.run(workspace, workers=1)).values()) == {RAN}
+    assert _calls(workspace) == ["fetch", "parse", "chart", "other"]
+
+    # The download fetched the same bytes, so nothing after it runs again
+    statuses = _statuses(pipeline.run(workspace, workers=1))
+    assert statuses == {"a.fetch": RAN, "a.parse": SKIPPED, "a.chart": SKIPPED, "b.other": SKIPPED}
+    assert _calls(workspace) == ["fetch"]
+
+    (workspace.root / "remote.txt").write_text("week 2")
+    pipeline.run(workspace, workers=1)
+    assert _calls(workspace) == ["fetch", "parse", "chart"]
+    assert (workspace.root / "chart.txt").read_text() == "WEEK 2WEEK 2"
+
+
+def test_new_code_versions_arguments_and_edited_outputs_rerun_a_node(workspace):
+    _pipeline().run(workspace, workers=1)
+    _calls(workspace)
+
+    _pipeline(version="2").run(workspace, ["a.parse"], workers=1)
+    assert _calls(workspace) == ["parse"]
+
+    (workspace.root / "chart.txt").write_text("edited")
+    _pipeline().run(workspace, ["a.chart"], workers=1)
+    assert _calls(workspace) == ["chart"]
+
+    rescaled = Node(
+        "a.chart",
+        "pipeline_steps:chart",
+        inputs=("parsed.txt",),
+        outputs=("chart.txt",),
+        kwargs={"scale": 3},
+    )
+    Pipeline("test", [rescaled]).run(workspace, workers=1)
+    assert _calls(workspace) == ["chart"]
+    assert (workspace.root / "chart.txt").read_text() == "WEEK 1" * 3
+
+
+def test_a_failed_node_blocks_the_nodes_after_it_and_runs_again(workspace):
+    broken = Node("a.check", "pipeline_steps:broken", inputs=("parsed.txt",), outputs=("ok.txt",))
+    after = Node("a.report", "pipeline_steps:other", inputs=("ok.txt",), outputs=("report.txt",))
+
+    statuses = _statuses(_pipeline(broken, after).run(workspace, workers=1))
+    assert statuses["a.check"] == FAILED and statuses["a.report"] == BLOCKED
+    assert statuses["a.chart"] == RAN and statuses["b.other"] == RAN
+
+    _calls(workspace)
+    _pipeline(broken, after).run(workspace, workers=1)
+    assert "broken" in _calls(workspace)
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+def test_a_dry_run_calls_nothing(workspace):
+    pipeline = _pipeline()
+    assert set(_statuses(pipeline.run(workspace, dry_run=True)).values()) == {WOULD_RUN}
+    assert _calls(workspace) == []
+    assert not pipeline.state_path(workspace).exists()
+
+    pipeline.run(workspace, workers=1)
+    _calls(workspace)
+    statuses = _statuses(pipeline.run(workspace, dry_run=True))
+    assert statuses == {
+        "a.fetch": WOULD_RUN,
+        "a.parse": MAY_RUN,
+        "a.chart": MAY_RUN,
+        "b.other": SKIPPED,
+    }
+    assert _calls(workspace) == []
+
+
+def test_branches_run_in_separate_processes(workspace, capfd):
+    results = _pipeline().run(workspace, workers=2)
+
+    assert set(_statuses(results).values()) == {RAN}
+    assert int((workspace.root / "other.txt").read_text()) != os.getpid()
+    out = capfd.readouterr().out
+    assert "a.parse" in out and "test: 4 ran" in out
+
+
+def test_refresh_command_plans_the_refresh_of_a_workspace(workspace, capsys):
+    assert main(["--workspace", str(workspace.root), "refresh", "--only", "wps", "--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "wps.ingest" in out and "steo.download" not in out
+    assert not (workspace.root / "data").exists()
+
+    with pytest.raises(SystemExit, match="Unknown node or branch eia"):
+        main(["--workspace", str(workspace.root), "refresh", "--only", "eia"])
@@ -0,0 +1,195 @@
+"""Published data snapshots (`dash_eia.pipelines.publish`).
+
+The WPS and STEO refreshes rewrote the files under data/ in place while the
+dashboard read them, one file after another. They now publish each complete
+group of files as an immutable snapshot and switch a single pointer to it;
+the pages read through that pointer. These tests check what a reader sees
+while working files change, and that snapshots can be rolled back.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from dash_eia.cli import main
+from dash_eia.pipelines.publish import Publisher, PublishError, describe
+from dash_eia.transforms import wps_stats
+from src.utils import datasets, snapshots
+from src.utils.simple_loader import SimpleDataLoader
+from src.utils.variables import years_last_five_years_range
+
+_ARTIFACTS = {
+    "wps": ("wps/pivot.feather", "wps/stats.npz"),
+    "steo": ("steo/pivot.feather",),
+}
+
+
+def _write(data, relative, values):
+    path = data / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".npz":
+        np.savez(path, values=np.array(values))
+    else:
+        pd.DataFrame({"value": values}).to_feather(path)
+    return path
+
+
+@pytest.fixture
+def data(tmp_path):
+    data = tmp_path / "data"
+    _write(data, "wps/pivot.feather", [1.0, 2.0])
+    _write(data, "wps/stats.npz", [0.5])
+    _write(data, "steo/pivot.feather", [10.0])
+    return data
+
+
+def _read(path):
+    return pd.read_feather(path)["value"].tolist()
+
+
+# ---------------------------------------------------------------------------
+# Publishing
+# ---------------------------------------------------------------------------
+def test_a_snapshot_holds_a_manifest_and_becomes_current(data):
+    publisher = Publisher(data, _ARTIFACTS)
+    assert publisher.path(data / "wps/pivot.feather") == data / "wps/pivot.feather"
+
+    snapshot = publisher.publish()
+
+    assert publisher.current() == snapshot
+    assert (data / "snapshots/CURRENT").read_text() == snapshot.id
+    files = snapshot.manifest["files"]
+    assert set(files) == {"wps/pivot.feather", "wps/stats.npz", "steo/pivot.feather"}
+    assert files["wps/pivot.feather"]["rows"] == 2
+    assert files["wps/pivot.feather"]["schema"] == {"value": "double"}
+    assert files["wps/stats.npz"]["schema"] == {"values": ["float64", [1]]}
+    assert publisher.path(data / "wps/pivot.feather") == snapshot.path / "wps/pivot.feather"
+    # Paths outside the data directory are not redirected
+    assert publisher.path(data.parent / "lookup.csv") == data.parent / "lookup.csv"
+
+
+def test_readers_keep_the_published_files_while_the_working_ones_change(data):
+    publisher = Publisher(data, _ARTIFACTS)
+    first = publisher.publish()
+    reading = publisher.path(data / "wps/pivot.feather")
+
+    # A refresh half way through: the pivot is rewritten, the stats are not yet
+    _write(data, "wps/pivot.feather", [1.0, 2.0, 3.0])
+    assert _read(publisher.path(data / "wps/pivot.feather")) == [1.0, 2.0]
+
+    _write(data, "wps/stats.npz", [0.7])
+    second = publisher.publish(["wps"])
+
+    assert second.id > first.id
+    assert _read(publisher.path(data / "wps/pivot.feather")) == [1.0, 2.0, 3.0]
+    assert _read(reading) == [1.0, 2.0]
+    # Unchanged files are shared with the previous snapshot
+    steo = [s.path / "steo/pivot.feather" for s in (first, second)]
+    assert os.stat(steo[0]).st_ino == os.stat(steo[1]).st_ino
+
+
+def test_a_group_carries_the_other_groups_over_from_the_current_snapshot(data):
+    publisher = Publisher(data, _ARTIFACTS)
+    publisher.publish()
+
+    _write(data, "steo/pivot.feather", [99.0])  # a STEO refresh still running
+    _write(data, "wps/pivot.feather", [4.0])
+    snapshot = publisher.publish(["wps"])
+
+    assert snapshot.manifest["groups"] == ["wps"]
+    assert _read(snapshot.path / "steo/pivot.feather") == [10.0]
+    assert _read(snapshot.path / "wps/pivot.feather") == [4.0]
+
+
+def test_publishing_unchanged_files_keeps_the_current_snapshot(data):
+    publisher = Publisher(data, _ARTIFACTS)
+    snapshot = publisher.publish()
+
+    assert publisher.publish() == snapshot
+    assert publisher.snapshots() == [snapshot]
+    with pytest.raises(PublishError, match="Unknown artifact group: cli"):
+        publisher.publish(["cli"])
+
+
+# ---------------------------------------------------------------------------
+# Rollback and retention
+# ---------------------------------------------------------------------------
+def test_rollback_and_retention(data):
+    publisher = Publisher(data, _ARTIFACTS, keep=3)
+    published = []
+    for week in range(5):
+        _write(data, "wps/pivot.feather", [float(week)])
+        published.append(publisher.publish(["wps"]))
+
+    assert [s.id for s in publisher.snapshots()] == [s.id for s in published[-3:]]
+
+    assert publisher.rollback() == published[-2]
+    assert _read(publisher.path(data / "wps/pivot.feather")) == [3.0]
+    assert publisher.rollback(published[-3].id) == published[-3]
+    assert _read(publisher.path(data / "wps/pivot.feather")) == [2.0]
+    with pytest.raises(PublishError, match="No earlier snapshot"):
+        publisher.rollback()
+
+    # The next refresh publishes on top of the snapshot rolled back to
+    _write(data, "wps/pivot.feather", [5.0])
+    assert publisher.publish(["wps"]).manifest["previous"] == published[-3].id
+
+
+def test_snapshots_command_publishes_lists_and_rolls_back(tmp_path, capsys):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "dash-eia"\nversion = "0.0.0"\n')
+    data = tmp_path / "data"
+    _write(data, "steo/steo_pivot.feather", [1.0])
+    workspace = ["--workspace", str(tmp_path), "snapshots"]
+
+    assert main([*workspace, "--publish", "--group", "steo"]) == 0
+    _write(data, "steo/steo_pivot.feather", [2.0])
+    assert main([*workspace, "--publish"]) == 0
+    assert main([*workspace, "--rollback"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()[-2:]
+    assert lines[0].startswith("* ") and lines[1].startswith("  ")
+    current = (data / "snapshots/CURRENT").read_text()
+    assert json.loads((data / "snapshots" / current / "manifest.json").read_text())["files"]
+    with pytest.raises(SystemExit, match="Unknown snapshot"):
+        main([*workspace, "--rollback", "20000101T000000000000Z"])
+
+
+# ---------------------------------------------------------------------------
+# Pages
+# ---------------------------------------------------------------------------
+def test_the_loader_reads_the_published_steo_pivot(tmp_path):
+    data = tmp_path / "data"
+    _write(data, "steo/steo_pivot.feather", [1.0])
+
+    with working_directory(tmp_path):
+        snapshots.publish("steo")
+        _write(data, "steo/steo_pivot.feather", [2.0])
+
+        assert SimpleDataLoader().load_steo_pivot_data()["value"].tolist() == [1.0]
+        snapshots.publish("steo")
+        assert SimpleDataLoader().load_steo_pivot_data()["value"].tolist() == [2.0]
+
+
+def test_a_stale_published_statistics_file_is_rebuilt_in_memory(tmp_path):
+    data = tmp_path / "data"
+    periods = pd.date_range("2018-01-05", "2025-12-26", freq="W-FRI")
+    pivot = data / "wps/wps_gte_2015_pivot.feather"
+    pivot.parent.mkdir(parents=True)
+    pd.DataFrame({"period": periods, "STOCKS": np.arange(len(periods), dtype=float)}).to_feather(pivot)
+    # Written for other band years than the pages use
+    wps_stats.materialize(pivot, data / "wps/wps_stats.npz", [2019])
+
+    with working_directory(tmp_path):
+        snapshot = snapshots.publish("wps")
+        published = snapshots.path(snapshots.DATA_DIR + "/wps/wps_stats.npz")
+        stats = datasets._wps_stats()
+
+        assert snapshots.is_published(published)
+        assert not snapshots.is_published(data / "wps/wps_stats.npz")
+        assert describe(Path(published)) == snapshot.manifest["files"]["wps/wps_stats.npz"]
+    assert stats.years.tolist() == list(years_last_five_years_range)
@@ -0,0 +1,174 @@
+"""In-memory datasets reloaded on a new data version (`src.utils.registry`).
+
+Pages loaded their frames at import and held them for the life of the
+process, so a refresh only showed after a restart and its cold start. They
+now hold registry datasets, which a throttled poll of the source files
+reloads one by one; caches built from a source are cleared in the same poll.
+"""
+
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from src.utils import datasets, registry, snapshots
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """Each test watches only its own files."""
+    monkeypatch.setattr(registry, "_datasets", {})
+    monkeypatch.setattr(registry, "_subscribers", [])
+    monkeypatch.setattr(registry, "_versions", {})
+    monkeypatch.setattr(registry, "_checked", None)
+
+
+def _touch(path, text):
+    """Rewrite ``path`` with a newer mtime, as a refresh would."""
+    stat = path.stat() if path.exists() else None
+    path.write_text(text)
+    if stat is not None:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _counted(name, source, loads):
+    def load():
+        loads.append(name)
+        return pd.DataFrame({"value": [int(source.read_text())]})
+
+    return registry.dataset(name, load, str(source))
+
+
+# ---------------------------------------------------------------------------
+# Reloading
+# ---------------------------------------------------------------------------
+def test_only_the_datasets_of_a_changed_file_reload(tmp_path):
+    wps, steo = tmp_path / "wps.txt", tmp_path / "steo.txt"
+    _touch(wps, "1")
+    _touch(steo, "10")
+    loads = []
+    wps_data, steo_data = _counted("wps", wps, loads), _counted("steo", steo, loads)
+    assert loads == []  # nothing is read at registration
+
+    assert wps_data()["value"].tolist() == [1]
+    assert steo_data()["value"].tolist() == [10]
+    assert wps_data() is wps_data()
+    assert loads == ["wps", "steo"]
+
+    _touch(wps, "2")
+    assert wps_data()["value"].tolist() == [1]  # not polled yet
+    assert registry.check(force=True) == {str(wps)}
+    assert wps_data()["value"].tolist() == [2]
+    assert steo_data()["value"].tolist() == [10]
+    assert loads == ["wps", "steo", "wps"]
+    assert set(registry.datasets()) == {"wps", "steo"}
+
+
+def test_checks_are_throttled(tmp_path, monkeypatch):
+    source = tmp_path / "source.txt"
+    _touch(source, "1")
+    registry.on_change([str(source)], lambda: None)
+    assert registry.check() == set()
+
+    _touch(source, "2")
+    assert registry.check() == set()
+    monkeypatch.setattr(registry, "POLL_SECONDS", 0.0)
+    assert registry.check() == {str(source)}
+
+
+def test_readers_keep_the_previous_frame_while_a_reload_runs(tmp_path):
+    source = tmp_path / "source.txt"
+    _touch(source, "1")
+    started, release = threading.Event(), threading.Event()
+
+    def load():
+        value = int(source.read_text())
+        if value > 1:
+            started.set()
+            release.wait(5)
+        return pd.DataFrame({"value": [value]})
+
+    data = registry.dataset("slow", load, str(source))
+    before = data()
+    _touch(source, "2")
+    registry.check(force=True)
+
+    reloading = threading.Thread(target=data)
+    reloading.start()
+    assert started.wait(5)
+    assert data() is before
+    release.set()
+    reloading.join(5)
+    assert data()["value"].tolist() == [2]
+
+
+# ---------------------------------------------------------------------------
+# Subscribed caches
+# ---------------------------------------------------------------------------
+def test_caches_of_a_changed_file_are_cleared_once(tmp_path):
+    wps, steo = tmp_path / "wps.txt", tmp_path / "steo.txt"
+    _touch(wps, "1")
+    _touch(steo, "1")
+    cleared = []
+    clear = cleared.append
+    registry.on_change([str(wps), str(steo)], lambda: clear("both"))
+    registry.on_change([str(steo)], lambda: clear("steo"))
+
+    registry.check(force=True)
+    assert cleared == []
+
+    _touch(wps, "2")
+    _touch(steo, "2")
+    registry.check(force=True)
+    assert cleared == ["both", "steo"]
+
+    wps.unlink()
+    registry.check(force=True)
+    assert cleared == ["both", "steo", "both"]
+
+
+def test_stale_handle_frames_are_dropped_on_a_new_version(tmp_path):
+    source = tmp_path / "source.txt"
+    _touch(source, "1")
+
+    def build():
+        return pd.DataFrame({"value": [int(source.read_text())]})
+
+    datasets.register("polled", build, str(source))
+    try:
+        old = datasets.resolve(datasets.handle("polled"))
+        _touch(source, "2")
+        new = datasets.resolve(datasets.handle("polled"))
+        assert [k for k in datasets._cache if k[0] == "polled"] != []
+
+        registry.check(force=True)
+        cached = [frame for key, frame in datasets._cache.items() if key[0] == "polled"]
+        assert len(cached) == 1 and cached[0]["value"].tolist() == new["value"].tolist() == [2]
+        assert old["value"].tolist() == [1]
+    finally:
+        datasets._builders.pop("polled")
+        datasets.clear()
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+def test_publishing_a_snapshot_is_a_new_version(tmp_path):
+    pivot = tmp_path / "data/steo/steo_pivot.feather"
+    pivot.parent.mkdir(parents=True)
+    pd.DataFrame({"value": [1.0]}).to_feather(pivot)
+    source = "./data/steo/steo_pivot.feather"
+
+    with working_directory(tmp_path):
+        snapshots.publish("steo")
+        data = registry.dataset("steo_pivot", lambda: pd.read_feather(snapshots.path(source)), source)
+        assert data()["value"].tolist() == [1.0]
+
+        # A refresh writing the working file is not seen until it is published
+        pd.DataFrame({"value": [1.0, 2.0]}).to_feather(pivot)
+        assert registry.check(force=True) == set()
+        snapshots.publish("steo")
+        assert registry.check(force=True) == {source}
+        assert data()["value"].tolist() == [1.0, 2.0]
@@ -0,0 +1,104 @@
+"""Routing through the declarative route table, and a data-free page import.
+
+`src/index.py` used to route with a 40-branch if/elif and import every page
+eagerly, and ~19 pages read feather/parquet files and ran pandas transforms at
+module scope -- every worker paid all of it before serving a request. Pages
+now hold no data at import: callbacks are still registered up front, and each
+layout is built by `PageRouter` on the first visit to its route.
+"""
+
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+from src.components.router import PageRouter
+from src.config.navigation import HOME, NAV_SECTIONS
+from src.config.routes import DEFAULT_PAGE, ROUTES
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def test_every_nav_href_has_a_route():
+    hrefs = {HOME["href"]}
+    for section in NAV_SECTIONS:
+        hrefs.update(link["href"] for link in section["links"])
+
+    assert hrefs <= set(ROUTES)
+    assert ROUTES["/"] == DEFAULT_PAGE
+
+
+def test_a_layout_is_built_once_and_unknown_paths_fall_back(monkeypatch):
+    builds = []
+    page = types.ModuleType("fake_page")
+    page.layout = lambda: builds.append(1) or {"built": len(builds)}
+    monkeypatch.setitem(sys.modules, "fake_page", page)
+    router = PageRouter({"/a": "fake_page", "/b": "fake_page"}, "fake_page")
+
+    first = router.layout("/a")
+    assert router.layout("/b") is first
+    assert router.layout("/nowhere") is first
+    assert builds == [1]
+
+    router.clear()
+    assert router.layout("/a") == {"built": 2}
+
+
+def test_layouts_are_rebuilt_when_the_data_changes(tmp_path, monkeypatch):
+    from src.utils import registry
+
+    monkeypatch.setattr(registry, "_subscribers", [])
+    monkeypatch.setattr(registry, "_versions", {})
+    builds = []
+    page = types.ModuleType("fake_page")
+    page.layout = lambda: builds.append(1) or {"built": len(builds)}
+    monkeypatch.setitem(sys.modules, "fake_page", page)
+    source = tmp_path / "pivot.feather"
+    source.write_text("week 1")
+    router = PageRouter({"/a": "fake_page"}, "fake_page")
+    registry.on_change([str(source)], router.clear)
+
+    assert router.layout("/a") == {"built": 1}
+    registry.check(force=True)
+    assert router.layout("/a") == {"built": 1}
+
+    source.write_text("week 2 and 3")
+    registry.check(force=True)
+    assert router.layout("/a") == {"built": 2}
+
+
+def test_the_dashboard_rebuilds_layouts_after_a_refresh():
+    from src.index import router
+    from src.utils import registry, snapshots
+
+    subscribed = set()
+    for sources, clear in registry._subscribers:
+        if clear == router.clear:
+            subscribed.update(sources)
+    assert subscribed == {*snapshots.sources(), "data/cli/companylevelimports"}
+
+
+def test_importing_the_dashboard_reads_no_data():
+    """Importing `src.index` registers every callback without touching `data/`.
+
+    Run in a fresh interpreter: the pages are cached modules in this one.
+    """
+    probe = (
+        "import pandas as pd, pyarrow as pa\n"
+        "reads = []\n"
+        "def spy(name, real):\n"
+        "    def wrapper(*args, **kwargs):\n"
+        "        reads.append(f'{name}({args[0] if args else kwargs})')\n"
+        "        return real(*args, **kwargs)\n"
+        "    return wrapper\n"
+        "for name in ('read_feather', 'read_parquet', 'read_csv', 'read_excel'):\n"
+        "    setattr(pd, name, spy(name, getattr(pd, name)))\n"
+        "pa.memory_map = spy('memory_map', pa.memory_map)\n"
+        "import src.index\n"
+        "print(reads)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", probe],
+        cwd=_REPO, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,44 @@
+"""The WPS seasonality table (`src.wps.generate_seasonality_data`).
+
+`build_seasonality` replaced a builder that pivoted each series separately.
+The committed `seasonality_data.feather` was written by that builder from the
+committed pivot, so it pins the schema and values; `benchmarks/
+seasonality_build.py` times the two against each other.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.wps.generate_seasonality_data import build_seasonality
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def pivot():
+    df = pd.read_feather(_REPO / "data/wps/wps_gte_2015_pivot.feather")
+    df["period"] = pd.to_datetime(df["period"])
+    return df
+
+
+def test_matches_the_committed_table(pivot):
+    expected = pd.read_feather(_REPO / "data/wps/seasonality_data.feather")
+
+    pd.testing.assert_frame_equal(build_seasonality(pivot), expected)
+
+
+def test_year_windows_are_parameters(pivot):
+    df = build_seasonality(pivot, windows={"2223": [2022, 2023]}, ids=["WCESTUS1"])
+
+    ranges = [col for col in df.columns if col.startswith(("min_", "max_", "average_"))]
+    assert ranges == ["average_2223", "max_2223", "min_2223"]
+
+    week = df.set_index("week_of_year").loc[10]
+    stocks = pivot.set_index("period")["WCESTUS1"] / 1000
+    weeks = stocks.index.isocalendar()
+    expected = stocks[(weeks.week == 10) & stocks.index.year.isin([2022, 2023])]
+    assert week["min_2223"] == expected.min()
+    assert week["max_2223"] == expected.max()
+    assert week["average_2223"] == pytest.approx(expected.mean())
@@ -0,0 +1,113 @@
+"""Typed WPS series behind the analysis pages (`src.utils.series_store`).
+
+The refinery, stocks, Cushing and supply/demand pages used to resolve the AG
+grid table -- one row per series, one '%m/%d/%y' string column per week --
+and re-parse every header of every row they plotted, then line series up
+through dicts keyed by date. Their stores now resolve to a `SeriesStore`:
+the headers are parsed once and each series is a row of one float array on a
+shared weekly index.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from src.utils import datasets
+from src.utils.series_store import SeriesStore
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def _table():
+    """An AG grid shaped table, weeks out of order across a year boundary."""
+    return pd.DataFrame(
+        {
+            "id": ["RUNS", "IMPORTS", "STOCKS"],
+            "name": ["Crude runs", "Crude imports", "Crude stocks"],
+            "padd": ["US", "US", "US"],
+            "commodity": ["crude", "crude", "crude"],
+            "type": ["runs", "imports", "stocks"],
+            "uom": ["kb/d", "kb/d", "mb"],
+            "01/03/25": [100.0, 40.0, 430.0],
+            "12/20/24": [80.0, 0.0, 420.0],
+            "12/27/24": [90.0, None, 425.0],
+        }
+    )
+
+
+def _parse_row(row):
+    """How the pages read a row before: parse each header, drop NaN, sort."""
+    pairs = []
+    for col in row.index.difference(["id", "name", "padd", "commodity", "type", "uom"]):
+        if pd.notna(row[col]):
+            pairs.append((pd.to_datetime(col, format="%m/%d/%y"), float(row[col])))
+    pairs.sort()
+    return [d for d, _ in pairs], [v for _, v in pairs]
+
+
+# ---------------------------------------------------------------------------
+# Series
+# ---------------------------------------------------------------------------
+def test_series_match_parsing_the_row_cell_by_cell():
+    table = _table()
+    store = SeriesStore.from_table(table)
+
+    assert store.periods.is_monotonic_increasing
+    for _, row in table.iterrows():
+        dates, values = store.series(row["id"])
+        expected_dates, expected_values = _parse_row(row)
+        assert dates.tolist() == expected_dates
+        assert values.tolist() == expected_values
+
+
+def test_align_keeps_the_weeks_every_series_has():
+    store = SeriesStore.from_table(_table())
+
+    dates, (runs, imports) = store.align("RUNS", "IMPORTS")
+
+    assert dates.strftime("%Y-%m-%d").tolist() == ["2024-12-20", "2025-01-03"]
+    assert runs.tolist() == [80.0, 100.0]
+    assert imports.tolist() == [0.0, 40.0]
+
+
+def test_ratio_skips_a_zero_denominator_and_diff_is_dated_at_the_later_week():
+    store = SeriesStore.from_table(_table())
+
+    dates, ratio = store.ratio("IMPORTS", "RUNS")
+    assert (dates.strftime("%Y-%m-%d").tolist(), ratio.tolist()) == (["2024-12-20", "2025-01-03"], [0.0, 40.0])
+    dates, ratio = store.ratio("RUNS", "IMPORTS")
+    assert (dates.strftime("%Y-%m-%d").tolist(), ratio.tolist()) == (["2025-01-03"], [250.0])
+
+    dates, change = store.diff("STOCKS")
+    assert (dates.strftime("%Y-%m-%d").tolist(), change.tolist()) == (["2024-12-27", "2025-01-03"], [5.0, 5.0])
+
+
+def test_unknown_series_are_empty_and_the_values_are_read_only():
+    store = SeriesStore.from_table(_table())
+
+    dates, values = store.series("MISSING")
+    assert (len(dates), len(values)) == (0, 0)
+    assert "MISSING" not in store and len(store) == 3
+    assert store.name("STOCKS") == "Crude stocks"
+    with pytest.raises(ValueError):
+        store.row("RUNS")[0] = 0.0
+    assert np.isnan(store.row("IMPORTS")[1])
+
+
+# ---------------------------------------------------------------------------
+# Dataset handle
+# ---------------------------------------------------------------------------
+def test_the_series_handle_resolves_to_a_shared_store():
+    ref = datasets.handle("wps_ag_series", start="2024-01-01", end="2024-12-31")
+    with working_directory(_REPO):
+        store = datasets.resolve(ref)
+        table = datasets.resolve(datasets.handle("wps_ag_table", start="2024-01-01", end="2024-12-31"))
+
+    assert datasets.resolve(ref) is store
+    row = table.iloc[0]
+    dates, values = store.series(row["id"])
+    assert values.tolist() == _parse_row(row)[1]
+    assert dates.year.unique().tolist() == [2024]
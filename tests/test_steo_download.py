@@ -0,0 +1,222 @@
+"""STEO archive downloads (`src.steo.download`).
+
+`steo.get_all` used to fetch each monthly `*_base.xlsx` in turn and stop at
+the first failure. Releases are now fetched a few at a time into a raw cache
+keyed by release month, cached releases are not fetched again, and the cached
+workbooks are parsed in a process pool. These tests serve small STEO-shaped
+workbooks from a local HTTP server; requests to anything else are still
+blocked by the network guard in conftest.
+"""
+
+import hashlib
+import io
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from src.steo import download
+
+_REPO = Path(__file__).resolve().parents[1]
+
+# Parsed workbooks (`src.utils.workbooks`) go to a throwaway workspace
+pytestmark = pytest.mark.usefixtures("tmp_workspace")
+
+
+def _workbook(value):
+    """A workbook laid out like an STEO release: two header rows, then years over months."""
+    rows = [
+        ["Short-Term Energy Outlook", None, None, None, None],
+        [None, None, None, None, None],
+        ["Forecast date:", None, 2025, None, 2026],
+        ["Table 4a", None, "Nov", "Dec", "Jan"],
+        ["COPRPUS", "Crude oil production", value, value + 1, value + 2],
+        ["PAPRPUS", "Liquids production", value * 2, None, value * 3],
+    ]
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for sheet in ["Contents", "Dates"]:
+            pd.DataFrame([[sheet]] * 4).to_excel(writer, sheet_name=sheet, header=False, index=False)
+        pd.DataFrame(rows).to_excel(writer, sheet_name="4atab", header=False, index=False)
+    return buffer.getvalue()
+
+
+class _Archive(BaseHTTPRequestHandler):
+    files = {}
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("Range")))
+        body = self.files.get(self.path.rsplit("/", 1)[-1])
+        if body is None:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range") == etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+        if start >= len(body) > 0:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(body)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", etag)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def archive(local_http):
+    _Archive.files = {"dec25_base.xlsx": _workbook(10.0), "nov25_base.xlsx": _workbook(20.0)}
+    _Archive.requests = []
+    return _Archive, local_http(_Archive, "/archives/")
+
+
+# ---------------------------------------------------------------------------
+# Raw cache
+# ---------------------------------------------------------------------------
+def test_releases_are_cached_by_month_and_a_missing_one_is_skipped(archive, tmp_path):
+    handler, url = archive
+    releases = download.get_download_list(3, end_month="2026-01-01", base_url=url)
+
+    paths, failed = download.download_releases(releases, tmp_path, workers=3)
+
+    assert failed == [pd.Timestamp("2026-01-01")]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "2025-11_base.xlsx",
+        "2025-12_base.xlsx",
+    ]
+    assert paths[pd.Timestamp("2025-12-01")].read_bytes() == handler.files["dec25_base.xlsx"]
+
+
+def test_cached_releases_are_not_fetched_again(archive, tmp_path):
+    handler, url = archive
+    releases = download.get_download_list(2, end_month="2025-12-01", base_url=url)
+    download.download_releases(releases, tmp_path)
+    handler.requests.clear()
+
+    paths, failed = download.download_releases(releases, tmp_path)
+
+    assert (len(paths), failed, handler.requests) == (2, [], [])
+    download.download_releases(releases, tmp_path, refresh=True)
+    assert len(handler.requests) == 2
+
+
+def _leave_part(directory, data, etag=None):
+    """What an interrupted run leaves: `data` in the .part file, and the ETag it was sent."""
+    (directory / "2025-12_base.xlsx.part").write_bytes(data)
+    if etag is not None:
+        (directory / "2025-12_base.xlsx.part.tag").write_text(etag)
+
+
+def _etag(body):
+    return '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+def _fetched(directory, url):
+    path = download.fetch_release(url + "dec25_base.xlsx", directory / "2025-12_base.xlsx")
+    assert sorted(p.name for p in directory.iterdir()) == ["2025-12_base.xlsx"]
+    return path.read_bytes()
+
+
+def test_a_partial_download_is_resumed(archive, tmp_path):
+    handler, url = archive
+    body = handler.files["dec25_base.xlsx"]
+    _leave_part(tmp_path, body[:1000], _etag(body))
+
+    assert _fetched(tmp_path, url) == body
+    assert handler.requests == [("/archives/dec25_base.xlsx", "bytes=1000-")]
+
+
+def test_a_part_left_complete_is_kept_without_fetching_it_again(archive, tmp_path):
+    handler, url = archive
+    body = handler.files["dec25_base.xlsx"]
+    _leave_part(tmp_path, body, _etag(body))
+
+    assert _fetched(tmp_path, url) == body
+    assert handler.requests == [("/archives/dec25_base.xlsx", f"bytes={len(body)}-")]
+
+
+def test_a_part_of_an_earlier_file_is_not_spliced_onto_the_new_one(archive, tmp_path):
+    handler, url = archive
+    earlier = _workbook(5.0)
+    body = handler.files["dec25_base.xlsx"]
+    _leave_part(tmp_path, earlier[:1000], _etag(earlier))
+
+    assert _fetched(tmp_path, url) == body
+
+
+def test_a_part_without_its_etag_is_downloaded_again(archive, tmp_path):
+    handler, url = archive
+    body = handler.files["dec25_base.xlsx"]
+    _leave_part(tmp_path, b"x" * 1000)
+
+    assert _fetched(tmp_path, url) == body
+    assert handler.requests == [("/archives/dec25_base.xlsx", None)]
+
+
+def test_a_resumed_part_that_is_not_a_workbook_is_fetched_in_full(archive, tmp_path):
+    handler, url = archive
+    body = handler.files["dec25_base.xlsx"]
+    _leave_part(tmp_path, b"x" * 1000, _etag(body))
+
+    assert _fetched(tmp_path, url) == body
+    assert [r for _, r in handler.requests] == ["bytes=1000-", None]
+
+
+def test_a_page_that_is_not_a_workbook_is_not_cached(archive, tmp_path):
+    handler, url = archive
+    handler.files["oct25_base.xlsx"] = b"<html>Page not found</html>"
+
+    with pytest.raises(ValueError, match="not return an xlsx"):
+        download.fetch_release(url + "oct25_base.xlsx", tmp_path / "2025-10_base.xlsx")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+def test_parsing_in_processes_matches_parsing_in_turn(archive, tmp_path):
+    _, url = archive
+    releases = download.get_download_list(2, end_month="2025-12-01", base_url=url)
+
+    with working_directory(_REPO):
+        parallel = download.collect(releases, tmp_path, parse_workers=2)
+        serial = download.collect(releases, tmp_path, parse_workers=1)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert parallel["release_date"].unique().tolist() == [
+        pd.Timestamp("2025-12-01"),
+        pd.Timestamp("2025-11-01"),
+    ]
+    copr = parallel[(parallel["id"] == "COPRPUS") & (parallel["release_date"] == "2025-12-01")]
+    assert copr.set_index("period")["value"].to_dict() == {
+        "2025-11-01": 10.0,
+        "2025-12-01": 11.0,
+        "2026-01-01": 12.0,
+    }
+
+
+def test_a_cached_workbook_that_fails_to_parse_is_skipped_and_fetched_again(archive, tmp_path):
+    handler, url = archive
+    releases = download.get_download_list(2, end_month="2025-12-01", base_url=url)
+    (tmp_path / "2025-11_base.xlsx").write_bytes(b"not a workbook")
+
+    with working_directory(_REPO):
+        df = download.collect(releases, tmp_path, parse_workers=2)
+        assert df["release_date"].unique().tolist() == [pd.Timestamp("2025-12-01")]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["2025-12_base.xlsx"]
+
+        df = download.collect(releases, tmp_path, parse_workers=1)
+    assert df["release_date"].nunique() == 2
@@ -0,0 +1,148 @@
+"""Workbooks parsed once per content (`src.utils.workbooks`).
+
+The WPS, STEO and CLI ingests parsed their workbooks with `pd.read_excel` on
+every run, even when the bytes had not changed. Parsed sheets are now kept as
+Arrow files keyed by the workbook's sha256 and parse options; a re-run reads
+those, and must get back exactly what `pd.read_excel` returned, down to the
+Python type of each cell of a mixed column.
+"""
+
+import datetime
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from src.utils import workbooks
+
+
+def _write(path, stamp=datetime.datetime(2025, 1, 3)):
+    """A psw09-like sheet (two header rows over dates and numbers) and a typed one."""
+    rows = [
+        ["Sourcekey", "WCESTUS1", "WCRFPUS2", "NOTE"],
+        ["Date", "Crude stocks", "Crude production", "Flag"],
+        [stamp, 430.5, 13500, True],
+        [datetime.datetime(2025, 1, 10), None, 13512, "revised"],
+    ]
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name="Data 1", header=False, index=False)
+        typed = pd.DataFrame(
+            {
+                "id": ["a", "b", "c"],
+                "count": [1, 2, 3],
+                "period": pd.to_datetime(["2025-01-01", "2025-02-01", "2025-03-01"]),
+                2025: [1.5, None, 2.5],
+            }
+        )
+        typed.to_excel(writer, sheet_name="Typed", index=False)
+    return path
+
+
+def _assert_same(stored, parsed):
+    pd.testing.assert_frame_equal(stored, parsed)
+    for position in range(parsed.shape[1]):
+        assert list(map(type, stored.iloc[:, position])) == list(map(type, parsed.iloc[:, position]))
+
+
+def _no_excel(*args, **kwargs):
+    raise AssertionError("the workbook should have come from the cache")
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("header", [0, 2])
+def test_sheets_read_back_exactly_as_read_excel_parses_them(tmp_path, header):
+    path = _write(tmp_path / "book.xlsx")
+    expected = pd.read_excel(path, sheet_name=None, header=header)
+
+    parsed = workbooks.read_workbook(path, header=header, workers=1, cache_dir=tmp_path / "cache")
+    stored = workbooks.read_workbook(path, header=header, workers=1, cache_dir=tmp_path / "cache")
+
+    assert list(stored) == list(expected) == ["Data 1", "Typed"]
+    for name in expected:
+        _assert_same(parsed[name], expected[name])
+        _assert_same(stored[name], expected[name])
+
+
+def test_sheets_parsed_in_processes_match_sheets_parsed_in_turn(tmp_path):
+    path = _write(tmp_path / "book.xlsx")
+
+    parallel = workbooks.read_workbook(path, workers=2, cache_dir=tmp_path / "parallel")
+    serial = workbooks.read_workbook(path, workers=1, cache_dir=tmp_path / "serial")
+
+    for name in serial:
+        _assert_same(parallel[name], serial[name])
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def test_unchanged_bytes_are_not_parsed_again(tmp_path, monkeypatch):
+    path = _write(tmp_path / "book.xlsx")
+    cache = tmp_path / "cache"
+    workbooks.read_workbook(path, workers=1, cache_dir=cache)
+    workbooks.read_workbook(path, "Typed", cache_dir=cache)
+
+    monkeypatch.setattr(pd, "read_excel", _no_excel)
+    monkeypatch.setattr(pd, "ExcelFile", _no_excel)
+    assert workbooks.read_workbook(path, cache_dir=cache)["Typed"]["count"].tolist() == [1, 2, 3]
+    assert workbooks.read_workbook(path, "Typed", cache_dir=cache)["id"].tolist() == ["a", "b", "c"]
+    assert len(list(cache.iterdir())) == 1
+
+
+def test_new_bytes_are_parsed_under_their_own_digest(tmp_path):
+    path = _write(tmp_path / "book.xlsx")
+    cache = tmp_path / "cache"
+    workbooks.read_workbook(path, "Data 1", cache_dir=cache)
+    before = workbooks.digest(path)
+
+    _write(path, stamp=datetime.datetime(2024, 12, 27))
+    sheet = workbooks.read_workbook(path, "Data 1", cache_dir=cache)
+
+    assert sheet.iloc[1, 0] == datetime.datetime(2024, 12, 27)
+    digests = {entry.name.split("-")[0] for entry in cache.iterdir()}
+    assert digests == {before, workbooks.digest(path)}
+
+
+def test_a_sheet_that_cannot_be_stored_is_still_returned(tmp_path):
+    path = tmp_path / "book.xlsx"
+    # A date as a column label, which is not stored
+    rows = [["Series", datetime.datetime(2025, 1, 3)], ["WCESTUS1", 430.5]]
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name="Dated", header=False, index=False)
+
+    sheet = workbooks.read_workbook(path, "Dated", cache_dir=tmp_path / "cache")
+
+    assert sheet[datetime.datetime(2025, 1, 3)].tolist() == [430.5]
+    assert not list((tmp_path / "cache").rglob("*.arrow"))
+
+
+def test_an_integer_beyond_int64_is_returned_and_not_cached(tmp_path):
+    sheet = pd.DataFrame({"id": ["WCESTUS1", 2**70]})
+    path = tmp_path / "cache" / "sheet.arrow"
+
+    workbooks._save_sheet(path, sheet)
+
+    assert not path.exists()
+
+
+def test_conversions_not_read_for_a_while_are_removed(tmp_path):
+    cache = tmp_path / "cache"
+    path = _write(tmp_path / "book.xlsx")
+    workbooks.read_workbook(path, "Data 1", cache_dir=cache)
+    (kept,) = cache.iterdir()
+    retired = cache / f"{'0' * 64}-h0-v{workbooks.FORMAT}"
+    retired.mkdir()
+    old = time.time() - workbooks.MAX_AGE - 60
+    os.utime(retired, (old, old))
+    os.utime(kept, (old, old))
+
+    # Reading a cached workbook marks it as used
+    workbooks.read_workbook(path, "Data 1", cache_dir=cache)
+    _write(path, stamp=datetime.datetime(2024, 12, 27))
+    workbooks.read_workbook(path, "Data 1", cache_dir=cache)
+
+    assert kept.exists() and not retired.exists()
+    assert len(list(cache.iterdir())) == 2
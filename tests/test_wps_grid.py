@@ -0,0 +1,81 @@
+"""Display formatting of the WPS stats grid (`src.wps.ag_calculations`).
+
+The stats pages formatted the grid with `iterrows()` and one `.at` write and
+`pd.to_numeric` call per cell, which stalled for seconds on wide date ranges.
+The value columns are now formatted an array at a time; the strings must be
+the ones the per-cell loop produced.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dash_eia.apps.compat import working_directory
+from src.utils.data_loader import loader
+from src.wps.ag_calculations import DataProcessor, format_grid_display_data
+
+_REPO = Path(__file__).resolve().parents[1]
+
+
+def _format_value(value, uom):
+    """The per-cell rule the pages applied before."""
+    numeric_value = pd.to_numeric(value, errors="coerce")
+    if pd.isna(numeric_value) or numeric_value == 0:
+        return "-"
+    decimals = 1 if uom in {"mb", "pct"} else 0
+    formatted = f"{abs(float(numeric_value)):,.{decimals}f}"
+    return f"({formatted})" if numeric_value < 0 else formatted
+
+
+def _table():
+    return pd.DataFrame(
+        {
+            "id": ["STOCKS", "RUNS", "UTIL"],
+            "name": ["Crude stocks", "Crude runs", "Utilization"],
+            "padd": ["US", "US", "US"],
+            "commodity": ["crude", "crude", "crude"],
+            "type": ["stocks", "runs", "util"],
+            "uom": ["mb", "kb/d", "pct"],
+            "01/03/25": [430.25, -16123.6, 0.0],
+            "12/27/24": [np.nan, 1234.5, -0.04],
+            "12/20/24": ["425.0", "n/a", 91.26],
+        }
+    )
+
+
+def test_cells_match_the_per_cell_rule():
+    table = _table()
+
+    display = format_grid_display_data(table)
+
+    assert display.columns.tolist() == table.columns.tolist()
+    for col in ["01/03/25", "12/27/24", "12/20/24"]:
+        expected = [_format_value(v, uom) for v, uom in zip(table[col], table["uom"])]
+        assert display[col].tolist() == expected
+    assert display["01/03/25"].tolist() == ["430.2", "(16,124)", "-"]
+    assert display["12/27/24"].tolist() == ["-", "1,234", "(0.0)"]
+
+
+def test_metadata_and_the_raw_table_are_left_alone():
+    table = _table()
+    raw = table.copy()
+
+    display = format_grid_display_data(table)
+
+    pd.testing.assert_frame_equal(table, raw)
+    pd.testing.assert_frame_equal(display[["id", "name", "uom"]], raw[["id", "name", "uom"]])
+    assert format_grid_display_data(pd.DataFrame()).empty
+
+
+def test_mapped_series_missing_from_the_pivot_are_left_out(monkeypatch):
+    with working_directory(_REPO):
+        mapping = loader.load_ag_mapping()
+        retired = {"W_RETIRED_SERIES": next(iter(mapping.values()))}
+        monkeypatch.setattr(loader, "load_ag_mapping", lambda: {**retired, **mapping})
+
+        table = DataProcessor().get_table("2024-01-01", "2024-03-31")
+
+    assert "W_RETIRED_SERIES" not in set(table["id"])
+    assert table["id"].tolist() == [id for id in mapping if id in set(table["id"])]
+    assert len(table) > 0
@@ -0,0 +1,102 @@
+"""Incremental weekly WPS ingest.
+
+A Wednesday release adds one week to psw09.xls and sometimes revises a few
+earlier ones. `src.wps.download_xlsx.ingest` recomputes only those weeks (and
+the week after each revision, which the adjustment factor's stock change
+reads) and splices them into the stored files. Whatever it touches, the files
+must come out the same as a full rebuild from the same release.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from dash_eia.apps.compat import working_directory
+from dash_eia.transforms.wps import WPS_FORMULAS
+from src.wps import download_xlsx, incremental
+
+_REPO = Path(__file__).resolve().parents[1]
+_FILES = [
+    download_xlsx.LONG_PATH,
+    download_xlsx.PIVOT_PATH,
+    incremental.LINE_PATH,
+    incremental.SEASONALITY_PATH,
+]
+
+
+@pytest.fixture(scope="module")
+def release():
+    """The stored long frame with the derived tickers taken out, as parsed from psw09."""
+    stored = pd.read_feather(_REPO / "data/wps/wps_gte_2015.feather")
+    return stored.loc[~stored["id"].isin(WPS_FORMULAS.ids), ["period", "id", "value"]]
+
+
+def _snapshot():
+    return {path: pd.read_feather(path) for path in _FILES}
+
+
+def _sorted_long(df):
+    return df.sort_values(["period", "id"]).reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# Detecting what changed
+# ---------------------------------------------------------------------------
+def test_new_and_revised_weeks_are_detected():
+    periods = pd.date_range("2025-01-03", periods=4, freq="W-FRI")
+    stored = pd.DataFrame({"period": periods[:3], "id": "WCESTUS1", "value": [1.0, None, 3.0]})
+    raw = pd.DataFrame({"period": periods, "id": "WCESTUS1", "value": [1.0, None, 3.5, 4.0]})
+
+    assert incremental.changed_periods(raw, stored).tolist() == list(periods[2:])
+
+
+def test_a_revision_recomputes_the_following_week_from_its_lookback():
+    periods = pd.date_range("2025-01-03", periods=8, freq="W-FRI")
+
+    out, inputs = incremental.recompute_window([periods[3], periods[7]], periods)
+
+    assert out.tolist() == [periods[3], periods[4], periods[7]]
+    assert inputs.tolist() == [periods[2], periods[3], periods[4], periods[6], periods[7]]
+
+
+# ---------------------------------------------------------------------------
+# Splicing matches a full rebuild
+# ---------------------------------------------------------------------------
+def test_incremental_ingest_matches_a_full_rebuild(tmp_path, release):
+    periods = sorted(release["period"].unique())
+    previous = release[release["period"] < periods[-1]]
+    latest = release.copy()
+    revised = (latest["period"] == periods[-4]) & (latest["id"] == "WCRSTUS1")
+    latest.loc[revised, "value"] += 7000
+
+    (tmp_path / "data/wps").mkdir(parents=True)
+    with working_directory(tmp_path):
+        download_xlsx.ingest(previous)
+        stored = pd.read_feather(download_xlsx.LONG_PATH)
+        assert incremental.changed_periods(latest, stored).tolist() == [periods[-4], periods[-1]]
+
+        download_xlsx.ingest(latest)
+        appended = _snapshot()
+        download_xlsx.ingest(latest, full=True)
+        rebuilt = _snapshot()
+
+    pd.testing.assert_frame_equal(
+        _sorted_long(appended[download_xlsx.LONG_PATH]),
+        _sorted_long(rebuilt[download_xlsx.LONG_PATH]),
+    )
+    for path in _FILES[1:]:
+        pd.testing.assert_frame_equal(appended[path], rebuilt[path], check_dtype=False)
+
+
+def test_a_failed_download_fails_the_job_and_falls_back_only_on_the_command_line(monkeypatch):
+    def offline():
+        raise ConnectionError("ir.eia.gov unreachable")
+
+    monkeypatch.setattr(download_xlsx, "download_raw_file", offline)
+    with working_directory(_REPO):
+        with pytest.raises(ConnectionError):
+            download_xlsx.main()
+        pv = download_xlsx.main(fallback=True)
+
+    assert not pv.empty and pv["period"].dtype.kind == "M"
@@ -0,0 +1,138 @@
+"""Seasonal and rolling WPS statistics (`dash_eia.transforms.wps_stats`).
+
+The stocks, Cushing and supply/demand pages computed ISO weeks, 5-year bands,
+rolling z-scores and percentile ranks over the pivot in every callback. They
+now look them up in one set of arrays written at WPS ingest; these tests pin
+the arrays to the per-callback computations they replaced.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_eia.transforms import wps_stats
+from src.utils.variables import years_last_five_years_range
+
+_REPO = Path(__file__).resolve().parents[1]
+_PIVOT = _REPO / "data/wps/wps_gte_2015_pivot.feather"
+_YEARS = [2021, 2022, 2023, 2024, 2025]
+
+
+def _pivot():
+    """Seven years of two weekly series; the second starts late and has a gap."""
+    periods = pd.date_range("2019-01-04", "2025-12-26", freq="W-FRI")
+    rng = np.random.default_rng(1)
+    stocks = 400 + rng.normal(0, 10, len(periods)).round(1)
+    runs = 16 + rng.normal(0, 1, len(periods)).round(2)
+    runs[:60] = np.nan
+    runs[200:203] = np.nan
+    return pd.DataFrame({"period": periods, "STOCKS": stocks, "RUNS": runs})
+
+
+def _week(df):
+    return df["period"].dt.isocalendar().week.astype(int)
+
+
+# ---------------------------------------------------------------------------
+# Seasonal bands
+# ---------------------------------------------------------------------------
+def test_bands_match_a_groupby_by_iso_week_over_the_band_years():
+    pivot = _pivot()
+    stats = wps_stats.build(pivot, _YEARS)
+
+    sub = pivot[pivot["period"].dt.year.isin(_YEARS)]
+    for sid in ["STOCKS", "RUNS"]:
+        expected = sub.groupby(_week(sub))[sid].agg(["mean", "min", "max"]).reset_index(names="week")
+        pd.testing.assert_frame_equal(stats.band(sid), expected, check_dtype=False)
+        assert stats.five_year_avg(sid, 10) == expected.set_index("week").loc[10, "mean"]
+
+    ratio = stats.row("STOCKS") / stats.row("RUNS")
+    expected = (pivot["STOCKS"] / pivot["RUNS"])[sub.index].groupby(_week(sub)).mean()
+    np.testing.assert_allclose(stats.bands_of(ratio)["mean"], expected.to_numpy())
+
+
+def test_a_calendar_year_comes_with_its_iso_weeks():
+    pivot = _pivot()
+    stats = wps_stats.build(pivot, _YEARS)
+
+    weeks, values = stats.by_year(stats.row("STOCKS"), 2021)
+
+    year = pivot[pivot["period"].dt.year == 2021]
+    assert weeks.tolist() == _week(year).tolist()
+    assert weeks[0] == 53
+    assert values.tolist() == year["STOCKS"].tolist()
+
+
+# ---------------------------------------------------------------------------
+# Rolling scores
+# ---------------------------------------------------------------------------
+def test_rolling_scores_are_over_the_series_own_observations():
+    pivot = _pivot()
+    stats = wps_stats.build(pivot, _YEARS)
+
+    runs = pivot[["period", "RUNS"]].dropna()
+    rolling = runs["RUNS"].rolling(window=156, min_periods=52)
+    zscores = ((runs["RUNS"] - rolling.mean()) / rolling.std()).dropna()
+    percentiles = rolling.apply(lambda x: (x.iloc[-1] >= x).sum() / len(x) * 100, raw=False).dropna()
+
+    periods, values = stats.zscore("RUNS")
+    assert pd.DatetimeIndex(periods).tolist() == runs.loc[zscores.index, "period"].tolist()
+    np.testing.assert_allclose(values, zscores.to_numpy())
+    periods, values = stats.percentile("RUNS")
+    assert pd.DatetimeIndex(periods).tolist() == runs.loc[percentiles.index, "period"].tolist()
+    np.testing.assert_allclose(values, percentiles.to_numpy())
+
+
+def test_seasonal_deviation_is_against_the_last_five_years_of_the_series():
+    pivot = _pivot()
+    stats = wps_stats.build(pivot, _YEARS)
+
+    hist = pivot[pivot["period"] >= pivot["period"].max() - pd.DateOffset(years=5)]
+    expected = pivot["STOCKS"] - _week(pivot).map(hist.groupby(_week(hist))["STOCKS"].mean())
+
+    periods, values = stats.seasonal_deviation("STOCKS")
+    assert pd.DatetimeIndex(periods).tolist() == pivot["period"].tolist()
+    np.testing.assert_allclose(values, expected.to_numpy())
+
+
+# ---------------------------------------------------------------------------
+# Stored arrays
+# ---------------------------------------------------------------------------
+def test_load_rebuilds_when_the_pivot_or_years_change(tmp_path):
+    pivot, path = tmp_path / "pivot.feather", tmp_path / "stats.npz"
+    _pivot().to_feather(pivot)
+
+    first = wps_stats.load(pivot, path, _YEARS)
+    assert path.exists()
+    assert wps_stats.load(pivot, path, _YEARS).digest == first.digest
+    assert wps_stats.load(pivot, path, _YEARS[1:]).years.tolist() == _YEARS[1:]
+
+    changed = _pivot()
+    changed.loc[0, "STOCKS"] = -1.0
+    changed.to_feather(pivot)
+    assert wps_stats.load(pivot, path, _YEARS).row("STOCKS")[0] == -1.0
+
+
+def test_load_without_write_leaves_a_stale_file_alone(tmp_path):
+    pivot, path = tmp_path / "pivot.feather", tmp_path / "stats.npz"
+    _pivot().to_feather(pivot)
+    wps_stats.materialize(pivot, path, _YEARS[1:])
+    stored = path.read_bytes()
+
+    stats = wps_stats.load(pivot, path, _YEARS, write=False)
+
+    assert stats.years.tolist() == _YEARS
+    assert path.read_bytes() == stored
+
+
+def test_the_committed_arrays_are_current_and_read_back_identically(tmp_path):
+    stored = wps_stats.WPSStats.read(_REPO / "data/wps/wps_stats.npz")
+    saved = wps_stats.materialize(_PIVOT, tmp_path / "stats.npz", years_last_five_years_range)
+
+    assert stored.digest == saved.digest
+    for key in wps_stats.WPSStats.KEYS:
+        np.testing.assert_array_equal(getattr(stored, key), getattr(saved, key))
+    with pytest.raises(KeyError, match="Not a WPS series"):
+        stored.position("COPRPM")
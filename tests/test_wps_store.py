@@ -0,0 +1,60 @@
+"""Column-projected, memory-mapped reads of the wide WPS pivot.
+
+The WPS pages used to load the whole period x series pivot into every worker at
+import time and then pick one or two columns out of it. `WPSStore` maps the
+file instead and materializes only the requested series and date range.
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+from src.utils.wps_store import WPSStore, write_wps_table
+
+
+def _pivot(path):
+    df = pd.DataFrame(
+        {
+            "period": pd.date_range("2024-01-05", periods=6, freq="W-FRI"),
+            "WCESTUS1": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "WGFRPUS2": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+            "WDIRPUS2": [7.0, 7.0, 7.0, 7.0, 7.0, 7.0],
+        }
+    )
+    write_wps_table(df, path)
+    return WPSStore(path)
+
+
+def test_reads_only_the_requested_series(tmp_path):
+    store = _pivot(tmp_path / "pivot.feather")
+
+    df = store.read(["WGFRPUS2"])
+
+    assert df.columns.tolist() == ["period", "WGFRPUS2"]
+    assert df["WGFRPUS2"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]
+    assert store.series_ids() == ["WCESTUS1", "WGFRPUS2", "WDIRPUS2"]
+
+
+def test_date_bounds_are_inclusive(tmp_path):
+    store = _pivot(tmp_path / "pivot.feather")
+
+    df = store.read("WCESTUS1", start="2024-01-12", end="2024-01-26")
+
+    assert df["period"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2024-01-12",
+        "2024-01-19",
+        "2024-01-26",
+    ]
+    assert df["WCESTUS1"].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_the_file_is_written_uncompressed(tmp_path):
+    path = tmp_path / "pivot.feather"
+    _pivot(path)
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        batch = reader.get_batch(0)
+        # An uncompressed column buffer is a view into the mapped file.
+        mapped = source.read_buffer(source.size())
+        buf = batch.column(1).buffers()[1]
+        assert mapped.address <= buf.address < mapped.address + mapped.size